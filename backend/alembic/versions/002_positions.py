@@ -0,0 +1,123 @@
+"""materialized positions
+
+Revision ID: 002_positions
+Revises: 001_initial
+Create Date: 2026-10-18
+
+Adds the positions engine tables:
+- position_history: running (quantity, cost_basis) per (asset, broker, trade_date)
+- positions: current position per (asset, broker)
+- position_invalidations: earliest affected trade_date per (asset, broker),
+  written by triggers on transactions (insert/update/delete, cascades included)
+
+Existing transactions are marked as invalidated, the tables are filled by the
+first PositionManager.sync() (or ./dev.sh db:positions rebuild).
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from backend.app.db.models import QUANTITY_TYPES_SQL
+
+revision: str = '002_positions'
+down_revision: Union[str, Sequence[str], None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Lower from_date of (asset, broker) to trade_date (insert or keep the earliest)
+_MARK_SQL = """INSERT INTO position_invalidations (asset_id, broker_id, from_date)
+               VALUES ({row}.asset_id, {row}.broker_id, {row}.trade_date)
+               ON CONFLICT (asset_id, broker_id) DO UPDATE SET from_date = MIN(from_date, excluded.from_date);"""
+
+
+def upgrade() -> None:
+    """Create positions tables and invalidation triggers."""
+    conn = op.get_bind()
+
+    print("🔧 Starting migration 002_positions...")
+    print("=" * 60)
+
+    print("📦 Creating table: position_history...")
+    conn.execute(sa.text("""CREATE TABLE position_history
+                            (
+                                id         INTEGER PRIMARY KEY,
+                                asset_id   INTEGER        NOT NULL,
+                                broker_id  INTEGER        NOT NULL,
+                                trade_date DATE           NOT NULL,
+                                quantity   NUMERIC(18, 6) NOT NULL,
+                                cost_basis NUMERIC(18, 6) NOT NULL,
+                                FOREIGN KEY (asset_id) REFERENCES assets (id) ON DELETE CASCADE,
+                                FOREIGN KEY (broker_id) REFERENCES brokers (id) ON DELETE CASCADE,
+                                CONSTRAINT uq_position_history_asset_broker_date UNIQUE (asset_id, broker_id, trade_date)
+                            )"""))
+    print("  ✓ Table created")
+
+    print("📦 Creating table: positions...")
+    conn.execute(sa.text("""CREATE TABLE positions
+                            (
+                                asset_id         INTEGER        NOT NULL,
+                                broker_id        INTEGER        NOT NULL,
+                                quantity         NUMERIC(18, 6) NOT NULL,
+                                cost_basis       NUMERIC(18, 6) NOT NULL,
+                                first_trade_date DATE           NOT NULL,
+                                last_trade_date  DATE           NOT NULL,
+                                updated_at       DATETIME       NOT NULL,
+                                PRIMARY KEY (asset_id, broker_id),
+                                FOREIGN KEY (asset_id) REFERENCES assets (id) ON DELETE CASCADE,
+                                FOREIGN KEY (broker_id) REFERENCES brokers (id) ON DELETE CASCADE
+                            )"""))
+    print("  ✓ Table created")
+
+    print("📦 Creating table: position_invalidations...")
+    conn.execute(sa.text("""CREATE TABLE position_invalidations
+                            (
+                                asset_id  INTEGER NOT NULL,
+                                broker_id INTEGER NOT NULL,
+                                from_date DATE    NOT NULL,
+                                PRIMARY KEY (asset_id, broker_id)
+                            )"""))
+    print("  ✓ Table created")
+
+    print("⚡ Creating position invalidation triggers on transactions...")
+    conn.execute(sa.text(f"""CREATE TRIGGER trg_transactions_positions_insert
+                             AFTER INSERT ON transactions
+                             WHEN new.type IN ({QUANTITY_TYPES_SQL})
+                             BEGIN
+                                 {_MARK_SQL.format(row="new")}
+                             END"""))
+    conn.execute(sa.text(f"""CREATE TRIGGER trg_transactions_positions_delete
+                             AFTER DELETE ON transactions
+                             WHEN old.type IN ({QUANTITY_TYPES_SQL})
+                             BEGIN
+                                 {_MARK_SQL.format(row="old")}
+                             END"""))
+    conn.execute(sa.text(f"""CREATE TRIGGER trg_transactions_positions_update
+                             AFTER UPDATE OF asset_id, broker_id, type, quantity, price, trade_date ON transactions
+                             WHEN old.type IN ({QUANTITY_TYPES_SQL}) OR new.type IN ({QUANTITY_TYPES_SQL})
+                             BEGIN
+                                 {_MARK_SQL.format(row="old")}
+                                 {_MARK_SQL.format(row="new")}
+                             END"""))
+    print("  ✓ 3 Triggers created")
+
+    conn.execute(sa.text(f"""INSERT INTO position_invalidations (asset_id, broker_id, from_date)
+                             SELECT asset_id, broker_id, MIN(trade_date)
+                             FROM transactions
+                             WHERE type IN ({QUANTITY_TYPES_SQL})
+                             GROUP BY asset_id, broker_id"""))
+    print("  ✓ Existing transactions marked for replay")
+
+    print("=" * 60)
+    print("✅ Migration 002_positions completed successfully!")
+
+
+def downgrade() -> None:
+    """Drop positions tables and triggers."""
+    conn = op.get_bind()
+    for trigger in [
+        'trg_transactions_positions_insert', 'trg_transactions_positions_delete', 'trg_transactions_positions_update'
+        ]:
+        conn.execute(sa.text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    for table in ['position_invalidations', 'positions', 'position_history']:
+        conn.execute(sa.text(f"DROP TABLE IF EXISTS {table}"))
@@ -0,0 +1,134 @@
+"""fifo lots
+
+Revision ID: 003_lots
+Revises: 002_positions
+Create Date: 2026-10-18
+
+Adds the FIFO lot engine tables:
+- position_lots: lots opened by BUY / ADD_HOLDING (one per transaction)
+- lot_matches: lot quantities closed by SELL / REMOVE_HOLDING, with realized P&L
+- lot_invalidations: earliest affected trade_date per (asset, broker),
+  written by triggers on transactions (insert/update/delete, cascades included)
+
+Existing transactions are marked as invalidated, the tables are filled by the
+first LotManager.sync() (or ./dev.sh db:lots rebuild).
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from backend.app.db.models import FIFO_TYPES_SQL
+
+revision: str = '003_lots'
+down_revision: Union[str, Sequence[str], None] = '002_positions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Lower from_date of (asset, broker) to trade_date (insert or keep the earliest)
+_MARK_SQL = """INSERT INTO lot_invalidations (asset_id, broker_id, from_date)
+               VALUES ({row}.asset_id, {row}.broker_id, {row}.trade_date)
+               ON CONFLICT (asset_id, broker_id) DO UPDATE SET from_date = MIN(from_date, excluded.from_date);"""
+
+
+def upgrade() -> None:
+    """Create lot tables and invalidation triggers."""
+    conn = op.get_bind()
+
+    print("🔧 Starting migration 003_lots...")
+    print("=" * 60)
+
+    print("📦 Creating table: position_lots...")
+    conn.execute(sa.text("""CREATE TABLE position_lots
+                            (
+                                transaction_id     INTEGER        NOT NULL PRIMARY KEY,
+                                asset_id           INTEGER        NOT NULL,
+                                broker_id          INTEGER        NOT NULL,
+                                open_date          DATE           NOT NULL,
+                                quantity           NUMERIC(18, 6) NOT NULL,
+                                remaining_quantity NUMERIC(18, 6) NOT NULL,
+                                unit_cost          NUMERIC(18, 6) NOT NULL,
+                                currency           VARCHAR        NOT NULL,
+                                FOREIGN KEY (transaction_id) REFERENCES transactions (id) ON DELETE CASCADE,
+                                FOREIGN KEY (asset_id) REFERENCES assets (id) ON DELETE CASCADE,
+                                FOREIGN KEY (broker_id) REFERENCES brokers (id) ON DELETE CASCADE
+                            )"""))
+    conn.execute(sa.text("""CREATE INDEX idx_position_lots_asset_broker_date
+                                ON position_lots (asset_id, broker_id, open_date, transaction_id)"""))
+    print("  ✓ Table created")
+
+    print("📦 Creating table: lot_matches...")
+    conn.execute(sa.text("""CREATE TABLE lot_matches
+                            (
+                                close_transaction_id INTEGER        NOT NULL,
+                                lot_transaction_id   INTEGER        NOT NULL,
+                                asset_id             INTEGER        NOT NULL,
+                                broker_id            INTEGER        NOT NULL,
+                                close_date           DATE           NOT NULL,
+                                quantity             NUMERIC(18, 6) NOT NULL,
+                                unit_cost            NUMERIC(18, 6) NOT NULL,
+                                unit_proceeds        NUMERIC(18, 6) NOT NULL,
+                                currency             VARCHAR        NOT NULL,
+                                proceeds_currency    VARCHAR        NOT NULL,
+                                realized_pnl         NUMERIC(18, 6),
+                                -- No FK on close_transaction_id: matches of a deleted sale are reverted by the next sync
+                                PRIMARY KEY (close_transaction_id, lot_transaction_id),
+                                FOREIGN KEY (lot_transaction_id) REFERENCES position_lots (transaction_id) ON DELETE CASCADE,
+                                FOREIGN KEY (asset_id) REFERENCES assets (id) ON DELETE CASCADE,
+                                FOREIGN KEY (broker_id) REFERENCES brokers (id) ON DELETE CASCADE
+                            )"""))
+    conn.execute(sa.text("""CREATE INDEX idx_lot_matches_asset_broker_date
+                                ON lot_matches (asset_id, broker_id, close_date)"""))
+    conn.execute(sa.text("CREATE INDEX idx_lot_matches_lot ON lot_matches (lot_transaction_id)"))
+    print("  ✓ Table created")
+
+    print("📦 Creating table: lot_invalidations...")
+    conn.execute(sa.text("""CREATE TABLE lot_invalidations
+                            (
+                                asset_id  INTEGER NOT NULL,
+                                broker_id INTEGER NOT NULL,
+                                from_date DATE    NOT NULL,
+                                PRIMARY KEY (asset_id, broker_id)
+                            )"""))
+    print("  ✓ Table created")
+
+    print("⚡ Creating lot invalidation triggers on transactions...")
+    conn.execute(sa.text(f"""CREATE TRIGGER trg_transactions_lots_insert
+                             AFTER INSERT ON transactions
+                             WHEN new.type IN ({FIFO_TYPES_SQL})
+                             BEGIN
+                                 {_MARK_SQL.format(row="new")}
+                             END"""))
+    conn.execute(sa.text(f"""CREATE TRIGGER trg_transactions_lots_delete
+                             AFTER DELETE ON transactions
+                             WHEN old.type IN ({FIFO_TYPES_SQL})
+                             BEGIN
+                                 {_MARK_SQL.format(row="old")}
+                             END"""))
+    conn.execute(sa.text(f"""CREATE TRIGGER trg_transactions_lots_update
+                             AFTER UPDATE OF asset_id, broker_id, type, quantity, price, currency, trade_date ON transactions
+                             WHEN old.type IN ({FIFO_TYPES_SQL}) OR new.type IN ({FIFO_TYPES_SQL})
+                             BEGIN
+                                 {_MARK_SQL.format(row="old")}
+                                 {_MARK_SQL.format(row="new")}
+                             END"""))
+    print("  ✓ 3 Triggers created")
+
+    conn.execute(sa.text(f"""INSERT INTO lot_invalidations (asset_id, broker_id, from_date)
+                             SELECT asset_id, broker_id, MIN(trade_date)
+                             FROM transactions
+                             WHERE type IN ({FIFO_TYPES_SQL})
+                             GROUP BY asset_id, broker_id"""))
+    print("  ✓ Existing transactions marked for recomputation")
+
+    print("=" * 60)
+    print("✅ Migration 003_lots completed successfully!")
+
+
+def downgrade() -> None:
+    """Drop lot tables and triggers."""
+    conn = op.get_bind()
+    for trigger in ['trg_transactions_lots_insert', 'trg_transactions_lots_delete', 'trg_transactions_lots_update']:
+        conn.execute(sa.text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    for table in ['lot_invalidations', 'lot_matches', 'position_lots']:
+        conn.execute(sa.text(f"DROP TABLE IF EXISTS {table}"))
@@ -0,0 +1,122 @@
+"""cash balance ledger
+
+Revision ID: 004_cash_balances
+Revises: 003_lots
+Create Date: 2026-10-18
+
+Adds cash_balance_history: running balance per (cash_account_id, trade_date),
+maintained by triggers on cash_movements (insert/update/delete, including
+deletes of movements linked to transactions).
+
+Balances are sums, so the triggers apply each change directly (no deferred
+replay): the day row is adjusted and the balance of the later rows shifted.
+Values are rounded to 6 decimals at every step (NUMERIC is stored as REAL).
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from backend.app.db.models import CASH_INFLOW_TYPES_SQL
+
+revision: str = '004_cash_balances'
+down_revision: Union[str, Sequence[str], None] = '003_lots'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_SIGNED_AMOUNT_SQL = "(CASE WHEN {row}.type IN (" + CASH_INFLOW_TYPES_SQL + ") THEN {row}.amount ELSE -{row}.amount END)"
+
+# Add a movement: create the day row from the previous balance if missing, then shift the day and later rows
+_APPLY_SQL = """INSERT INTO cash_balance_history (cash_account_id, trade_date, net_amount, balance, movement_count)
+                VALUES ({row}.cash_account_id, {row}.trade_date, 0,
+                        COALESCE((SELECT balance FROM cash_balance_history
+                                  WHERE cash_account_id = {row}.cash_account_id AND trade_date < {row}.trade_date
+                                  ORDER BY trade_date DESC LIMIT 1), 0),
+                        0)
+                ON CONFLICT (cash_account_id, trade_date) DO NOTHING;
+                UPDATE cash_balance_history
+                SET net_amount = ROUND(net_amount + {amount}, 6), movement_count = movement_count + 1
+                WHERE cash_account_id = {row}.cash_account_id AND trade_date = {row}.trade_date;
+                UPDATE cash_balance_history
+                SET balance = ROUND(balance + {amount}, 6)
+                WHERE cash_account_id = {row}.cash_account_id AND trade_date >= {row}.trade_date;"""
+
+# Remove a movement: shift the day and later rows back, drop the day row when it has no movement left
+_REVERT_SQL = """UPDATE cash_balance_history
+                 SET net_amount = ROUND(net_amount - {amount}, 6), movement_count = movement_count - 1
+                 WHERE cash_account_id = {row}.cash_account_id AND trade_date = {row}.trade_date;
+                 UPDATE cash_balance_history
+                 SET balance = ROUND(balance - {amount}, 6)
+                 WHERE cash_account_id = {row}.cash_account_id AND trade_date >= {row}.trade_date;
+                 DELETE FROM cash_balance_history
+                 WHERE cash_account_id = {row}.cash_account_id AND trade_date = {row}.trade_date AND movement_count = 0;"""
+
+
+def _apply(row: str) -> str:
+    return _APPLY_SQL.format(row=row, amount=_SIGNED_AMOUNT_SQL.format(row=row))
+
+
+def _revert(row: str) -> str:
+    return _REVERT_SQL.format(row=row, amount=_SIGNED_AMOUNT_SQL.format(row=row))
+
+
+def upgrade() -> None:
+    """Create cash balance ledger and its triggers."""
+    conn = op.get_bind()
+
+    print("🔧 Starting migration 004_cash_balances...")
+    print("=" * 60)
+
+    print("📦 Creating table: cash_balance_history...")
+    conn.execute(sa.text("""CREATE TABLE cash_balance_history
+                            (
+                                cash_account_id INTEGER        NOT NULL,
+                                trade_date      DATE           NOT NULL,
+                                net_amount      NUMERIC(18, 6) NOT NULL,
+                                balance         NUMERIC(18, 6) NOT NULL,
+                                movement_count  INTEGER        NOT NULL,
+                                PRIMARY KEY (cash_account_id, trade_date),
+                                FOREIGN KEY (cash_account_id) REFERENCES cash_accounts (id) ON DELETE CASCADE
+                            )"""))
+    print("  ✓ Table created")
+
+    print("⚡ Creating cash balance triggers on cash_movements...")
+    conn.execute(sa.text(f"""CREATE TRIGGER trg_cash_movements_balance_insert
+                             AFTER INSERT ON cash_movements
+                             BEGIN
+                                 {_apply("new")}
+                             END"""))
+    conn.execute(sa.text(f"""CREATE TRIGGER trg_cash_movements_balance_delete
+                             AFTER DELETE ON cash_movements
+                             BEGIN
+                                 {_revert("old")}
+                             END"""))
+    conn.execute(sa.text(f"""CREATE TRIGGER trg_cash_movements_balance_update
+                             AFTER UPDATE OF cash_account_id, type, amount, trade_date ON cash_movements
+                             BEGIN
+                                 {_revert("old")}
+                                 {_apply("new")}
+                             END"""))
+    print("  ✓ 3 Triggers created")
+
+    conn.execute(sa.text(f"""INSERT INTO cash_balance_history (cash_account_id, trade_date, net_amount, balance, movement_count)
+                             SELECT cash_account_id, trade_date, net_amount,
+                                    ROUND(SUM(net_amount) OVER (PARTITION BY cash_account_id ORDER BY trade_date), 6),
+                                    movement_count
+                             FROM (SELECT cash_account_id, trade_date,
+                                          ROUND(SUM({_SIGNED_AMOUNT_SQL.format(row="cash_movements")}), 6) AS net_amount,
+                                          COUNT(*) AS movement_count
+                                   FROM cash_movements
+                                   GROUP BY cash_account_id, trade_date)"""))
+    print("  ✓ Ledger filled from existing movements")
+
+    print("=" * 60)
+    print("✅ Migration 004_cash_balances completed successfully!")
+
+
+def downgrade() -> None:
+    """Drop cash balance ledger and triggers."""
+    conn = op.get_bind()
+    for trigger in ['trg_cash_movements_balance_insert', 'trg_cash_movements_balance_delete', 'trg_cash_movements_balance_update']:
+        conn.execute(sa.text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    conn.execute(sa.text("DROP TABLE IF EXISTS cash_balance_history"))
@@ -0,0 +1,114 @@
+"""portfolio daily snapshots
+
+Revision ID: 005_portfolio_snapshots
+Revises: 004_cash_balances
+Create Date: 2026-10-18
+
+Adds the portfolio snapshot tables:
+- portfolio_daily_snapshots: value per (broker, day) and total (broker_id NULL),
+  in the portfolio base currency
+- portfolio_snapshot_invalidations: earliest affected day (single row), lowered
+  by triggers on every input of the valuation:
+  transactions and cash_movements (trade_date), price_history (date, only for
+  assets with a position history: prices of assets bought later only matter
+  from the day of the transaction, which marks it) and fx_rates (date)
+
+Snapshots are filled by the first PortfolioSnapshotManager.sync() (background
+job, or ./dev.sh db:snapshots sync): an empty table is computed from the first
+activity date.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '005_portfolio_snapshots'
+down_revision: Union[str, Sequence[str], None] = '004_cash_balances'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Lower the pending from_date to {day} (insert or keep the earliest)
+_MARK_SQL = """INSERT INTO portfolio_snapshot_invalidations (id, from_date)
+               VALUES (1, {day})
+               ON CONFLICT (id) DO UPDATE SET from_date = MIN(from_date, excluded.from_date);"""
+
+# (table, date column, columns whose update affects values, WHEN condition per row alias)
+_SOURCES = [
+    ("transactions", "trade_date", "asset_id, broker_id, type, quantity, trade_date", None),
+    ("cash_movements", "trade_date", "cash_account_id, type, amount, trade_date", None),
+    ("price_history", "date", "asset_id, date, close, currency",
+     "EXISTS (SELECT 1 FROM position_history WHERE asset_id = {row}.asset_id)"),
+    ("fx_rates", "date", "date, base, quote, rate", None),
+    ]
+
+
+def _trigger(name: str, event: str, table: str, rows: list[str], date_column: str, condition: str | None) -> str:
+    when = ""
+    if condition:
+        when = "WHEN " + " OR ".join(condition.format(row=row) for row in rows)
+    marks = "\n".join(_MARK_SQL.format(day=f"{row}.{date_column}") for row in rows)
+    return f"""CREATE TRIGGER {name}
+               AFTER {event} ON {table}
+               {when}
+               BEGIN
+                   {marks}
+               END"""
+
+
+def _trigger_names() -> list[str]:
+    return [f"trg_{table}_snapshots_{event}" for table, *_ in _SOURCES for event in ("insert", "delete", "update")]
+
+
+def upgrade() -> None:
+    """Create portfolio snapshot tables and invalidation triggers."""
+    conn = op.get_bind()
+
+    print("🔧 Starting migration 005_portfolio_snapshots...")
+    print("=" * 60)
+
+    print("📦 Creating table: portfolio_daily_snapshots...")
+    conn.execute(sa.text("""CREATE TABLE portfolio_daily_snapshots
+                            (
+                                id            INTEGER PRIMARY KEY,
+                                snapshot_date DATE           NOT NULL,
+                                broker_id     INTEGER,
+                                currency      VARCHAR        NOT NULL,
+                                assets_value  NUMERIC(18, 6) NOT NULL,
+                                cash_value    NUMERIC(18, 6) NOT NULL,
+                                total_value   NUMERIC(18, 6) NOT NULL,
+                                unvalued      BOOLEAN        NOT NULL,
+                                FOREIGN KEY (broker_id) REFERENCES brokers (id) ON DELETE CASCADE
+                            )"""))
+    conn.execute(sa.text("""CREATE INDEX idx_portfolio_snapshots_broker_date
+                            ON portfolio_daily_snapshots (broker_id, snapshot_date)"""))
+    print("  ✓ Table created")
+
+    print("📦 Creating table: portfolio_snapshot_invalidations...")
+    conn.execute(sa.text("""CREATE TABLE portfolio_snapshot_invalidations
+                            (
+                                id        INTEGER NOT NULL,
+                                from_date DATE    NOT NULL,
+                                PRIMARY KEY (id)
+                            )"""))
+    print("  ✓ Table created")
+
+    print("⚡ Creating snapshot invalidation triggers...")
+    for table, date_column, columns, condition in _SOURCES:
+        conn.execute(sa.text(_trigger(f"trg_{table}_snapshots_insert", "INSERT", table, ["new"], date_column, condition)))
+        conn.execute(sa.text(_trigger(f"trg_{table}_snapshots_delete", "DELETE", table, ["old"], date_column, condition)))
+        conn.execute(sa.text(_trigger(
+            f"trg_{table}_snapshots_update", f"UPDATE OF {columns}", table, ["old", "new"], date_column, condition,
+            )))
+    print(f"  ✓ {len(_trigger_names())} Triggers created")
+
+    print("=" * 60)
+    print("✅ Migration 005_portfolio_snapshots completed successfully!")
+
+
+def downgrade() -> None:
+    """Drop portfolio snapshot tables and triggers."""
+    conn = op.get_bind()
+    for trigger in _trigger_names():
+        conn.execute(sa.text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    for table in ['portfolio_snapshot_invalidations', 'portfolio_daily_snapshots']:
+        conn.execute(sa.text(f"DROP TABLE IF EXISTS {table}"))
@@ -0,0 +1,57 @@
+"""return cache
+
+Revision ID: 006_return_cache
+Revises: 005_portfolio_snapshots
+Create Date: 2026-10-18
+
+Adds return_cache: period returns (TWR, XIRR) per (scope, scope_id,
+start_date, end_date), computed by services/returns.py.
+
+No triggers: rows are deleted by PortfolioSnapshotManager.sync() from the
+first recomputed snapshot day (the snapshot invalidation marker already
+covers every input of the returns: transactions, cash movements, prices and
+FX rates).
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '006_return_cache'
+down_revision: Union[str, Sequence[str], None] = '005_portfolio_snapshots'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create return cache table."""
+    conn = op.get_bind()
+
+    print("🔧 Starting migration 006_return_cache...")
+    print("=" * 60)
+
+    print("📦 Creating table: return_cache...")
+    conn.execute(sa.text("""CREATE TABLE return_cache
+                            (
+                                scope       VARCHAR NOT NULL,
+                                scope_id    INTEGER NOT NULL,
+                                start_date  DATE    NOT NULL,
+                                end_date    DATE    NOT NULL,
+                                currency    VARCHAR NOT NULL,
+                                start_value FLOAT   NOT NULL,
+                                end_value   FLOAT   NOT NULL,
+                                net_flows   FLOAT   NOT NULL,
+                                twr         FLOAT,
+                                mwr         FLOAT,
+                                PRIMARY KEY (scope, scope_id, start_date, end_date)
+                            )"""))
+    print("  ✓ Table created")
+
+    print("=" * 60)
+    print("✅ Migration 006_return_cache completed successfully!")
+
+
+def downgrade() -> None:
+    """Drop return cache table."""
+    conn = op.get_bind()
+    conn.execute(sa.text("DROP TABLE IF EXISTS return_cache"))
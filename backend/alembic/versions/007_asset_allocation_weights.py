@@ -0,0 +1,87 @@
+"""asset allocation weights
+
+Revision ID: 007_asset_allocation_weights
+Revises: 006_return_cache
+Create Date: 2026-10-18
+
+Adds asset_allocation_weights: one row per (asset_id, dimension, key) of the
+geographic_area / sector_area distributions stored as JSON in
+assets.classification_params, maintained by triggers on assets (insert and
+update of classification_params; rows cascade on asset delete).
+
+The triggers read the JSON written by the services, already validated and
+normalized by FAGeographicArea / FASectorArea (ISO-3166-A3 keys, standard
+sectors, weights quantized to 4 decimals): no validation is repeated here.
+Invalid JSON is skipped instead of failing the asset write.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from backend.app.db.models import ALLOCATION_DISTRIBUTION_PATHS
+
+revision: str = '007_asset_allocation_weights'
+down_revision: Union[str, Sequence[str], None] = '006_return_cache'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Insert the weights of every dimension of an asset row ({row}: NEW, or assets for the backfill)
+_INSERT_WEIGHTS_SQL = "\n".join(
+    f"""INSERT INTO asset_allocation_weights (asset_id, dimension, key, weight)
+        SELECT {{row}}.id, '{dimension.value}', key, ROUND(CAST(value AS REAL), 6)
+        FROM {{source}}json_each(CASE WHEN json_valid({{row}}.classification_params) THEN {{row}}.classification_params END, '{path}');"""
+    for dimension, path in ALLOCATION_DISTRIBUTION_PATHS.items()
+    )
+
+
+def upgrade() -> None:
+    """Create asset allocation weights table and its triggers."""
+    conn = op.get_bind()
+
+    print("🔧 Starting migration 007_asset_allocation_weights...")
+    print("=" * 60)
+
+    print("📦 Creating table: asset_allocation_weights...")
+    conn.execute(sa.text("""CREATE TABLE asset_allocation_weights
+                            (
+                                asset_id  INTEGER        NOT NULL,
+                                dimension VARCHAR(7)     NOT NULL,
+                                key       VARCHAR        NOT NULL,
+                                weight    NUMERIC(18, 6) NOT NULL,
+                                PRIMARY KEY (asset_id, dimension, key),
+                                FOREIGN KEY (asset_id) REFERENCES assets (id) ON DELETE CASCADE
+                            )"""))
+    conn.execute(sa.text("CREATE INDEX idx_asset_allocation_weights_dimension_key ON asset_allocation_weights (dimension, key)"))
+    print("  ✓ Table created")
+
+    print("⚡ Creating allocation triggers on assets...")
+    conn.execute(sa.text(f"""CREATE TRIGGER trg_assets_allocation_insert
+                             AFTER INSERT ON assets
+                             WHEN NEW.classification_params IS NOT NULL
+                             BEGIN
+                                 {_INSERT_WEIGHTS_SQL.format(row="NEW", source="")}
+                             END"""))
+    conn.execute(sa.text(f"""CREATE TRIGGER trg_assets_allocation_update
+                             AFTER UPDATE OF classification_params ON assets
+                             BEGIN
+                                 DELETE FROM asset_allocation_weights WHERE asset_id = NEW.id;
+                                 {_INSERT_WEIGHTS_SQL.format(row="NEW", source="")}
+                             END"""))
+    print("  ✓ 2 Triggers created")
+
+    for statement in _INSERT_WEIGHTS_SQL.format(row="assets", source="assets, ").split(";"):
+        if statement.strip():
+            conn.execute(sa.text(statement))
+    print("  ✓ Weights filled from existing assets")
+
+    print("=" * 60)
+    print("✅ Migration 007_asset_allocation_weights completed successfully!")
+
+
+def downgrade() -> None:
+    """Drop asset allocation weights table and triggers."""
+    conn = op.get_bind()
+    for trigger in ['trg_assets_allocation_insert', 'trg_assets_allocation_update']:
+        conn.execute(sa.text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    conn.execute(sa.text("DROP TABLE IF EXISTS asset_allocation_weights"))
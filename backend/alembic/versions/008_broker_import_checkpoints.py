@@ -0,0 +1,54 @@
+"""broker import checkpoints
+
+Revision ID: 008_broker_import_checkpoints
+Revises: 007_asset_allocation_weights
+Create Date: 2026-10-18
+
+Adds broker_import_checkpoints: progress of streaming broker statement
+imports (services/broker_import.py), one row per import_key. The row is
+written in the same transaction as each imported chunk, so an interrupted
+import resumes after its last committed chunk.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '008_broker_import_checkpoints'
+down_revision: Union[str, Sequence[str], None] = '007_asset_allocation_weights'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create broker import checkpoints table."""
+    conn = op.get_bind()
+
+    print("🔧 Starting migration 008_broker_import_checkpoints...")
+    print("=" * 60)
+
+    print("📦 Creating table: broker_import_checkpoints...")
+    conn.execute(sa.text("""CREATE TABLE broker_import_checkpoints
+                            (
+                                import_key             VARCHAR  NOT NULL,
+                                broker_id              INTEGER  NOT NULL,
+                                rows_processed         INTEGER  NOT NULL,
+                                transactions_created   INTEGER  NOT NULL,
+                                cash_movements_created INTEGER  NOT NULL,
+                                completed              BOOLEAN  NOT NULL,
+                                created_at             DATETIME NOT NULL,
+                                updated_at             DATETIME NOT NULL,
+                                PRIMARY KEY (import_key),
+                                FOREIGN KEY (broker_id) REFERENCES brokers (id)
+                            )"""))
+    conn.execute(sa.text("CREATE INDEX ix_broker_import_checkpoints_broker_id ON broker_import_checkpoints (broker_id)"))
+    print("  ✓ Table created")
+
+    print("=" * 60)
+    print("✅ Migration 008_broker_import_checkpoints completed successfully!")
+
+
+def downgrade() -> None:
+    """Drop broker import checkpoints table."""
+    conn = op.get_bind()
+    conn.execute(sa.text("DROP TABLE IF EXISTS broker_import_checkpoints"))
@@ -0,0 +1,46 @@
+"""import content hash
+
+Revision ID: 009_import_content_hash
+Revises: 008_broker_import_checkpoints
+Create Date: 2026-10-18
+
+Adds import_hash to transactions and cash_movements: a hash of the
+normalized fields of the source row (services/broker_import.py), with a
+unique index so bulk imports skip rows already imported with
+INSERT ... ON CONFLICT DO NOTHING. Rows written outside imports keep NULL
+(never deduplicated).
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '009_import_content_hash'
+down_revision: Union[str, Sequence[str], None] = '008_broker_import_checkpoints'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add import hash columns and unique indexes."""
+    conn = op.get_bind()
+
+    print("🔧 Starting migration 009_import_content_hash...")
+    print("=" * 60)
+
+    for table in ['transactions', 'cash_movements']:
+        print(f"📦 Adding column: {table}.import_hash...")
+        conn.execute(sa.text(f"ALTER TABLE {table} ADD COLUMN import_hash VARCHAR"))
+        conn.execute(sa.text(f"CREATE UNIQUE INDEX uq_{table}_import_hash ON {table} (import_hash)"))
+        print("  ✓ Column and unique index created")
+
+    print("=" * 60)
+    print("✅ Migration 009_import_content_hash completed successfully!")
+
+
+def downgrade() -> None:
+    """Drop import hash columns and indexes."""
+    conn = op.get_bind()
+    for table in ['transactions', 'cash_movements']:
+        conn.execute(sa.text(f"DROP INDEX IF EXISTS uq_{table}_import_hash"))
+        conn.execute(sa.text(f"ALTER TABLE {table} DROP COLUMN import_hash"))
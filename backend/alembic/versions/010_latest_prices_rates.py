@@ -0,0 +1,139 @@
+"""latest prices and rates
+
+Revision ID: 010_latest_prices_rates
+Revises: 009_import_content_hash
+Create Date: 2026-10-18
+
+Adds the newest point per asset / FX pair, maintained by triggers on every
+write path of price_history and fx_rates (bulk upserts, refreshes, syncs,
+range deletes, asset delete cascade):
+- asset_latest_prices: newest price_history row with a close, per asset
+- fx_latest_rates: newest fx_rates row, per stored (alphabetical) pair
+
+Inserts only move the row forward (newer or same date). Deletes and updates
+touching the stored date re-read the newest row with one backward seek on
+idx_price_history_asset_date / idx_fx_rates_base_quote_date.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '010_latest_prices_rates'
+down_revision: Union[str, Sequence[str], None] = '009_import_content_hash'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Move the latest price of {row}.asset_id forward to {row} (no-op for older dates)
+_ADVANCE_PRICE_SQL = """INSERT INTO asset_latest_prices (asset_id, date, close, currency)
+                        VALUES ({row}.asset_id, {row}.date, {row}.close, {row}.currency)
+                        ON CONFLICT (asset_id) DO UPDATE SET date = excluded.date, close = excluded.close, currency = excluded.currency
+                        WHERE excluded.date >= asset_latest_prices.date;"""
+
+# Re-read the latest price of {row}.asset_id ({condition}: extra guard of both statements)
+_RELOAD_PRICE_SQL = """DELETE FROM asset_latest_prices WHERE asset_id = {row}.asset_id{condition};
+                       INSERT INTO asset_latest_prices (asset_id, date, close, currency)
+                       SELECT asset_id, date, close, currency FROM price_history
+                       WHERE asset_id = {row}.asset_id AND close IS NOT NULL{condition}
+                       ORDER BY date DESC LIMIT 1;"""
+
+_ADVANCE_RATE_SQL = """INSERT INTO fx_latest_rates (base, quote, date, rate)
+                       VALUES ({row}.base, {row}.quote, {row}.date, {row}.rate)
+                       ON CONFLICT (base, quote) DO UPDATE SET date = excluded.date, rate = excluded.rate
+                       WHERE excluded.date >= fx_latest_rates.date;"""
+
+_RELOAD_RATE_SQL = """DELETE FROM fx_latest_rates WHERE base = {row}.base AND quote = {row}.quote{condition};
+                      INSERT INTO fx_latest_rates (base, quote, date, rate)
+                      SELECT base, quote, date, rate FROM fx_rates
+                      WHERE base = {row}.base AND quote = {row}.quote{condition}
+                      ORDER BY date DESC LIMIT 1;"""
+
+# Row is (or was) the stored latest point of its asset / pair
+_IS_LATEST_PRICE = "EXISTS (SELECT 1 FROM asset_latest_prices WHERE asset_id = {row}.asset_id AND date <= {row}.date)"
+_IS_LATEST_RATE = "EXISTS (SELECT 1 FROM fx_latest_rates WHERE base = {row}.base AND quote = {row}.quote AND date <= {row}.date)"
+
+_TRIGGERS = [
+    ("trg_price_history_latest_insert", "INSERT ON price_history", "NEW.close IS NOT NULL",
+     _ADVANCE_PRICE_SQL.format(row="NEW")),
+    ("trg_price_history_latest_delete", "DELETE ON price_history", _IS_LATEST_PRICE.format(row="OLD"),
+     _RELOAD_PRICE_SQL.format(row="OLD", condition="")),
+    # Old asset re-read only when the row moved to another asset
+    ("trg_price_history_latest_update", "UPDATE OF asset_id, date, close, currency ON price_history",
+     f"{_IS_LATEST_PRICE.format(row='OLD')} OR (NEW.close IS NOT NULL AND NOT EXISTS "
+     f"(SELECT 1 FROM asset_latest_prices WHERE asset_id = NEW.asset_id AND date > NEW.date))",
+     _RELOAD_PRICE_SQL.format(row="OLD", condition=" AND OLD.asset_id <> NEW.asset_id")
+     + "\n" + _RELOAD_PRICE_SQL.format(row="NEW", condition="")),
+    ("trg_fx_rates_latest_insert", "INSERT ON fx_rates", None,
+     _ADVANCE_RATE_SQL.format(row="NEW")),
+    ("trg_fx_rates_latest_delete", "DELETE ON fx_rates", _IS_LATEST_RATE.format(row="OLD"),
+     _RELOAD_RATE_SQL.format(row="OLD", condition="")),
+    ("trg_fx_rates_latest_update", "UPDATE OF date, base, quote, rate ON fx_rates",
+     f"{_IS_LATEST_RATE.format(row='OLD')} OR NOT EXISTS "
+     f"(SELECT 1 FROM fx_latest_rates WHERE base = NEW.base AND quote = NEW.quote AND date > NEW.date)",
+     _RELOAD_RATE_SQL.format(row="OLD", condition=" AND (OLD.base <> NEW.base OR OLD.quote <> NEW.quote)")
+     + "\n" + _RELOAD_RATE_SQL.format(row="NEW", condition="")),
+    ]
+
+
+def upgrade() -> None:
+    """Create latest price / rate tables and their triggers."""
+    conn = op.get_bind()
+
+    print("🔧 Starting migration 010_latest_prices_rates...")
+    print("=" * 60)
+
+    print("📦 Creating table: asset_latest_prices...")
+    conn.execute(sa.text("""CREATE TABLE asset_latest_prices
+                            (
+                                asset_id INTEGER        NOT NULL,
+                                date     DATE           NOT NULL,
+                                close    NUMERIC(18, 6) NOT NULL,
+                                currency VARCHAR        NOT NULL,
+                                PRIMARY KEY (asset_id),
+                                FOREIGN KEY (asset_id) REFERENCES assets (id) ON DELETE CASCADE
+                            )"""))
+    print("  ✓ Table created")
+
+    print("📦 Creating table: fx_latest_rates...")
+    conn.execute(sa.text("""CREATE TABLE fx_latest_rates
+                            (
+                                base  VARCHAR         NOT NULL,
+                                quote VARCHAR         NOT NULL,
+                                date  DATE            NOT NULL,
+                                rate  NUMERIC(24, 10) NOT NULL,
+                                PRIMARY KEY (base, quote)
+                            )"""))
+    print("  ✓ Table created")
+
+    print("⚡ Creating latest price / rate triggers...")
+    for name, event, condition, body in _TRIGGERS:
+        when = f"WHEN {condition}" if condition else ""
+        conn.execute(sa.text(f"""CREATE TRIGGER {name}
+                                 AFTER {event}
+                                 {when}
+                                 BEGIN
+                                     {body}
+                                 END"""))
+    print(f"  ✓ {len(_TRIGGERS)} Triggers created")
+
+    conn.execute(sa.text("""INSERT INTO asset_latest_prices (asset_id, date, close, currency)
+                            SELECT p.asset_id, p.date, p.close, p.currency
+                            FROM price_history p
+                            WHERE p.date = (SELECT MAX(date) FROM price_history WHERE asset_id = p.asset_id AND close IS NOT NULL)"""))
+    conn.execute(sa.text("""INSERT INTO fx_latest_rates (base, quote, date, rate)
+                            SELECT r.base, r.quote, r.date, r.rate
+                            FROM fx_rates r
+                            WHERE r.date = (SELECT MAX(date) FROM fx_rates WHERE base = r.base AND quote = r.quote)"""))
+    print("  ✓ Filled from existing prices and rates")
+
+    print("=" * 60)
+    print("✅ Migration 010_latest_prices_rates completed successfully!")
+
+
+def downgrade() -> None:
+    """Drop latest price / rate tables and triggers."""
+    conn = op.get_bind()
+    for name, *_ in _TRIGGERS:
+        conn.execute(sa.text(f"DROP TRIGGER IF EXISTS {name}"))
+    for table in ['fx_latest_rates', 'asset_latest_prices']:
+        conn.execute(sa.text(f"DROP TABLE IF EXISTS {table}"))
@@ -0,0 +1,93 @@
+"""scheduled value versions
+
+Revision ID: 011_scheduled_value_versions
+Revises: 010_latest_prices_rates
+Create Date: 2026-10-18
+
+Adds the input version of scheduled-yield value curves:
+- scheduled_value_versions: counter per asset, bumped by triggers on every write
+  of the curve inputs (transactions of scheduled_investment assets, including
+  deletes cascaded from cash_movements / assets, and provider assignments)
+
+The value curve cache validates its curves with one primary key lookup on this
+table instead of re-reading (and hashing) the transactions and provider_params.
+A missing row is version 0: existing assets need no backfill.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '011_scheduled_value_versions'
+down_revision: Union[str, Sequence[str], None] = '010_latest_prices_rates'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Bump the version of {row}.asset_id (insert the first one)
+_BUMP_SQL = """INSERT INTO scheduled_value_versions (asset_id, version)
+               VALUES ({row}.asset_id, 1)
+               ON CONFLICT (asset_id) DO UPDATE SET version = version + 1;"""
+
+# Update moving a row to another asset: also bump the previous asset (once per row)
+_BUMP_MOVED_SQL = """INSERT INTO scheduled_value_versions (asset_id, version)
+                     SELECT OLD.asset_id, 1 WHERE OLD.asset_id <> NEW.asset_id
+                     ON CONFLICT (asset_id) DO UPDATE SET version = version + 1;"""
+
+# Transactions only matter for assets valued by the scheduled_investment provider
+_IS_SCHEDULED = ("EXISTS (SELECT 1 FROM asset_provider_assignments "
+                 "WHERE asset_id = {row}.asset_id AND provider_code = 'scheduled_investment')")
+
+_TRIGGERS = [
+    ("trg_transactions_scheduled_value_insert", "INSERT ON transactions", _IS_SCHEDULED.format(row="NEW"),
+     _BUMP_SQL.format(row="NEW")),
+    ("trg_transactions_scheduled_value_delete", "DELETE ON transactions", _IS_SCHEDULED.format(row="OLD"),
+     _BUMP_SQL.format(row="OLD")),
+    ("trg_transactions_scheduled_value_update", "UPDATE OF asset_id, type, quantity, price, trade_date ON transactions",
+     f"{_IS_SCHEDULED.format(row='OLD')} OR {_IS_SCHEDULED.format(row='NEW')}",
+     _BUMP_SQL.format(row="NEW") + "\n" + _BUMP_MOVED_SQL),
+    ("trg_asset_provider_scheduled_value_insert", "INSERT ON asset_provider_assignments", None,
+     _BUMP_SQL.format(row="NEW")),
+    ("trg_asset_provider_scheduled_value_delete", "DELETE ON asset_provider_assignments", None,
+     _BUMP_SQL.format(row="OLD")),
+    ("trg_asset_provider_scheduled_value_update", "UPDATE OF asset_id, provider_code, provider_params ON asset_provider_assignments", None,
+     _BUMP_SQL.format(row="NEW") + "\n" + _BUMP_MOVED_SQL),
+    ]
+
+
+def upgrade() -> None:
+    """Create scheduled value versions table and its triggers."""
+    conn = op.get_bind()
+
+    print("🔧 Starting migration 011_scheduled_value_versions...")
+    print("=" * 60)
+
+    print("📦 Creating table: scheduled_value_versions...")
+    conn.execute(sa.text("""CREATE TABLE scheduled_value_versions
+                            (
+                                asset_id INTEGER NOT NULL,
+                                version  INTEGER NOT NULL,
+                                PRIMARY KEY (asset_id)
+                            )"""))
+    print("  ✓ Table created")
+
+    print("⚡ Creating scheduled value version triggers...")
+    for name, event, condition, body in _TRIGGERS:
+        when = f"WHEN {condition}" if condition else ""
+        conn.execute(sa.text(f"""CREATE TRIGGER {name}
+                                 AFTER {event}
+                                 {when}
+                                 BEGIN
+                                     {body}
+                                 END"""))
+    print(f"  ✓ {len(_TRIGGERS)} Triggers created")
+
+    print("=" * 60)
+    print("✅ Migration 011_scheduled_value_versions completed successfully!")
+
+
+def downgrade() -> None:
+    """Drop scheduled value versions table and triggers."""
+    conn = op.get_bind()
+    for name, *_ in _TRIGGERS:
+        conn.execute(sa.text(f"DROP TRIGGER IF EXISTS {name}"))
+    conn.execute(sa.text("DROP TABLE IF EXISTS scheduled_value_versions"))
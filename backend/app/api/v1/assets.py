@@ -34,6 +34,8 @@ from backend.app.schemas.prices import (
     FAUpsertResult,
     FABulkUpsertResponse,
     FABulkDeleteResponse,
+    FALatestPrice,
+    FAPriceMatrix,
     )
 from backend.app.schemas.provider import (
     FAProviderInfo,
@@ -43,10 +45,12 @@ from backend.app.schemas.provider import (
     FAProviderAssignmentReadItem,
     FAProviderSearchResponse,
     )
-from backend.app.schemas.refresh import FABulkRefreshResponse, FARefreshItem
+from backend.app.schemas.refresh import FABulkRefreshResponse, FARefreshItem, FARefreshSchedulerStatus
 from backend.app.services.asset_crud import AssetCRUDService
-from backend.app.services.asset_source import AssetSourceManager
+from backend.app.services.asset_source import AssetSourceManager, PriceSeriesPoint
+from backend.app.services.price_refresh_scheduler import price_refresh_scheduler
 from backend.app.services.provider_registry import AssetProviderRegistry
+from backend.app.utils.streaming import StreamFormat, streaming_response
 
 logger = get_logger(__name__)
 
@@ -467,6 +471,56 @@ async def delete_prices_bulk(
 # PRICE QUERY ENDPOINTS
 # ============================================================================
 
+# Declared before /{asset_id} so "latest" is not parsed as an asset id
+@price_router.get("/latest", response_model=List[FALatestPrice])
+async def get_latest_prices(
+    asset_ids: Optional[List[int]] = Query(None, description="Asset IDs (default: all assets with a stored price)"),
+    session: AsyncSession = Depends(get_session_generator)
+    ):
+    """Newest stored close per asset (maintained table, no provider call).
+
+    For dashboards and bulk valuations: one primary key lookup per asset.
+    Assets without a stored close are omitted.
+    """
+    try:
+        return await AssetSourceManager.get_latest_prices(asset_ids, session)
+    except Exception as e:
+        logger.error(f"Error getting latest prices: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@price_router.get("/matrix", response_model=FAPriceMatrix)
+async def get_price_matrix(
+    asset_ids: List[int] = Query(..., min_length=1, description="Asset IDs (one series each, in this order)"),
+    start_date: date = Query(..., description="First day (inclusive)"),
+    end_date: Optional[date] = Query(None, description="Last day (inclusive, defaults to today)"),
+    currency: Optional[str] = Query(None, min_length=3, max_length=3, description="Convert closes to this currency (optional)"),
+    session: AsyncSession = Depends(get_session_generator)
+    ):
+    """Stored closes of many assets aligned on one calendar-day axis (columnar, backward-filled).
+
+    One shared `dates` axis and, per asset, a `closes` array plus a `backward_filled`
+    mask, instead of one request and one FAPricePoint per asset and day. Reads stored
+    prices only (no provider call).
+
+    **Example**:
+    ```
+    GET /api/v1/assets/prices/matrix?asset_ids=1&asset_ids=2&start_date=2015-01-01&currency=EUR
+    ```
+    """
+    if end_date is None:
+        end_date = date.today()
+    try:
+        return await AssetSourceManager.get_price_matrix(
+            asset_ids, start_date, end_date, session, currency=currency.upper() if currency else None,
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error building price matrix: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # Use single asset price history with backward-fill support because
 # create a POST and encapsulate params is too much overhead and complexity
 @price_router.get("/{asset_id}", response_model=List[FAPricePoint])
@@ -474,19 +528,28 @@ async def get_prices(
     asset_id: int,
     start_date: date = Query(..., description="Start date (required)"),
     end_date: Optional[date] = Query(None, description="End date (optional, defaults to start_date)"),
+    fmt: StreamFormat = Query(StreamFormat.JSON, alias="format", description="Output format: json (list of FAPricePoint), ndjson or csv"),
     session: AsyncSession = Depends(get_session_generator)
     ):
     """Get prices for asset with backward-fill support.
 
     Returns a list of FAPricePoint with OHLC data, volume, and backward-fill info.
+    The series is streamed: stored prices are read with a server-side cursor and
+    serialized while they are sent (one compact point per day, no FAPricePoint
+    built), so memory stays flat for any range. `format=ndjson` returns one
+    FAPricePoint per line, `format=csv` one row per day (backward-fill info in
+    the actual_rate_date / days_back columns).
     """
     try:
         if end_date is None:
             end_date = start_date
 
-        prices = await AssetSourceManager.get_prices(asset_id, start_date, end_date, session)
+        points = await AssetSourceManager.iter_prices(asset_id, start_date, end_date, session)
 
-        return prices  # Already List[FAPricePoint] from service
+        return streaming_response(
+            points, fmt, PriceSeriesPoint.json_serializer(), PriceSeriesPoint.to_csv_row, PriceSeriesPoint.CSV_COLUMNS,
+            filename=f"prices_{asset_id}_{start_date.isoformat()}_{end_date.isoformat()}",
+            )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -627,6 +690,48 @@ async def refresh_prices_bulk(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@price_router.post("/refresh/incremental", response_model=FABulkRefreshResponse)
+async def refresh_prices_incremental(
+    asset_ids: List[int] = Query(..., description="List of asset IDs to refresh"),
+    end_date: Optional[date] = Query(None, description="Last date to refresh (optional, defaults to today)"),
+    force: bool = Query(False, description="Refresh even if fetch_interval has not elapsed"),
+    session: AsyncSession = Depends(get_session_generator)
+    ):
+    """
+    Incrementally refresh prices from the last stored date per asset.
+
+    The refresh window is derived from the DB (last stored price minus the provider
+    overlap window) instead of being passed by the caller. Assets whose fetch_interval
+    has not elapsed since last_fetch_at are returned with skipped=true.
+
+    **Example Request**:
+    ```
+    POST /api/v1/assets/prices/refresh/incremental?asset_ids=1&asset_ids=2
+    ```
+    """
+    try:
+        return await AssetSourceManager.bulk_refresh_prices_incremental(asset_ids, session, end_date=end_date, force=force)
+    except Exception as e:
+        logger.error(f"Error in incremental refresh prices: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@price_router.get("/refresh/scheduler", response_model=FARefreshSchedulerStatus)
+async def get_refresh_scheduler_status(session: AsyncSession = Depends(get_session_generator)):
+    """
+    Background price refresh scheduler status.
+
+    Reports queue depth (assets with a provider), how many are due
+    (last_fetch_at + fetch_interval elapsed), per-provider due counts and the lag
+    of the stalest due asset. Statistics of the last scheduler tick are included.
+    """
+    try:
+        return await price_refresh_scheduler.get_status(session)
+    except Exception as e:
+        logger.error(f"Error getting refresh scheduler status: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @provider_router.post("/refresh", response_model=FABulkMetadataRefreshResponse, tags=["FA Provider"])
 async def refresh_assets_from_provider(
     asset_ids: List[int] = Query(..., description="List of asset IDs to refresh metadata for"),
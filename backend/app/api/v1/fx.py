@@ -8,19 +8,19 @@ from decimal import Decimal
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select, delete as sql_delete, and_, or_
 
 from backend.app.db.models import FxCurrencyPairSource
 from backend.app.db.session import get_session_generator
 from backend.app.logging_config import get_logger
-from backend.app.schemas.common import BackwardFillInfo, DateRangeModel
+from backend.app.schemas.common import DateRangeModel
 from backend.app.schemas.fx import (
     # Provider models
     FXProviderInfo,
     # Conversion models
     FXConversionRequest,
-    FXConversionResult,
     FXConvertResponse,
     # Rate upsert models
     FXUpsertItem,
@@ -39,6 +39,9 @@ from backend.app.schemas.fx import (
     FXDeletePairSourceResult,
     FXDeletePairSourcesResponse,
     FXCurrenciesResponse,
+    FXLatestRate,
+    FXLatestRatesResponse,
+    FXRatePoint,
     )
 from backend.app.schemas.refresh import FXSyncResponse
 from backend.app.services.fx import (
@@ -47,8 +50,12 @@ from backend.app.services.fx import (
     ensure_rates_multi_source,
     upsert_rates_bulk,
     delete_rates_bulk,
+    get_latest_rates,
+    iter_converted_series,
     )
 from backend.app.services.provider_registry import FXProviderRegistry
+from backend.app.utils.fast_json import FastJSONResponse
+from backend.app.utils.streaming import StreamFormat, streaming_response
 
 logger = get_logger(__name__)
 fx_router = APIRouter(prefix="/fx", tags=["FX"])
@@ -344,6 +351,90 @@ async def sync_rates(
         raise HTTPException(status_code=502, detail=f"Failed to sync rates: {str(e)}")
 
 
+@router_currencies.get("/rate/latest", response_model=FXLatestRatesResponse)
+async def get_latest_rates_endpoint(
+    pairs: List[str] | None = Query(None, description="Currency pairs as BASE/QUOTE, e.g. EUR/USD (default: all stored pairs)"),
+    session: AsyncSession = Depends(get_session_generator)
+    ):
+    """
+    Newest stored rate per currency pair (maintained table, no provider call).
+
+    Pairs are normalized to alphabetical order like stored rates, so USD/EUR returns
+    the stored EUR/USD rate (1 EUR = rate USD). Pairs without rates are omitted.
+    """
+    requested = None
+    if pairs is not None:
+        requested = []
+        for pair in pairs:
+            parts = pair.split("/")
+            if len(parts) != 2 or not all(len(code.strip()) == 3 for code in parts):
+                raise HTTPException(status_code=400, detail=f"Invalid currency pair '{pair}' (expected BASE/QUOTE)")
+            requested.append((parts[0].strip(), parts[1].strip()))
+
+    rates = [
+        FXLatestRate(base=base, quote=quote, date=rate_date, rate=rate)
+        for base, quote, rate_date, rate in await get_latest_rates(session, requested)
+        ]
+    return FXLatestRatesResponse(rates=rates, count=len(rates))
+
+
+# CSV columns of streamed rate series / conversions (backward-fill info flattened)
+RATE_SERIES_CSV_COLUMNS = ("date", "base", "quote", "rate", "actual_rate_date", "days_back")
+CONVERSION_CSV_COLUMNS = (
+    "amount", "from_currency", "to_currency", "conversion_date", "converted_amount", "rate", "actual_rate_date", "days_back", "error",
+    )
+
+
+def _backward_fill_json(on_date: date, rate_date: date) -> dict | None:
+    if rate_date == on_date:
+        return None
+    return {"actual_rate_date": rate_date.isoformat(), "days_back": (on_date - rate_date).days}
+
+
+@router_currencies.get("/rate", response_model=List[FXRatePoint])
+async def get_rate_series_endpoint(
+    base: str = Query(..., min_length=3, max_length=3, description="Base currency (1 base = rate quote)"),
+    quote: str = Query(..., min_length=3, max_length=3, description="Quote currency"),
+    start_date: date = Query(..., description="Start date (required)"),
+    end_date: date | None = Query(None, description="End date (optional, defaults to start_date)"),
+    fmt: StreamFormat = Query(StreamFormat.JSON, alias="format", description="Output format: json (list of FXRatePoint), ndjson or csv"),
+    session: AsyncSession = Depends(get_session_generator)
+    ):
+    """
+    Daily rate of a currency pair over a range, backward-filled (stored rates, no provider call).
+
+    Either direction can be requested: USD/EUR is computed from the stored EUR/USD
+    rate. Days before the first stored rate of the pair are omitted. Rates are read
+    with a server-side cursor and streamed while serialized, so memory stays flat for
+    any range; `format=ndjson` returns one FXRatePoint per line, `format=csv` one row
+    per day (backward-fill info in the actual_rate_date / days_back columns).
+    """
+    if end_date is None:
+        end_date = start_date
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start date must be before or equal to end date")
+    base, quote = base.upper(), quote.upper()
+
+    async def _rated_days():
+        async for on_date, rate, rate_date in iter_converted_series(session, Decimal(1), base, quote, start_date, end_date):
+            if rate is not None:
+                yield on_date, rate, rate_date
+
+    def _to_json(point) -> dict:
+        on_date, rate, rate_date = point
+        return {"date": on_date.isoformat(), "base": base, "quote": quote, "rate": str(rate), "backward_fill_info": _backward_fill_json(on_date, rate_date)}
+
+    def _to_csv_row(point) -> tuple:
+        on_date, rate, rate_date = point
+        filled = rate_date != on_date
+        return on_date.isoformat(), base, quote, rate, rate_date.isoformat() if filled else None, (on_date - rate_date).days if filled else None
+
+    return streaming_response(
+        _rated_days(), fmt, _to_json, _to_csv_row, RATE_SERIES_CSV_COLUMNS,
+        filename=f"fx_{base}_{quote}_{start_date.isoformat()}_{end_date.isoformat()}",
+        )
+
+
 @router_currencies.post("/rate", response_model=FXBulkUpsertResponse, status_code=200)
 async def upsert_rates_endpoint(
     rates: List[FXUpsertItem],
@@ -556,9 +647,65 @@ async def delete_rates_endpoint(
         )
 
 
+def _conversion_rate(amount: Decimal, from_cur: str, to_cur: str, converted_amount: Decimal | None) -> Decimal | None:
+    return None if converted_amount is None or from_cur == to_cur else converted_amount / amount
+
+
+def _conversion_json(amount: Decimal, from_cur: str, to_cur: str, on_date: date, converted_amount: Decimal | None, rate_date: date | None) -> dict:
+    """JSON form of one conversion result (same as the FXConversionResult serialization), no model built."""
+    rate = _conversion_rate(amount, from_cur, to_cur, converted_amount)
+    return {
+        "amount": str(amount),
+        "from_currency": from_cur,
+        "to_currency": to_cur,
+        "conversion_date": on_date.isoformat(),
+        "converted_amount": None if converted_amount is None else str(converted_amount),
+        "rate": None if rate is None else str(rate),
+        "backward_fill_info": None if rate_date is None else _backward_fill_json(on_date, rate_date),
+        }
+
+
+def _stream_conversions(request: List[FXConversionRequest], fmt: StreamFormat, session: AsyncSession) -> StreamingResponse:
+    """Streamed form of convert_currency_bulk: one result per conversion day, rates read with session.stream."""
+
+    async def _results():
+        for conv_idx, conversion in enumerate(request):
+            from_cur = conversion.from_currency.upper()
+            to_cur = conversion.to_currency.upper()
+            start = conversion.date_range.start
+            end = conversion.date_range.end or start
+            async for on_date, converted_amount, rate_date in iter_converted_series(session, conversion.amount, from_cur, to_cur, start, end):
+                error = None
+                if converted_amount is None:
+                    base, quote = sorted((from_cur, to_cur))
+                    error = (
+                        f"Conversion {conv_idx}: No FX rate found for {base}/{quote} on or before {on_date}. "
+                        f"Please sync rates using POST /api/v1/fx/currencies/sync"
+                    )
+                yield conversion.amount, from_cur, to_cur, on_date, converted_amount, rate_date, error
+
+    def _to_json(result) -> dict:
+        *conversion, error = result
+        item = _conversion_json(*conversion)
+        if error:
+            item["error"] = error
+        return item
+
+    def _to_csv_row(result) -> tuple:
+        amount, from_cur, to_cur, on_date, converted_amount, rate_date, error = result
+        filled = rate_date is not None and rate_date != on_date
+        return (
+            amount, from_cur, to_cur, on_date.isoformat(), converted_amount, _conversion_rate(amount, from_cur, to_cur, converted_amount),
+            rate_date.isoformat() if filled else None, (on_date - rate_date).days if filled else None, error,
+            )
+
+    return streaming_response(_results(), fmt, _to_json, _to_csv_row, CONVERSION_CSV_COLUMNS, filename="fx_conversions")
+
+
 @router_currencies.post("/convert", response_model=FXConvertResponse)
 async def convert_currency_bulk(
     request: List[FXConversionRequest],
+    fmt: StreamFormat = Query(StreamFormat.JSON, alias="format", description="Output format: json (FXConvertResponse), ndjson or csv (streamed)"),
     session: AsyncSession = Depends(get_session_generator)
     ):
     """
@@ -574,14 +721,34 @@ async def convert_currency_bulk(
     Uses unlimited backward-fill logic: if rate for exact date is not available,
     uses the most recent rate before the requested date.
 
+    With `format=ndjson` or `format=csv` the results are streamed instead (rates read
+    with a server-side cursor per conversion, memory flat for any range): one result
+    per line / row, in request and date order. Days without a rate are reported on
+    their own line / row with an `error` (no envelope, no success_count).
+
+    The json envelope is built as plain JSON-ready data and encoded with orjson
+    (FastJSONResponse): no FXConversionResult model per day, no response re-validation.
+
     Args:
         request: List of conversions to perform
+        fmt: Output format
         session: Database session
 
     Returns:
         Conversion results with rate information for each conversion (one result per day)
     """
 
+    # Validate date ranges (all of them before any result is produced or streamed)
+    for conv_idx, conversion in enumerate(request):
+        if conversion.date_range.end and conversion.date_range.start > conversion.date_range.end:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Conversion {conv_idx}: start date must be before or equal to end date"
+                )
+
+    if fmt != StreamFormat.JSON:
+        return _stream_conversions(request, fmt, session)
+
     # Prepare bulk conversions, expanding date ranges
     bulk_conversions = []
     conversion_metadata = []  # Track which original conversion each bulk conversion belongs to
@@ -590,13 +757,6 @@ async def convert_currency_bulk(
         from_cur = conversion.from_currency.upper()
         to_cur = conversion.to_currency.upper()
 
-        # Validate date range
-        if conversion.date_range.end and conversion.date_range.start > conversion.date_range.end:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Conversion {conv_idx}: start date must be before or equal to end date"
-                )
-
         # Expand date range into individual days
         if conversion.date_range.end:
             # Multi-day conversion: process each day in range
@@ -632,31 +792,12 @@ async def convert_currency_bulk(
 
         converted_amount, actual_rate_date, backward_fill_applied = bulk_result
         conversion = metadata['conversion']
-        on_date = metadata['date']
         # TODO: portare questi upper dentro la classe che astrae la valuta, ancora da fare
         from_cur = conversion.from_currency.upper()
         to_cur = conversion.to_currency.upper()
 
-        # Calculate effective rate (for display purposes)
-        rate = None
-        if from_cur != to_cur:
-            rate = converted_amount / conversion.amount
-
-        # Build backward-fill info if applicable
-        backward_fill_info = None
-        if backward_fill_applied:
-            days_back = (on_date - actual_rate_date).days
-            backward_fill_info = BackwardFillInfo(actual_rate_date=actual_rate_date, days_back=days_back)
-
-        results.append(FXConversionResult(
-            amount=conversion.amount,
-            from_currency=from_cur,
-            to_currency=to_cur,
-            conversion_date=on_date.isoformat(),
-            converted_amount=converted_amount,
-            rate=rate,
-            backward_fill_info=backward_fill_info
-            ))
+        # Effective rate (for display purposes) and backward-fill info (rate date before the day) included
+        results.append(_conversion_json(conversion.amount, from_cur, to_cur, metadata['date'], converted_amount, actual_rate_date))
 
     # If all conversions failed, return 404
     if bulk_errors and not results:
@@ -665,11 +806,11 @@ async def convert_currency_bulk(
             detail=f"All conversions failed: {'; '.join(bulk_errors)}"
             )
 
-    return FXConvertResponse(
-        results=results,
-        success_count=len([r for r in results if r.converted_amount is not None]),
-        errors=bulk_errors
-        )
+    return FastJSONResponse({
+        "results": results,
+        "success_count": len([r for r in results if r["converted_amount"] is not None]),
+        "errors": bulk_errors,
+        })
 
 
 # ============================================================================
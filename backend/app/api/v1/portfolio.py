@@ -0,0 +1,187 @@
+"""
+Portfolio API endpoints.
+Whole-portfolio valuation over time (computed NAV, stored daily snapshots, returns)
+and country/sector allocation.
+"""
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import AllocationDimension
+from backend.app.db.session import get_session_generator
+from backend.app.logging_config import get_logger
+from backend.app.schemas.portfolio import (
+    FAAllocationBreakdown,
+    FANavSeries,
+    FAPeriodReturns,
+    FAPortfolioSnapshotSeries,
+    FAPortfolioSnapshotSyncResult,
+    ReturnScope,
+    )
+from backend.app.services.asset_allocation import AssetAllocationManager
+from backend.app.services.portfolio_nav import PortfolioNavManager
+from backend.app.services.portfolio_snapshots import PortfolioSnapshotManager
+from backend.app.services.returns import ReturnManager
+
+logger = get_logger(__name__)
+portfolio_router = APIRouter(prefix="/portfolio", tags=["Portfolio"])
+
+
+def _parse_ids(value: Optional[str], name: str) -> Optional[list[int]]:
+    """Parse a comma-separated id list (None = no filter)."""
+    if value is None:
+        return None
+    try:
+        return [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be comma-separated integers")
+
+
+@portfolio_router.get("/nav", response_model=FANavSeries)
+async def get_nav_series(
+    start_date: date = Query(..., description="First day (inclusive)"),
+    end_date: Optional[date] = Query(None, description="Last day (inclusive, defaults to today)"),
+    currency: str = Query(..., min_length=3, max_length=3, description="Target currency (ISO 4217)"),
+    broker_ids: Optional[str] = Query(None, description="Comma-separated broker ids (default: all)"),
+    asset_ids: Optional[str] = Query(None, description="Comma-separated asset ids (default: all)"),
+    include_contributions: bool = Query(False, description="Also return the per-asset series"),
+    session: AsyncSession = Depends(get_session_generator)
+    ):
+    """
+    Daily portfolio NAV in one currency.
+
+    Values every calendar day of the range: quantity held (all selected brokers)
+    × last known close × last known FX rate to `currency` (backward-fill, as in
+    FX conversion). Assets held without a price or rate up to a day count as 0
+    on that day and are listed in `unvalued_asset_ids`.
+
+    **Example**:
+    ```
+    GET /api/v1/portfolio/nav?start_date=2024-01-01&currency=EUR&include_contributions=true
+    ```
+    """
+    if end_date is None:
+        end_date = date.today()
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="Start date must be before or equal to end date")
+    broker_id_list = _parse_ids(broker_ids, "broker_ids")
+    asset_id_list = _parse_ids(asset_ids, "asset_ids")
+
+    try:
+        return await PortfolioNavManager.get_nav_series(
+            session, start_date, end_date, currency.upper(),
+            broker_ids=broker_id_list, asset_ids=asset_id_list, include_contributions=include_contributions,
+            )
+    except Exception as e:
+        logger.error(f"Error computing NAV series: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@portfolio_router.get("/snapshots", response_model=FAPortfolioSnapshotSeries)
+async def get_snapshots(
+    start_date: Optional[date] = Query(None, description="First day (inclusive, default: first snapshot)"),
+    end_date: Optional[date] = Query(None, description="Last day (inclusive, default: last snapshot)"),
+    broker_id: Optional[int] = Query(None, description="Broker (default: all brokers)"),
+    session: AsyncSession = Depends(get_session_generator)
+    ):
+    """
+    Stored daily portfolio values (assets, cash, total) in the base currency.
+
+    A range scan of the snapshots kept by the background recompute: no
+    valuation happens here. While writes wait for the next recompute,
+    `pending_from` is the first stale day.
+
+    **Example**:
+    ```
+    GET /api/v1/portfolio/snapshots?start_date=2024-01-01&broker_id=1
+    ```
+    """
+    if start_date is not None and end_date is not None and start_date > end_date:
+        raise HTTPException(status_code=400, detail="Start date must be before or equal to end date")
+
+    try:
+        return await PortfolioSnapshotManager.get_snapshots(session, start_date, end_date, broker_id)
+    except Exception as e:
+        logger.error(f"Error reading portfolio snapshots: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@portfolio_router.post("/snapshots/sync", response_model=FAPortfolioSnapshotSyncResult)
+async def sync_snapshots(
+    rebuild: bool = Query(False, description="Recompute every day instead of the pending ones"),
+    session: AsyncSession = Depends(get_session_generator)
+    ):
+    """
+    Recompute the pending snapshot days now (instead of waiting for the background job).
+    """
+    try:
+        if rebuild:
+            return await PortfolioSnapshotManager.rebuild(session)
+        return await PortfolioSnapshotManager.sync(session)
+    except Exception as e:
+        logger.error(f"Error syncing portfolio snapshots: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@portfolio_router.get("/returns", response_model=FAPeriodReturns)
+async def get_returns(
+    scope: ReturnScope = Query(ReturnScope.PORTFOLIO, description="Whole portfolio, per broker or per asset"),
+    start_date: date = Query(..., description="First day (inclusive)"),
+    end_date: Optional[date] = Query(None, description="Last day (inclusive, defaults to today)"),
+    ids: Optional[str] = Query(None, description="Comma-separated broker or asset ids (default: all with activity)"),
+    session: AsyncSession = Depends(get_session_generator)
+    ):
+    """
+    Time-weighted (TWR) and money-weighted (XIRR) returns over a period, in the base currency.
+
+    TWR removes the effect of deposits and withdrawals (performance of the
+    investments), XIRR includes their timing (performance of the investor).
+    Results are cached per period until a write changes one of its days.
+
+    **Example**:
+    ```
+    GET /api/v1/portfolio/returns?scope=asset&start_date=2024-01-01&end_date=2024-12-31
+    ```
+    """
+    if end_date is not None and start_date > end_date:
+        raise HTTPException(status_code=400, detail="Start date must be before or equal to end date")
+    id_list = _parse_ids(ids, "ids")
+
+    try:
+        return await ReturnManager.get_returns(session, scope, start_date, end_date, ids=id_list)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error computing returns: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@portfolio_router.get("/allocation", response_model=FAAllocationBreakdown)
+async def get_allocation(
+    dimension: AllocationDimension = Query(..., description="COUNTRY (geographic area) or SECTOR"),
+    broker_ids: Optional[str] = Query(None, description="Comma-separated broker ids (default: all)"),
+    as_of: Optional[date] = Query(None, description="Holdings at the end of this date (default: current holdings)"),
+    session: AsyncSession = Depends(get_session_generator)
+    ):
+    """
+    Country or sector exposure of the holdings, in the base currency.
+
+    Each held asset contributes quantity × last close × last FX rate, split by
+    the weights of its geographic or sector distribution (one aggregate query
+    over the allocation index, no per-asset JSON parsing). Assets without a
+    distribution count as `unclassified_value`.
+
+    **Example**:
+    ```
+    GET /api/v1/portfolio/allocation?dimension=COUNTRY&broker_ids=1,2
+    ```
+    """
+    broker_id_list = _parse_ids(broker_ids, "broker_ids")
+
+    try:
+        return await AssetAllocationManager.get_exposure(session, dimension, broker_ids=broker_id_list, as_of=as_of)
+    except Exception as e:
+        logger.error(f"Error computing allocation: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -57,6 +57,30 @@ class Settings(BaseSettings):
     # Portfolio
     PORTFOLIO_BASE_CURRENCY: str = "EUR"  # ISO 4217 currency code
 
+    # Background price refresh scheduler (disabled automatically in test mode)
+    PRICE_REFRESH_SCHEDULER_ENABLED: bool = True
+    PRICE_REFRESH_TICK_SECONDS: int = 60  # How often the scheduler checks for stale assets
+    PRICE_REFRESH_BATCH_SIZE: int = 50  # Max assets refreshed per tick (all providers)
+    PRICE_REFRESH_RETRY_MINUTES: int = 30  # Backoff after a failed refresh (instead of retrying every tick)
+
+    # Background portfolio snapshot recompute (disabled automatically in test mode)
+    PORTFOLIO_SNAPSHOT_SCHEDULER_ENABLED: bool = True
+    PORTFOLIO_SNAPSHOT_TICK_SECONDS: int = 60  # How often pending snapshot days are recomputed
+
+    # Outbound provider rate limits: provider code -> requests/second (overrides provider default policy)
+    PROVIDER_RATE_LIMITS: dict[str, float] = {}
+
+    # Scheduled-yield value curves kept in memory (assets, LRU)
+    # Worst case memory: SIZE x MAX_DAYS x ~112 bytes (one full-precision Decimal per day),
+    # 200 x 1830 ~ 41 MB with the defaults
+    SCHEDULED_VALUE_CACHE_SIZE: int = 200
+
+    # Max days of one cached value curve (longer ranges are computed, not cached)
+    SCHEDULED_VALUE_CURVE_MAX_DAYS: int = 1830
+
+    # Day count fractions kept in memory (LRU, (start, end, convention) entries)
+    DAY_COUNT_CACHE_SIZE: int = 65536
+
     # CORS (for frontend development)
     BACKEND_CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:5173"]
 
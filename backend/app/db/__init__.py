@@ -8,6 +8,7 @@ from backend.app.db.base import (
     AssetType,
     TransactionType,
     CashMovementType,
+    AllocationDimension,
     # Models
     Broker,
     Asset,
@@ -16,8 +17,23 @@ from backend.app.db.base import (
     FxRate,
     FxCurrencyPairSource,
     AssetProviderAssignment,
+    BrokerImportCheckpoint,
     CashAccount,
     CashMovement,
+    PositionHistory,
+    Position,
+    PositionInvalidation,
+    PositionLot,
+    LotMatch,
+    LotInvalidation,
+    CashBalanceHistory,
+    PortfolioDailySnapshot,
+    PortfolioSnapshotInvalidation,
+    ReturnCache,
+    AssetAllocationWeight,
+    AssetLatestPrice,
+    FxLatestRate,
+    ScheduledValueVersion,
     )
 from backend.app.db.session import get_sync_engine, get_async_engine, get_session_generator
 
@@ -31,6 +47,7 @@ __all__ = [
     "AssetType",
     "TransactionType",
     "CashMovementType",
+    "AllocationDimension",
     # Models
     "Broker",
     "Asset",
@@ -39,6 +56,21 @@ __all__ = [
     "FxRate",
     "FxCurrencyPairSource",
     "AssetProviderAssignment",
+    "BrokerImportCheckpoint",
     "CashAccount",
     "CashMovement",
+    "PositionHistory",
+    "Position",
+    "PositionInvalidation",
+    "PositionLot",
+    "LotMatch",
+    "LotInvalidation",
+    "CashBalanceHistory",
+    "PortfolioDailySnapshot",
+    "PortfolioSnapshotInvalidation",
+    "ReturnCache",
+    "AssetAllocationWeight",
+    "AssetLatestPrice",
+    "FxLatestRate",
+    "ScheduledValueVersion",
     ]
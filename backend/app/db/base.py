@@ -12,6 +12,7 @@ from backend.app.db.models import (
     AssetType,
     TransactionType,
     CashMovementType,
+    AllocationDimension,
     # Models
     Broker,
     Asset,
@@ -20,8 +21,23 @@ from backend.app.db.models import (
     FxRate,
     FxCurrencyPairSource,
     AssetProviderAssignment,
+    BrokerImportCheckpoint,
     CashAccount,
     CashMovement,
+    PositionHistory,
+    Position,
+    PositionInvalidation,
+    PositionLot,
+    LotMatch,
+    LotInvalidation,
+    CashBalanceHistory,
+    PortfolioDailySnapshot,
+    PortfolioSnapshotInvalidation,
+    ReturnCache,
+    AssetAllocationWeight,
+    AssetLatestPrice,
+    FxLatestRate,
+    ScheduledValueVersion,
     )
 
 __all__ = [
@@ -31,6 +47,7 @@ __all__ = [
     "AssetType",
     "TransactionType",
     "CashMovementType",
+    "AllocationDimension",
     # Models
     "Broker",
     "Asset",
@@ -39,6 +56,21 @@ __all__ = [
     "FxRate",
     "FxCurrencyPairSource",
     "AssetProviderAssignment",
+    "BrokerImportCheckpoint",
     "CashAccount",
     "CashMovement",
+    "PositionHistory",
+    "Position",
+    "PositionInvalidation",
+    "PositionLot",
+    "LotMatch",
+    "LotInvalidation",
+    "CashBalanceHistory",
+    "PortfolioDailySnapshot",
+    "PortfolioSnapshotInvalidation",
+    "ReturnCache",
+    "AssetAllocationWeight",
+    "AssetLatestPrice",
+    "FxLatestRate",
+    "ScheduledValueVersion",
     ]
@@ -18,6 +18,7 @@ from sqlalchemy import (
     UniqueConstraint,
     Index,
     Numeric,
+    Float,
     Text,
     event,
     CheckConstraint,
@@ -259,6 +260,17 @@ class CashMovementType(str, Enum):
     TRANSFER_OUT = "TRANSFER_OUT"
 
 
+class AllocationDimension(str, Enum):
+    """
+    Allocation breakdowns of an asset (see AssetAllocationWeight).
+
+    - COUNTRY: classification_params.geographic_area (ISO-3166-A3 keys)
+    - SECTOR: classification_params.sector_area (FinancialSector keys)
+    """
+    COUNTRY = "COUNTRY"
+    SECTOR = "SECTOR"
+
+
 TRANSACTION_TYPES_REQUIRING_CASH_MOVEMENT = {
     TransactionType.BUY: CashMovementType.BUY_SPEND,
     TransactionType.SELL: CashMovementType.SALE_PROCEEDS,
@@ -271,6 +283,54 @@ TRANSACTION_TYPES_REQUIRING_CASH_MOVEMENT = {
 # Helper to generate SQL IN clause for CHECK constraint
 CASH_REQUIRED_TYPES_SQL = ", ".join(f"'{t.value}'" for t in TRANSACTION_TYPES_REQUIRING_CASH_MOVEMENT.keys())
 
+# Signed quantity effect of quantity-affecting transactions (positions, oversell guard)
+TRANSACTION_QUANTITY_SIGN = {
+    TransactionType.BUY: 1,
+    TransactionType.TRANSFER_IN: 1,
+    TransactionType.ADD_HOLDING: 1,
+    TransactionType.SELL: -1,
+    TransactionType.TRANSFER_OUT: -1,
+    TransactionType.REMOVE_HOLDING: -1,
+    }
+
+# Helper to generate SQL IN clause for position invalidation triggers
+QUANTITY_TYPES_SQL = ", ".join(f"'{t.value}'" for t in TRANSACTION_QUANTITY_SIGN.keys())
+
+# Cash balance effect of movement types (amounts are always positive, direction implied by type)
+CASH_MOVEMENT_SIGN = {
+    CashMovementType.DEPOSIT: 1,
+    CashMovementType.SALE_PROCEEDS: 1,
+    CashMovementType.DIVIDEND_INCOME: 1,
+    CashMovementType.INTEREST_INCOME: 1,
+    CashMovementType.TRANSFER_IN: 1,
+    CashMovementType.WITHDRAWAL: -1,
+    CashMovementType.BUY_SPEND: -1,
+    CashMovementType.FEE: -1,
+    CashMovementType.TAX: -1,
+    CashMovementType.TRANSFER_OUT: -1,
+    }
+
+# Helper to generate SQL IN clause for cash balance triggers (inflow types)
+CASH_INFLOW_TYPES_SQL = ", ".join(f"'{t.value}'" for t, sign in CASH_MOVEMENT_SIGN.items() if sign > 0)
+
+# FIFO lot matching: +1 opens a lot, -1 closes lots oldest first. Transfers are not matched: lots stay
+# with the broker that opened them (P&L results flag pairs with transfers, see services/lots.py)
+FIFO_LOT_SIGN = {
+    TransactionType.BUY: 1,
+    TransactionType.ADD_HOLDING: 1,
+    TransactionType.SELL: -1,
+    TransactionType.REMOVE_HOLDING: -1,
+    }
+
+# Helper to generate SQL IN clause for lot invalidation triggers
+FIFO_TYPES_SQL = ", ".join(f"'{t.value}'" for t in FIFO_LOT_SIGN.keys())
+
+# JSON path of each allocation distribution in Asset.classification_params (allocation triggers)
+ALLOCATION_DISTRIBUTION_PATHS = {
+    AllocationDimension.COUNTRY: "$.geographic_area.distribution",
+    AllocationDimension.SECTOR: "$.sector_area.distribution",
+    }
+
 
 # ============================================================================
 # MODELS
@@ -411,6 +471,7 @@ class Transaction(SQLModel, table=True):
     __tablename__ = "transactions"
     __table_args__ = (
         Index("idx_transactions_asset_broker_date", "asset_id", "broker_id", "trade_date", "id"),
+        Index("uq_transactions_import_hash", "import_hash", unique=True),
         CheckConstraint(
             f"""
             (type IN ({CASH_REQUIRED_TYPES_SQL}) AND cash_movement_id IS NOT NULL)
@@ -448,6 +509,9 @@ class Transaction(SQLModel, table=True):
     settlement_date: Optional[date_type] = Field(default=None)
     note: Optional[str] = Field(default=None, sa_column=Column(Text))
 
+    # Content hash of the imported source row (NULL = not imported): see services/broker_import.py
+    import_hash: Optional[str] = Field(default=None)
+
     created_at: datetime = Field(default_factory=utcnow)
     updated_at: datetime = Field(default_factory=utcnow)
 
@@ -597,7 +661,7 @@ class CashAccount(SQLModel, table=True):
     Cash account per broker and currency.
 
     Each broker can have multiple cash accounts (one per currency).
-    Balance computed at runtime from cash_movements.
+    Running balance per trade_date in cash_balance_history (maintained by triggers on cash_movements).
     """
     __tablename__ = "cash_accounts"
     __table_args__ = (
@@ -639,6 +703,7 @@ class CashMovement(SQLModel, table=True):
     __tablename__ = "cash_movements"
     __table_args__ = (
         Index("idx_cash_movements_account_date", "cash_account_id", "trade_date", "id"),
+        Index("uq_cash_movements_import_hash", "import_hash", unique=True),
         )
 
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -654,6 +719,9 @@ class CashMovement(SQLModel, table=True):
         )
     note: Optional[str] = Field(default=None, sa_column=Column(Text))
 
+    # Content hash of the imported source row (NULL = not imported): see services/broker_import.py
+    import_hash: Optional[str] = Field(default=None)
+
     created_at: datetime = Field(default_factory=utcnow)
     updated_at: datetime = Field(default_factory=utcnow)
 
@@ -761,6 +829,341 @@ class AssetProviderAssignment(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=utcnow)
 
 
+class BrokerImportCheckpoint(SQLModel, table=True):
+    """
+    Progress of a broker statement import (services/broker_import.py).
+
+    - import_key: identifies the source (default: broker id + SHA-256 of the file)
+    - rows_processed: source rows consumed by committed chunks (imported or rejected)
+
+    Updated in the same transaction as each chunk's rows, so an interrupted
+    import resumes after the last committed chunk without duplicates.
+    """
+    __tablename__ = "broker_import_checkpoints"
+
+    import_key: str = Field(primary_key=True)
+    broker_id: int = Field(foreign_key="brokers.id", nullable=False, index=True)
+
+    rows_processed: int = Field(default=0, nullable=False)
+    transactions_created: int = Field(default=0, nullable=False)
+    cash_movements_created: int = Field(default=0, nullable=False)
+    completed: bool = Field(default=False, nullable=False)
+
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
+
+
+# ============================================================================
+# DERIVED TABLES (materialized from transactions, maintained by services)
+# ============================================================================
+
+
+class PositionHistory(SQLModel, table=True):
+    """
+    Running position per (asset, broker) at the end of each trade date.
+
+    One row per (asset_id, broker_id, trade_date) with quantity-affecting
+    transactions (see TRANSACTION_QUANTITY_SIGN). Values are cumulative:
+    - quantity: held quantity after all transactions of the day
+    - cost_basis: average cost of the held quantity (transaction currency)
+
+    Maintained by PositionManager (services/positions.py): replayed from the
+    earliest affected trade_date recorded in position_invalidations.
+    """
+    __tablename__ = "position_history"
+    __table_args__ = (
+        UniqueConstraint("asset_id", "broker_id", "trade_date", name="uq_position_history_asset_broker_date"),
+        )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    asset_id: int = Field(foreign_key="assets.id", nullable=False)
+    broker_id: int = Field(foreign_key="brokers.id", nullable=False)
+    trade_date: date_type = Field(nullable=False)
+
+    quantity: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+    cost_basis: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+
+
+class Position(SQLModel, table=True):
+    """
+    Current position per (asset, broker): last row of position_history.
+
+    Rows exist only for (asset, broker) pairs with quantity-affecting
+    transactions (a closed position has quantity 0).
+    """
+    __tablename__ = "positions"
+
+    asset_id: int = Field(foreign_key="assets.id", primary_key=True)
+    broker_id: int = Field(foreign_key="brokers.id", primary_key=True)
+
+    quantity: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+    cost_basis: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+
+    first_trade_date: date_type = Field(nullable=False)
+    last_trade_date: date_type = Field(nullable=False)
+
+    updated_at: datetime = Field(default_factory=utcnow)
+
+
+class PositionInvalidation(SQLModel, table=True):
+    """
+    Pending position replays: earliest affected trade_date per (asset, broker).
+
+    Written by SQLite triggers on transactions (insert, update, delete, including
+    deletes cascaded from cash_movements), so every write path is tracked.
+    Consumed (and cleared) by PositionManager.sync().
+    """
+    __tablename__ = "position_invalidations"
+
+    asset_id: int = Field(primary_key=True)
+    broker_id: int = Field(primary_key=True)
+    from_date: date_type = Field(nullable=False)
+
+
+class PositionLot(SQLModel, table=True):
+    """
+    FIFO lot opened by a BUY or ADD_HOLDING transaction (one lot per transaction).
+
+    - quantity: quantity opened
+    - remaining_quantity: quantity not yet closed by lot_matches (0 = fully closed)
+    - unit_cost: opening price (NULL price counts as 0), in the lot currency
+
+    Maintained by LotManager (services/lots.py): lots opened on or after the
+    earliest affected trade_date recorded in lot_invalidations are recomputed.
+    """
+    __tablename__ = "position_lots"
+    __table_args__ = (
+        Index("idx_position_lots_asset_broker_date", "asset_id", "broker_id", "open_date", "transaction_id"),
+        )
+
+    transaction_id: int = Field(foreign_key="transactions.id", primary_key=True)
+
+    asset_id: int = Field(foreign_key="assets.id", nullable=False)
+    broker_id: int = Field(foreign_key="brokers.id", nullable=False)
+    open_date: date_type = Field(nullable=False)
+
+    quantity: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+    remaining_quantity: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+    unit_cost: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+    currency: str = Field(nullable=False)  # ISO 4217
+
+
+class LotMatch(SQLModel, table=True):
+    """
+    Quantity of a lot closed by a SELL or REMOVE_HOLDING transaction (FIFO).
+
+    One row per (closing transaction, lot). realized_pnl = quantity * (unit_proceeds - unit_cost),
+    NULL when the closing transaction is in another currency than the lot.
+    REMOVE_HOLDING without price closes at 0 (realized loss of the cost).
+
+    close_transaction_id has no foreign key on purpose: when a closing transaction
+    is deleted its matches are kept until the next sync, which needs them to
+    restore the lots they closed (and then deletes them).
+    """
+    __tablename__ = "lot_matches"
+    __table_args__ = (
+        Index("idx_lot_matches_asset_broker_date", "asset_id", "broker_id", "close_date"),
+        Index("idx_lot_matches_lot", "lot_transaction_id"),
+        )
+
+    close_transaction_id: int = Field(primary_key=True)
+    lot_transaction_id: int = Field(foreign_key="position_lots.transaction_id", primary_key=True)
+
+    asset_id: int = Field(foreign_key="assets.id", nullable=False)
+    broker_id: int = Field(foreign_key="brokers.id", nullable=False)
+    close_date: date_type = Field(nullable=False)
+
+    quantity: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+    unit_cost: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+    unit_proceeds: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+    currency: str = Field(nullable=False)  # ISO 4217 (lot currency)
+    proceeds_currency: str = Field(nullable=False)  # ISO 4217 (closing transaction currency)
+    realized_pnl: Optional[Decimal] = Field(default=None, sa_column=Column(Numeric(18, 6)))
+
+
+class LotInvalidation(SQLModel, table=True):
+    """
+    Pending lot recomputations: earliest affected trade_date per (asset, broker).
+
+    Written by SQLite triggers on transactions for FIFO types (see FIFO_LOT_SIGN),
+    consumed (and cleared) by LotManager.sync().
+    """
+    __tablename__ = "lot_invalidations"
+
+    asset_id: int = Field(primary_key=True)
+    broker_id: int = Field(primary_key=True)
+    from_date: date_type = Field(nullable=False)
+
+
+class CashBalanceHistory(SQLModel, table=True):
+    """
+    Running cash balance per (cash account, trade_date) with movements.
+
+    - net_amount: signed sum of the day's movements (see CASH_MOVEMENT_SIGN)
+    - balance: balance at the end of the day
+    - movement_count: movements of the day (the row is removed when it reaches 0)
+
+    Maintained by SQLite triggers on cash_movements (insert, update, delete,
+    including deletes that cascade to the linked transaction): a change on
+    trade_date D adjusts the row of D and the balance of the rows after it.
+    The primary key index serves balance-at-date lookups (one seek).
+    """
+    __tablename__ = "cash_balance_history"
+
+    cash_account_id: int = Field(foreign_key="cash_accounts.id", primary_key=True)
+    trade_date: date_type = Field(primary_key=True)
+
+    net_amount: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+    balance: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+    movement_count: int = Field(nullable=False)
+
+
+
+class PortfolioDailySnapshot(SQLModel, table=True):
+    """
+    Portfolio value at the end of each day, per broker and in total.
+
+    - broker_id: broker (NULL = all brokers)
+    - assets_value: held quantities × last close × last FX rate (NAV engine)
+    - cash_value: cash balances converted with the last FX rate
+    - unvalued: some holding or balance had no price or rate (counted as 0)
+
+    Values are in the portfolio base currency (currency column: a change of
+    PORTFOLIO_BASE_CURRENCY triggers a full recompute). Broker rows start at the
+    broker's first activity, total rows at the first activity of any broker.
+
+    Maintained by PortfolioSnapshotManager (services/portfolio_snapshots.py):
+    days on or after the date recorded in portfolio_snapshot_invalidations are
+    recomputed, reads are range scans on (broker_id, snapshot_date).
+    """
+    __tablename__ = "portfolio_daily_snapshots"
+    __table_args__ = (
+        Index("idx_portfolio_snapshots_broker_date", "broker_id", "snapshot_date"),
+        )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    snapshot_date: date_type = Field(nullable=False)
+    broker_id: Optional[int] = Field(default=None, foreign_key="brokers.id", nullable=True)
+    currency: str = Field(nullable=False)  # ISO 4217
+
+    assets_value: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+    cash_value: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+    total_value: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+    unvalued: bool = Field(default=False, nullable=False)
+
+
+class PortfolioSnapshotInvalidation(SQLModel, table=True):
+    """
+    Pending snapshot recompute: earliest affected day (single row, id = 1).
+
+    Written by SQLite triggers on transactions, cash_movements, price_history
+    (assets with a position history) and fx_rates, whatever the write path.
+    Consumed (and cleared) by PortfolioSnapshotManager.sync().
+    """
+    __tablename__ = "portfolio_snapshot_invalidations"
+
+    id: int = Field(default=1, primary_key=True)
+    from_date: date_type = Field(nullable=False)
+
+
+class ReturnCache(SQLModel, table=True):
+    """
+    Cached period returns (TWR and XIRR) of the portfolio, a broker or an asset.
+
+    - scope: 'portfolio' (scope_id 0), 'broker' or 'asset'
+    - twr: time-weighted return over the period (not annualized)
+    - mwr: money-weighted return (XIRR, annualized), NULL without a solution
+
+    Values are float64 analytics in the portfolio base currency. Rows whose
+    end_date is on or after a recomputed snapshot day are deleted by
+    PortfolioSnapshotManager.sync() (inputs changed): see services/returns.py.
+    """
+    __tablename__ = "return_cache"
+
+    scope: str = Field(primary_key=True)
+    scope_id: int = Field(primary_key=True)
+    start_date: date_type = Field(primary_key=True)
+    end_date: date_type = Field(primary_key=True)
+    currency: str = Field(nullable=False)  # ISO 4217
+
+    start_value: float = Field(sa_column=Column(Float, nullable=False))
+    end_value: float = Field(sa_column=Column(Float, nullable=False))
+    net_flows: float = Field(sa_column=Column(Float, nullable=False))
+    twr: Optional[float] = Field(default=None, sa_column=Column(Float))
+    mwr: Optional[float] = Field(default=None, sa_column=Column(Float))
+
+
+class AssetAllocationWeight(SQLModel, table=True):
+    """
+    Allocation weight of an asset per (dimension, key): one row per entry of the
+    geographic_area / sector_area distributions of Asset.classification_params.
+
+    Weights are the validated values (quantized to 4 decimals, summing to 1).
+    Maintained by SQLite triggers on assets (insert, update of
+    classification_params; rows cascade on asset delete), so every write path
+    (create, patch, provider metadata refresh) is covered. Exposures aggregate
+    it against positions in SQL: see services/asset_allocation.py.
+    """
+    __tablename__ = "asset_allocation_weights"
+    __table_args__ = (
+        Index("idx_asset_allocation_weights_dimension_key", "dimension", "key"),
+        )
+
+    asset_id: int = Field(foreign_key="assets.id", primary_key=True)
+    dimension: AllocationDimension = Field(primary_key=True)
+    key: str = Field(primary_key=True)
+
+    weight: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+
+
+class AssetLatestPrice(SQLModel, table=True):
+    """
+    Newest price_history row with a close, per asset.
+
+    Maintained by SQLite triggers on price_history (insert, delete, update; rows
+    cascade on asset delete), so every write path (bulk upsert, provider refresh,
+    range delete) keeps it current. Current valuations read it with one primary
+    key lookup per asset instead of a backward scan of price_history.
+    """
+    __tablename__ = "asset_latest_prices"
+
+    asset_id: int = Field(foreign_key="assets.id", primary_key=True)
+    date: date_type = Field(nullable=False)
+    close: Decimal = Field(sa_column=Column(Numeric(18, 6), nullable=False))
+    currency: str = Field(nullable=False)  # ISO 4217
+
+
+class FxLatestRate(SQLModel, table=True):
+    """
+    Newest fx_rates row per stored pair (alphabetical base < quote, as in fx_rates).
+
+    Maintained by SQLite triggers on fx_rates (insert, delete, update).
+    """
+    __tablename__ = "fx_latest_rates"
+
+    base: str = Field(primary_key=True)  # ISO 4217
+    quote: str = Field(primary_key=True)  # ISO 4217
+    date: date_type = Field(nullable=False)
+    rate: Decimal = Field(sa_column=Column(Numeric(24, 10), nullable=False))
+
+
+class ScheduledValueVersion(SQLModel, table=True):
+    """
+    Input version of the value curve of a scheduled-yield asset.
+
+    Bumped by SQLite triggers on every write of the curve inputs: transactions of
+    scheduled_investment assets (insert, update, delete, cascades included) and
+    provider assignments (provider_params). The value curve cache validates a
+    curve with one primary key lookup (no row = version 0). No FK: bumps fired by
+    cascaded deletes must not fail, rows of deleted assets are never read.
+    """
+    __tablename__ = "scheduled_value_versions"
+
+    asset_id: int = Field(primary_key=True)
+    version: int = Field(nullable=False)
+
+
 # ============================================================================
 # EVENT LISTENERS
 # ============================================================================
@@ -773,6 +1176,8 @@ class AssetProviderAssignment(SQLModel, table=True):
 @event.listens_for(CashMovement, "before_update")
 @event.listens_for(AssetProviderAssignment, "before_update")
 @event.listens_for(FxCurrencyPairSource, "before_update")
+@event.listens_for(BrokerImportCheckpoint, "before_update")
+@event.listens_for(Position, "before_update")
 def receive_before_update(mapper, connection, target):
     """Update updated_at timestamp on update."""
     target.updated_at = utcnow()
@@ -15,6 +15,8 @@ from fastapi.responses import HTMLResponse, FileResponse
 from backend.app.api.v1.router import router as api_v1_router
 from backend.app.config import get_settings, set_test_mode, is_test_mode
 from backend.app.logging_config import configure_logging, get_logger
+from backend.app.services.portfolio_snapshots import portfolio_snapshot_scheduler
+from backend.app.services.price_refresh_scheduler import price_refresh_scheduler
 
 # Check for --test flag in command line arguments
 # This must be done before any imports that might use settings
@@ -129,8 +131,18 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     # Ensure database exists and is migrated
     ensure_database_exists()
 
+    # Background price refresh (never in test mode: tests drive refresh explicitly)
+    if settings.PRICE_REFRESH_SCHEDULER_ENABLED and not is_test_mode():
+        price_refresh_scheduler.start()
+
+    # Background snapshot recompute (never in test mode: tests call PortfolioSnapshotManager.sync)
+    if settings.PORTFOLIO_SNAPSHOT_SCHEDULER_ENABLED and not is_test_mode():
+        portfolio_snapshot_scheduler.start()
+
     yield
     # Shutdown
+    portfolio_snapshot_scheduler.stop()
+    price_refresh_scheduler.stop()
     logger.info("Shutting down LibreFolio")
 
 
@@ -8,9 +8,14 @@ and standardize data exchange between components.
 - common.py: Shared schemas (BackwardFillInfo, DateRangeModel, BaseBulkResponse, BaseDeleteResult)
 - assets.py: Asset-related schemas (FAPricePoint, ScheduledInvestment*, etc.)
 - provider.py: Provider assignment schemas (FA + FX)
-- prices.py: FA price operation schemas (upsert, delete, query)
+- prices.py: FA price operation schemas (upsert, delete, query, latest price, price matrix)
 - refresh.py: FA refresh + FX sync operational schemas
-- fx.py: FX-specific schemas (conversion, upsert, delete, pair sources)
+- fx.py: FX-specific schemas (conversion, upsert, delete, pair sources, rate series, latest rates)
+- positions.py: Positions materialized from transactions (holdings, sync, checks, oversell guard)
+- lots.py: FIFO lots persisted from transactions (open lots, realized/unrealized P&L)
+- cash.py: Cash account balances from the running-balance ledger
+- portfolio.py: Portfolio valuation over time (NAV series, daily snapshots, returns, allocation)
+- imports.py: Broker statement imports (transactions and cash movements from CSV/JSON)
 
 **Naming Conventions**:
 - FA prefix: Financial Assets (stocks, ETFs, bonds, loans)
@@ -74,6 +79,9 @@ from backend.app.schemas.fx import (
     FXDeletePairSourceResult,
     FXDeletePairSourcesResponse,
     FXCurrenciesResponse,
+    FXRatePoint,
+    FXLatestRate,
+    FXLatestRatesResponse,
     )
 from backend.app.schemas.prices import (
     FAUpsert,
@@ -83,6 +91,48 @@ from backend.app.schemas.prices import (
     FABulkDeleteResponse,
     FAPriceDeleteResult,
     FAUpsertResult,
+    FALatestPrice,
+    FAPriceMatrixSeries,
+    FAPriceMatrix,
+    )
+from backend.app.schemas.positions import (
+    FAPosition,
+    FAPositionSyncResult,
+    FAPositionMismatch,
+    FAPositionCheckResult,
+    FAOversellViolation,
+    FAOversellCheckResult,
+    )
+from backend.app.schemas.lots import (
+    FALot,
+    FALotSyncResult,
+    FARealizedPnL,
+    FAUnrealizedPnL,
+    FALotMismatch,
+    FALotCheckResult,
+    )
+from backend.app.schemas.cash import (
+    FACashBalance,
+    FACashBalancePoint,
+    FACashBalanceHistory,
+    FACashBalanceMismatch,
+    FACashBalanceCheckResult,
+    )
+from backend.app.schemas.portfolio import (
+    FANavContribution,
+    FANavSeries,
+    FAPortfolioSnapshot,
+    FAPortfolioSnapshotSeries,
+    FAPortfolioSnapshotSyncResult,
+    FAPeriodReturn,
+    FAPeriodReturns,
+    FAAllocationExposure,
+    FAAllocationBreakdown,
+    FAAllocationCheckResult,
+    )
+from backend.app.schemas.imports import (
+    FAImportRowError,
+    FABrokerImportResult,
     )
 from backend.app.schemas.provider import (
     FAProviderInfo,
@@ -98,6 +148,7 @@ from backend.app.schemas.refresh import (
     FARefreshItem,
     FABulkRefreshResponse,
     FARefreshResult,
+    FARefreshSchedulerStatus,
     FXSyncResponse,
     )
 
@@ -151,10 +202,48 @@ __all__ = [
     "FABulkDeleteResponse",
     "FAPriceDeleteResult",
     "FAUpsertResult",
+    "FALatestPrice",
+    "FAPriceMatrixSeries",
+    "FAPriceMatrix",
+    # Positions
+    "FAPosition",
+    "FAPositionSyncResult",
+    "FAPositionMismatch",
+    "FAPositionCheckResult",
+    "FAOversellViolation",
+    "FAOversellCheckResult",
+    # Lots
+    "FALot",
+    "FALotSyncResult",
+    "FARealizedPnL",
+    "FAUnrealizedPnL",
+    "FALotMismatch",
+    "FALotCheckResult",
+    # Cash balances
+    "FACashBalance",
+    "FACashBalancePoint",
+    "FACashBalanceHistory",
+    "FACashBalanceMismatch",
+    "FACashBalanceCheckResult",
+    # Portfolio valuation
+    "FANavContribution",
+    "FANavSeries",
+    "FAPortfolioSnapshot",
+    "FAPortfolioSnapshotSeries",
+    "FAPortfolioSnapshotSyncResult",
+    "FAPeriodReturn",
+    "FAPeriodReturns",
+    "FAAllocationExposure",
+    "FAAllocationBreakdown",
+    "FAAllocationCheckResult",
+    # Broker imports
+    "FAImportRowError",
+    "FABrokerImportResult",
     # Refresh
     "FARefreshItem",
     "FABulkRefreshResponse",
     "FARefreshResult",
+    "FARefreshSchedulerStatus",
     "FXSyncResponse",
     # FX
     "FXProviderInfo",
@@ -174,4 +263,7 @@ __all__ = [
     "FXDeletePairSourceResult",
     "FXDeletePairSourcesResponse",
     "FXCurrenciesResponse",
+    "FXRatePoint",
+    "FXLatestRate",
+    "FXLatestRatesResponse",
     ]
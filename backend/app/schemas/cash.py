@@ -0,0 +1,72 @@
+"""
+Cash Balance Schemas (FA).
+
+Cash account balances read from the running-balance ledger
+(cash_balance_history, services/cash_balances.py).
+
+**Naming Conventions**:
+- FA prefix: Financial Assets (cash held at brokers, like positions)
+
+**Design Notes**:
+- Balances are derived data: they are never written by clients
+- Amounts use the movements' precision (Numeric(18, 6)), in the account currency
+"""
+from __future__ import annotations
+
+from datetime import date as date_type
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class FACashBalance(BaseModel):
+    """Balance of one cash account at the end of a date."""
+    model_config = ConfigDict(extra="forbid")
+
+    cash_account_id: int
+    broker_id: int
+    currency: str
+    as_of: Optional[date_type] = Field(None, description="Requested date (None = latest)")
+    balance: Decimal = Field(..., description="Balance at the end of the date (0 before the first movement)")
+    last_movement_date: Optional[date_type] = Field(None, description="Last trade_date with movements up to as_of")
+
+
+class FACashBalancePoint(BaseModel):
+    """Ledger row: a trade_date with movements."""
+    model_config = ConfigDict(extra="forbid")
+
+    trade_date: date_type
+    net_amount: Decimal = Field(..., description="Signed sum of the day's movements")
+    balance: Decimal = Field(..., description="Balance at the end of the day")
+
+
+class FACashBalanceHistory(BaseModel):
+    """Balance history of one cash account over a date range."""
+    model_config = ConfigDict(extra="forbid")
+
+    cash_account_id: int
+    currency: str
+    opening_balance: Decimal = Field(..., description="Balance before the first day of the range")
+    points: List[FACashBalancePoint] = Field(default_factory=list, description="Days with movements, ascending")
+
+
+class FACashBalanceMismatch(BaseModel):
+    """Difference between the stored ledger and a from-scratch sum of movements."""
+    model_config = ConfigDict(extra="forbid")
+
+    cash_account_id: int
+    trade_date: date_type
+    field: str = Field(..., description="Mismatching field (net_amount, balance, movement_count, row)")
+    stored: Optional[str] = Field(None, description="Stored value (None = missing row)")
+    expected: Optional[str] = Field(None, description="Recomputed value (None = unexpected row)")
+
+
+class FACashBalanceCheckResult(BaseModel):
+    """Consistency check of the cash balance ledger against movements."""
+    model_config = ConfigDict(extra="forbid")
+
+    consistent: bool
+    accounts_checked: int
+    rows_checked: int
+    mismatches: List[FACashBalanceMismatch] = Field(default_factory=list)
@@ -14,6 +14,8 @@ Covers provider info, currency conversion, rate upsert/delete, and pair sources.
 - Upsert: Insert/update FX rates in bulk
 - Delete: Remove FX rates by date ranges
 - Pair sources: Configure provider priority for currency pairs
+- Rate series: Backward-filled daily rates of a pair over a range
+- Latest rates: Newest stored rate per pair
 
 **Design Notes**:
 - No backward compatibility maintained during refactoring
@@ -306,6 +308,37 @@ class FXDeletePairSourcesResponse(BaseBulkDeleteResponse[FXDeletePairSourceResul
     pass
 
 
+# ============================================================================
+# RATE SERIES MODELS
+# ============================================================================
+
+class FXRatePoint(BaseModel):
+    """Rate of a day in a rate series: 1 base = rate quote, in the requested direction."""
+    date: date_type = Field(..., description="Day of the series")
+    base: str
+    quote: str
+    rate: Decimal
+    backward_fill_info: Optional[BackwardFillInfo] = Field(None, description="Backward-fill info (null if the rate is of that very day)")
+
+
+# ============================================================================
+# LATEST RATE MODELS
+# ============================================================================
+
+class FXLatestRate(BaseModel):
+    """Newest stored rate of a pair (fx_latest_rates): 1 base = rate quote, stored direction (base < quote)."""
+    base: str
+    quote: str
+    date: date_type = Field(..., description="Date of the newest rate")
+    rate: Decimal
+
+
+class FXLatestRatesResponse(BaseModel):
+    """Response model for GET /currencies/rate/latest."""
+    rates: list[FXLatestRate] = Field(..., description="Newest rate per pair, ordered by base, quote")
+    count: int = Field(..., description="Number of pairs returned")
+
+
 # ============================================================================
 # CURRENCY LIST MODELS
 # ============================================================================
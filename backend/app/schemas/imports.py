@@ -0,0 +1,53 @@
+"""
+Broker Import Schemas (FA).
+
+Results of streaming broker statement imports (services/broker_import.py):
+CSV / JSON exports turned into transactions and cash movements.
+
+**Naming Conventions**:
+- FA prefix: Financial Assets (transactions and cash movements of a broker)
+
+**Design Notes**:
+- Source rows are plain mappings parsed by the service (no per-row pydantic
+  model: validation is part of the streaming hot path)
+- Row numbers are 1-based data rows of the source (CSV header excluded)
+- Rows already imported (same content hash, any source) are skipped, not
+  rejected: they are reported in duplicate_rows
+"""
+from __future__ import annotations
+
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class BrokerImportFormat(str, Enum):
+    """Source file format of a broker statement."""
+    CSV = "csv"
+    JSON = "json"  # Array of objects, or one object per line (JSON Lines)
+
+
+class FAImportRowError(BaseModel):
+    """A source row rejected by the import."""
+    model_config = ConfigDict(extra="forbid")
+
+    row: Optional[int] = Field(None, description="Source row number (None = stored transaction day turned negative)")
+    message: str
+
+
+class FABrokerImportResult(BaseModel):
+    """Result of one run of a broker statement import."""
+    model_config = ConfigDict(extra="forbid")
+
+    import_key: str
+    broker_id: int
+    resumed_from: int = Field(0, description="Rows skipped: already processed by a previous run (checkpoint)")
+    rows_read: int = Field(..., description="Rows read in this run")
+    rows_failed: int = Field(0, description="Rows rejected in this run (not written)")
+    transactions_created: int = 0
+    cash_movements_created: int = Field(0, description="Linked and standalone movements")
+    duplicates_skipped: int = Field(0, description="Rows skipped in this run: already imported")
+    completed: bool = Field(..., description="Source fully processed (False = stopped by an oversell, resume after fixing it)")
+    errors: List[FAImportRowError] = Field(default_factory=list, description="Rejected rows (truncated)")
+    duplicate_rows: List[int] = Field(default_factory=list, description="Source rows skipped as duplicates (truncated)")
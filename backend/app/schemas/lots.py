@@ -0,0 +1,102 @@
+"""
+Lot Schemas (FA).
+
+FIFO lots per (asset, broker) persisted by the lot engine (services/lots.py):
+open lots, realized gain/loss of closed quantities, unrealized gain/loss of
+open quantities. Transfers do not move lots: P&L rows of pairs with transfers
+are flagged (has_transfers).
+
+**Naming Conventions**:
+- FA prefix: Financial Assets
+
+**Design Notes**:
+- Lots are derived data: they are never written by clients
+- Quantities and amounts use the transactions' precision (Numeric(18, 6))
+- Amounts are in the lot currency (currency of the opening transaction)
+"""
+from __future__ import annotations
+
+from datetime import date as date_type
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class FALot(BaseModel):
+    """FIFO lot opened by a BUY or ADD_HOLDING transaction."""
+    model_config = ConfigDict(extra="forbid")
+
+    transaction_id: int = Field(..., description="Opening transaction (lot identifier)")
+    asset_id: int
+    broker_id: int
+    open_date: date_type
+    quantity: Decimal = Field(..., description="Quantity opened")
+    remaining_quantity: Decimal = Field(..., description="Quantity not closed yet")
+    unit_cost: Decimal = Field(..., description="Opening unit price (lot currency)")
+    currency: str
+
+
+class FALotSyncResult(BaseModel):
+    """Result of an incremental lot recomputation."""
+    model_config = ConfigDict(extra="forbid")
+
+    pairs_recomputed: int = Field(..., description="(asset, broker) pairs recomputed")
+    transactions_replayed: int = Field(..., description="Transactions read (from each earliest affected trade_date)")
+    lots_written: int = Field(..., description="position_lots rows written")
+    matches_written: int = Field(..., description="lot_matches rows written")
+    unmatched_quantity: Decimal = Field(Decimal("0"), description="Closed quantity without open lots (oversell)")
+
+
+class FARealizedPnL(BaseModel):
+    """Realized gain/loss of the lot quantities closed in a period, per (asset, broker, currencies)."""
+    model_config = ConfigDict(extra="forbid")
+
+    asset_id: int
+    broker_id: int
+    currency: str = Field(..., description="Lot currency (cost)")
+    proceeds_currency: str = Field(..., description="Closing transactions currency (proceeds)")
+    quantity: Decimal = Field(..., description="Quantity closed")
+    cost_basis: Decimal = Field(..., description="FIFO cost of the quantity closed")
+    proceeds: Decimal = Field(..., description="Proceeds of the quantity closed")
+    realized_pnl: Optional[Decimal] = Field(None, description="proceeds - cost_basis (None if currencies differ)")
+    has_transfers: bool = Field(False, description="Pair has TRANSFER_IN/TRANSFER_OUT: lots are not moved, cost basis ignores them")
+
+
+class FAUnrealizedPnL(BaseModel):
+    """Unrealized gain/loss of the open lots of an (asset, broker, currency), at the latest price."""
+    model_config = ConfigDict(extra="forbid")
+
+    asset_id: int
+    broker_id: int
+    currency: str = Field(..., description="Lot currency (all amounts)")
+    quantity: Decimal = Field(..., description="Open quantity")
+    cost_basis: Decimal = Field(..., description="FIFO cost of the open quantity")
+    price_date: Optional[date_type] = Field(None, description="Date of the price used (None = no price)")
+    market_value: Optional[Decimal] = Field(None, description="Open quantity at the price (None = no price or FX rate)")
+    unrealized_pnl: Optional[Decimal] = Field(None, description="market_value - cost_basis")
+    has_transfers: bool = Field(False, description="Pair has TRANSFER_IN/TRANSFER_OUT: lots are not moved, cost basis ignores them")
+
+
+class FALotMismatch(BaseModel):
+    """Difference between stored lot data and a from-scratch recompute."""
+    model_config = ConfigDict(extra="forbid")
+
+    asset_id: int
+    broker_id: int
+    transaction_id: int = Field(..., description="Opening transaction (lot) or closing transaction (match)")
+    lot_transaction_id: Optional[int] = Field(None, description="Matched lot (None = lot row)")
+    field: str = Field(..., description="Mismatching field (remaining_quantity, quantity, realized_pnl, row, ...)")
+    stored: Optional[str] = Field(None, description="Stored value (None = missing row)")
+    expected: Optional[str] = Field(None, description="Recomputed value (None = unexpected row)")
+
+
+class FALotCheckResult(BaseModel):
+    """Consistency check of persisted lots against transactions."""
+    model_config = ConfigDict(extra="forbid")
+
+    consistent: bool
+    pairs_checked: int
+    lots_checked: int
+    matches_checked: int
+    mismatches: List[FALotMismatch] = Field(default_factory=list)
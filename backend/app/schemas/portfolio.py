@@ -0,0 +1,151 @@
+"""
+Portfolio Valuation Schemas (FA).
+
+Whole-portfolio values over time computed by the NAV engine
+(services/portfolio_nav.py) from positions, prices and FX rates.
+
+**Naming Conventions**:
+- FA prefix: Financial Assets (portfolio of positions)
+
+**Design Notes**:
+- Series are columnar (one list per field, aligned with dates) to keep
+  multi-year responses compact
+- NAV values are float64: the valuation is vectorized (NumPy), for charts and
+  analytics; exact amounts stay on positions and cash balances
+- Snapshots are the same valuation persisted per day (Numeric(18, 6)), in the
+  portfolio base currency, per broker and in total
+- Returns (TWR, XIRR) are float64 ratios (0.05 = 5%) in the base currency
+- Allocation exposures are float64 values in the base currency (SQL-side
+  aggregation of positions × asset allocation weights)
+"""
+from __future__ import annotations
+
+from datetime import date as date_type
+from decimal import Decimal
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, ConfigDict
+
+from backend.app.db.models import AllocationDimension
+
+
+class FANavContribution(BaseModel):
+    """Daily value of one asset (all selected brokers) in the target currency."""
+    model_config = ConfigDict(extra="forbid")
+
+    asset_id: int
+    values: List[float] = Field(..., description="Value per day, aligned with FANavSeries.dates")
+
+
+class FANavSeries(BaseModel):
+    """Daily portfolio NAV (net asset value of the held assets) in one currency."""
+    model_config = ConfigDict(extra="forbid")
+
+    currency: str = Field(..., description="Target currency (ISO 4217)")
+    dates: List[date_type] = Field(default_factory=list, description="Every calendar day of the range")
+    totals: List[float] = Field(default_factory=list, description="Total value per day")
+    contributions: List[FANavContribution] = Field(default_factory=list, description="Per-asset values (if requested)")
+    unvalued_asset_ids: List[int] = Field(
+        default_factory=list,
+        description="Assets held on some day without a price or FX rate up to that day (counted as 0 there)",
+        )
+
+
+class FAPortfolioSnapshot(BaseModel):
+    """Stored portfolio value at the end of one day (one broker or all brokers)."""
+    model_config = ConfigDict(extra="forbid")
+
+    snapshot_date: date_type
+    assets_value: Decimal = Field(..., description="Held assets at the last close and FX rate")
+    cash_value: Decimal = Field(..., description="Cash balances at the last FX rate")
+    total_value: Decimal = Field(..., description="assets_value + cash_value")
+    unvalued: bool = Field(False, description="Some holding or balance had no price or FX rate (counted as 0)")
+
+
+class FAPortfolioSnapshotSeries(BaseModel):
+    """Daily snapshots of one broker (or the total) over a date range."""
+    model_config = ConfigDict(extra="forbid")
+
+    broker_id: Optional[int] = Field(None, description="Broker (None = all brokers)")
+    currency: str = Field(..., description="Portfolio base currency (ISO 4217)")
+    pending_from: Optional[date_type] = Field(
+        None, description="Days from this date are being recomputed (stale until the next sync)",
+        )
+    points: List[FAPortfolioSnapshot] = Field(default_factory=list, description="One point per day, ascending")
+
+
+class FAPortfolioSnapshotSyncResult(BaseModel):
+    """Result of an incremental snapshot recompute."""
+    model_config = ConfigDict(extra="forbid")
+
+    from_date: Optional[date_type] = Field(None, description="First recomputed day (None = nothing to do)")
+    to_date: Optional[date_type] = Field(None, description="Last recomputed day")
+    rows_written: int = Field(0, description="portfolio_daily_snapshots rows written")
+    full: bool = Field(False, description="Whole history recomputed (empty table or base currency changed)")
+
+
+class ReturnScope(str, Enum):
+    """What a period return measures."""
+    PORTFOLIO = "portfolio"  # All brokers: deposits/withdrawals and holdings added/removed are flows
+    BROKER = "broker"  # One broker: also cash and asset transfers between brokers are flows
+    ASSET = "asset"  # One asset (all brokers): buys, sales, income and holdings added/removed are flows
+
+
+class FAPeriodReturn(BaseModel):
+    """Time-weighted and money-weighted return of one portfolio, broker or asset over a period."""
+    model_config = ConfigDict(extra="forbid")
+
+    scope_id: int = Field(..., description="Broker or asset id (0 for the portfolio)")
+    start_value: float = Field(..., description="Value at the end of the day before start_date")
+    end_value: float = Field(..., description="Value at the end of end_date")
+    net_flows: float = Field(..., description="External flows in the period (+ money in, - money out)")
+    twr: Optional[float] = Field(None, description="Time-weighted return over the period (None = never held)")
+    mwr: Optional[float] = Field(None, description="Money-weighted return (XIRR, annualized; None = no solution)")
+
+
+class FAPeriodReturns(BaseModel):
+    """Period returns of a set of portfolios, brokers or assets (one batch)."""
+    model_config = ConfigDict(extra="forbid")
+
+    scope: ReturnScope
+    currency: str = Field(..., description="Portfolio base currency (ISO 4217)")
+    start_date: date_type
+    end_date: date_type
+    cached_count: int = Field(0, description="Results read from the cache (the others were computed)")
+    results: List[FAPeriodReturn] = Field(default_factory=list, description="Ordered by scope_id")
+
+
+class FAAllocationExposure(BaseModel):
+    """Portfolio value exposed to one country or sector."""
+    model_config = ConfigDict(extra="forbid")
+
+    key: str = Field(..., description="ISO-3166-A3 country code or sector name")
+    value: float = Field(..., description="Sum of held value × allocation weight, in the base currency")
+    weight: float = Field(..., description="Share of the valued holdings (0.05 = 5%)")
+    asset_count: int = Field(..., description="Held assets with a weight on this key")
+
+
+class FAAllocationBreakdown(BaseModel):
+    """Country or sector exposure of the holdings."""
+    model_config = ConfigDict(extra="forbid")
+
+    dimension: AllocationDimension
+    as_of: Optional[date_type] = Field(None, description="Holdings at the end of this date (None = current)")
+    currency: str = Field(..., description="Portfolio base currency (ISO 4217)")
+    total_value: float = Field(..., description="Valued holdings (exposures + unclassified)")
+    unclassified_value: float = Field(0.0, description="Held value of assets without a distribution for the dimension")
+    exposures: List[FAAllocationExposure] = Field(default_factory=list, description="Ordered by value, descending")
+    unvalued_asset_ids: List[int] = Field(
+        default_factory=list, description="Held assets without a price or FX rate (excluded from the values)",
+        )
+
+
+class FAAllocationCheckResult(BaseModel):
+    """Consistency check of asset_allocation_weights against classification_params."""
+    model_config = ConfigDict(extra="forbid")
+
+    consistent: bool
+    assets_checked: int
+    rows_checked: int
+    mismatched_asset_ids: List[int] = Field(default_factory=list)
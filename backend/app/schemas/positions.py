@@ -0,0 +1,86 @@
+"""
+Position Schemas (FA).
+
+Holdings per (asset, broker) materialized from transactions by the positions
+engine (services/positions.py).
+
+**Naming Conventions**:
+- FA prefix: Financial Assets
+
+**Design Notes**:
+- Positions are derived data: they are never written by clients
+- Quantities and cost basis use the transactions' precision (Numeric(18, 6))
+- cost_basis is the average cost of the held quantity, in transaction currency
+"""
+from __future__ import annotations
+
+from datetime import date as date_type
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class FAPosition(BaseModel):
+    """Position of one asset at one broker (current, or as of a date)."""
+    model_config = ConfigDict(extra="forbid")
+
+    asset_id: int
+    broker_id: int
+    quantity: Decimal = Field(..., description="Held quantity")
+    cost_basis: Decimal = Field(..., description="Average cost of the held quantity (transaction currency)")
+    first_trade_date: Optional[date_type] = Field(None, description="First quantity-affecting trade date")
+    last_trade_date: date_type = Field(..., description="Last quantity-affecting trade date (up to the requested date)")
+
+
+class FAPositionSyncResult(BaseModel):
+    """Result of an incremental positions replay."""
+    model_config = ConfigDict(extra="forbid")
+
+    pairs_replayed: int = Field(..., description="(asset, broker) pairs replayed")
+    transactions_replayed: int = Field(..., description="Transactions read (from each earliest affected trade_date)")
+    history_rows_written: int = Field(..., description="position_history rows written")
+    positions_removed: int = Field(0, description="Positions removed (no quantity-affecting transaction left)")
+
+
+class FAPositionMismatch(BaseModel):
+    """Difference between stored position data and a from-scratch recompute."""
+    model_config = ConfigDict(extra="forbid")
+
+    asset_id: int
+    broker_id: int
+    trade_date: Optional[date_type] = Field(None, description="History date (None = current position row)")
+    field: str = Field(..., description="Mismatching field (quantity, cost_basis, row)")
+    stored: Optional[str] = Field(None, description="Stored value (None = missing row)")
+    expected: Optional[str] = Field(None, description="Recomputed value (None = unexpected row)")
+
+
+class FAPositionCheckResult(BaseModel):
+    """Consistency check of materialized positions against transactions."""
+    model_config = ConfigDict(extra="forbid")
+
+    consistent: bool
+    pairs_checked: int
+    history_rows_checked: int
+    mismatches: List[FAPositionMismatch] = Field(default_factory=list)
+
+
+class FAOversellViolation(BaseModel):
+    """A batch row (or a later stored day) whose running quantity would go below zero."""
+    model_config = ConfigDict(extra="forbid")
+
+    asset_id: int
+    broker_id: int
+    trade_date: date_type
+    index: Optional[int] = Field(None, description="Batch row index (None = stored day after the batch rows)")
+    quantity: Decimal = Field(..., description="Running quantity after the row (or at the end of the stored day)")
+
+
+class FAOversellCheckResult(BaseModel):
+    """Oversell validation of a transaction batch against stored positions."""
+    model_config = ConfigDict(extra="forbid")
+
+    valid: bool
+    rows_checked: int = Field(..., description="Batch rows (cash-only rows always pass)")
+    pairs_checked: int = Field(..., description="(asset, broker) pairs with quantity-affecting rows")
+    violations: List[FAOversellViolation] = Field(default_factory=list)
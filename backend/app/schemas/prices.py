@@ -11,7 +11,8 @@ Covers upsert, delete, and query operations for asset price history.
 **Domain Coverage**:
 - Price upsert: Insert or update price points (OHLC + volume)
 - Price delete: Remove price data by date ranges
-- Price query: Retrieve historical prices with backward-fill
+- Price query: Retrieve historical prices with backward-fill, newest stored price per asset,
+  aligned price matrix of many assets
 
 **Design Notes**:
 - No backward compatibility maintained during refactoring
@@ -154,6 +155,35 @@ class FACurrentValue(BaseModel):
         return Decimal(str(v))
 
 
+class FALatestPrice(BaseModel):
+    """Newest stored close of an asset (asset_latest_prices, no provider call)."""
+    model_config = ConfigDict(extra="forbid")
+
+    asset_id: int
+    date: date_type = Field(..., description="Date of the newest price with a close")
+    close: Decimal
+    currency: str
+
+
+class FAPriceMatrixSeries(BaseModel):
+    """Daily closes of one asset, aligned with FAPriceMatrix.dates."""
+    model_config = ConfigDict(extra="forbid")
+
+    asset_id: int
+    currency: Optional[str] = Field(None, description="Currency of the closes (target currency when converted, None = no price)")
+    closes: List[Optional[float]] = Field(..., description="Close per day, backward-filled (None before the first price or without FX rate)")
+    backward_filled: List[bool] = Field(..., description="True where the close is carried from an earlier day")
+
+
+class FAPriceMatrix(BaseModel):
+    """Stored closes of many assets on one shared calendar-day axis (columnar)."""
+    model_config = ConfigDict(extra="forbid")
+
+    dates: List[date_type] = Field(..., description="Every calendar day of the range")
+    currency: Optional[str] = Field(None, description="Target currency (None = price currency of each asset)")
+    series: List[FAPriceMatrixSeries] = Field(default_factory=list, description="One series per requested asset, in request order")
+
+
 class FAHistoricalData(BaseModel):
     """Historical price data for an asset (list of price points)."""
     model_config = ConfigDict(extra="forbid")
@@ -27,8 +27,8 @@ and update price/rate data from external providers.
 """
 from __future__ import annotations
 
-from datetime import date as date_type
-from typing import List, Optional
+from datetime import date as date_type, datetime
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field, ConfigDict, field_validator
 
@@ -58,6 +58,8 @@ class FARefreshResult(BaseModel):
     fetched_count: int = Field(..., description="Number of prices fetched from provider")
     inserted_count: int = Field(..., description="Number of prices inserted into DB")
     updated_count: int = Field(..., description="Number of prices updated in DB")
+    unchanged_count: int = Field(0, description="Number of fetched prices identical to DB (not written)")
+    skipped: bool = Field(False, description="True if incremental refresh skipped the asset (fetch_interval not elapsed)")
     errors: List[str] = Field(default_factory=list)
 
 class FABulkRefreshResponse(BaseBulkResponse[FARefreshResult]):
@@ -65,6 +67,26 @@ class FABulkRefreshResponse(BaseBulkResponse[FARefreshResult]):
     pass
 
 
+class FARefreshSchedulerStatus(BaseModel):
+    """Background price refresh scheduler status (queue depth and lag).
+
+    Queue entries are ordered by staleness: due_at = last_fetch_at + fetch_interval.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    running: bool = Field(..., description="True if the background scheduler is active")
+    queue_depth: int = Field(..., description="Assets with a provider assignment (queue size)")
+    due_count: int = Field(..., description="Assets whose fetch_interval has elapsed")
+    never_fetched_count: int = Field(..., description="Due assets never fetched from provider")
+    max_lag_seconds: float = Field(..., description="Seconds the stalest due asset is past its due time")
+    due_by_provider: Dict[str, int] = Field(default_factory=dict, description="Due assets per provider code")
+    retrying_count: int = Field(0, description="Assets in retry backoff after a failed refresh")
+    tick_seconds: int = Field(..., description="Scheduler tick interval")
+    last_run_at: Optional[datetime] = Field(None, description="Last tick timestamp (UTC)")
+    last_batch_size: int = Field(0, description="Assets refreshed in last tick")
+    last_failed_count: int = Field(0, description="Assets failed in last tick")
+
+
 # ============================================================================
 # FX SYNC SECTION
 # ============================================================================
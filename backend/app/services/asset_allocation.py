@@ -0,0 +1,312 @@
+"""
+Asset allocation index and portfolio exposures.
+
+Reads and maintains asset_allocation_weights, the geographic_area and
+sector_area distributions of Asset.classification_params as rows
+(asset_id, dimension, key, weight):
+- SQLite triggers on assets keep it current on insert and on every update of
+  classification_params (asset create, patch, provider metadata refresh);
+  rows cascade on asset delete
+- the stored JSON is already validated by FAGeographicArea / FASectorArea,
+  so reads never parse JSON or re-run pydantic
+
+Exposures are one GROUP BY over the holdings (current positions, or the
+position history at a date) × last close × last FX rate to the base currency
+× allocation weight; assets without a distribution for the dimension are
+reported as unclassified. Current exposures join asset_latest_prices and
+fx_latest_rates; exposures at a date seek the last row up to it.
+
+Maintenance commands (also via ./dev.sh db:allocation):
+    python -m backend.app.services.asset_allocation rebuild   # recompute from classification_params
+    python -m backend.app.services.asset_allocation check     # compare with classification_params
+"""
+import asyncio
+import sys
+from datetime import date as date_type
+from decimal import Decimal
+from typing import Optional
+
+import structlog
+from sqlalchemy import select, delete, func, case, and_, insert, type_coerce, Float
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from backend.app.config import get_settings
+from backend.app.db.models import (
+    AllocationDimension,
+    Asset,
+    AssetAllocationWeight,
+    AssetLatestPrice,
+    FxLatestRate,
+    FxRate,
+    Position,
+    PositionHistory,
+    PriceHistory,
+    )
+from backend.app.schemas.assets import FAClassificationParams
+from backend.app.schemas.portfolio import FAAllocationBreakdown, FAAllocationCheckResult, FAAllocationExposure
+from backend.app.services.positions import PositionManager
+
+logger = structlog.get_logger(__name__)
+
+# Mismatching assets reported by check_consistency (the check itself covers all assets)
+MAX_REPORTED_MISMATCHES = 100
+
+
+def _distributions(params: FAClassificationParams) -> dict[AllocationDimension, dict[str, Decimal]]:
+    """Validated distributions of an asset per dimension (absent areas are omitted)."""
+    areas = {AllocationDimension.COUNTRY: params.geographic_area, AllocationDimension.SECTOR: params.sector_area}
+    return {dimension: area.distribution for dimension, area in areas.items() if area is not None}
+
+
+async def _expected_weights(session: AsyncSession) -> dict[int, set[tuple[AllocationDimension, str, Decimal]]]:
+    """Weights per asset parsed from classification_params (assets with invalid JSON have none)."""
+    expected: dict[int, set[tuple[AllocationDimension, str, Decimal]]] = {}
+    rows = (await session.execute(select(Asset.id, Asset.classification_params).where(Asset.classification_params.is_not(None)))).all()
+    for asset_id, classification_params in rows:
+        try:
+            params = FAClassificationParams.model_validate_json(classification_params)
+        except ValueError as e:
+            logger.warning("Invalid classification_params, no allocation weights", asset_id=asset_id, error=str(e))
+            continue
+        expected[asset_id] = {
+            (dimension, key, weight)
+            for dimension, distribution in _distributions(params).items()
+            for key, weight in distribution.items()
+            }
+    return expected
+
+
+def _held_quantities(as_of: Optional[date_type], broker_ids: Optional[list[int]]):
+    """
+    Quantity held per asset (summed over brokers): current positions, or the
+    last position_history row up to as_of of each (asset, broker) pair.
+
+    Positions list every pair with history (closed ones included), so the
+    as-of lookup is one seek per pair on the position_history unique index.
+    """
+    if as_of is None:
+        stmt = select(Position.asset_id, func.sum(Position.quantity).label("quantity"))
+    else:
+        previous = aliased(PositionHistory)
+        last_date = (
+            select(func.max(previous.trade_date))
+            .where(previous.asset_id == Position.asset_id, previous.broker_id == Position.broker_id, previous.trade_date <= as_of)
+            .correlate(Position)
+            .scalar_subquery()
+        )
+        stmt = select(Position.asset_id, func.sum(PositionHistory.quantity).label("quantity")).join(PositionHistory, and_(
+            PositionHistory.asset_id == Position.asset_id,
+            PositionHistory.broker_id == Position.broker_id,
+            PositionHistory.trade_date == last_date,
+            ))
+    if broker_ids is not None:
+        stmt = stmt.where(Position.broker_id.in_(broker_ids))
+    return stmt.group_by(Position.asset_id).having(stmt.selected_columns.quantity != 0).cte("held")
+
+
+def _rate_to(currency_column, target: str, as_of: date_type):
+    """Correlated last FX rate up to as_of from currency_column to target (one index seek on the alphabetical pair)."""
+
+    def last_rate(base, quote):
+        return (
+            select(type_coerce(FxRate.rate, Float))
+            .where(FxRate.base == base, FxRate.quote == quote, FxRate.date <= as_of)
+            .order_by(FxRate.date.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+    return case(
+        (currency_column == target, 1.0),
+        (currency_column < target, last_rate(currency_column, target)),
+        else_=1.0 / last_rate(target, currency_column),
+        )
+
+
+class AssetAllocationManager:
+    """Allocation weights of assets: portfolio exposures, rebuild and consistency check."""
+
+    @staticmethod
+    async def get_exposure(
+        session: AsyncSession,
+        dimension: AllocationDimension,
+        broker_ids: Optional[list[int]] = None,
+        as_of: Optional[date_type] = None,
+        ) -> FAAllocationBreakdown:
+        """
+        Country or sector exposure of the holdings in the base currency.
+
+        Args:
+            session: Database session (pending position replays are applied first)
+            dimension: Country or sector
+            broker_ids: Filter by brokers (None = all)
+            as_of: Holdings, prices and FX rates at the end of this date (None = current holdings, newest prices and rates)
+
+        Returns:
+            FAAllocationBreakdown with one exposure per key, ordered by value (descending)
+        """
+        await PositionManager.sync(session)
+        currency = get_settings().PORTFOLIO_BASE_CURRENCY
+        held = _held_quantities(as_of, broker_ids)
+
+        if as_of is None:
+            # Current holdings: newest close and rate from the maintained tables (primary key joins)
+            direct, inverse = aliased(FxLatestRate), aliased(FxLatestRate)
+            rate = case(
+                (AssetLatestPrice.currency == currency, 1.0),
+                (AssetLatestPrice.currency < currency, type_coerce(direct.rate, Float)),
+                else_=1.0 / type_coerce(inverse.rate, Float),
+                )
+            valued = (
+                select(
+                    held.c.asset_id,
+                    (type_coerce(held.c.quantity, Float) * type_coerce(AssetLatestPrice.close, Float) * rate).label("value"),
+                    )
+                .select_from(held)
+                .outerjoin(AssetLatestPrice, AssetLatestPrice.asset_id == held.c.asset_id)
+                .outerjoin(direct, and_(direct.base == AssetLatestPrice.currency, direct.quote == currency))
+                .outerjoin(inverse, and_(inverse.base == currency, inverse.quote == AssetLatestPrice.currency))
+                .cte("valued")
+            )
+        else:
+            last_price = (
+                select(PriceHistory.close, PriceHistory.currency)
+                .where(PriceHistory.asset_id == held.c.asset_id, PriceHistory.date <= as_of, PriceHistory.close.is_not(None))
+                .order_by(PriceHistory.date.desc())
+                .limit(1)
+            )
+            priced = select(
+                held.c.asset_id,
+                type_coerce(held.c.quantity, Float).label("quantity"),
+                last_price.with_only_columns(type_coerce(PriceHistory.close, Float)).scalar_subquery().label("close"),
+                last_price.with_only_columns(PriceHistory.currency).scalar_subquery().label("currency"),
+                ).cte("priced").prefix_with("MATERIALIZED")
+            # Materialized CTEs: each holding is priced and valued once (correlated lookups not repeated per reference)
+            valued = select(
+                priced.c.asset_id, (priced.c.quantity * priced.c.close * _rate_to(priced.c.currency, currency, as_of)).label("value"),
+                ).cte("valued").prefix_with("MATERIALIZED")
+
+        # One GROUP BY per key (NULL = no weight for the dimension); unvalued holdings are collected in the same pass
+        weight = AssetAllocationWeight
+        rows = (await session.execute(
+            select(
+                weight.key,
+                func.sum(valued.c.value * func.coalesce(type_coerce(weight.weight, Float), 1.0)),
+                func.count(valued.c.value),
+                func.group_concat(case((valued.c.value.is_(None), valued.c.asset_id)).distinct()),
+                )
+            .select_from(valued)
+            .outerjoin(weight, and_(weight.asset_id == valued.c.asset_id, weight.dimension == dimension))
+            .group_by(weight.key)
+            )).all()
+
+        valued_rows = [(key, value, count) for key, value, count, _ in rows if count]
+        unvalued = sorted({int(asset_id) for *_, ids in rows if ids for asset_id in ids.split(",")})
+        total = sum(value for _, value, _ in valued_rows)
+        exposures = sorted(
+            (
+                FAAllocationExposure(key=key, value=value, weight=value / total if total else 0.0, asset_count=count)
+                for key, value, count in valued_rows if key is not None
+                ),
+            key=lambda e: (-e.value, e.key),
+            )
+        return FAAllocationBreakdown(
+            dimension=dimension,
+            as_of=as_of,
+            currency=currency,
+            total_value=total,
+            unclassified_value=sum(value for key, value, _ in valued_rows if key is None),
+            exposures=exposures,
+            unvalued_asset_ids=unvalued,
+            )
+
+    @staticmethod
+    async def rebuild(session: AsyncSession) -> int:
+        """
+        Recompute all weights from classification_params (validated through FAClassificationParams).
+
+        Args:
+            session: Database session (committed)
+
+        Returns:
+            Number of weight rows written
+        """
+        rows = [
+            {"asset_id": asset_id, "dimension": dimension, "key": key, "weight": weight}
+            for asset_id, weights in (await _expected_weights(session)).items()
+            for dimension, key, weight in weights
+            ]
+        await session.execute(delete(AssetAllocationWeight))
+        if rows:
+            await session.execute(insert(AssetAllocationWeight), rows)
+        await session.commit()
+        logger.info("Asset allocation weights rebuilt", rows=len(rows))
+        return len(rows)
+
+    @staticmethod
+    async def check_consistency(session: AsyncSession) -> FAAllocationCheckResult:
+        """
+        Compare the stored weights with classification_params parsed through pydantic.
+
+        Args:
+            session: Database session
+
+        Returns:
+            FAAllocationCheckResult (consistent=False with the mismatching asset ids on any difference)
+        """
+        expected = await _expected_weights(session)
+        stored: dict[int, set[tuple[AllocationDimension, str, Decimal]]] = {}
+        rows = (await session.execute(select(AssetAllocationWeight))).scalars().all()
+        for row in rows:
+            stored.setdefault(row.asset_id, set()).add((row.dimension, row.key, row.weight.normalize()))
+
+        normalized = {
+            asset_id: {(dimension, key, weight.normalize()) for dimension, key, weight in weights}
+            for asset_id, weights in expected.items()
+            }
+        mismatched = sorted(
+            asset_id for asset_id in set(normalized) | set(stored)
+            if normalized.get(asset_id, set()) != stored.get(asset_id, set())
+            )
+        if mismatched:
+            logger.warning("Asset allocation weights inconsistent with classification_params", mismatch_count=len(mismatched))
+        return FAAllocationCheckResult(
+            consistent=not mismatched,
+            assets_checked=len(set(normalized) | set(stored)),
+            rows_checked=len(rows),
+            mismatched_asset_ids=mismatched[:MAX_REPORTED_MISMATCHES],
+            )
+
+
+async def _run_command(command: str) -> bool:
+    from backend.app.db.session import get_async_engine
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        if command == "rebuild":
+            rows = await AssetAllocationManager.rebuild(session)
+            print(f"✅ Asset allocation weights rebuilt: {rows} rows")
+            return True
+
+        result = await AssetAllocationManager.check_consistency(session)
+        if result.consistent:
+            print(f"✅ Asset allocation weights consistent: {result.assets_checked} assets, {result.rows_checked} rows")
+            return True
+        print(f"❌ Asset allocation weights inconsistent ({len(result.mismatched_asset_ids)} assets shown):")
+        print(f"  asset ids: {', '.join(str(asset_id) for asset_id in result.mismatched_asset_ids)}")
+        print("Run: ./dev.sh db:allocation rebuild")
+        return False
+
+
+def main():
+    """Asset allocation weights maintenance commands (rebuild, check)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Asset allocation weights maintenance")
+    parser.add_argument("command", choices=["rebuild", "check"], help="rebuild: recompute from classification_params, check: compare with them")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(_run_command(args.command)) else 1)
+
+
+if __name__ == "__main__":
+    main()
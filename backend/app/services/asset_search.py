@@ -11,6 +11,7 @@ from typing import Optional
 from backend.app.logging_config import get_logger
 from backend.app.schemas.provider import FAProviderSearchResponse, FAProviderSearchResultItem
 from backend.app.services.provider_registry import AssetProviderRegistry
+from backend.app.services.rate_limiter import rate_limiter
 
 logger = get_logger(__name__)
 
@@ -77,7 +78,8 @@ class AssetSearchService:
             Error is None if successful, error message string if failed.
             """
             try:
-                search_results = await provider.search(query)
+                async with rate_limiter.limit(code, None, provider.rate_limit_policy):
+                    search_results = await provider.search(query)
                 return (code, search_results, None)
             except Exception as e:
                 error_str = str(e).lower()
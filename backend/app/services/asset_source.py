@@ -25,15 +25,17 @@ Design principles:
 import asyncio
 import json
 from abc import ABC, abstractmethod
-from datetime import date as date_type, timedelta
-from typing import Optional, List, Dict
+from datetime import date as date_type, time as time_type, timedelta, timezone
+from typing import Optional, List, Dict, AsyncIterator, Callable, Iterable
 
+import numpy as np
 import structlog
-from sqlalchemy import select, delete, and_, or_, func
+from sqlalchemy import select, delete, and_, or_, func, union_all, type_coerce, Float, Numeric
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.db.models import (
-    Asset, AssetProviderAssignment,
+    Asset, AssetLatestPrice, AssetProviderAssignment,
     PriceHistory, IdentifierType,
     )
 from backend.app.schemas import (
@@ -42,17 +44,31 @@ from backend.app.schemas import (
     FAUpsert, FAPricePoint, FAAssetDelete, FAProviderAssignmentItem,
     FAProviderAssignmentResult, FARefreshItem, FABulkMetadataRefreshResponse,
     FABulkDeleteResponse, FAPriceDeleteResult, FABulkRemoveResponse,
-    FAProviderRemovalResult, FABulkRefreshResponse, FARefreshResult)
+    FAProviderRemovalResult, FABulkRefreshResponse, FARefreshResult, DateRangeModel, FALatestPrice,
+    FAPriceMatrix, FAPriceMatrixSeries)
 from backend.app.schemas.assets import FAAssetPatchItem
 from backend.app.schemas.provider import FAProviderRefreshFieldsDetail
 from backend.app.services.asset_crud import AssetCRUDService
+from backend.app.services.portfolio_nav import backward_fill, backward_fill_index, day_offset, load_fx_matrix
 from backend.app.services.provider_registry import AssetProviderRegistry
+from backend.app.services.rate_limiter import RateLimitPolicy, rate_limiter, host_from_url, is_upstream_error, throttle_delay
+from backend.app.services.scheduled_value_cache import scheduled_value_cache
 from backend.app.utils.datetime_utils import utcnow
 from backend.app.utils.decimal_utils import truncate_priceHistory
+from backend.app.utils.streaming import iter_backward_filled, iter_stream_rows
 
 # Initialize structured logger
 logger = structlog.get_logger(__name__)
 
+# Incremental refresh: history window for assets without any stored price
+INCREMENTAL_INITIAL_LOOKBACK_DAYS = 365
+# Fallback when assignment.fetch_interval is NULL (same default as FAProviderAssignmentItem)
+DEFAULT_FETCH_INTERVAL_MINUTES = 1440
+# Rows per INSERT statement when writing refreshed prices (10 params/row, SQLite limit 32766)
+PRICE_WRITE_CHUNK_SIZE = 1000
+# Date ranges per DELETE statement (3 params/range, OR chain depth < SQLite limit of 1000)
+PRICE_DELETE_CHUNK_SIZE = 250
+
 
 # (Pydantic models for API request/response live in backend.app.schemas.assets)
 # They are imported by API modules when needed
@@ -116,6 +132,9 @@ class AssetSourceProvider(ABC):
     Optional overrides:
     - get_icon(): Provider icon URL
     - supports_history: False if provider cannot fetch historical data
+    - refresh_overlap_days: Days re-fetched before last stored price (incremental refresh)
+    - refresh_budget / market_hours: Hints for the background refresh scheduler
+    - rate_limit_policy: Outbound rate limit (None = unlimited)
     - search(): Search for assets by query
     - validate_params(): Validate provider-specific parameters
     - fetch_asset_metadata(): Fetch asset metadata (type, sector, etc.)
@@ -237,6 +256,55 @@ class AssetSourceProvider(ABC):
         """
         return True
 
+    @property
+    def refresh_overlap_days(self) -> int:
+        """
+        Days re-fetched before the last stored price during incremental refresh.
+
+        Incremental refresh starts from max(price_history.date) minus this window,
+        so late revisions of recent closes are picked up without refetching the
+        whole history. Override for sources that revise data further back.
+
+        Default: 3 days
+        """
+        return 3
+
+    @property
+    def refresh_budget(self) -> int:
+        """
+        Max assets refreshed per background scheduler tick for this provider.
+
+        Lower it for sources that throttle aggressively (web scrapers),
+        raise it for local/computed sources.
+
+        Default: 20
+        """
+        return 20
+
+    @property
+    def rate_limit_policy(self) -> RateLimitPolicy | None:
+        """
+        Outbound rate limit for this provider (token bucket per provider + host).
+
+        Shared limiter for refresh, metadata and search calls: see services/rate_limiter.py.
+        Return None for local/computed providers that need no limiting.
+
+        Default: 2 req/s, burst 5, max 5 in-flight requests
+        """
+        return RateLimitPolicy()
+
+    @property
+    def market_hours(self) -> tuple[time_type, time_type] | None:
+        """
+        Trading window hint (open, close) in UTC, Monday to Friday.
+
+        Outside this window the background scheduler refreshes an asset at most
+        once (after the last close), then defers it to the next open.
+
+        Default: None (always refreshable)
+        """
+        return None
+
     @abstractmethod
     async def get_history_value(
         self,
@@ -289,6 +357,46 @@ class AssetSourceProvider(ABC):
         """
         pass
 
+    @property
+    def supports_bulk_history(self) -> bool:
+        """
+        Whether this provider values many assets at once (bulk_get_history_value).
+
+        Override to return True for providers computing values locally from DB
+        data (e.g., scheduled investments), where a batch of assets can be loaded
+        with a few set-based queries on the caller's session.
+
+        Default: False (per-asset get_history_value)
+        """
+        return False
+
+    async def bulk_get_history_value(
+        self,
+        asset_ids: Optional[list[int]],
+        start_date: date_type,
+        end_date: date_type,
+        session: AsyncSession,
+        ) -> dict[int, FAHistoricalData | AssetSourceError]:
+        """
+        Compute historical values for many assets in one call (optional).
+
+        Only called when supports_bulk_history is True.
+
+        Args:
+            asset_ids: Asset IDs to value (None = all assets assigned to this provider)
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+            session: Database session (used for all reads)
+
+        Returns:
+            Dict asset_id -> FAHistoricalData, or AssetSourceError for assets that failed
+        """
+        raise AssetSourceError(
+            f"Bulk history not supported by {self.provider_code}",
+            error_code="NOT_SUPPORTED",
+            details={"provider": self.provider_code}
+            )
+
     @property
     @abstractmethod
     def test_search_query(self) -> str | None:
@@ -434,6 +542,102 @@ class AssetSourceProvider(ABC):
     # TODO: definire metodo da far chiamare periodicamente ad un job garbage collector, per ripulire eventuali cache
 
 
+# ============================================================================
+# PRICE SERIES POINT
+# ============================================================================
+
+
+class PriceSeriesPoint:
+    """One calendar day of a backward-filled price series.
+
+    Compact alternative to FAPricePoint for long series: the point keeps a reference
+    to the stored row it carries (price_history row or provider FAPricePoint, anything
+    with date/open/high/low/close/volume/currency) instead of copying OHLCV, and the
+    FAPricePoint / JSON form is only built when the point is consumed.
+    """
+    __slots__ = ("date", "row", "actual_date")
+
+    CSV_COLUMNS = ("date", "open", "high", "low", "close", "volume", "currency", "actual_rate_date", "days_back")
+
+    def __init__(self, day: date_type, row, actual_date: date_type):
+        self.date = day
+        self.row = row
+        self.actual_date = actual_date  # Date of the data used (== date when not backward-filled)
+
+    @classmethod
+    def from_model(cls, point: FAPricePoint) -> "PriceSeriesPoint":
+        info = point.backward_fill_info
+        return cls(point.date, point, info.actual_rate_date if info else point.date)
+
+    def to_model(self) -> FAPricePoint:
+        """FAPricePoint of this day (values already validated: no re-validation)."""
+        row = self.row
+        return FAPricePoint.model_construct(
+            date=self.date, open=row.open, high=row.high, low=row.low, close=row.close, volume=row.volume, currency=row.currency,
+            backward_fill_info=None if self.actual_date == self.date else BackwardFillInfo.model_construct(
+                actual_rate_date=self.actual_date, days_back=(self.date - self.actual_date).days,
+                ),
+            )
+
+    @staticmethod
+    def _row_json(row) -> dict:
+        """JSON form of the stored row fields (Decimals as str, like FAPricePoint serialization)."""
+        return {
+            "open": None if row.open is None else str(row.open),
+            "high": None if row.high is None else str(row.high),
+            "low": None if row.low is None else str(row.low),
+            "close": str(row.close),
+            "volume": None if row.volume is None else str(row.volume),
+            "currency": row.currency,
+            }
+
+    def _json(self, row_json: dict) -> dict:
+        return {
+            "date": self.date.isoformat(),
+            **row_json,
+            "backward_fill_info": None if self.actual_date == self.date else {
+                "actual_rate_date": self.actual_date.isoformat(), "days_back": (self.date - self.actual_date).days,
+                },
+            }
+
+    def to_json(self) -> dict:
+        """JSON-ready dict, same shape as the JSON serialization of FAPricePoint."""
+        return self._json(self._row_json(self.row))
+
+    @classmethod
+    def json_serializer(cls) -> Callable[["PriceSeriesPoint"], dict]:
+        """
+        to_json for the consecutive points of one series, formatting each stored row once.
+
+        Backward-filled days share their row (weekends, holidays), so they reuse the
+        row's Decimal strings instead of formatting them again for every day.
+        """
+        last_row = None
+        row_json = None
+
+        def to_json(point: "PriceSeriesPoint") -> dict:
+            nonlocal last_row, row_json
+            if point.row is not last_row:
+                last_row, row_json = point.row, cls._row_json(point.row)
+            return point._json(row_json)
+
+        return to_json
+
+    def to_csv_row(self) -> tuple:
+        """CSV row in CSV_COLUMNS order (backward-fill columns empty on exact days)."""
+        row = self.row
+        filled = self.actual_date != self.date
+        return (
+            self.date.isoformat(), row.open, row.high, row.low, row.close, row.volume, row.currency,
+            self.actual_date.isoformat() if filled else None, (self.date - self.actual_date).days if filled else None,
+            )
+
+
+async def _iter_points(points: Iterable[PriceSeriesPoint]) -> AsyncIterator[PriceSeriesPoint]:
+    for point in points:
+        yield point
+
+
 # ============================================================================
 # ASSET SOURCE MANAGER
 # ============================================================================
@@ -510,6 +714,8 @@ class AssetSourceManager:
 
         session.add_all(new_assignments)
         await session.commit()
+        # New provider_params: drop cached scheduled-yield value curves
+        scheduled_value_cache.invalidate(a.asset_id for a in assignments)
 
         # Build results and auto-populate metadata
         for assignment in assignments:
@@ -534,11 +740,12 @@ class AssetSourceManager:
                     if asset:
                         # Try to fetch metadata
                         try:
-                            patch_item = await provider.fetch_asset_metadata(
-                                assignment.identifier,
-                                assignment.identifier_type,
-                                assignment.provider_params
-                                )
+                            async with rate_limiter.limit(assignment.provider_code, host_from_url(assignment.identifier), provider.rate_limit_policy):
+                                patch_item = await provider.fetch_asset_metadata(
+                                    assignment.identifier,
+                                    assignment.identifier_type,
+                                    assignment.provider_params
+                                    )
 
                             if patch_item:
                                 # Set correct asset_id
@@ -622,6 +829,7 @@ class AssetSourceManager:
             return FABulkRemoveResponse(results=[], success_count=0)
         await session.execute(delete(AssetProviderAssignment).where(AssetProviderAssignment.asset_id.in_(asset_ids)))
         await session.commit()
+        scheduled_value_cache.invalidate(asset_ids)
         results = [
             FAProviderRemovalResult(
                 asset_id=aid,
@@ -722,11 +930,12 @@ class AssetSourceManager:
                 provider_params = json.loads(assignment.provider_params) if assignment.provider_params else None
 
                 try:
-                    patch_item = await provider.fetch_asset_metadata(
-                        assignment.identifier,
-                        assignment.identifier_type,
-                        provider_params
-                        )
+                    async with rate_limiter.limit(assignment.provider_code, host_from_url(assignment.identifier), provider.rate_limit_policy):
+                        patch_item = await provider.fetch_asset_metadata(
+                            assignment.identifier,
+                            assignment.identifier_type,
+                            provider_params
+                            )
                 except Exception as e:
                     results.append(FAMetadataRefreshResult(
                         asset_id=asset_id,
@@ -902,32 +1111,15 @@ class AssetSourceManager:
         Returns:
             FABulkDeleteResponse with results and deleted count
 
-        Optimized: 1 SELECT COUNT + 1 DELETE query with complex WHERE
+        Optimized: DELETE ... RETURNING asset_id gives per-asset counts without
+        extra COUNT queries. Ranges are chunked (PRICE_DELETE_CHUNK_SIZE per
+        statement) to stay under SQLite expression-depth and variable limits.
         Note: Cannot parallelize with gather - DB operations are sequential and interdependent
         """
         if not data:
             return FABulkDeleteResponse(deleted_count=0, results=[])
 
-        # Build count per asset before deletion
-        asset_delete_counts = {}
-
-        for item in data:
-            asset_id = item.asset_id
-            ranges = item.date_ranges
-            count = 0
-
-            for date_range in ranges:
-                start = date_range.start
-                end = date_range.end or start  # Single day if no end
-
-                # Count rows for this specific range
-                count_stmt = select(func.count()).select_from(PriceHistory).where(and_(PriceHistory.asset_id == asset_id, PriceHistory.date >= start, PriceHistory.date <= end))
-                result = await session.execute(count_stmt)
-                count += result.scalar()
-
-            asset_delete_counts[asset_id] = count
-
-        # Build complex OR conditions for all ranges
+        # Build OR conditions for all ranges
         conditions = []
         for item in data:
             asset_id = item.asset_id
@@ -941,12 +1133,16 @@ class AssetSourceManager:
         if not conditions:
             return FABulkDeleteResponse(deleted_count=0, results=[])
 
-        # Execute single DELETE with OR of all conditions
-        stmt = delete(PriceHistory).where(or_(*conditions))
-        result = await session.execute(stmt)
+        # Execute chunked DELETEs, counting deleted rows per asset from RETURNING
+        asset_delete_counts: Dict[int, int] = {}
+        for offset in range(0, len(conditions), PRICE_DELETE_CHUNK_SIZE):
+            stmt = delete(PriceHistory).where(or_(*conditions[offset:offset + PRICE_DELETE_CHUNK_SIZE])).returning(PriceHistory.asset_id)
+            result = await session.execute(stmt)
+            for deleted_asset_id in result.scalars():
+                asset_delete_counts[deleted_asset_id] = asset_delete_counts.get(deleted_asset_id, 0) + 1
         await session.commit()
 
-        deleted_count = result.rowcount
+        deleted_count = sum(asset_delete_counts.values())
 
         # Build results per asset with exact counts
         results = [
@@ -991,9 +1187,13 @@ class AssetSourceManager:
         asset_id: int,
         start_date: date_type,
         end_date: date_type,
+        session: AsyncSession,
         ) -> Optional[list[FAPricePoint]]:
         """Delegate to provider history fetch, returning FAPricePoint list or None on failure.
 
+        Providers with supports_bulk_history are called through bulk_get_history_value
+        with the caller's session.
+
         Logs warnings with context when provider fetch fails for diagnostics.
         """
         provider_code = assignment.provider_code
@@ -1012,6 +1212,13 @@ class AssetSourceManager:
         params = AssetSourceManager._parse_provider_params(assignment.provider_params)
 
         try:
+            if provider.supports_bulk_history:
+                # Local valuation: reuse caller's session, no per-asset session/queries
+                historical = (await provider.bulk_get_history_value([asset_id], start_date, end_date, session))[asset_id]
+                if isinstance(historical, AssetSourceError):
+                    raise historical
+                return historical.prices
+
             historical = await provider.get_history_value(str(asset_id), params, start_date, end_date)
             # historical expected FAHistoricalData with prices: List[FAPricePoint]
             return historical.prices
@@ -1028,77 +1235,180 @@ class AssetSourceManager:
             return None
 
     @staticmethod
-    async def _fetch_db_price_map(
+    async def _iter_db_prices(
         session: AsyncSession,
         asset_id: int,
         start_date: date_type,
         end_date: date_type,
-        ) -> dict[date_type, PriceHistory]:
-        stmt = select(PriceHistory).where(
-            and_(
-                PriceHistory.asset_id == asset_id,
-                PriceHistory.date >= start_date,
-                PriceHistory.date <= end_date,
-                )
-            ).order_by(PriceHistory.date)
-        db_result = await session.execute(stmt)
-        return {p.date: p for p in db_result.scalars().all()}
+        ) -> AsyncIterator[PriceSeriesPoint]:
+        """Stored closes backward-filled over every calendar day of the range.
+
+        The last close before start_date is one backward seek on idx_price_history_asset_date,
+        so a range starting on a weekend/holiday is filled from its first day; the range is
+        then read with a server-side cursor (session.stream). Rows without a close are not
+        prices and are skipped. Plain rows (no ORM identity map); volume is read as stored,
+        without rounding to the column scale.
+        """
+        columns = (
+            PriceHistory.date, PriceHistory.open, PriceHistory.high, PriceHistory.low,
+            PriceHistory.close, type_coerce(PriceHistory.volume, Numeric()).label("volume"), PriceHistory.currency,
+            )
+        price_filters = (PriceHistory.asset_id == asset_id, PriceHistory.close.is_not(None))
+        previous = (await session.execute(
+            select(*columns).where(*price_filters, PriceHistory.date < start_date).order_by(PriceHistory.date.desc()).limit(1)
+            )).first()
+        rows = iter_stream_rows(session, select(*columns).where(
+            *price_filters, PriceHistory.date >= start_date, PriceHistory.date <= end_date,
+            ).order_by(PriceHistory.date))
+        async for day, row in iter_backward_filled(rows, start_date, end_date, previous):
+            yield PriceSeriesPoint(day, row, row.date)
 
     @staticmethod
-    def _build_backward_filled_series(price_map: dict[date_type, PriceHistory], start_date: date_type, end_date: date_type, ) -> list[FAPricePoint]:
-        results: list[FAPricePoint] = []
-        last_known: Optional[PriceHistory] = None
-        current = start_date
-        while current <= end_date:
-            ph = price_map.get(current)
-            if ph:
-                last_known = ph
-                results.append(
-                    FAPricePoint(
-                        date=current,
-                        open=ph.open,
-                        high=ph.high,
-                        low=ph.low,
-                        close=ph.close,
-                        volume=ph.volume,
-                        currency=ph.currency,
-                        backward_fill_info=None,
-                        )
-                    )
-            elif last_known:
-                days_back = (current - last_known.date).days
-                results.append(
-                    FAPricePoint(
-                        date=current,
-                        open=last_known.open,
-                        high=last_known.high,
-                        low=last_known.low,
-                        close=last_known.close,
-                        volume=last_known.volume,
-                        currency=last_known.currency,
-                        backward_fill_info=BackwardFillInfo(actual_rate_date=last_known.date, days_back=days_back),
-                        )
+    async def get_latest_prices(asset_ids: Optional[List[int]], session: AsyncSession) -> list[FALatestPrice]:
+        """Newest stored close per asset (asset_latest_prices, kept current by triggers on price_history).
+
+        One primary key lookup per asset: no scan of price_history, no provider call
+        (use get_prices for a provider-backed current value). Assets without a stored
+        close are omitted; results are ordered by asset_id.
+        """
+        stmt = select(AssetLatestPrice).order_by(AssetLatestPrice.asset_id)
+        if asset_ids is not None:
+            stmt = stmt.where(AssetLatestPrice.asset_id.in_(asset_ids))
+        rows = (await session.execute(stmt)).scalars().all()
+        return [FALatestPrice(asset_id=r.asset_id, date=r.date, close=r.close, currency=r.currency) for r in rows]
+
+    @staticmethod
+    async def get_price_matrix(
+        asset_ids: List[int],
+        start_date: date_type,
+        end_date: date_type,
+        session: AsyncSession,
+        currency: Optional[str] = None,
+        ) -> FAPriceMatrix:
+        """Stored closes of many assets on one calendar-day axis, backward-filled (columnar).
+
+        One query over idx_price_history_asset_date reads every close in the range plus
+        the last close before it per asset, scattered into a (days × assets) matrix and
+        backward-filled with NumPy (same engine as the portfolio NAV). No provider call:
+        use get_prices for provider-backed series of one asset.
+
+        Args:
+            asset_ids: Assets (series in this order, duplicates ignored)
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+            session: Database session
+            currency: Convert closes to this currency at the backward-filled rate of each
+                day (None = price currency of each asset)
+
+        Returns:
+            FAPriceMatrix
+
+        Raises:
+            ValueError: Invalid range, unknown assets, or an asset priced in several
+                currencies in the range without a target currency
+        """
+        if start_date > end_date:
+            raise ValueError(f"Start date {start_date} is after end date {end_date}")
+        asset_ids = list(dict.fromkeys(asset_ids))
+        found = set((await session.execute(select(Asset.id).where(Asset.id.in_(asset_ids)))).scalars().all())
+        missing = [asset_id for asset_id in asset_ids if asset_id not in found]
+        if missing:
+            raise ValueError(f"Assets not found: {missing}")
+
+        days = (end_date - start_date).days + 1
+        dates = [start_date + timedelta(days=i) for i in range(days)]
+        price_filters = [PriceHistory.asset_id.in_(asset_ids), PriceHistory.close.is_not(None)]
+        last_price = (
+            select(PriceHistory.asset_id, func.max(PriceHistory.date).label("date"))
+            .where(*price_filters, PriceHistory.date < start_date)
+            .group_by(PriceHistory.asset_id)
+            .subquery()
+        )
+        price_columns = (
+            PriceHistory.asset_id, day_offset(PriceHistory.date, start_date).label("day"),
+            type_coerce(PriceHistory.close, Float), PriceHistory.currency,
+            )
+        rows = (await session.execute(
+            union_all(
+                select(*price_columns).join(last_price, and_(
+                    last_price.c.asset_id == PriceHistory.asset_id, last_price.c.date == PriceHistory.date,
+                    )),
+                select(*price_columns).where(*price_filters, PriceHistory.date >= start_date, PriceHistory.date <= end_date),
+                ).order_by("asset_id", "day")
+            )).all()
+
+        prices = np.full((days, len(asset_ids)), np.nan)
+        price_currencies = np.zeros((days, len(asset_ids)), dtype=np.int64)
+        exact = np.zeros((days, len(asset_ids)), dtype=bool)  # Close of that very day (not carried from before start)
+        currencies: list[str] = []
+        if rows:
+            row_assets, row_days, row_closes, row_currencies = zip(*rows)
+            currencies, currency_columns = np.unique(row_currencies, return_inverse=True)
+            currencies = currencies.tolist()
+            order = np.argsort(asset_ids)
+            row_days = np.array(row_days, dtype=np.int64)
+            cells = (np.maximum(row_days, 0), order[np.searchsorted(np.array(asset_ids)[order], row_assets)])
+            prices[cells] = row_closes
+            price_currencies[cells] = currency_columns
+            exact[cells] = row_days >= 0
+            if currency is None:
+                # Distinct (asset, currency) pairs: an asset listed twice has several price currencies
+                pair_columns = np.unique(cells[1] * len(currencies) + currency_columns) // len(currencies)
+                values, counts = np.unique(pair_columns, return_counts=True)
+                if (counts > 1).any():
+                    mixed_ids = [asset_ids[i] for i in values[counts > 1].tolist()]
+                    raise ValueError(f"Assets priced in several currencies in the range (set a target currency): {mixed_ids}")
+
+        source_rows = backward_fill_index(~np.isnan(prices))
+        columns = np.arange(len(asset_ids))
+        cells = (np.maximum(source_rows, 0), columns)
+        closes = prices[cells]
+        closes[source_rows < 0] = np.nan
+        carried = (source_rows >= 0) & ((source_rows != np.arange(days)[:, None]) | ~exact[cells])
+        last_rows = source_rows[-1]
+        series_currencies: list[Optional[str]] = [None] * len(asset_ids)
+        for i in np.flatnonzero(last_rows >= 0).tolist():
+            series_currencies[i] = currency or currencies[price_currencies[last_rows[i], i]]
+        if currency is not None and currencies:
+            # Rate of each day from the currency of the close it multiplies (FX matrix columns: price currencies + target)
+            fx_currencies = sorted(set(currencies) | {currency})
+            fx_rates = backward_fill(await load_fx_matrix(session, start_date, end_date, currency, fx_currencies))
+            fx_columns = np.searchsorted(fx_currencies, currencies)[price_currencies[cells]]
+            closes = np.round(closes * fx_rates[np.arange(days)[:, None], fx_columns], 6)
+
+        priced = ~np.isnan(closes)
+        return FAPriceMatrix(
+            dates=dates,
+            currency=currency,
+            series=[
+                FAPriceMatrixSeries(
+                    asset_id=asset_id,
+                    currency=series_currencies[i],
+                    closes=np.where(priced[:, i], closes[:, i], None).tolist(),
+                    backward_filled=(carried[:, i] & priced[:, i]).tolist(),
                     )
-            # else: skip days before first known price
-            current += timedelta(days=1)
-        return results
+                for i, asset_id in enumerate(asset_ids)
+                ],
+            )
 
     @staticmethod
-    async def get_prices(
+    async def iter_prices(
         asset_id: int,
         start_date: date_type,
         end_date: date_type,
         session: AsyncSession,
-        ) -> list[FAPricePoint]:
-        """Get prices for asset with backward-fill and provider delegation.
+        ) -> AsyncIterator[PriceSeriesPoint]:
+        """Get prices for asset with backward-fill and provider delegation, as a lazy series.
 
         Logic:
         1. Validate date range
         2. Fetch asset
         3. If provider assignment exists -> try provider fetch
-        4. Fallback to DB with backward-fill
+        4. Fallback to DB with backward-fill (last close before start_date included)
 
-        Returns List[FAPricePoint] (uniform output).
+        Validation and provider delegation run here (errors raise before anything is
+        returned); DB rows are read while the iterator is consumed, one PriceSeriesPoint
+        per day, so a streaming response keeps memory flat for any range.
         Synthetic yield (scheduled investment) handled entirely inside the dedicated provider plugin.
         """
         if start_date > end_date:
@@ -1110,12 +1420,24 @@ class AssetSourceManager:
 
         assignment = await AssetSourceManager.get_asset_provider(asset_id, session)
         if assignment:
-            provider_prices = await AssetSourceManager._fetch_provider_history(assignment, asset_id, start_date, end_date)
+            provider_prices = await AssetSourceManager._fetch_provider_history(assignment, asset_id, start_date, end_date, session)
             if provider_prices is not None:
-                return provider_prices
+                return _iter_points(PriceSeriesPoint.from_model(p) for p in provider_prices)
         # Fallback DB if no provider is assigned at current asset
-        price_map = await AssetSourceManager._fetch_db_price_map(session, asset_id, start_date, end_date)
-        return AssetSourceManager._build_backward_filled_series(price_map, start_date, end_date)
+        return AssetSourceManager._iter_db_prices(session, asset_id, start_date, end_date)
+
+    @staticmethod
+    async def get_prices(
+        asset_id: int,
+        start_date: date_type,
+        end_date: date_type,
+        session: AsyncSession,
+        ) -> list[FAPricePoint]:
+        """Get prices for asset with backward-fill and provider delegation (see iter_prices).
+
+        Returns List[FAPricePoint] (uniform output).
+        """
+        return [point.to_model() async for point in await AssetSourceManager.iter_prices(asset_id, start_date, end_date, session)]
 
     # ========================================================================
     # PRICE REFRESH (PROVIDER) METHODS - NEW
@@ -1125,8 +1447,7 @@ class AssetSourceManager:
     async def bulk_refresh_prices(
         requests: List[FARefreshItem],
         session: AsyncSession,
-        concurrency: int = 5,
-        semaphore_timeout: int = 60,
+        timeout: int = 60,
         ) -> FABulkRefreshResponse:
         """
         Refresh prices for multiple assets using their configured providers.
@@ -1134,33 +1455,42 @@ class AssetSourceManager:
         Args:
             requests: List of FARefreshItem (asset_id, start_date, end_date)
             session: Database session
-            concurrency: Max concurrent provider calls
-            semaphore_timeout: Timeout for acquiring semaphore (seconds)
+            timeout: Timeout of each provider call, once its rate-limit slot is acquired (seconds)
 
         Returns:
             FABulkRefreshResponse with per-item results
 
-        Note: Already parallelized with asyncio.gather and semaphore
+        Note: Parallelized with asyncio.gather; provider calls are throttled by the
+        shared rate limiter (token bucket per provider + host, see rate_limiter.py).
+        Providers with supports_bulk_history are valued once for the whole batch.
         """
         if not requests:
             return FABulkRefreshResponse(results=[])
 
         results = []
-        sem = asyncio.Semaphore(concurrency)
+
+        # Providers valuing locally (supports_bulk_history): one batch call per provider
+        prefetched = await AssetSourceManager._prefetch_bulk_history(requests, session)
+
+        # Items run concurrently but share one AsyncSession, which does not allow
+        # concurrent operations: DB sections are serialized, provider calls are not
+        db_lock = asyncio.Lock()
 
         async def _process_single(item: FARefreshItem) -> FARefreshResult:
             asset_id = item.asset_id
             start = item.date_range.start
-            end = item.date_range.end
+            end = item.date_range.end or start  # Single day if no end
 
             fetched_count = 0
             inserted_count = 0
             updated_count = 0
+            unchanged_count = 0
             errors = []
 
             # Resolve provider assignment
             try:
-                assignment = await AssetSourceManager.get_asset_provider(asset_id, session)
+                async with db_lock:
+                    assignment = await AssetSourceManager.get_asset_provider(asset_id, session)
                 if not assignment:
                     errors.append("No provider assigned for asset")
                     return FARefreshResult(
@@ -1177,7 +1507,8 @@ class AssetSourceManager:
 
                 # Verify asset exists
                 asset_stmt = select(Asset).where(Asset.id == asset_id)
-                asset_res = await session.execute(asset_stmt)
+                async with db_lock:
+                    asset_res = await session.execute(asset_stmt)
                 asset = asset_res.scalar_one_or_none()
                 if not asset:
                     errors.append(f"Asset {asset_id} not found")
@@ -1242,9 +1573,18 @@ class AssetSourceManager:
                         PriceHistory.date <= end,
                         )
                     )
-                db_res = await session.execute(stmt)
+                async with db_lock:
+                    db_res = await session.execute(stmt)
                 return {p.date: p for p in db_res.scalars().all()}
 
+            # One provider call in its own rate-limited slot: errors are reported to the limiter,
+            # the timeout starts once the slot is acquired (waiting in the bucket queue or a
+            # Retry-After back-off is not counted against the asset)
+            async def _provider_call(fetch):
+                async with rate_limiter.limit(provider_code, host_from_url(identifier), prov.rate_limit_policy):
+                    async with asyncio.timeout(timeout):
+                        return await fetch()
+
             # Provider fetch coroutine
             async def _fetch_remote():
                 try:
@@ -1252,28 +1592,49 @@ class AssetSourceManager:
                     today = date_type.today()
                     identifier_type = assignment.identifier_type
 
+                    # 0. Bulk-capable provider: values already computed for the whole batch
+                    if asset_id in prefetched:
+                        bulk_data = prefetched[asset_id]
+                        if isinstance(bulk_data, Exception):
+                            raise bulk_data
+                        # Same window as history + current value: start .. min(end, today)
+                        prices_data = [p.model_dump() for p in bulk_data.prices if start <= p.date <= min(end, today)]
+                        if not prices_data:
+                            raise AssetSourceError(
+                                "No price data available from provider",
+                                "NO_DATA",
+                                {"asset_id": asset_id, "provider": provider_code}
+                            )
+                        return {
+                            "prices": prices_data,
+                            "source": provider_code
+                        }
+
                     # 1. Try to fetch historical data if provider supports it AND date range includes past dates
                     if prov.supports_history and start < today:
                         try:
                             # Fetch history up to yesterday (or end if end < today)
                             history_end = min(end, today - timedelta(days=1)) if end >= today else end
                             if start <= history_end:
-                                hist_data = await prov.get_history_value(
+                                hist_data = await _provider_call(lambda: prov.get_history_value(
                                     identifier, identifier_type, provider_params, start, history_end
-                                )
+                                ))
                                 if hist_data and hist_data.prices:
                                     prices_data = [p.model_dump() for p in hist_data.prices]
                                     logger.debug(f"Fetched {len(prices_data)} historical prices for asset {asset_id}")
                         except Exception as hist_e:
                             logger.warning(f"History fetch failed for asset {asset_id}: {hist_e}")
+                            # Throttled or failing source: skip the current value call (the bucket backs off)
+                            if throttle_delay(hist_e) is not None or is_upstream_error(hist_e):
+                                raise
                             # Continue - we'll try current value
 
                     # 2. Always try to get current value if end date includes today
                     if end >= today:
                         try:
-                            current_data = await prov.get_current_value(
+                            current_data = await _provider_call(lambda: prov.get_current_value(
                                 identifier, identifier_type, provider_params
-                            )
+                            ))
                             if current_data and current_data.value:
                                 # Create a price point for today
                                 current_price = {
@@ -1301,21 +1662,25 @@ class AssetSourceManager:
                         "prices": prices_data,
                         "source": provider_code
                     }
-                except AssetSourceError:
+                except (AssetSourceError, TimeoutError):
                     raise
                 except Exception as e:
                     raise AssetSourceError(f"Provider fetch failed: {str(e)}", "PROVIDER_FETCH_ERROR", {})
 
-            # Run both in parallel with semaphore
+            # Run both in parallel
             try:
-                async with asyncio.timeout(semaphore_timeout):
-                    async with sem:
-                        db_task = asyncio.create_task(_fetch_db_existing())
-                        fetch_task = asyncio.create_task(_fetch_remote())
+                db_task = asyncio.create_task(_fetch_db_existing())
+                fetch_task = asyncio.create_task(_fetch_remote())
 
-                        db_existing, remote_data = await asyncio.gather(db_task, fetch_task)
+                db_existing, remote_data = await asyncio.gather(db_task, fetch_task)
+            except TimeoutError:
+                errors.append(f"Provider {provider_code} timed out after {timeout}s")
             except Exception as e:
-                errors.append(str(e))
+                if throttle_delay(e) is not None:
+                    errors.append(f"Provider {provider_code} rate-limited the request: {e}")
+                else:
+                    errors.append(str(e))
+            if errors:
                 return FARefreshResult(
                     asset_id=asset_id,
                     fetched_count=fetched_count,
@@ -1349,30 +1714,43 @@ class AssetSourceManager:
                     currency=p.get("currency", "USD")
                     ))
 
-            # Build FAUpsert object
-            upsert_obj = FAUpsert(asset_id=asset_id, prices=price_items)
-
-            try:
-                upsert_res = await AssetSourceManager.bulk_upsert_prices([upsert_obj], session)
-                fetched_count = len(prices)
-                inserted_count = upsert_res.get("inserted_count", 0)
-            except Exception as e:
-                errors.append(f"DB upsert failed: {str(e)}")
+            # Write only rows that are new or differ from DB at storage precision.
+            # Unchanged rows are not touched (their fetched_at is preserved).
+            fetched_count = len(prices)
+            changed_items = {}  # date -> FAPricePoint (last one wins on duplicate dates)
+            for p in price_items:
+                if AssetSourceManager._price_point_changed(p, db_existing.get(p.date), asset.currency):
+                    changed_items[p.date] = p
+            new_count = sum(1 for d in changed_items if d not in db_existing)
+            unchanged_count = len({p.date for p in price_items}) - len(changed_items)
+
+            async with db_lock:
+                if changed_items:
+                    try:
+                        await AssetSourceManager._write_refreshed_prices(
+                            asset_id, list(changed_items.values()), provider_code, asset.currency, session
+                            )
+                        inserted_count = new_count
+                        updated_count = len(changed_items) - new_count
+                    except Exception as e:
+                        await session.rollback()
+                        errors.append(f"DB upsert failed: {str(e)}")
 
-            # Update last_fetch_at on assignment
-            try:
-                assignment.last_fetch_at = utcnow()
-                session.add(assignment)
-                await session.commit()
-            except Exception:
-                # Not critical, skip
-                pass
+                # Update last_fetch_at on assignment
+                try:
+                    assignment.last_fetch_at = utcnow()
+                    session.add(assignment)
+                    await session.commit()
+                except Exception:
+                    # Not critical, skip
+                    pass
 
             return FARefreshResult(
                 asset_id=asset_id,
                 fetched_count=fetched_count,
                 inserted_count=inserted_count,
                 updated_count=updated_count,
+                unchanged_count=unchanged_count,
                 errors=errors
                 )
 
@@ -1388,3 +1766,261 @@ class AssetSourceManager:
             success_count=sum(1 for r in results if not r.errors),  # Success = no errors
             errors=[]
         )
+
+    @staticmethod
+    async def _prefetch_bulk_history(
+        requests: List[FARefreshItem],
+        session: AsyncSession,
+        ) -> dict[int, FAHistoricalData | Exception]:
+        """
+        Value assets of bulk-capable providers in one call per provider.
+
+        Loads assignments of all requested assets (1 query), groups assets whose
+        provider supports_bulk_history and calls bulk_get_history_value once per
+        provider over the union of the requested ranges.
+
+        Returns:
+            Dict asset_id -> FAHistoricalData (full union range) or the error raised
+            for that asset. Assets of other providers are not included.
+        """
+        ranges: dict[int, tuple[date_type, date_type]] = {}
+        for item in requests:
+            item_start = item.date_range.start
+            item_end = item.date_range.end or item_start
+            if item.asset_id in ranges:
+                prev_start, prev_end = ranges[item.asset_id]
+                item_start, item_end = min(prev_start, item_start), max(prev_end, item_end)
+            ranges[item.asset_id] = (item_start, item_end)
+
+        rows = await session.execute(
+            select(AssetProviderAssignment.asset_id, AssetProviderAssignment.provider_code)
+            .where(AssetProviderAssignment.asset_id.in_(list(ranges.keys())))
+            )
+        assets_by_provider: dict[str, list[int]] = {}
+        for asset_id, provider_code in rows.all():
+            prov = AssetProviderRegistry.get_provider_instance(provider_code)
+            if prov is not None and prov.supports_bulk_history:
+                assets_by_provider.setdefault(provider_code, []).append(asset_id)
+
+        prefetched: dict[int, FAHistoricalData | Exception] = {}
+        for provider_code, asset_ids in assets_by_provider.items():
+            prov = AssetProviderRegistry.get_provider_instance(provider_code)
+            start = min(ranges[asset_id][0] for asset_id in asset_ids)
+            end = max(ranges[asset_id][1] for asset_id in asset_ids)
+            try:
+                prefetched.update(await prov.bulk_get_history_value(asset_ids, start, end, session))
+            except Exception as e:
+                logger.warning("Bulk history fetch failed", provider_code=provider_code, asset_count=len(asset_ids), error=str(e))
+                prefetched.update({asset_id: e for asset_id in asset_ids})
+        return prefetched
+
+    @staticmethod
+    async def _write_refreshed_prices(
+        asset_id: int,
+        points: List[FAPricePoint],
+        source: str,
+        default_currency: str,
+        session: AsyncSession,
+        ) -> None:
+        """
+        Insert or update provider prices in place (INSERT ... ON CONFLICT DO UPDATE).
+
+        Only called with rows that changed, so fetched_at marks when a value was
+        last modified by the provider. Rows are written in chunks to stay under
+        SQLite's bound-parameter limit.
+
+        Args:
+            asset_id: Asset ID
+            points: New or changed price points (unique dates)
+            source: Provider code (stored in source_plugin_key)
+            default_currency: Asset currency used when point has no currency
+            session: Database session (committed)
+        """
+        fetched_at = utcnow()
+        values_list = [
+            {
+                "asset_id": asset_id,
+                "date": p.date,
+                "open": truncate_priceHistory(p.open, "open") if p.open is not None else None,
+                "high": truncate_priceHistory(p.high, "high") if p.high is not None else None,
+                "low": truncate_priceHistory(p.low, "low") if p.low is not None else None,
+                "close": truncate_priceHistory(p.close, "close"),
+                "volume": p.volume,
+                "currency": p.currency or default_currency,
+                "source_plugin_key": source,
+                "fetched_at": fetched_at,
+                }
+            for p in points
+            ]
+
+        for offset in range(0, len(values_list), PRICE_WRITE_CHUNK_SIZE):
+            stmt = insert(PriceHistory).values(values_list[offset:offset + PRICE_WRITE_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["asset_id", "date"],
+                set_={
+                    "open": stmt.excluded.open,
+                    "high": stmt.excluded.high,
+                    "low": stmt.excluded.low,
+                    "close": stmt.excluded.close,
+                    "volume": stmt.excluded.volume,
+                    "currency": stmt.excluded.currency,
+                    "source_plugin_key": stmt.excluded.source_plugin_key,
+                    "fetched_at": stmt.excluded.fetched_at,
+                    }
+                )
+            await session.execute(stmt)
+        await session.commit()
+
+    @staticmethod
+    def _price_point_changed(point: FAPricePoint, existing: Optional[PriceHistory], default_currency: str) -> bool:
+        """
+        Check whether a fetched price point differs from the stored row.
+
+        Values are compared after truncation to DB column precision, so provider
+        noise below storage precision is not considered a change.
+
+        Args:
+            point: Price point returned by provider
+            existing: Stored PriceHistory row for the same date (None if missing)
+            default_currency: Asset currency used when point has no currency
+
+        Returns:
+            True if the row is new or any OHLCV/currency field differs
+        """
+        if existing is None:
+            return True
+
+        for field in ("open", "high", "low", "close"):
+            new_value = getattr(point, field)
+            new_value = truncate_priceHistory(new_value, field) if new_value is not None else None
+            if new_value != getattr(existing, field):
+                return True
+
+        if point.volume != existing.volume:
+            return True
+
+        return (point.currency or default_currency) != existing.currency
+
+    @staticmethod
+    async def bulk_refresh_prices_incremental(
+        asset_ids: List[int],
+        session: AsyncSession,
+        end_date: Optional[date_type] = None,
+        force: bool = False,
+        ) -> FABulkRefreshResponse:
+        """
+        Incrementally refresh prices starting from the last stored date per asset.
+
+        For each asset the refresh window is derived from the DB instead of the caller:
+        - start = max(price_history.date) - provider.refresh_overlap_days
+        - start = end - INCREMENTAL_INITIAL_LOOKBACK_DAYS if the asset has no prices yet
+        - assets whose fetch_interval has not elapsed since last_fetch_at are skipped
+          (unless force=True) and reported with skipped=True
+
+        Last stored dates for all assets are loaded with a single grouped query,
+        then eligible assets are delegated to bulk_refresh_prices(), which writes
+        only new or changed rows.
+
+        Args:
+            asset_ids: Asset IDs to refresh
+            session: Database session
+            end_date: Last date to refresh (default: today)
+            force: Ignore fetch_interval and refresh all assets
+
+        Returns:
+            FABulkRefreshResponse with per-asset results in input order
+        """
+        if not asset_ids:
+            return FABulkRefreshResponse(results=[])
+
+        end = end_date or date_type.today()
+        now = utcnow()
+
+        # 1 query: assignments + last stored price date per asset
+        last_dates = (
+            select(PriceHistory.asset_id, func.max(PriceHistory.date).label("last_date"))
+            .where(PriceHistory.asset_id.in_(asset_ids))
+            .group_by(PriceHistory.asset_id)
+            .subquery()
+            )
+        stmt = (
+            select(AssetProviderAssignment, last_dates.c.last_date)
+            .outerjoin(last_dates, last_dates.c.asset_id == AssetProviderAssignment.asset_id)
+            .where(AssetProviderAssignment.asset_id.in_(asset_ids))
+            )
+        rows = (await session.execute(stmt)).all()
+        assignments = {assignment.asset_id: (assignment, last_date) for assignment, last_date in rows}
+
+        results_by_asset: dict[int, FARefreshResult] = {}
+        refresh_items: list[FARefreshItem] = []
+
+        for asset_id in dict.fromkeys(asset_ids):
+            if asset_id not in assignments:
+                results_by_asset[asset_id] = FARefreshResult(
+                    asset_id=asset_id,
+                    fetched_count=0,
+                    inserted_count=0,
+                    updated_count=0,
+                    errors=["No provider assigned for asset"]
+                    )
+                continue
+
+            assignment, last_date = assignments[asset_id]
+
+            if not force and not AssetSourceManager._is_refresh_due(assignment, now):
+                results_by_asset[asset_id] = FARefreshResult(
+                    asset_id=asset_id,
+                    fetched_count=0,
+                    inserted_count=0,
+                    updated_count=0,
+                    skipped=True
+                    )
+                continue
+
+            if last_date is not None:
+                provider = AssetProviderRegistry.get_provider_instance(assignment.provider_code)
+                overlap = provider.refresh_overlap_days if provider else 0
+                start = min(last_date - timedelta(days=overlap), end)
+            else:
+                start = end - timedelta(days=INCREMENTAL_INITIAL_LOOKBACK_DAYS)
+
+            refresh_items.append(FARefreshItem(asset_id=asset_id, date_range=DateRangeModel(start=start, end=end)))
+
+        if refresh_items:
+            logger.info(
+                "Incremental price refresh",
+                requested=len(asset_ids),
+                refreshing=len(refresh_items),
+                skipped=sum(1 for r in results_by_asset.values() if r.skipped)
+                )
+            refreshed = await AssetSourceManager.bulk_refresh_prices(refresh_items, session)
+            for r in refreshed.results:
+                results_by_asset[r.asset_id] = r
+
+        results = [results_by_asset[asset_id] for asset_id in dict.fromkeys(asset_ids)]
+        return FABulkRefreshResponse(
+            results=results,
+            success_count=sum(1 for r in results if not r.errors),
+            errors=[]
+            )
+
+    @staticmethod
+    def _is_refresh_due(assignment: AssetProviderAssignment, now) -> bool:
+        """
+        Check whether fetch_interval has elapsed since the last provider fetch.
+
+        Args:
+            assignment: Provider assignment (last_fetch_at, fetch_interval in minutes)
+            now: Current UTC datetime (timezone-aware)
+
+        Returns:
+            True if the asset was never fetched or its interval has elapsed
+        """
+        if assignment.last_fetch_at is None:
+            return True
+        last_fetch_at = assignment.last_fetch_at
+        if last_fetch_at.tzinfo is None:
+            # SQLite returns naive datetimes: stored values are UTC
+            last_fetch_at = last_fetch_at.replace(tzinfo=timezone.utc)
+        interval = assignment.fetch_interval or DEFAULT_FETCH_INTERVAL_MINUTES
+        return now >= last_fetch_at + timedelta(minutes=interval)
@@ -24,6 +24,7 @@ except ImportError:
 
 from backend.app.services.provider_registry import register_provider, AssetProviderRegistry
 from backend.app.services.asset_source import AssetSourceProvider, AssetSourceError
+from backend.app.services.rate_limiter import RateLimitPolicy
 from backend.app.schemas.assets import FACurrentValue, FAHistoricalData
 
 logger = get_logger(__name__)
@@ -172,6 +173,16 @@ class CSSScraperProvider(AssetSourceProvider):
                 {"url": url, "error": str(e)}
                 )
 
+    @property
+    def rate_limit_policy(self) -> RateLimitPolicy:
+        """Limit is applied per scraped host (identifier URL)."""
+        return RateLimitPolicy(rate=0.5, burst=2, max_concurrency=2)
+
+    @property
+    def refresh_budget(self) -> int:
+        """Scraped sites have unknown tolerance: keep background refresh gentle."""
+        return 5
+
     @property
     def supports_history(self) -> bool:
         """Whether this provider supports historical data."""
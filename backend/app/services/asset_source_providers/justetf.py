@@ -6,7 +6,7 @@ Uses the justetf-scraping library to fetch ETF data from justetf.com.
 from __future__ import annotations
 
 import asyncio
-from datetime import date, datetime
+from datetime import date, datetime, time
 from decimal import Decimal
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -24,6 +24,7 @@ from backend.app.schemas.assets import (
 )
 from backend.app.services.asset_source import AssetSourceError, AssetSourceProvider
 from backend.app.services.provider_registry import AssetProviderRegistry, register_provider
+from backend.app.services.rate_limiter import RateLimitPolicy
 
 try:
     import justetf_scraping
@@ -212,6 +213,16 @@ class JustETFProvider(AssetSourceProvider):
                 {"identifier": identifier, "error": str(e)},
             ) from e
 
+    @property
+    def rate_limit_policy(self) -> RateLimitPolicy:
+        """justetf.com / gettex are scraped: keep load low."""
+        return RateLimitPolicy(rate=0.5, burst=2, max_concurrency=2)
+
+    @property
+    def market_hours(self) -> tuple[time, time] | None:
+        """gettex/Xetra trading window (08:00-22:00 CET) expressed in UTC."""
+        return time(7, 0), time(21, 0)
+
     @property
     def supports_history(self) -> bool:
         return True
@@ -63,6 +63,11 @@ class MockProvider(AssetSourceProvider):
             source=self.provider_name
             )
 
+    @property
+    def rate_limit_policy(self) -> None:
+        """Mock data is generated locally: no rate limit."""
+        return None
+
     @property
     def supports_history(self) -> bool:
         """Whether this provider supports historical data."""
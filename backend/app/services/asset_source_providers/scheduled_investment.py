@@ -10,7 +10,9 @@ The provider calculates values at runtime based on:
 - Interest schedule from Asset.interest_schedule (JSON field)
 - Current principal (face_value) calculated from transactions
 
-Values are NOT stored in the database - they are calculated on-demand.
+Values are NOT stored in the database - they are calculated on-demand and kept
+in an in-memory value curve cache (see services/scheduled_value_cache.py), tagged
+with a version bumped by DB triggers on every write of the schedule or transactions.
 
 How it works:
 1. Receives asset_id as identifier
@@ -43,10 +45,11 @@ from datetime import date as date_type, timedelta
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import select, and_
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.app.db.models import Asset, Transaction, TransactionType, AssetProviderAssignment, IdentifierType
+from backend.app.config import get_settings
+from backend.app.db.models import Asset, Transaction, TransactionType, AssetProviderAssignment, IdentifierType, ScheduledValueVersion
 from backend.app.db.session import get_session_generator
 from backend.app.logging_config import get_logger
 from backend.app.schemas.assets import (
@@ -59,6 +62,7 @@ from backend.app.schemas.assets import (
     )
 from backend.app.services.asset_source import AssetSourceProvider, AssetSourceError
 from backend.app.services.provider_registry import register_provider, AssetProviderRegistry
+from backend.app.services.scheduled_value_cache import ValueCurve, scheduled_value_cache
 from backend.app.utils.financial_math import (
     calculate_day_count_fraction,
     calculate_simple_interest,
@@ -67,6 +71,9 @@ from backend.app.utils.financial_math import (
 
 logger = get_logger(__name__)
 
+# Max asset IDs per IN list when loading transactions of cache misses
+TRANSACTION_LOAD_CHUNK_SIZE = 500
+
 
 @register_provider(AssetProviderRegistry)
 class ScheduledInvestmentProvider(AssetSourceProvider):
@@ -119,59 +126,216 @@ class ScheduledInvestmentProvider(AssetSourceProvider):
         """Search not applicable for scheduled investments."""
         return False
 
-    async def _get_asset_from_db(self, asset_id: int, session: AsyncSession) -> Asset:
+    async def _load_versions_bulk(
+        self,
+        asset_ids: Optional[list[int]],
+        session: AsyncSession,
+        ) -> dict[int, tuple[str, str, int] | AssetSourceError]:
         """
-        Retrieve asset record from database.
+        Load currency, schedule JSON and curve version of many assets with one query.
+
+        Assets are outer-joined with their assignment to this provider and with
+        scheduled_value_versions (primary key lookup, no row = version 0).
+        Transactions are not read here: they are only loaded for cache misses.
 
         Args:
-            asset_id: Asset ID
+            asset_ids: Asset IDs (None = all assets assigned to this provider)
             session: Database session
 
         Returns:
-            Asset record
+            Dict asset_id -> (currency, provider_params JSON string, curve version)
+            or AssetSourceError (asset not found / provider_params missing).
+        """
+        stmt = (
+            select(Asset.id, Asset.currency, AssetProviderAssignment.provider_params, func.coalesce(ScheduledValueVersion.version, 0))
+            .outerjoin(AssetProviderAssignment, and_(
+                AssetProviderAssignment.asset_id == Asset.id,
+                AssetProviderAssignment.provider_code == self.provider_code
+                ))
+            .outerjoin(ScheduledValueVersion, ScheduledValueVersion.asset_id == Asset.id)
+            )
+        if asset_ids is None:
+            stmt = stmt.where(AssetProviderAssignment.asset_id.is_not(None))
+        else:
+            stmt = stmt.where(Asset.id.in_(asset_ids))
+        rows = {asset_id: (currency, params_json, version) for asset_id, currency, params_json, version in (await session.execute(stmt)).all()}
+
+        inputs: dict[int, tuple[str, str, int] | AssetSourceError] = {}
+        for asset_id in (asset_ids if asset_ids is not None else rows.keys()):
+            if asset_id not in rows:
+                inputs[asset_id] = AssetSourceError(
+                    f"Asset not found: {asset_id}",
+                    error_code="ASSET_NOT_FOUND",
+                    details={"asset_id": asset_id}
+                    )
+            elif not rows[asset_id][1]:
+                inputs[asset_id] = AssetSourceError(
+                    f"Asset {asset_id} has no provider_params configured",
+                    error_code="MISSING_PARAMS",
+                    details={"asset_id": asset_id}
+                    )
+            else:
+                inputs[asset_id] = rows[asset_id]
+        return inputs
 
-        Raises:
-            AssetSourceError: If asset not found
+    @staticmethod
+    async def _load_transactions_bulk(asset_ids: list[int], session: AsyncSession) -> dict[int, list]:
         """
-        result = await session.execute(select(Asset).where(Asset.id == asset_id))
-        asset = result.scalar_one_or_none()
+        Load transactions of many assets (one query per TRANSACTION_LOAD_CHUNK_SIZE assets).
 
-        if not asset:
-            raise AssetSourceError(
-                f"Asset not found: {asset_id}",
-                error_code="ASSET_NOT_FOUND",
-                details={"asset_id": asset_id}
+        Returns:
+            Dict asset_id -> transaction rows (asset_id, id, type, quantity, price, trade_date),
+            ordered by trade_date, id
+        """
+        transactions_by_asset: dict[int, list] = {asset_id: [] for asset_id in asset_ids}
+        for i in range(0, len(asset_ids), TRANSACTION_LOAD_CHUNK_SIZE):
+            txn_result = await session.execute(
+                select(Transaction.asset_id, Transaction.id, Transaction.type, Transaction.quantity, Transaction.price, Transaction.trade_date)
+                .where(Transaction.asset_id.in_(asset_ids[i:i + TRANSACTION_LOAD_CHUNK_SIZE]))
+                .order_by(Transaction.asset_id, Transaction.trade_date, Transaction.id)
                 )
+            for row in txn_result.all():
+                transactions_by_asset[row.asset_id].append(row)
+        return transactions_by_asset
 
-        return asset
+    @property
+    def supports_bulk_history(self) -> bool:
+        """Values are computed from DB data: many assets are loaded with set-based queries."""
+        return True
 
-    async def _get_transactions_from_db(
+    async def bulk_get_history_value(
         self,
-        asset_id: int,
+        asset_ids: Optional[list[int]],
+        start_date: date_type,
+        end_date: date_type,
         session: AsyncSession,
-        up_to_date: Optional[date_type] = None
-        ) -> list[Transaction]:
+        ) -> dict[int, FAHistoricalData | AssetSourceError]:
         """
-        Retrieve all transactions for an asset from database.
+        Daily values of many scheduled-yield assets (portfolio-wide valuation).
+
+        Curve versions are read with one query (_load_versions_bulk) and values
+        are served from the value curve cache. Transactions are loaded for the
+        cache misses only (one more query up to TRANSACTION_LOAD_CHUNK_SIZE
+        misses), whose curves are computed with the sweep engine.
 
         Args:
-            asset_id: Asset ID
+            asset_ids: Asset IDs (None = all assets assigned to this provider)
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
             session: Database session
-            up_to_date: Optional date filter (inclusive)
 
         Returns:
-            List of Transaction records
+            Dict asset_id -> FAHistoricalData, or AssetSourceError for assets that failed
         """
-        query = select(Transaction).where(Transaction.asset_id == asset_id)
+        results: dict[int, FAHistoricalData | AssetSourceError] = {}
+        values_by_asset: dict[int, list[tuple[date_type, Decimal]]] = {}
+        inputs = await self._load_versions_bulk(asset_ids, session)
+
+        misses: list[int] = []
+        for asset_id, asset_inputs in inputs.items():
+            if isinstance(asset_inputs, AssetSourceError):
+                results[asset_id] = asset_inputs
+                continue
+            curve = scheduled_value_cache.get(asset_id, asset_inputs[2], start_date, end_date)
+            if curve is None:
+                misses.append(asset_id)
+            else:
+                values_by_asset[asset_id] = curve.slice(start_date, end_date)
+
+        # Versions are read before transactions: a write in between leaves the
+        # curve tagged with an older version, recomputed on the next query
+        transactions_by_asset = await self._load_transactions_bulk(misses, session) if misses else {}
+        for asset_id in misses:
+            _, params_json, version = inputs[asset_id]
+            try:
+                values_by_asset[asset_id] = self._compute_cached_values(
+                    asset_id, params_json, version, transactions_by_asset[asset_id], start_date, end_date
+                    )
+            except AssetSourceError as e:
+                results[asset_id] = e
+            except Exception as e:
+                results[asset_id] = AssetSourceError(
+                    f"Failed to calculate history: {e}",
+                    error_code="CALCULATION_ERROR",
+                    details={"asset_id": asset_id, "error": str(e)}
+                    )
 
-        if up_to_date:
-            # Use settlement_date if available, otherwise trade_date
-            query = query.where(and_(Transaction.trade_date <= up_to_date))
+        for asset_id, values in values_by_asset.items():
+            currency = inputs[asset_id][0]
+            results[asset_id] = FAHistoricalData(
+                prices=[FAPricePoint(date=value_date, close=value, currency=currency) for value_date, value in values],
+                currency=currency,
+                source=self.provider_name
+                )
+        return {asset_id: results[asset_id] for asset_id in inputs}
 
-        query = query.order_by(Transaction.trade_date, Transaction.id)
+    async def bulk_get_current_value(
+        self,
+        asset_ids: Optional[list[int]],
+        session: AsyncSession,
+        ) -> dict[int, FACurrentValue | AssetSourceError]:
+        """
+        Today's value of many scheduled-yield assets (see bulk_get_history_value).
+
+        Returns:
+            Dict asset_id -> FACurrentValue, or AssetSourceError for assets that failed
+        """
+        today = date_type.today()
+        results: dict[int, FACurrentValue | AssetSourceError] = {}
+        for asset_id, history in (await self.bulk_get_history_value(asset_ids, today, today, session)).items():
+            if isinstance(history, AssetSourceError):
+                results[asset_id] = history
+            else:
+                results[asset_id] = FACurrentValue(
+                    value=history.prices[0].close,
+                    currency=history.currency,
+                    as_of_date=today,
+                    source=self.provider_name
+                    )
+        return results
 
-        result = await session.execute(query)
-        return list(result.scalars().all())
+    def _compute_cached_values(
+        self,
+        asset_id: int,
+        params_json: str,
+        version: int,
+        transactions: list,
+        start_date: date_type,
+        end_date: date_type,
+        ) -> list[tuple[date_type, Decimal]]:
+        """
+        Daily values for [start_date, end_date] on a cache miss, stored in the value curve cache.
+
+        The curve is computed with the sweep engine over the union of the requested
+        range and the cached range (same version), so later queries for either range
+        are slices. Curves are capped at SCHEDULED_VALUE_CURVE_MAX_DAYS: a union over
+        the cap restarts from the requested range, a longer requested range is
+        computed but not cached.
+
+        Args:
+            asset_id: Asset ID (cache key)
+            params_json: provider_params JSON string
+            version: Curve version from _load_versions_bulk
+            transactions: Transaction rows from _load_transactions_bulk
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+        """
+        max_days = get_settings().SCHEDULED_VALUE_CURVE_MAX_DAYS
+        start_date_full, end_date_full = start_date, end_date
+        previous = scheduled_value_cache.peek(asset_id, version)
+        if previous is not None:
+            schedule = previous.schedule
+            union_start, union_end = min(start_date, previous.start_date), max(end_date, previous.end_date)
+            if (union_end - union_start).days < max_days:
+                start_date_full, end_date_full = union_start, union_end
+        else:
+            schedule = self.validate_params(json.loads(params_json))
+
+        values = self._calculate_values_for_range(schedule, transactions, start_date_full, end_date_full)
+        curve = ValueCurve(version, schedule, start_date_full, [value for _, value in values])
+        if (end_date_full - start_date_full).days < max_days:
+            scheduled_value_cache.put(asset_id, curve)
+        return curve.slice(start_date, end_date)
 
     # Type is list[dict] when _transaction_override is used by tests
     def _calculate_face_value_from_transactions(self, transactions: list[Transaction] | list[dict]) -> Decimal:
@@ -193,30 +357,52 @@ class ScheduledInvestmentProvider(AssetSourceProvider):
         face_value = Decimal("0")
 
         for txn in transactions:
-            # Handle both Transaction objects and dicts
-            if isinstance(txn, dict):
-                txn_type = txn.get("type")
-                quantity = Decimal(str(txn.get("quantity", 0)))
-                price = Decimal(str(txn.get("price", 0)))
-            else:
-                txn_type = txn.type
-                quantity = txn.quantity
-                price = txn.price if txn.price else Decimal("0")
-
-            if txn_type == TransactionType.BUY or txn_type == "BUY":
-                # Buy increases principal
-                face_value += quantity * price
-            elif txn_type == TransactionType.SELL or txn_type == "SELL":
-                # Sell decreases principal
-                face_value -= quantity * price
-            elif txn_type == TransactionType.INTEREST or txn_type == "INTEREST":
-                # Interest transactions with negative price represent principal repayment
-                # Positive price is just interest income (doesn't affect principal)
-                if price < 0:
-                    face_value += price  # Negative price reduces principal
+            face_value += self._principal_delta(txn)
 
         return face_value
 
+    @staticmethod
+    def _principal_delta(txn: Transaction | dict) -> Decimal:
+        """
+        Principal change caused by a single transaction (see _calculate_face_value_from_transactions).
+
+        Args:
+            txn: Transaction record or dict (from override)
+
+        Returns:
+            Signed principal delta (0 for transactions not affecting principal)
+        """
+        # Handle both Transaction objects and dicts
+        if isinstance(txn, dict):
+            txn_type = txn.get("type")
+            quantity = Decimal(str(txn.get("quantity", 0)))
+            price = Decimal(str(txn.get("price", 0)))
+        else:
+            txn_type = txn.type
+            quantity = txn.quantity
+            price = txn.price if txn.price else Decimal("0")
+
+        if txn_type == TransactionType.BUY or txn_type == "BUY":
+            # Buy increases principal
+            return quantity * price
+        if txn_type == TransactionType.SELL or txn_type == "SELL":
+            # Sell decreases principal
+            return -(quantity * price)
+        if txn_type == TransactionType.INTEREST or txn_type == "INTEREST":
+            # Interest transactions with negative price represent principal repayment
+            # Positive price is just interest income (doesn't affect principal)
+            if price < 0:
+                return price  # Negative price reduces principal
+        return Decimal("0")
+
+    @staticmethod
+    def _transaction_date(txn: Transaction | dict) -> date_type:
+        """Trade date of a Transaction record or override dict (ISO string or date)."""
+        if isinstance(txn, dict):
+            trade_date = txn.get("trade_date")
+            return date_type.fromisoformat(trade_date) if isinstance(trade_date, str) else trade_date
+        return txn.trade_date
+
     async def get_current_value(
         self,
         identifier: str,
@@ -267,31 +453,15 @@ class ScheduledInvestmentProvider(AssetSourceProvider):
                 schedule = self.validate_params(params_copy)
                 currency = "EUR"  # Default for tests
             else:
-                # Production mode: fetch from DB
+                # Production mode: value curve cache (inputs loaded from DB)
                 async for session in get_session_generator():
-                    # Get asset record
-                    asset = await self._get_asset_from_db(asset_id, session)
-
-                    # Get transactions
-                    transactions = await self._get_transactions_from_db(asset_id, session)
-
-                    # Get provider assignment to read schedule from provider_params
-                    assignment_result = await session.execute(select(AssetProviderAssignment).where(AssetProviderAssignment.asset_id == asset_id))
-                    assignment = assignment_result.scalar_one_or_none()
-
-                    if not assignment or not assignment.provider_params:
-                        raise AssetSourceError(
-                            f"Asset {asset_id} has no provider_params configured",
-                            error_code="MISSING_PARAMS",
-                            details={"asset_id": asset_id}
-                            )
-
-                    # Parse schedule from provider_params
-                    params_data = json.loads(assignment.provider_params)
-                    schedule = self.validate_params(params_data)
-                    currency = asset.currency
+                    result = (await self.bulk_get_current_value([asset_id], session))[asset_id]
                     break  # Exit after first iteration
 
+                if isinstance(result, AssetSourceError):
+                    raise result
+                return result
+
             if schedule is None:
                 raise AssetSourceError(
                     "Failed to load schedule",
@@ -337,6 +507,16 @@ class ScheduledInvestmentProvider(AssetSourceProvider):
                 details={"error": str(e)}
                 )
 
+    @property
+    def rate_limit_policy(self) -> None:
+        """Values are computed locally: no outbound calls to limit."""
+        return None
+
+    @property
+    def refresh_budget(self) -> int:
+        """Values are computed locally (no remote source): no need to throttle."""
+        return 500
+
     @property
     def supports_history(self) -> bool:
         """This provider supports historical data (calculated)."""
@@ -391,30 +571,15 @@ class ScheduledInvestmentProvider(AssetSourceProvider):
                 schedule = self.validate_params(params_copy)
                 currency = "EUR"
             else:
-                # Production mode: fetch from DB
+                # Production mode: slice of the cached value curve (inputs loaded from DB)
                 async for session in get_session_generator():
-                    asset = await self._get_asset_from_db(asset_id, session)
-                    all_transactions = await self._get_transactions_from_db(
-                        asset_id, session, up_to_date=end_date
-                        )
-
-                    # Get provider assignment to read schedule from provider_params
-                    assignment_result = await session.execute(select(AssetProviderAssignment).where(AssetProviderAssignment.asset_id == asset_id))
-                    assignment = assignment_result.scalar_one_or_none()
-
-                    if not assignment or not assignment.provider_params:
-                        raise AssetSourceError(
-                            f"Asset {asset_id} has no provider_params configured",
-                            error_code="MISSING_PARAMS",
-                            details={"asset_id": asset_id}
-                            )
-
-                    # Parse schedule from provider_params
-                    params_data = json.loads(assignment.provider_params)
-                    schedule = self.validate_params(params_data)
-                    currency = asset.currency
+                    result = (await self.bulk_get_history_value([asset_id], start_date, end_date, session))[asset_id]
                     break
 
+                if isinstance(result, AssetSourceError):
+                    raise result
+                return result
+
             if schedule is None:
                 raise AssetSourceError(
                     "Failed to load schedule",
@@ -422,33 +587,11 @@ class ScheduledInvestmentProvider(AssetSourceProvider):
                     details={"asset_id": asset_id}
                     )
 
-            # Calculate for each day in range
-            prices = []
-            current_date = start_date
-
-            while current_date <= end_date:
-                # Filter transactions up to current_date
-                transactions_up_to_date = [
-                    txn for txn in all_transactions
-                    if (isinstance(txn, dict) and txn.get("trade_date") <= current_date.isoformat())
-                       or (not isinstance(txn, dict) and txn.trade_date <= current_date)
-                    ]
-
-                # Calculate face_value for this date
-                face_value = self._calculate_face_value_from_transactions(transactions_up_to_date)
-
-                # Calculate value
-                if face_value <= 0:
-                    value = Decimal("0")
-                else:
-                    value = self._calculate_value_for_date(schedule, face_value, current_date)
-
-                prices.append(FAPricePoint(
-                    date=current_date,
-                    close=value,
-                    currency=currency
-                    ))
-                current_date += timedelta(days=1)
+            # Single sweep over days and transactions (see _calculate_values_for_range)
+            prices = [
+                FAPricePoint(date=value_date, close=value, currency=currency)
+                for value_date, value in self._calculate_values_for_range(schedule, all_transactions, start_date, end_date)
+                ]
 
             return FAHistoricalData(
                 prices=prices,
@@ -574,34 +717,186 @@ class ScheduledInvestmentProvider(AssetSourceProvider):
                             )
                         )
 
-        total_interest = Decimal("0")
-        for period in periods_to_process:
-            # day count fraction inclusive of start/end
-            time_fraction = calculate_day_count_fraction(
-                start_date=period.start_date,
-                end_date=period.end_date,
-                convention=period.day_count,
+        total_interest = self._segments_interest(face_value, [
+            (p.start_date, p.end_date, p.annual_rate, p.compounding, p.compound_frequency, p.day_count)
+            for p in periods_to_process
+            ])
+        return face_value + total_interest
+
+    @staticmethod
+    def _period_interest(
+        face_value: Decimal,
+        start_date: date_type,
+        end_date: date_type,
+        annual_rate: Decimal,
+        compounding: CompoundingType,
+        compound_frequency,
+        day_count,
+        ) -> Optional[Decimal]:
+        """
+        Interest of one (possibly truncated) period on face_value.
+
+        Returns:
+            Interest amount, None if the period has no positive day count fraction
+        """
+        # day count fraction inclusive of start/end
+        time_fraction = calculate_day_count_fraction(
+            start_date=start_date,
+            end_date=end_date,
+            convention=day_count,
+            )
+        if time_fraction <= 0:
+            return None  # defensive, shouldn't happen
+        if compounding == CompoundingType.SIMPLE:
+            return calculate_simple_interest(
+                principal=face_value,
+                annual_rate=annual_rate,
+                time_fraction=time_fraction,
                 )
-            if time_fraction <= 0:
-                continue  # defensive, shouldn't happen
-            if period.compounding == CompoundingType.SIMPLE:
-                segment_interest = calculate_simple_interest(
-                    principal=face_value,
-                    annual_rate=period.annual_rate,
-                    time_fraction=time_fraction,
-                    )
-            else:
-                if period.compound_frequency is None:
-                    raise ValueError("compound_frequency required for COMPOUND interest")
-                segment_interest = calculate_compound_interest(
-                    principal=face_value,
-                    annual_rate=period.annual_rate,
-                    time_fraction=time_fraction,
-                    frequency=period.compound_frequency,
-                    )
-            total_interest += segment_interest
+        if compound_frequency is None:
+            raise ValueError("compound_frequency required for COMPOUND interest")
+        return calculate_compound_interest(
+            principal=face_value,
+            annual_rate=annual_rate,
+            time_fraction=time_fraction,
+            frequency=compound_frequency,
+            )
 
-        return face_value + total_interest
+    @classmethod
+    def _segments_interest(cls, face_value: Decimal, segments: list[tuple]) -> Decimal:
+        """
+        Total interest of face_value over many segments.
+
+        Sum of _period_interest per segment, in segment order (segments without a
+        positive day count fraction are skipped).
+
+        Args:
+            face_value: Principal of every segment
+            segments: (start, end, annual_rate, compounding, compound_frequency, day_count) tuples
+
+        Returns:
+            Sum of the segment interests (Decimal("0") if none accrues)
+        """
+        total = Decimal("0")
+        for segment in segments:
+            interest = cls._period_interest(face_value, *segment)
+            if interest is not None:
+                total += interest
+        return total
+
+    @staticmethod
+    def _build_segments(schedule: FAScheduledInvestmentSchedule) -> list[tuple]:
+        """
+        Flatten schedule into interest segments ordered by start date.
+
+        Same periods _calculate_value_for_date builds for a target date after
+        maturity: scheduled periods, then grace (last scheduled rate) and late
+        (late_interest config) segments. The late segment is open-ended (end None).
+
+        Returns:
+            List of (start, end, annual_rate, compounding, compound_frequency, day_count)
+        """
+        segments = [
+            (p.start_date, p.end_date, p.annual_rate, p.compounding, p.compound_frequency, p.day_count)
+            for p in schedule.schedule
+            ]
+        if not schedule.schedule or not schedule.late_interest:
+            return segments
+
+        li = schedule.late_interest
+        maturity_date = schedule.schedule[-1].end_date
+        grace_end = maturity_date + timedelta(days=li.grace_period_days)
+        last_rate_period = schedule.schedule[-1]
+        if li.grace_period_days > 0:
+            segments.append((
+                maturity_date + timedelta(days=1),
+                grace_end,
+                last_rate_period.annual_rate,
+                last_rate_period.compounding,
+                last_rate_period.compound_frequency,
+                last_rate_period.day_count,
+                ))
+        segments.append((grace_end + timedelta(days=1), None, li.annual_rate, li.compounding, li.compound_frequency, li.day_count))
+        return segments
+
+    def _calculate_values_for_range(
+        self,
+        schedule: FAScheduledInvestmentSchedule,
+        transactions: list[Transaction] | list[dict],
+        start_date: date_type,
+        end_date: date_type,
+        ) -> list[tuple[date_type, Decimal]]:
+        """Daily values for [start_date, end_date] in a single sweep.
+
+        Produces exactly the values of calling _calculate_face_value_from_transactions
+        + _calculate_value_for_date for every day, without the per-day rescans:
+          * Transactions are sorted once and applied as days pass (face value
+            tracked incrementally).
+          * Segments (scheduled, grace, late) open when the day reaches their start.
+          * Segments that ended before the current day have a fixed fraction:
+            their interest is summed once and carried forward, recomputed only
+            when the face value changes.
+          * Only open segments (normally one) are evaluated per day.
+
+        Periods are contiguous and sorted (schema validation), so closed segments
+        always form a prefix and the summation order matches the per-day method.
+
+        Complexity: O(days + transactions + periods * face_value_changes).
+        """
+        deltas = sorted(
+            ((self._transaction_date(txn), self._principal_delta(txn)) for txn in transactions),
+            key=lambda item: item[0],
+            )
+        segments = self._build_segments(schedule)
+        first_start = schedule.schedule[0].start_date if schedule.schedule else None
+
+        values: list[tuple[date_type, Decimal]] = []
+        face_value = Decimal("0")
+        txn_idx = 0
+        opened = 0  # segments[:opened] started on or before current_date
+        closed = 0  # segments[:closed] ended before current_date
+        closed_interest = Decimal("0")
+        closed_face_value: Optional[Decimal] = None  # face value closed_interest was computed with
+
+        current_date = start_date
+        while current_date <= end_date:
+            while txn_idx < len(deltas) and deltas[txn_idx][0] <= current_date:
+                face_value += deltas[txn_idx][1]
+                txn_idx += 1
+            while opened < len(segments) and segments[opened][0] <= current_date:
+                opened += 1
+            while closed < opened and segments[closed][1] is not None and segments[closed][1] < current_date:
+                if closed_face_value == face_value:
+                    # Carried sum still valid: append the newly closed segment
+                    interest = self._period_interest(face_value, *segments[closed])
+                    if interest is not None:
+                        closed_interest += interest
+                else:
+                    # Not accumulated (face value changed or <= 0): recompute on the next valued day
+                    closed_face_value = None
+                closed += 1
+
+            if face_value <= 0:
+                value = Decimal("0")
+            elif first_start is None or current_date < first_start:
+                value = face_value
+            else:
+                if closed_face_value != face_value:
+                    closed_interest = self._segments_interest(face_value, segments[:closed])
+                    closed_face_value = face_value
+
+                total_interest = closed_interest
+                for seg_start, seg_end, rate, compounding, frequency, day_count in segments[closed:opened]:
+                    eff_end = current_date if seg_end is None or seg_end > current_date else seg_end
+                    interest = self._period_interest(face_value, seg_start, eff_end, rate, compounding, frequency, day_count)
+                    if interest is not None:
+                        total_interest += interest
+                value = face_value + total_interest
+
+            values.append((current_date, value))
+            current_date += timedelta(days=1)
+
+        return values
 
     def validate_params(self, provider_params: dict) -> FAScheduledInvestmentSchedule:
         """
@@ -27,6 +27,7 @@ except ImportError:
 
 from backend.app.services.provider_registry import register_provider, AssetProviderRegistry
 from backend.app.services.asset_source import AssetSourceProvider, AssetSourceError
+from backend.app.services.rate_limiter import RateLimitPolicy
 from backend.app.schemas.assets import FACurrentValue, FAPricePoint, FAHistoricalData, FAAssetPatchItem, FAClassificationParams, FASectorArea
 
 logger = get_logger(__name__)
@@ -54,6 +55,11 @@ class YahooFinanceProvider(AssetSourceProvider):
         """ Return provider icon URL (hardcoded) """
         return "https://s.yimg.com/cv/apiv2/myc/finance/Finance_icon_0919_250x252.png" # Yahoo Finance logo
 
+    @property
+    def rate_limit_policy(self) -> RateLimitPolicy:
+        """Yahoo throttles bursts quickly (YFRateLimitError): stay conservative."""
+        return RateLimitPolicy(rate=1.0, burst=3, max_concurrency=3)
+
     @property
     def test_cases(self) -> list[dict]:
         """Test cases with identifier and provider_params."""
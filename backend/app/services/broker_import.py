@@ -0,0 +1,631 @@
+"""
+Broker statement import.
+
+Streams CSV / JSON broker exports into transactions and cash movements:
+- sources are read lazily (csv.DictReader, incremental JSON decoding), so
+  memory is bounded by the chunk size, not the file size
+- assets and cash accounts are resolved through lookup maps loaded once
+  (provider identifiers and display names, cash account per currency;
+  missing cash accounts of the broker are created on first use)
+- each chunk is written with two executemany inserts: cash movements first
+  (ids assigned up front while the chunk holds the write lock), then the
+  transactions pointing to them, so ck_transaction_cash_movement_required
+  holds for every linked pair
+- rows already imported (from this or any overlapping export) are skipped:
+  every row carries import_hash, a hash of its normalized fields, and both
+  inserts are INSERT ... ON CONFLICT DO NOTHING on the unique import_hash
+  indexes; the pre-assigned id ranges tell which rows were skipped
+- quantity-affecting rows go through the oversell guard
+  (PositionManager.validate_batch) before their chunk is written
+- every chunk commits together with its checkpoint (broker_import_checkpoints):
+  an interrupted import resumes after the last committed chunk
+
+Derived tables (positions, lots, cash ledger, snapshots) are kept current by
+the existing triggers on transactions and cash_movements.
+
+Source rows (CSV header / JSON keys, case-insensitive):
+    trade_date        ISO date (required)
+    settlement_date   ISO date (optional)
+    type              TransactionType for asset rows, CashMovementType for cash rows
+    asset             provider identifier (ticker, ISIN, ...) or display name; or
+    asset_id          asset id (rows with neither are cash movements)
+    quantity          > 0 for quantity-affecting types, empty / 0 for cash-only types
+    price             unit price (BUY, SELL), total amount (DIVIDEND, INTEREST, FEE, TAX)
+    currency          ISO 4217 (required)
+    amount            cash amount (cash rows; default for transactions: quantity × price
+                      for BUY / SELL, price for the cash-only types)
+    note              free text (optional)
+
+Identical rows of the same trade date (e.g. two equal fills) are told apart by
+their occurrence number, so exports are expected grouped by trade date (as
+brokers sort them, either direction).
+
+Command line (also via ./dev.sh db:import):
+    python -m backend.app.services.broker_import <broker_id> <file> [--key KEY]
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import re
+import sys
+from datetime import date as date_type
+from decimal import Decimal, InvalidOperation, ROUND_DOWN
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping, Optional, TextIO
+
+import structlog
+from sqlalchemy import delete, select, update, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import (
+    Asset,
+    AssetProviderAssignment,
+    Broker,
+    BrokerImportCheckpoint,
+    CashAccount,
+    CashMovement,
+    CashMovementType,
+    Transaction,
+    TransactionType,
+    TRANSACTION_QUANTITY_SIGN,
+    TRANSACTION_TYPES_REQUIRING_CASH_MOVEMENT,
+    )
+from backend.app.schemas.imports import BrokerImportFormat, FABrokerImportResult, FAImportRowError
+from backend.app.services.positions import PositionManager
+from backend.app.utils.datetime_utils import utcnow
+from backend.app.utils.decimal_utils import get_model_column_precision
+
+logger = structlog.get_logger(__name__)
+
+# Source rows per chunk (one validation, two executemany inserts and one commit)
+IMPORT_CHUNK_SIZE = 5000
+# Characters read per step when decoding a JSON array
+JSON_READ_SIZE = 1 << 16
+# Rejected / duplicate rows reported in the result (all of them are counted)
+MAX_REPORTED_ERRORS = 100
+
+ZERO = Decimal("0")
+
+# Truncation quantum of quantity/price/amount columns (same as truncate_to_db_precision)
+_QUANTUM = Decimal(10) ** -get_model_column_precision(Transaction, "quantity")[1]
+
+# Movements created only together with their transaction (FEE and TAX can also stand alone)
+_LINKED_ONLY_MOVEMENTS = {
+    movement_type for movement_type in TRANSACTION_TYPES_REQUIRING_CASH_MOVEMENT.values()
+    if movement_type not in (CashMovementType.FEE, CashMovementType.TAX)
+    }
+
+# Separators between the elements of a JSON array
+_JSON_SEPARATORS = re.compile(r"[\s,]*")
+
+
+class _RowError(ValueError):
+    """A source row that cannot be imported (message reported to the caller)."""
+
+
+# ============================================================================
+# SOURCE READERS (lazy)
+# ============================================================================
+
+
+def iter_csv_rows(file: TextIO) -> Iterator[dict[str, str]]:
+    """Rows of a CSV export with a header line (header names stripped and lowercased)."""
+    reader = csv.DictReader(file)
+    if reader.fieldnames is not None:
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    yield from reader
+
+
+def iter_json_rows(file: TextIO) -> Iterator[Any]:
+    """
+    Elements of a JSON export: a top-level array decoded incrementally, or
+    JSON Lines (one value per line).
+    """
+    decoder = json.JSONDecoder()
+    buffer = file.read(JSON_READ_SIZE).lstrip()
+    if not buffer.startswith("["):
+        for line in (buffer + file.readline()).splitlines() if buffer else []:
+            if line.strip():
+                yield json.loads(line)
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+        return
+
+    position = 1
+    while True:
+        position = _JSON_SEPARATORS.match(buffer, position).end()
+        if position == len(buffer) or buffer[position] != "]":
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Element split by the read boundary: read more (a real syntax error survives EOF)
+                more = file.read(JSON_READ_SIZE)
+                if not more:
+                    raise
+                buffer, position = buffer[position:] + more, 0
+                continue
+            yield element
+            position = end
+            if position > JSON_READ_SIZE:
+                buffer, position = buffer[position:], 0
+        else:
+            return
+
+
+def _lowercase_keys(rows: Iterable[Any]) -> Iterator[Any]:
+    for row in rows:
+        yield {str(key).strip().lower(): value for key, value in row.items()} if isinstance(row, dict) else row
+
+
+def file_import_key(broker_id: int, path: Path) -> str:
+    """Default import key of a file: broker id and SHA-256 of the content (a re-run of the same file resumes)."""
+    with open(path, "rb") as file:
+        digest = hashlib.file_digest(file, "sha256").hexdigest()
+    return f"{broker_id}:{digest}"
+
+
+# ============================================================================
+# ROW PARSING
+# ============================================================================
+
+
+def _text(row: Mapping[str, Any], name: str) -> Optional[str]:
+    value = row.get(name)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _decimal(row: Mapping[str, Any], name: str) -> Optional[Decimal]:
+    value = _text(row, name)
+    if value is None:
+        return None
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        raise _RowError(f"{name}: invalid number {value!r}")
+    if not number.is_finite():
+        raise _RowError(f"{name}: invalid number {value!r}")
+    return number.quantize(_QUANTUM, ROUND_DOWN)
+
+
+def _date(row: Mapping[str, Any], name: str) -> Optional[date_type]:
+    value = _text(row, name)
+    if value is None:
+        return None
+    try:
+        return date_type.fromisoformat(value)
+    except ValueError:
+        raise _RowError(f"{name}: invalid ISO date {value!r}")
+
+
+def _parse_row(
+    row: Any, broker_id: int, asset_ids: Mapping[str, Optional[int]],
+    ) -> tuple[Optional[dict[str, Any]], Optional[dict[str, Any]]]:
+    """
+    Validate a source row against the table rules (quantity by type, positive amounts).
+
+    Returns:
+        (transaction, movement): transaction row for the transactions insert without its
+        cash_movement_id, movement row with its currency (cash account resolved by
+        the caller); either can be None
+    """
+    if not isinstance(row, Mapping):
+        raise _RowError("row is not an object")
+    trade_date = _date(row, "trade_date")
+    if trade_date is None:
+        raise _RowError("trade_date is required")
+    currency = _text(row, "currency")
+    if currency is None or len(currency) != 3 or not currency.isalpha():
+        raise _RowError(f"currency: invalid ISO 4217 code {currency!r}")
+    currency = currency.upper()
+    type_name = (_text(row, "type") or "").upper()
+    settlement_date = _date(row, "settlement_date")
+    note = _text(row, "note")
+    amount = _decimal(row, "amount")
+    if amount is not None and amount <= 0:
+        raise _RowError("amount must be positive (direction is implied by type)")
+
+    asset_key = _text(row, "asset")
+    asset_id = _text(row, "asset_id")
+    if asset_key is None and asset_id is None:
+        try:
+            movement_type = CashMovementType(type_name)
+        except ValueError:
+            raise _RowError(f"type: {type_name!r} is not a cash movement type (rows without asset)")
+        if movement_type in _LINKED_ONLY_MOVEMENTS:
+            raise _RowError(f"type: {movement_type.value} is created with its transaction (row with an asset)")
+        if amount is None:
+            raise _RowError("amount is required for cash movements")
+        return None, {
+            "currency": currency, "type": movement_type, "amount": amount,
+            "trade_date": trade_date, "settlement_date": settlement_date, "note": note,
+            }
+
+    try:
+        transaction_type = TransactionType(type_name)
+    except ValueError:
+        raise _RowError(f"type: {type_name!r} is not a transaction type")
+    if asset_id is not None:
+        if not asset_id.isdigit():
+            raise _RowError(f"asset_id: invalid id {asset_id!r}")
+        resolved = int(asset_id)
+    else:
+        resolved = asset_ids.get(asset_key.casefold(), 0)
+        if resolved is None:
+            raise _RowError(f"asset: {asset_key!r} matches more than one asset")
+        if resolved == 0:
+            raise _RowError(f"asset: {asset_key!r} not found")
+
+    quantity = _decimal(row, "quantity") or ZERO
+    price = _decimal(row, "price")
+    if transaction_type in TRANSACTION_QUANTITY_SIGN:
+        if quantity <= 0:
+            raise _RowError(f"quantity must be positive for {transaction_type.value}")
+    elif quantity != 0:
+        raise _RowError(f"quantity must be 0 for {transaction_type.value}")
+
+    movement = None
+    movement_type = TRANSACTION_TYPES_REQUIRING_CASH_MOVEMENT.get(transaction_type)
+    if movement_type is not None:
+        if amount is None:
+            if price is None:
+                raise _RowError(f"price or amount is required for {transaction_type.value}")
+            amount = (quantity * price if quantity else price).quantize(_QUANTUM, ROUND_DOWN)
+        if amount <= 0:
+            raise _RowError(f"cash amount of {transaction_type.value} must be positive")
+        movement = {
+            "currency": currency, "type": movement_type, "amount": amount,
+            "trade_date": trade_date, "settlement_date": settlement_date, "note": None,
+            }
+    return {
+        "asset_id": resolved, "broker_id": broker_id, "type": transaction_type, "quantity": quantity,
+        "price": price, "currency": currency, "trade_date": trade_date, "settlement_date": settlement_date,
+        "note": note,
+        }, movement
+
+
+class _ContentHasher:
+    """
+    import_hash of parsed rows: broker, trade date and the normalized fields of the
+    row (resolved asset, type, truncated decimals, currency, cash amount), plus its
+    occurrence among identical rows of the trade date.
+    """
+
+    def __init__(self, broker_id: int):
+        self.broker_id = broker_id
+        self.trade_date: Optional[date_type] = None
+        self.occurrences: dict[str, int] = {}
+
+    def __call__(self, transaction: Optional[dict[str, Any]], movement: Optional[dict[str, Any]]) -> str:
+        if transaction is not None:
+            fields = (
+                transaction["asset_id"], transaction["type"].value, transaction["quantity"], transaction["price"],
+                transaction["currency"], movement["amount"] if movement is not None else None,
+                )
+            trade_date = transaction["trade_date"]
+        else:
+            fields = (None, movement["type"].value, None, None, movement["currency"], movement["amount"])
+            trade_date = movement["trade_date"]
+        if trade_date != self.trade_date:
+            self.trade_date = trade_date
+            self.occurrences.clear()
+        key = "|".join("" if value is None else str(value) for value in (self.broker_id, trade_date, *fields))
+        occurrence = self.occurrences.get(key, 0)
+        self.occurrences[key] = occurrence + 1
+        return hashlib.blake2b(f"{key}|{occurrence}".encode(), digest_size=16).hexdigest()
+
+
+# ============================================================================
+# IMPORT
+# ============================================================================
+
+
+async def _asset_lookup(session: AsyncSession) -> dict[str, Optional[int]]:
+    """Casefolded provider identifier / display name -> asset id (None = ambiguous key)."""
+    lookup: dict[str, Optional[int]] = {}
+    identifiers = (await session.execute(select(AssetProviderAssignment.identifier, AssetProviderAssignment.asset_id))).all()
+    names = (await session.execute(select(Asset.display_name, Asset.id))).all()
+    for key, asset_id in [*identifiers, *names]:
+        key = key.casefold()
+        lookup[key] = asset_id if lookup.get(key, asset_id) == asset_id else None
+    return lookup
+
+
+async def _cash_account_ids(session: AsyncSession, broker: Broker, currencies: set[str], accounts: dict[str, int]) -> None:
+    """Fill accounts (currency -> cash account id) for currencies, creating the missing accounts of the broker."""
+    missing = sorted(currencies - accounts.keys())
+    if not missing:
+        return
+    now = utcnow()
+    await session.execute(sqlite_insert(CashAccount).on_conflict_do_nothing(), [
+        {"broker_id": broker.id, "currency": currency, "display_name": f"{broker.name} {currency} Account",
+         "created_at": now, "updated_at": now}
+        for currency in missing
+        ])
+    rows = await session.execute(
+        select(CashAccount.currency, CashAccount.id).where(CashAccount.broker_id == broker.id, CashAccount.currency.in_(missing))
+        )
+    accounts.update(rows.all())
+    logger.info("Cash accounts created for import", broker_id=broker.id, currencies=missing)
+
+
+class BrokerImportManager:
+    """Streaming import of broker statements into transactions and cash movements, with resumable checkpoints."""
+
+    @staticmethod
+    async def import_rows(
+        session: AsyncSession,
+        broker_id: int,
+        rows: Iterable[Any],
+        import_key: str,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        validate_oversell: bool = True,
+        ) -> FABrokerImportResult:
+        """
+        Import source rows (mappings, see module docstring) in committed chunks.
+
+        Rows already processed under import_key are skipped (resume). Invalid rows are
+        rejected and reported, rows already imported (same import_hash) are skipped and
+        reported, the others are written. An oversell stops the import before the
+        offending chunk: nothing of it is written, the checkpoint stays at the previous
+        chunk.
+
+        Args:
+            session: Database session (committed per chunk)
+            broker_id: Broker of the statement
+            rows: Source rows, consumed lazily
+            import_key: Checkpoint key of the source (same key = resume)
+            chunk_size: Rows per committed chunk
+            validate_oversell: Check quantity-affecting rows against stored positions
+
+        Returns:
+            FABrokerImportResult of this run
+
+        Raises:
+            ValueError: Unknown broker, or a checkpoint of import_key with another broker
+        """
+        broker = await session.get(Broker, broker_id)
+        if broker is None:
+            raise ValueError(f"Broker {broker_id} not found")
+        checkpoint = await session.get(BrokerImportCheckpoint, import_key)
+        if checkpoint is None:
+            checkpoint = BrokerImportCheckpoint(import_key=import_key, broker_id=broker_id)
+            session.add(checkpoint)
+            await session.flush()
+        elif checkpoint.broker_id != broker_id:
+            raise ValueError(f"Import {import_key} belongs to broker {checkpoint.broker_id}")
+
+        processed = checkpoint.rows_processed
+        result = FABrokerImportResult(
+            import_key=import_key, broker_id=broker_id, resumed_from=processed, rows_read=0, completed=checkpoint.completed,
+            )
+        if result.completed:
+            return result
+
+        asset_ids = await _asset_lookup(session)
+        accounts = dict((await session.execute(
+            select(CashAccount.currency, CashAccount.id).where(CashAccount.broker_id == broker_id)
+            )).all())
+        hasher = _ContentHasher(broker_id)
+        row_number = processed
+        source = iter(rows)
+        # Rows of previous runs only go through the hasher (occurrence numbers of identical rows)
+        for row in islice(source, processed):
+            try:
+                hasher(*_parse_row(row, broker_id, asset_ids))
+            except _RowError:
+                pass
+
+        while chunk := list(islice(source, chunk_size)):
+            transactions: list[dict[str, Any]] = []
+            transaction_rows: list[int] = []
+            movements: list[dict[str, Any]] = []
+            movement_rows: list[int] = []
+            linked: list[int] = []  # Index in movements of each transaction's movement (-1 = none)
+            errors: list[FAImportRowError] = []
+            for row in chunk:
+                row_number += 1
+                try:
+                    transaction, movement = _parse_row(row, broker_id, asset_ids)
+                except _RowError as e:
+                    errors.append(FAImportRowError(row=row_number, message=str(e)))
+                    continue
+                content_hash = hasher(transaction, movement)
+                if movement is not None:
+                    movement["import_hash"] = content_hash
+                    movements.append(movement)
+                    movement_rows.append(row_number)
+                if transaction is not None:
+                    transaction["import_hash"] = content_hash
+                    transactions.append(transaction)
+                    transaction_rows.append(row_number)
+                    linked.append(len(movements) - 1 if movement is not None else -1)
+
+            if validate_oversell and transactions:
+                # Rows already imported are already in the stored positions: left out of the check
+                quantity_hashes = [t["import_hash"] for t in transactions if t["type"] in TRANSACTION_QUANTITY_SIGN]
+                imported = set((await session.execute(
+                    select(Transaction.import_hash).where(Transaction.import_hash.in_(quantity_hashes))
+                    )).scalars()) if quantity_hashes else set()
+                checked = [i for i, t in enumerate(transactions) if t["import_hash"] not in imported]
+                check = await PositionManager.validate_batch(session, [transactions[i] for i in checked])
+                if not check.valid:
+                    for violation in check.violations:
+                        row = transaction_rows[checked[violation.index]] if violation.index is not None else None
+                        errors.append(FAImportRowError(row=row, message=(
+                            f"oversell: asset {violation.asset_id} quantity {violation.quantity} on {violation.trade_date}"
+                            )))
+                    result.rows_read += len(chunk)
+                    result.rows_failed += len(errors)
+                    result.errors.extend(errors[:MAX_REPORTED_ERRORS - len(result.errors)])
+                    result.completed = False
+                    logger.warning("Broker import stopped by oversell", import_key=import_key, rows_processed=processed)
+                    return result
+
+            # Checkpoint first: the chunk's transaction holds the SQLite write lock from here on
+            now = utcnow()
+            await session.execute(
+                update(BrokerImportCheckpoint)
+                .where(BrokerImportCheckpoint.import_key == import_key)
+                .values(rows_processed=row_number, updated_at=now)
+                )
+            await _cash_account_ids(session, broker, {m["currency"] for m in movements}, accounts)
+
+            # Ids assigned up front (no other writer under the lock): Core executemany, no RETURNING.
+            # Rows already imported hit uq_*_import_hash and are skipped: the ids missing from
+            # each range are the duplicates.
+            duplicates: set[int] = set()
+            first_id = ((await session.execute(select(func.max(CashMovement.id)))).scalar() or 0) + 1
+            inserted_movements: set[int] = set()
+            if movements:
+                await session.execute(sqlite_insert(CashMovement.__table__).on_conflict_do_nothing(index_elements=["import_hash"]), [
+                    {"id": first_id + i, "cash_account_id": accounts[m["currency"]], "type": m["type"], "amount": m["amount"],
+                     "trade_date": m["trade_date"], "settlement_date": m["settlement_date"], "note": m["note"],
+                     "import_hash": m["import_hash"], "created_at": now, "updated_at": now}
+                    for i, m in enumerate(movements)
+                    ])
+                inserted_movements = set((await session.execute(
+                    select(CashMovement.id).where(CashMovement.id.between(first_id, first_id + len(movements) - 1))
+                    )).scalars())
+                duplicates.update(row for i, row in enumerate(movement_rows) if first_id + i not in inserted_movements)
+
+            # Transactions of a skipped movement are duplicates too (same row, same hash)
+            pending = [i for i, index in enumerate(linked) if index < 0 or first_id + index in inserted_movements]
+            first_transaction_id = ((await session.execute(select(func.max(Transaction.id)))).scalar() or 0) + 1
+            inserted_transactions = 0
+            if pending:
+                for n, i in enumerate(pending):
+                    transaction = transactions[i]
+                    transaction["id"] = first_transaction_id + n
+                    transaction["cash_movement_id"] = first_id + linked[i] if linked[i] >= 0 else None
+                    transaction["created_at"] = transaction["updated_at"] = now
+                await session.execute(
+                    sqlite_insert(Transaction.__table__).on_conflict_do_nothing(index_elements=["import_hash"]),
+                    [transactions[i] for i in pending],
+                    )
+                inserted = set((await session.execute(
+                    select(Transaction.id).where(Transaction.id.between(first_transaction_id, first_transaction_id + len(pending) - 1))
+                    )).scalars())
+                inserted_transactions = len(inserted)
+                skipped = [i for n, i in enumerate(pending) if first_transaction_id + n not in inserted]
+                duplicates.update(transaction_rows[i] for i in skipped)
+                # Movement written for a transaction already imported (its stored movement lost the hash): undone
+                orphans = [first_id + linked[i] for i in skipped if linked[i] >= 0]
+                if orphans:
+                    await session.execute(delete(CashMovement).where(CashMovement.id.in_(orphans)))
+                    inserted_movements.difference_update(orphans)
+
+            await session.execute(
+                update(BrokerImportCheckpoint)
+                .where(BrokerImportCheckpoint.import_key == import_key)
+                .values(
+                    transactions_created=BrokerImportCheckpoint.transactions_created + inserted_transactions,
+                    cash_movements_created=BrokerImportCheckpoint.cash_movements_created + len(inserted_movements),
+                    )
+                )
+            await session.commit()
+            processed = row_number
+
+            result.rows_read += len(chunk)
+            result.rows_failed += len(errors)
+            result.transactions_created += inserted_transactions
+            result.cash_movements_created += len(inserted_movements)
+            result.duplicates_skipped += len(duplicates)
+            result.errors.extend(errors[:MAX_REPORTED_ERRORS - len(result.errors)])
+            result.duplicate_rows.extend(sorted(duplicates)[:MAX_REPORTED_ERRORS - len(result.duplicate_rows)])
+            logger.debug(
+                "Broker import chunk committed", import_key=import_key, rows_processed=row_number,
+                transactions=inserted_transactions, movements=len(inserted_movements), rejected=len(errors),
+                duplicates=len(duplicates),
+                )
+
+        await session.execute(
+            update(BrokerImportCheckpoint).where(BrokerImportCheckpoint.import_key == import_key).values(completed=True, updated_at=utcnow())
+            )
+        await session.commit()
+        result.completed = True
+        logger.info(
+            "Broker import completed", import_key=import_key, rows_read=result.rows_read, rows_failed=result.rows_failed,
+            transactions=result.transactions_created, cash_movements=result.cash_movements_created,
+            duplicates=result.duplicates_skipped,
+            )
+        return result
+
+    @staticmethod
+    async def import_file(
+        session: AsyncSession,
+        broker_id: int,
+        path: Path,
+        file_format: Optional[BrokerImportFormat] = None,
+        import_key: Optional[str] = None,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        validate_oversell: bool = True,
+        ) -> FABrokerImportResult:
+        """
+        Import a CSV or JSON export (streamed; see import_rows).
+
+        Args:
+            session: Database session (committed per chunk)
+            broker_id: Broker of the statement
+            path: Source file
+            file_format: CSV or JSON (None = from the extension: .csv, else JSON)
+            import_key: Checkpoint key (None = file_import_key: re-running the same file resumes)
+            chunk_size: Rows per committed chunk
+            validate_oversell: Check quantity-affecting rows against stored positions
+
+        Returns:
+            FABrokerImportResult of this run
+        """
+        path = Path(path)
+        if file_format is None:
+            file_format = BrokerImportFormat.CSV if path.suffix.lower() == ".csv" else BrokerImportFormat.JSON
+        if import_key is None:
+            import_key = file_import_key(broker_id, path)
+
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            rows = iter_csv_rows(file) if file_format == BrokerImportFormat.CSV else _lowercase_keys(iter_json_rows(file))
+            return await BrokerImportManager.import_rows(
+                session, broker_id, rows, import_key, chunk_size=chunk_size, validate_oversell=validate_oversell,
+                )
+
+
+async def _run_import(broker_id: int, path: Path, import_key: Optional[str]) -> bool:
+    from backend.app.db.session import get_async_engine
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        result = await BrokerImportManager.import_file(session, broker_id, path, import_key=import_key)
+    if result.resumed_from:
+        print(f"↪️  Resumed after {result.resumed_from} rows ({result.import_key})")
+    print(f"📥 Rows read: {result.rows_read}, rejected: {result.rows_failed}")
+    print(f"  transactions: {result.transactions_created}, cash movements: {result.cash_movements_created}")
+    if result.duplicates_skipped:
+        rows = ", ".join(map(str, result.duplicate_rows))
+        print(f"  ⏭️  skipped {result.duplicates_skipped} rows already imported: {rows}")
+    for error in result.errors:
+        print(f"  ⚠️  row {error.row if error.row is not None else '-'}: {error.message}")
+    if result.completed:
+        print("✅ Import completed")
+        return True
+    print("❌ Import stopped by an oversell: fix the rows above and run the same command again to resume")
+    return False
+
+
+def main():
+    """Import a broker statement (CSV or JSON) for a broker."""
+    parser = argparse.ArgumentParser(description="Broker statement import")
+    parser.add_argument("broker_id", type=int, help="Broker of the statement")
+    parser.add_argument("path", type=Path, help="CSV or JSON export (.csv = CSV, else JSON array / JSON Lines)")
+    parser.add_argument("--key", default=None, help="Checkpoint key (default: broker id + SHA-256 of the file)")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(_run_import(args.broker_id, args.path, args.key)) else 1)
+
+
+if __name__ == "__main__":
+    main()
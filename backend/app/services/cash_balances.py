@@ -0,0 +1,289 @@
+"""
+Cash balance ledger.
+
+Reads and maintains cash_balance_history, the running balance per
+(cash_account_id, trade_date):
+- SQLite triggers on cash_movements keep it current on insert, update and
+  delete (including deletes of movements linked to transactions, which
+  cascade to the transaction): a change on trade_date D adjusts the row of D
+  and shifts the balance of the rows after it
+- balances are sums, so no deferred replay is needed (unlike positions and
+  lots, which depend on transaction order)
+
+Queries are index seeks on the (cash_account_id, trade_date) primary key:
+- balance at a date: last row with trade_date <= date
+- balance history: range scan plus one seek for the opening balance
+
+Maintenance commands (also via ./dev.sh db:cash-balances):
+    python -m backend.app.services.cash_balances rebuild   # recompute from movements
+    python -m backend.app.services.cash_balances check     # compare with a from-scratch sum
+"""
+import asyncio
+import sys
+from datetime import date as date_type
+from decimal import Decimal
+from itertools import groupby
+from typing import Optional
+
+import structlog
+from sqlalchemy import select, delete, func, case, and_
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from backend.app.db.models import (
+    CASH_MOVEMENT_SIGN,
+    CashAccount,
+    CashBalanceHistory,
+    CashMovement,
+    )
+from backend.app.schemas.cash import (
+    FACashBalance,
+    FACashBalanceCheckResult,
+    FACashBalanceHistory,
+    FACashBalanceMismatch,
+    FACashBalancePoint,
+    )
+
+logger = structlog.get_logger(__name__)
+
+# Mismatches reported by check_consistency (the check itself covers all rows)
+MAX_REPORTED_MISMATCHES = 100
+
+ZERO = Decimal("0")
+
+_INFLOW_TYPES = [movement_type for movement_type, sign in CASH_MOVEMENT_SIGN.items() if sign > 0]
+
+
+def _last_row_date(as_of: Optional[date_type]):
+    """Correlated lookup of the last ledger date of CashAccount up to as_of (one index seek)."""
+    previous = aliased(CashBalanceHistory)
+    stmt = select(func.max(previous.trade_date)).where(previous.cash_account_id == CashAccount.id)
+    if as_of is not None:
+        stmt = stmt.where(previous.trade_date <= as_of)
+    return stmt.scalar_subquery()
+
+
+class CashBalanceManager:
+    """Running-balance ledger of cash accounts: queries, rebuild and consistency check."""
+
+    @staticmethod
+    async def get_balances(
+        session: AsyncSession,
+        as_of: Optional[date_type] = None,
+        cash_account_ids: Optional[list[int]] = None,
+        ) -> list[FACashBalance]:
+        """
+        Balances of cash accounts at the end of a date.
+
+        Args:
+            session: Database session
+            as_of: Date (inclusive, None = latest)
+            cash_account_ids: Filter by accounts (None = all)
+
+        Returns:
+            List of FACashBalance ordered by cash_account_id (balance 0 before the first movement)
+        """
+        stmt = (
+            select(CashAccount.id, CashAccount.broker_id, CashAccount.currency, CashBalanceHistory.balance, CashBalanceHistory.trade_date)
+            .outerjoin(CashBalanceHistory, and_(
+                CashBalanceHistory.cash_account_id == CashAccount.id,
+                CashBalanceHistory.trade_date == _last_row_date(as_of),
+                ))
+            .order_by(CashAccount.id)
+        )
+        if cash_account_ids is not None:
+            stmt = stmt.where(CashAccount.id.in_(cash_account_ids))
+        return [
+            FACashBalance(
+                cash_account_id=r.id, broker_id=r.broker_id, currency=r.currency, as_of=as_of,
+                balance=ZERO if r.balance is None else r.balance, last_movement_date=r.trade_date,
+                )
+            for r in (await session.execute(stmt)).all()
+            ]
+
+    @staticmethod
+    async def get_balance_history(
+        session: AsyncSession,
+        cash_account_id: int,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None,
+        ) -> FACashBalanceHistory:
+        """
+        Ledger rows of a cash account in [start_date, end_date].
+
+        Args:
+            session: Database session
+            cash_account_id: Cash account
+            start_date: First date (None = first movement)
+            end_date: Last date, inclusive (None = last movement)
+
+        Returns:
+            FACashBalanceHistory with the opening balance (before start_date) and one point
+            per day with movements (callers backward-fill the days in between)
+
+        Raises:
+            ValueError: If the account does not exist or start_date > end_date
+        """
+        if start_date is not None and end_date is not None and start_date > end_date:
+            raise ValueError(f"Start date {start_date} is after end date {end_date}")
+        account = await session.get(CashAccount, cash_account_id)
+        if account is None:
+            raise ValueError(f"Cash account {cash_account_id} not found")
+
+        opening = None
+        if start_date is not None:
+            opening = (await session.execute(
+                select(CashBalanceHistory.balance)
+                .where(CashBalanceHistory.cash_account_id == cash_account_id, CashBalanceHistory.trade_date < start_date)
+                .order_by(CashBalanceHistory.trade_date.desc())
+                .limit(1)
+                )).scalar_one_or_none()
+
+        stmt = (
+            select(CashBalanceHistory.trade_date, CashBalanceHistory.net_amount, CashBalanceHistory.balance)
+            .where(CashBalanceHistory.cash_account_id == cash_account_id)
+            .order_by(CashBalanceHistory.trade_date)
+        )
+        if start_date is not None:
+            stmt = stmt.where(CashBalanceHistory.trade_date >= start_date)
+        if end_date is not None:
+            stmt = stmt.where(CashBalanceHistory.trade_date <= end_date)
+
+        return FACashBalanceHistory(
+            cash_account_id=cash_account_id,
+            currency=account.currency,
+            opening_balance=ZERO if opening is None else opening,
+            points=[
+                FACashBalancePoint(trade_date=r.trade_date, net_amount=r.net_amount, balance=r.balance)
+                for r in (await session.execute(stmt)).all()
+                ],
+            )
+
+    @staticmethod
+    async def rebuild(session: AsyncSession) -> int:
+        """
+        Recompute the whole ledger from cash_movements (one INSERT ... SELECT with a window sum).
+
+        Args:
+            session: Database session (committed)
+
+        Returns:
+            Number of ledger rows written
+        """
+        signed_amount = case(
+            (CashMovement.type.in_(_INFLOW_TYPES), CashMovement.amount),
+            else_=-CashMovement.amount,
+            )
+        daily = (
+            select(
+                CashMovement.cash_account_id.label("cash_account_id"),
+                CashMovement.trade_date.label("trade_date"),
+                func.round(func.sum(signed_amount), 6).label("net_amount"),
+                func.count().label("movement_count"),
+                )
+            .group_by(CashMovement.cash_account_id, CashMovement.trade_date)
+            .subquery()
+        )
+        await session.execute(delete(CashBalanceHistory))
+        result = await session.execute(
+            insert(CashBalanceHistory).from_select(
+                ["cash_account_id", "trade_date", "net_amount", "balance", "movement_count"],
+                select(
+                    daily.c.cash_account_id, daily.c.trade_date, daily.c.net_amount,
+                    func.round(func.sum(daily.c.net_amount).over(partition_by=daily.c.cash_account_id, order_by=daily.c.trade_date), 6),
+                    daily.c.movement_count,
+                    ),
+                )
+            )
+        await session.commit()
+        logger.info("Cash balance ledger rebuilt", rows=result.rowcount)
+        return result.rowcount
+
+    @staticmethod
+    async def check_consistency(session: AsyncSession) -> FACashBalanceCheckResult:
+        """
+        Compare the ledger with an exact (Decimal) sum of all movements.
+
+        Args:
+            session: Database session
+
+        Returns:
+            FACashBalanceCheckResult (consistent=False with mismatches on any difference)
+        """
+        movements = (await session.execute(
+            select(CashMovement.cash_account_id, CashMovement.trade_date, CashMovement.type, CashMovement.amount)
+            .order_by(CashMovement.cash_account_id, CashMovement.trade_date)
+            )).all()
+        expected: dict[tuple[int, date_type], tuple[Decimal, Decimal, int]] = {}
+        for cash_account_id, account_rows in groupby(movements, key=lambda r: r.cash_account_id):
+            balance = ZERO
+            for trade_date, day_rows in groupby(account_rows, key=lambda r: r.trade_date):
+                day_rows = list(day_rows)
+                net_amount = sum((CASH_MOVEMENT_SIGN[r.type] * r.amount for r in day_rows), ZERO)
+                balance += net_amount
+                expected[(cash_account_id, trade_date)] = (net_amount, balance, len(day_rows))
+
+        stored = {
+            (r.cash_account_id, r.trade_date): (r.net_amount, r.balance, r.movement_count)
+            for r in (await session.execute(select(CashBalanceHistory))).scalars().all()
+            }
+
+        mismatches: list[FACashBalanceMismatch] = []
+        for key in sorted(set(expected) | set(stored)):
+            exp, got = expected.get(key), stored.get(key)
+            if exp is None or got is None:
+                mismatches.append(FACashBalanceMismatch(
+                    cash_account_id=key[0], trade_date=key[1], field="row",
+                    stored=None if got is None else str(got[1]), expected=None if exp is None else str(exp[1]),
+                    ))
+                continue
+            for field, exp_value, got_value in zip(("net_amount", "balance", "movement_count"), exp, got):
+                if exp_value != got_value:
+                    mismatches.append(FACashBalanceMismatch(
+                        cash_account_id=key[0], trade_date=key[1], field=field, stored=str(got_value), expected=str(exp_value),
+                        ))
+
+        result = FACashBalanceCheckResult(
+            consistent=not mismatches,
+            accounts_checked=len({key[0] for key in set(expected) | set(stored)}),
+            rows_checked=len(stored),
+            mismatches=mismatches[:MAX_REPORTED_MISMATCHES],
+            )
+        if mismatches:
+            logger.warning("Cash balance ledger inconsistent with movements", mismatch_count=len(mismatches))
+        return result
+
+
+async def _run_command(command: str) -> bool:
+    from backend.app.db.session import get_async_engine
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        if command == "rebuild":
+            rows = await CashBalanceManager.rebuild(session)
+            print(f"✅ Cash balance ledger rebuilt: {rows} rows")
+            return True
+
+        result = await CashBalanceManager.check_consistency(session)
+        if result.consistent:
+            print(f"✅ Cash balance ledger consistent: {result.accounts_checked} accounts, {result.rows_checked} rows")
+            return True
+        print(f"❌ Cash balance ledger inconsistent ({len(result.mismatches)} mismatches shown):")
+        for m in result.mismatches:
+            print(f"  account={m.cash_account_id} date={m.trade_date} {m.field}: stored={m.stored} expected={m.expected}")
+        print("Run: ./dev.sh db:cash-balances rebuild")
+        return False
+
+
+def main():
+    """Cash balance ledger maintenance commands (rebuild, check)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cash balance ledger maintenance")
+    parser.add_argument("command", choices=["rebuild", "check"], help="rebuild: recompute from movements, check: compare with a from-scratch sum")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(_run_command(args.command)) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,18 +4,21 @@ Handles currency conversion and FX rate management with support for multiple pro
 """
 import asyncio
 from abc import ABC, abstractmethod
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
+from typing import AsyncIterator
 
 from sqlalchemy import delete as sql_delete
 from sqlalchemy import func, select as sql_select, or_, and_
 from sqlalchemy.dialects.sqlite import insert
 from sqlmodel import select
 
-from backend.app.db.models import FxRate
+from backend.app.db.models import FxLatestRate, FxRate
 from backend.app.logging_config import get_logger
 from backend.app.services.provider_registry import FXProviderRegistry
+from backend.app.services.rate_limiter import RateLimitPolicy
 from backend.app.utils.decimal_utils import truncate_fx_rate
+from backend.app.utils.streaming import iter_backward_filled, iter_stream_rows
 
 logger = get_logger(__name__)
 
@@ -148,6 +151,18 @@ class FXRateProvider(ABC):
         """
         return set()
 
+    @property
+    def rate_limit_policy(self) -> RateLimitPolicy | None:
+        """
+        Outbound rate limit for this provider's API (shared token bucket).
+
+        Wrap HTTP calls with: async with rate_limiter.limit(self.code, None, self.rate_limit_policy)
+        See services/rate_limiter.py. Return None to disable limiting.
+
+        Default: 2 req/s, burst 4, max 2 in-flight requests
+        """
+        return RateLimitPolicy(rate=2.0, burst=4, max_concurrency=2)
+
     @abstractmethod
     async def get_supported_currencies(self) -> list[str]:
         """
@@ -1052,3 +1067,89 @@ async def delete_rates_bulk(
     await session.commit()
 
     return results
+
+
+async def get_latest_rates(
+    session,  # AsyncSession
+    pairs: list[tuple[str, str]] | None = None  # [(from_currency, to_currency), ...]
+    ) -> list[tuple[str, str, date, Decimal]]:  # [(base, quote, date, rate), ...]
+    """
+    Newest stored rate per pair, read from fx_latest_rates (kept current by triggers on fx_rates).
+
+    One primary key lookup per pair: no scan of fx_rates, no provider call.
+
+    Args:
+        session: Database session
+        pairs: Currency pairs, normalized to alphabetical order like fx_rates (None = all stored pairs)
+
+    Returns:
+        List of (base, quote, date, rate) tuples in stored direction (1 base = rate quote),
+        ordered by base, quote; pairs without rates are omitted
+    """
+    stmt = sql_select(FxLatestRate.base, FxLatestRate.quote, FxLatestRate.date, FxLatestRate.rate)
+    if pairs is not None:
+        normalized = {tuple(sorted((from_cur.upper(), to_cur.upper()))) for from_cur, to_cur in pairs}
+        if not normalized:
+            return []
+        stmt = stmt.where(or_(*(and_(FxLatestRate.base == base, FxLatestRate.quote == quote) for base, quote in normalized)))
+    result = await session.execute(stmt.order_by(FxLatestRate.base, FxLatestRate.quote))
+    return [tuple(r) for r in result.all()]
+
+
+async def iter_converted_series(
+    session,  # AsyncSession
+    amount: Decimal,
+    from_currency: str,
+    to_currency: str,
+    start_date: date,
+    end_date: date,
+    ) -> AsyncIterator[tuple[date, Decimal | None, date | None]]:  # (day, converted_amount, rate_date)
+    """
+    Convert amount on every calendar day of a range, reading rates with a server-side cursor.
+
+    Same backward-fill and arithmetic as convert_bulk (1 base = rate quote, divide when
+    converting quote -> base), but rates are streamed: the last rate before start_date is
+    one backward seek on idx_fx_rates_base_quote_date, the range is read with
+    session.stream, and one tuple is yielded per day, so memory stays flat for any range.
+    With amount=1 the series is the daily rate of from_currency/to_currency.
+
+    Args:
+        session: Database session
+        amount: Amount to convert
+        from_currency: Source currency
+        to_currency: Target currency
+        start_date: First day (inclusive)
+        end_date: Last day (inclusive)
+
+    Yields:
+        (day, converted_amount, rate_date); converted_amount and rate_date are None for
+        days before the first stored rate of the pair (identity: amount, day)
+    """
+    if from_currency == to_currency:
+        day = start_date
+        while day <= end_date:
+            yield day, amount, day
+            day += timedelta(days=1)
+        return
+
+    base, quote = sorted((from_currency, to_currency))
+    direct = from_currency == base
+    columns = (FxRate.date, FxRate.rate)
+    pair_filters = (FxRate.base == base, FxRate.quote == quote)
+    previous = (await session.execute(
+        sql_select(*columns).where(*pair_filters, FxRate.date < start_date).order_by(FxRate.date.desc()).limit(1)
+        )).first()
+    rows = iter_stream_rows(session, sql_select(*columns).where(
+        *pair_filters, FxRate.date >= start_date, FxRate.date <= end_date,
+        ).order_by(FxRate.date))
+
+    day = start_date
+    async for filled_day, row in iter_backward_filled(rows, start_date, end_date, previous):
+        while day < filled_day:  # Before the first rate of the pair
+            yield day, None, None
+            day += timedelta(days=1)
+        yield day, amount * row.rate if direct else amount / row.rate, row.date
+        day += timedelta(days=1)
+    while day <= end_date:  # No rate at all for the pair
+        yield day, None, None
+        day += timedelta(days=1)
@@ -14,6 +14,7 @@ import httpx
 from backend.app.logging_config import get_logger
 from backend.app.services.fx import FXRateProvider, FXServiceError
 from backend.app.services.provider_registry import register_provider, FXProviderRegistry
+from backend.app.services.rate_limiter import rate_limiter
 
 logger = get_logger(__name__)
 
@@ -166,7 +167,7 @@ class BOEProvider(FXRateProvider):
                     'User-Agent': 'Mozilla/5.0 (compatible; LibreFolio/1.0; +https://github.com/librefolio)'
                     }
 
-                async with httpx.AsyncClient(timeout=30.0, headers=headers, follow_redirects=True) as client:
+                async with rate_limiter.limit(self.code, None, self.rate_limit_policy), httpx.AsyncClient(timeout=30.0, headers=headers, follow_redirects=True) as client:
                     response = await client.get(self.BASE_URL, params=params)
                     response.raise_for_status()
 
@@ -16,6 +16,7 @@ import httpx
 from backend.app.logging_config import get_logger
 from backend.app.services.fx import FXRateProvider, FXServiceError
 from backend.app.services.provider_registry import register_provider, FXProviderRegistry
+from backend.app.services.rate_limiter import rate_limiter
 
 logger = get_logger(__name__)
 
@@ -178,7 +179,7 @@ class FEDProvider(FXRateProvider):
                 }
 
             try:
-                async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+                async with rate_limiter.limit(self.code, None, self.rate_limit_policy), httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
                     response = await client.get(self.BASE_URL, params=params)
                     response.raise_for_status()
 
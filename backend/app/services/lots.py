@@ -0,0 +1,615 @@
+"""
+FIFO lot engine.
+
+Persists FIFO lots per (asset, broker) from transactions:
+- position_lots: one lot per BUY / ADD_HOLDING, with its remaining quantity
+- lot_matches: quantity of each lot closed by a SELL / REMOVE_HOLDING, with
+  realized gain/loss (closing price NULL counts as 0)
+
+Transfers are not part of FIFO matching (see FIFO_LOT_SIGN): TRANSFER_OUT does
+not close lots and TRANSFER_IN does not open any (transactions carry no link
+between the two sides), so lots stay with the broker that opened them. Realized
+and unrealized P&L rows of (asset, broker) pairs with transfers are flagged with
+has_transfers: their FIFO cost does not follow the transferred quantity.
+
+Incremental maintenance:
+- SQLite triggers on transactions record the earliest affected trade_date per
+  (asset, broker) in lot_invalidations (insert, update, delete, and deletes
+  cascaded from cash_movements), whatever the write path
+- sync() recomputes only those pairs, only from the recorded date: lots opened
+  before it are restored to their remaining quantity at that date (matches
+  closed after it are reverted), lots and matches after it are rewritten
+- readers call sync() first, so P&L queries never see stale lots
+
+Maintenance commands (also via ./dev.sh db:lots):
+    python -m backend.app.services.lots rebuild   # full recompute
+    python -m backend.app.services.lots check     # compare with a from-scratch replay
+
+Design principles:
+- Set-based: a sync is a fixed number of statements, whatever the number of pairs
+- Matching is pure (match_fifo), shared by sync and the consistency checker
+"""
+import asyncio
+import sys
+from collections import deque
+from datetime import date as date_type
+from decimal import Decimal, ROUND_DOWN
+from itertools import groupby
+from typing import Iterable, Optional
+
+import structlog
+from sqlalchemy import select, delete, update, exists, func, tuple_, and_
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from backend.app.db.models import (
+    FIFO_LOT_SIGN,
+    AssetLatestPrice,
+    LotInvalidation,
+    LotMatch,
+    PositionLot,
+    PriceHistory,
+    Transaction,
+    TransactionType,
+    )
+from backend.app.schemas.lots import (
+    FALot,
+    FALotCheckResult,
+    FALotMismatch,
+    FALotSyncResult,
+    FARealizedPnL,
+    FAUnrealizedPnL,
+    )
+from backend.app.utils.decimal_utils import get_model_column_precision
+
+logger = structlog.get_logger(__name__)
+
+# Rows per executemany batch when writing lots and matches
+LOT_WRITE_CHUNK_SIZE = 5000
+# Keys per DELETE statement when clearing processed invalidations (3 params/key)
+INVALIDATION_DELETE_CHUNK_SIZE = 500
+# Mismatches reported by check_consistency (the check itself covers all rows)
+MAX_REPORTED_MISMATCHES = 100
+
+ZERO = Decimal("0")
+
+_CLOSING_TYPES = [txn_type for txn_type, sign in FIFO_LOT_SIGN.items() if sign < 0]
+_TRANSFER_TYPES = [TransactionType.TRANSFER_IN, TransactionType.TRANSFER_OUT]
+
+# Truncation quantum of lot amounts (same as truncate_to_db_precision)
+_QUANTUM = Decimal(10) ** -get_model_column_precision(LotMatch, "realized_pnl")[1]
+
+
+def _truncate(value: Decimal) -> Decimal:
+    return value.quantize(_QUANTUM, rounding=ROUND_DOWN)
+
+
+def match_fifo(
+    rows: Iterable,
+    open_lots: dict[tuple[int, int], list[dict]],
+    ) -> tuple[list[dict], list[dict], Decimal]:
+    """
+    Match FIFO transactions against open lots, oldest lot first.
+
+    Args:
+        rows: (id, asset_id, broker_id, trade_date, type, quantity, price, currency),
+              sorted by asset_id, broker_id, trade_date, id
+        open_lots: (asset_id, broker_id) -> open lots before the first row, in FIFO order,
+                   as dicts with transaction_id, remaining_quantity, unit_cost, currency
+                   (remaining_quantity is updated in place; missing pairs start without lots)
+
+    Returns:
+        (lots, matches, unmatched_quantity):
+        - lots: position_lots rows opened by the rows (remaining_quantity after all rows)
+        - matches: lot_matches rows closed by the rows
+        - unmatched_quantity: closed quantity exceeding the open lots (oversell, not matched)
+    """
+    lots: list[dict] = []
+    matches: list[dict] = []
+    unmatched = ZERO
+    for (asset_id, broker_id), key_rows in groupby(rows, key=lambda r: (r[1], r[2])):
+        queue = deque(lot for lot in open_lots.get((asset_id, broker_id), []) if lot["remaining_quantity"] > 0)
+        for txn_id, _, _, trade_date, txn_type, quantity, price, currency in key_rows:
+            if FIFO_LOT_SIGN[txn_type] > 0:
+                lot = {
+                    "transaction_id": txn_id, "asset_id": asset_id, "broker_id": broker_id, "open_date": trade_date,
+                    "quantity": quantity, "remaining_quantity": quantity, "unit_cost": price or ZERO, "currency": currency,
+                    }
+                lots.append(lot)
+                queue.append(lot)
+                continue
+
+            unit_proceeds = price or ZERO
+            to_close = quantity
+            while to_close > 0 and queue:
+                lot = queue[0]
+                closed = min(to_close, lot["remaining_quantity"])
+                matches.append({
+                    "close_transaction_id": txn_id, "lot_transaction_id": lot["transaction_id"],
+                    "asset_id": asset_id, "broker_id": broker_id, "close_date": trade_date,
+                    "quantity": closed, "unit_cost": lot["unit_cost"], "unit_proceeds": unit_proceeds,
+                    "currency": lot["currency"], "proceeds_currency": currency,
+                    "realized_pnl": (
+                        _truncate(closed * (unit_proceeds - lot["unit_cost"])) if currency == lot["currency"] else None
+                    ),
+                    })
+                lot["remaining_quantity"] -= closed
+                to_close -= closed
+                if lot["remaining_quantity"] <= 0:
+                    queue.popleft()
+            unmatched += to_close
+    return lots, matches, unmatched
+
+
+def _transaction_rows_query():
+    """FIFO transactions in matching order."""
+    return (
+        select(
+            Transaction.id, Transaction.asset_id, Transaction.broker_id, Transaction.trade_date,
+            Transaction.type, Transaction.quantity, Transaction.price, Transaction.currency,
+            )
+        .where(Transaction.type.in_(list(FIFO_LOT_SIGN)))
+        .order_by(Transaction.asset_id, Transaction.broker_id, Transaction.trade_date, Transaction.id)
+    )
+
+
+def _filter_pairs(stmt, model, asset_ids: Optional[list[int]], broker_ids: Optional[list[int]]):
+    if asset_ids is not None:
+        stmt = stmt.where(model.asset_id.in_(asset_ids))
+    if broker_ids is not None:
+        stmt = stmt.where(model.broker_id.in_(broker_ids))
+    return stmt
+
+
+async def _transfer_pairs(
+    session: AsyncSession,
+    asset_ids: Iterable[int],
+    end_date: Optional[date_type] = None,
+    ) -> set[tuple[int, int]]:
+    """(asset, broker) pairs of the given assets with TRANSFER_IN / TRANSFER_OUT transactions (up to end_date)."""
+    stmt = (
+        select(Transaction.asset_id, Transaction.broker_id)
+        .where(Transaction.asset_id.in_(list(asset_ids)), Transaction.type.in_(_TRANSFER_TYPES))
+        .distinct()
+    )
+    if end_date is not None:
+        stmt = stmt.where(Transaction.trade_date <= end_date)
+    return {(r.asset_id, r.broker_id) for r in (await session.execute(stmt)).all()}
+
+
+class LotManager:
+    """Persisted FIFO lots: incremental sync, P&L queries, rebuild and consistency check."""
+
+    @staticmethod
+    async def sync(session: AsyncSession) -> FALotSyncResult:
+        """
+        Recompute every invalidated (asset, broker) pair from its earliest affected trade_date.
+
+        Statements (independent of the number of pairs, except write chunking):
+        1. read invalidations
+        2. read lots opened before from_date that are closed after it (remaining quantity at
+           from_date = stored remaining + quantity matched after it), and the open lots that
+           the closes after from_date can reach (window sum of the FIFO queue)
+        3. delete matches closed and lots opened from from_date
+        4. read transactions from from_date, match them
+        5. insert new lots and matches, update remaining quantity of the start lots that changed
+        6. clear processed invalidations, commit
+
+        Args:
+            session: Database session (committed on success)
+
+        Returns:
+            FALotSyncResult with counts (all zero if nothing was invalidated)
+        """
+        invalidations = (await session.execute(
+            select(LotInvalidation.asset_id, LotInvalidation.broker_id, LotInvalidation.from_date)
+            )).all()
+        if not invalidations:
+            return FALotSyncResult(pairs_recomputed=0, transactions_replayed=0, lots_written=0, matches_written=0)
+
+        inv = LotInvalidation
+        lot_columns = (
+            PositionLot.transaction_id, PositionLot.asset_id, PositionLot.broker_id, PositionLot.open_date,
+            PositionLot.remaining_quantity, PositionLot.unit_cost, PositionLot.currency,
+            )
+        lot_before = and_(
+            inv.asset_id == PositionLot.asset_id, inv.broker_id == PositionLot.broker_id, PositionLot.open_date < inv.from_date,
+            )
+
+        # Start state: lots closed (partially) by matches being reverted, plus the head of the
+        # open lots queue (FIFO closes after from_date can only consume the first lots)
+        start_lots: dict[int, dict] = {}
+        stored_remaining: dict[int, Decimal] = {}
+        reverted = (await session.execute(
+            select(*lot_columns, LotMatch.quantity.label("matched"))
+            .select_from(LotMatch)
+            .join(PositionLot, PositionLot.transaction_id == LotMatch.lot_transaction_id)
+            .join(inv, and_(lot_before, LotMatch.close_date >= inv.from_date))
+            )).all()
+        for r in reverted:
+            lot = start_lots.setdefault(r.transaction_id, {k: v for k, v in r._mapping.items() if k != "matched"})
+            lot["remaining_quantity"] += r.matched
+            stored_remaining[r.transaction_id] = r.remaining_quantity
+
+        closing = (
+            select(Transaction.asset_id, Transaction.broker_id, func.sum(Transaction.quantity).label("quantity"))
+            .join(inv, and_(
+                inv.asset_id == Transaction.asset_id,
+                inv.broker_id == Transaction.broker_id,
+                Transaction.trade_date >= inv.from_date,
+                ))
+            .where(Transaction.type.in_(_CLOSING_TYPES))
+            .group_by(Transaction.asset_id, Transaction.broker_id)
+            .subquery()
+        )
+        queue = (
+            select(
+                *lot_columns,
+                (func.sum(PositionLot.remaining_quantity).over(
+                    partition_by=(PositionLot.asset_id, PositionLot.broker_id),
+                    order_by=(PositionLot.open_date, PositionLot.transaction_id),
+                    ) - PositionLot.remaining_quantity).label("queued_before"),
+                )
+            .join(inv, lot_before)
+            .where(PositionLot.remaining_quantity > 0)
+            .subquery()
+        )
+        head = (await session.execute(
+            select(*[queue.c[column.key] for column in lot_columns])
+            .join(closing, and_(closing.c.asset_id == queue.c.asset_id, closing.c.broker_id == queue.c.broker_id))
+            .where(queue.c.queued_before < closing.c.quantity)
+            )).all()
+        for r in head:
+            if r.transaction_id not in start_lots:
+                start_lots[r.transaction_id] = dict(r._mapping)
+                stored_remaining[r.transaction_id] = r.remaining_quantity
+
+        open_lots: dict[tuple[int, int], list[dict]] = {}
+        for lot in sorted(start_lots.values(), key=lambda lot: (lot["asset_id"], lot["broker_id"], lot["open_date"], lot["transaction_id"])):
+            open_lots.setdefault((lot["asset_id"], lot["broker_id"]), []).append(lot)
+
+        await session.execute(
+            delete(LotMatch).where(exists(select(1).where(
+                inv.asset_id == LotMatch.asset_id, inv.broker_id == LotMatch.broker_id, LotMatch.close_date >= inv.from_date,
+                )))
+            )
+        await session.execute(
+            delete(PositionLot).where(exists(select(1).where(
+                inv.asset_id == PositionLot.asset_id, inv.broker_id == PositionLot.broker_id, PositionLot.open_date >= inv.from_date,
+                )))
+            )
+
+        txn_rows = (await session.execute(
+            _transaction_rows_query().join(inv, and_(
+                inv.asset_id == Transaction.asset_id,
+                inv.broker_id == Transaction.broker_id,
+                Transaction.trade_date >= inv.from_date,
+                ))
+            )).all()
+        lots, matches, unmatched = match_fifo(txn_rows, open_lots)
+
+        for i in range(0, len(lots), LOT_WRITE_CHUNK_SIZE):
+            await session.execute(insert(PositionLot), lots[i:i + LOT_WRITE_CHUNK_SIZE])
+        for i in range(0, len(matches), LOT_WRITE_CHUNK_SIZE):
+            await session.execute(insert(LotMatch), matches[i:i + LOT_WRITE_CHUNK_SIZE])
+        remaining = [
+            {"transaction_id": lot_id, "remaining_quantity": lot["remaining_quantity"]}
+            for lot_id, lot in start_lots.items()
+            if lot["remaining_quantity"] != stored_remaining[lot_id]
+            ]
+        for i in range(0, len(remaining), LOT_WRITE_CHUNK_SIZE):
+            await session.execute(update(PositionLot), remaining[i:i + LOT_WRITE_CHUNK_SIZE])
+
+        # Clear processed invalidations (exact from_date: a lower one written meanwhile stays)
+        processed = [(r.asset_id, r.broker_id, r.from_date) for r in invalidations]
+        for i in range(0, len(processed), INVALIDATION_DELETE_CHUNK_SIZE):
+            chunk = processed[i:i + INVALIDATION_DELETE_CHUNK_SIZE]
+            await session.execute(delete(inv).where(tuple_(inv.asset_id, inv.broker_id, inv.from_date).in_(chunk)))
+        await session.commit()
+
+        result = FALotSyncResult(
+            pairs_recomputed=len(invalidations),
+            transactions_replayed=len(txn_rows),
+            lots_written=len(lots),
+            matches_written=len(matches),
+            unmatched_quantity=unmatched,
+            )
+        if unmatched:
+            logger.warning("FIFO lots: closed quantity exceeds open lots", unmatched_quantity=str(unmatched))
+        logger.info("Lots synced", **result.model_dump(exclude={"unmatched_quantity"}))
+        return result
+
+    @staticmethod
+    async def rebuild(session: AsyncSession) -> FALotSyncResult:
+        """
+        Full rebuild: drop all lots and matches and recompute every pair from its first transaction.
+
+        Args:
+            session: Database session (committed)
+
+        Returns:
+            FALotSyncResult of the full recomputation
+        """
+        await session.execute(delete(LotMatch))
+        await session.execute(delete(PositionLot))
+        await session.execute(delete(LotInvalidation))
+        await session.execute(
+            insert(LotInvalidation).from_select(
+                ["asset_id", "broker_id", "from_date"],
+                select(Transaction.asset_id, Transaction.broker_id, func.min(Transaction.trade_date))
+                .where(Transaction.type.in_(list(FIFO_LOT_SIGN)))
+                .group_by(Transaction.asset_id, Transaction.broker_id),
+                )
+            )
+        return await LotManager.sync(session)
+
+    @staticmethod
+    async def check_consistency(session: AsyncSession, sync_first: bool = True) -> FALotCheckResult:
+        """
+        Compare persisted lots and matches with a from-scratch FIFO matching of all transactions.
+
+        Args:
+            session: Database session
+            sync_first: Apply pending invalidations before checking (False checks the
+                        stored rows as they are, pending pairs then show as mismatches)
+
+        Returns:
+            FALotCheckResult (consistent=False with mismatches on any difference)
+        """
+        if sync_first:
+            await LotManager.sync(session)
+
+        expected_lots, expected_matches, _ = match_fifo((await session.execute(_transaction_rows_query())).all(), {})
+        stored_lots = (await session.execute(select(PositionLot))).scalars().all()
+        stored_matches = (await session.execute(select(LotMatch))).scalars().all()
+
+        mismatches: list[FALotMismatch] = []
+
+        def compare(expected: dict, stored: dict, fields: tuple[str, ...], key_fields: tuple[str, str | None]):
+            for key in sorted(set(expected) | set(stored)):
+                exp, got = expected.get(key), stored.get(key)
+                row = exp or got
+                ids = {"transaction_id": row[key_fields[0]], "lot_transaction_id": row[key_fields[1]] if key_fields[1] else None}
+                if exp is None or got is None:
+                    mismatches.append(FALotMismatch(
+                        asset_id=row["asset_id"], broker_id=row["broker_id"], **ids, field="row",
+                        stored=None if got is None else str(got["quantity"]),
+                        expected=None if exp is None else str(exp["quantity"]),
+                        ))
+                    continue
+                for field in fields:
+                    if exp[field] != got[field]:
+                        mismatches.append(FALotMismatch(
+                            asset_id=row["asset_id"], broker_id=row["broker_id"], **ids, field=field,
+                            stored=None if got[field] is None else str(got[field]),
+                            expected=None if exp[field] is None else str(exp[field]),
+                            ))
+
+        lot_fields = ("asset_id", "broker_id", "open_date", "quantity", "remaining_quantity", "unit_cost", "currency")
+        compare(
+            {lot["transaction_id"]: lot for lot in expected_lots},
+            {lot.transaction_id: lot.model_dump() for lot in stored_lots},
+            lot_fields, ("transaction_id", None),
+            )
+        match_fields = ("close_date", "quantity", "unit_cost", "unit_proceeds", "currency", "proceeds_currency", "realized_pnl")
+        compare(
+            {(m["close_transaction_id"], m["lot_transaction_id"]): m for m in expected_matches},
+            {(m.close_transaction_id, m.lot_transaction_id): m.model_dump() for m in stored_matches},
+            match_fields, ("close_transaction_id", "lot_transaction_id"),
+            )
+
+        result = FALotCheckResult(
+            consistent=not mismatches,
+            pairs_checked=len({(lot.asset_id, lot.broker_id) for lot in stored_lots} | {(lot["asset_id"], lot["broker_id"]) for lot in expected_lots}),
+            lots_checked=len(stored_lots),
+            matches_checked=len(stored_matches),
+            mismatches=mismatches[:MAX_REPORTED_MISMATCHES],
+            )
+        if mismatches:
+            logger.warning("Lots inconsistent with transactions", mismatch_count=len(mismatches))
+        return result
+
+    @staticmethod
+    async def get_open_lots(
+        session: AsyncSession,
+        asset_ids: Optional[list[int]] = None,
+        broker_ids: Optional[list[int]] = None,
+        ) -> list[FALot]:
+        """
+        Open lots (remaining quantity > 0), synced first.
+
+        Args:
+            session: Database session
+            asset_ids: Filter by assets (None = all)
+            broker_ids: Filter by brokers (None = all)
+
+        Returns:
+            List of FALot in FIFO order per (asset_id, broker_id)
+        """
+        await LotManager.sync(session)
+        stmt = _filter_pairs(
+            select(PositionLot)
+            .where(PositionLot.remaining_quantity > 0)
+            .order_by(PositionLot.asset_id, PositionLot.broker_id, PositionLot.open_date, PositionLot.transaction_id),
+            PositionLot, asset_ids, broker_ids,
+            )
+        return [FALot(**lot.model_dump()) for lot in (await session.execute(stmt)).scalars().all()]
+
+    @staticmethod
+    async def get_realized_pnl(
+        session: AsyncSession,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None,
+        asset_ids: Optional[list[int]] = None,
+        broker_ids: Optional[list[int]] = None,
+        ) -> list[FARealizedPnL]:
+        """
+        Realized gain/loss of the quantities closed in [start_date, end_date], synced first.
+
+        Reads lot_matches (idx_lot_matches_asset_broker_date); sums are exact Decimals.
+        Pairs with transfers up to end_date are flagged (has_transfers).
+
+        Args:
+            session: Database session
+            start_date: First closing date (None = no lower bound)
+            end_date: Last closing date, inclusive (None = no upper bound)
+            asset_ids: Filter by assets (None = all)
+            broker_ids: Filter by brokers (None = all)
+
+        Returns:
+            List of FARealizedPnL ordered by asset_id, broker_id, currency, proceeds_currency
+        """
+        await LotManager.sync(session)
+        stmt = _filter_pairs(
+            select(
+                LotMatch.asset_id, LotMatch.broker_id, LotMatch.currency, LotMatch.proceeds_currency,
+                LotMatch.quantity, LotMatch.unit_cost, LotMatch.unit_proceeds,
+                ),
+            LotMatch, asset_ids, broker_ids,
+            )
+        if start_date is not None:
+            stmt = stmt.where(LotMatch.close_date >= start_date)
+        if end_date is not None:
+            stmt = stmt.where(LotMatch.close_date <= end_date)
+
+        totals: dict[tuple[int, int, str, str], list[Decimal]] = {}
+        for r in (await session.execute(stmt)).all():
+            total = totals.setdefault((r.asset_id, r.broker_id, r.currency, r.proceeds_currency), [ZERO, ZERO, ZERO])
+            total[0] += r.quantity
+            total[1] += r.quantity * r.unit_cost
+            total[2] += r.quantity * r.unit_proceeds
+
+        if not totals:
+            return []
+
+        transferred = await _transfer_pairs(session, {key[0] for key in totals}, end_date)
+        return [
+            FARealizedPnL(
+                asset_id=asset_id, broker_id=broker_id, currency=currency, proceeds_currency=proceeds_currency,
+                quantity=quantity, cost_basis=_truncate(cost), proceeds=_truncate(proceeds),
+                realized_pnl=_truncate(proceeds - cost) if currency == proceeds_currency else None,
+                has_transfers=(asset_id, broker_id) in transferred,
+                )
+            for (asset_id, broker_id, currency, proceeds_currency), (quantity, cost, proceeds) in sorted(totals.items())
+            ]
+
+    @staticmethod
+    async def get_unrealized_pnl(
+        session: AsyncSession,
+        as_of: Optional[date_type] = None,
+        asset_ids: Optional[list[int]] = None,
+        broker_ids: Optional[list[int]] = None,
+        ) -> list[FAUnrealizedPnL]:
+        """
+        Unrealized gain/loss of the current open lots, synced first.
+
+        Market value uses the last close in price_history up to as_of (one indexed
+        lookup per asset; asset_latest_prices when as_of is None), converted to the lot
+        currency when the price currency differs. Pairs with transfers are flagged
+        (has_transfers).
+
+        Args:
+            session: Database session
+            as_of: Price date, inclusive (None = latest price)
+            asset_ids: Filter by assets (None = all)
+            broker_ids: Filter by brokers (None = all)
+
+        Returns:
+            List of FAUnrealizedPnL ordered by asset_id, broker_id, currency
+            (market_value/unrealized_pnl None when no price or FX rate is available)
+        """
+        from backend.app.services.fx import convert_bulk
+
+        await LotManager.sync(session)
+        stmt = _filter_pairs(
+            select(PositionLot.asset_id, PositionLot.broker_id, PositionLot.currency, PositionLot.remaining_quantity, PositionLot.unit_cost)
+            .where(PositionLot.remaining_quantity > 0),
+            PositionLot, asset_ids, broker_ids,
+            )
+        totals: dict[tuple[int, int, str], list[Decimal]] = {}
+        for r in (await session.execute(stmt)).all():
+            total = totals.setdefault((r.asset_id, r.broker_id, r.currency), [ZERO, ZERO])
+            total[0] += r.remaining_quantity
+            total[1] += r.remaining_quantity * r.unit_cost
+        if not totals:
+            return []
+
+        asset_ids = {key[0] for key in totals}
+        if as_of is None:
+            price_stmt = (
+                select(AssetLatestPrice.asset_id, AssetLatestPrice.date, AssetLatestPrice.close, AssetLatestPrice.currency)
+                .where(AssetLatestPrice.asset_id.in_(asset_ids))
+            )
+        else:
+            previous = aliased(PriceHistory)
+            last_date = (
+                select(func.max(previous.date))
+                .where(previous.asset_id == PriceHistory.asset_id, previous.close.is_not(None), previous.date <= as_of)
+            )
+            price_stmt = (
+                select(PriceHistory.asset_id, PriceHistory.date, PriceHistory.close, PriceHistory.currency)
+                .where(PriceHistory.asset_id.in_(asset_ids), PriceHistory.date == last_date.scalar_subquery())
+            )
+        prices = {r.asset_id: r for r in (await session.execute(price_stmt)).all()}
+
+        transferred = await _transfer_pairs(session, asset_ids)
+        keys = sorted(totals)
+        priced = [key for key in keys if key[0] in prices]
+        conversions = [
+            (totals[key][0] * prices[key[0]].close, prices[key[0]].currency, key[2], prices[key[0]].date)
+            for key in priced
+            ]
+        converted, _ = await convert_bulk(session, conversions, raise_on_error=False)
+        market_values = {key: (result[0] if result else None) for key, result in zip(priced, converted)}
+
+        results = []
+        for key in keys:
+            quantity, cost = totals[key]
+            market_value = market_values.get(key)
+            results.append(FAUnrealizedPnL(
+                asset_id=key[0], broker_id=key[1], currency=key[2], quantity=quantity, cost_basis=_truncate(cost),
+                price_date=prices[key[0]].date if key[0] in prices else None,
+                market_value=None if market_value is None else _truncate(market_value),
+                unrealized_pnl=None if market_value is None else _truncate(market_value) - _truncate(cost),
+                has_transfers=key[:2] in transferred,
+                ))
+        return results
+
+
+async def _run_command(command: str) -> bool:
+    from backend.app.db.session import get_async_engine
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        if command == "rebuild":
+            result = await LotManager.rebuild(session)
+            print(f"✅ Lots rebuilt: {result.pairs_recomputed} pairs, {result.transactions_replayed} transactions, "
+                  f"{result.lots_written} lots, {result.matches_written} matches")
+            if result.unmatched_quantity:
+                print(f"⚠️  Closed quantity without open lots: {result.unmatched_quantity}")
+            return True
+
+        result = await LotManager.check_consistency(session)
+        if result.consistent:
+            print(f"✅ Lots consistent: {result.pairs_checked} pairs, {result.lots_checked} lots, {result.matches_checked} matches")
+            return True
+        print(f"❌ Lots inconsistent ({len(result.mismatches)} mismatches shown):")
+        for m in result.mismatches:
+            print(f"  asset={m.asset_id} broker={m.broker_id} txn={m.transaction_id} lot={m.lot_transaction_id} "
+                  f"{m.field}: stored={m.stored} expected={m.expected}")
+        print("Run: ./dev.sh db:lots rebuild")
+        return False
+
+
+def main():
+    """FIFO lots maintenance commands (rebuild, check)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="FIFO lots maintenance")
+    parser.add_argument("command", choices=["rebuild", "check"], help="rebuild: full recompute, check: compare with a from-scratch matching")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(_run_command(args.command)) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+Portfolio NAV engine.
+
+Values the whole portfolio day by day in one currency with NumPy, on dense
+(days × assets) matrices, instead of one price lookup per asset and one
+conversion per amount:
+- quantities: daily changes of position_history (synced first), scattered into
+  the matrix and accumulated along the days
+- prices: close of price_history, backward-filled along the days
+- FX: fx_rates from each price currency to the target currency, backward-filled,
+  gathered per cell by the currency of the price it multiplies
+- value = quantity × price × rate, summed per day (totals) or kept per asset
+  (contributions)
+
+Each input is one SQL query returning the matrix row of every value (day
+offset from start), including the last value before start, so the first day
+is backward-filled too. Backward-fill has no time limit (same as convert_bulk).
+The last value before start is read from asset_latest_prices / fx_latest_rates
+when the newest stored point is older than start (current valuations: one
+primary key lookup), from a grouped MAX(date) over the history otherwise.
+
+FX uses the stored direct pair (alphabetical base/quote), like convert_bulk:
+currencies without a rate to the target leave their assets unvalued.
+"""
+from datetime import date as date_type, timedelta
+from itertools import chain
+from typing import Optional, Sequence
+
+import numpy as np
+import structlog
+from sqlalchemy import select, func, case, and_, or_, cast, tuple_, type_coerce, union_all, Float, Integer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import AssetLatestPrice, FxLatestRate, FxRate, PositionHistory, PriceHistory
+from backend.app.schemas.portfolio import FANavContribution, FANavSeries
+from backend.app.services.positions import PositionManager
+
+logger = structlog.get_logger(__name__)
+
+# Quantities are stored with 6 decimals: accumulated float deltas are rounded back to them
+_QUANTITY_DECIMALS = 6
+
+
+def backward_fill_index(known: np.ndarray) -> np.ndarray:
+    """
+    Row of the last known cell on or before each cell, per column.
+
+    Args:
+        known: (days × columns) bool, True where a value is known
+
+    Returns:
+        (days × columns) int64 rows, -1 before the first known value of the column
+    """
+    rows = np.where(known, np.arange(known.shape[0])[:, None], -1)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return rows
+
+
+def backward_fill(values: np.ndarray) -> np.ndarray:
+    """Replace NaN cells with the last non-NaN value above them (leading NaNs stay NaN)."""
+    rows = backward_fill_index(~np.isnan(values))
+    filled = values[np.maximum(rows, 0), np.arange(values.shape[1])]
+    filled[rows < 0] = np.nan
+    return filled
+
+
+def compute_nav(
+    quantity_deltas: np.ndarray,
+    prices: np.ndarray,
+    price_currencies: np.ndarray,
+    fx_rates: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized NAV kernel.
+
+    Args:
+        quantity_deltas: (days × columns) quantity change per day (row 0 includes the quantity held before)
+        prices: (days × columns) prices, NaN where the day has none (row 0 may hold the last price before)
+        price_currencies: (days × columns) int, column of fx_rates of each price (ignored where prices is NaN)
+        fx_rates: (days × currencies) rate from each currency to the target, NaN where the day has none
+
+    Returns:
+        (totals (days,), contributions (days × columns), unvalued (days × columns) bool: quantity held
+        without a price or rate up to that day, counted as 0)
+    """
+    days, columns = prices.shape
+    quantities = np.round(np.cumsum(quantity_deltas, axis=0), _QUANTITY_DECIMALS)
+
+    price_rows = backward_fill_index(~np.isnan(prices))
+    cells = (np.maximum(price_rows, 0), np.arange(columns))
+    rates = backward_fill(fx_rates)[np.arange(days)[:, None], price_currencies[cells]]
+    contributions = quantities * prices[cells] * rates
+
+    missing = np.isnan(contributions) | (price_rows < 0)
+    unvalued = missing & (quantities != 0)
+    contributions[missing] = 0.0
+    return contributions.sum(axis=1), contributions, unvalued
+
+
+def rows_to_matrix(rows: Sequence[Sequence], columns: int) -> np.ndarray:
+    """Numeric result rows as a (rows × columns) float64 matrix (flat copy: np.array probes every Row)."""
+    return np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=len(rows) * columns).reshape(-1, columns)
+
+
+def day_offset(column, start: date_type):
+    """Days from start to a DATE column (negative before start), computed by SQLite."""
+    return cast(func.julianday(column) - func.julianday(start), Integer)
+
+
+async def load_fx_matrix(
+    session: AsyncSession,
+    start_date: date_type,
+    end_date: date_type,
+    currency: str,
+    currencies: list[str],
+    ) -> np.ndarray:
+    """
+    Rates from each currency to the target currency, one row per day (one query).
+
+    Args:
+        session: Database session
+        start_date: First day (row 0)
+        end_date: Last day
+        currency: Target currency
+        currencies: Source currencies (matrix columns, may include the target)
+
+    Returns:
+        (days × currencies) float64: rate of the day, NaN where the day has none (row 0 holds the
+        last rate before start_date; the target column is 1). Backward-fill with backward_fill().
+    """
+    days = (end_date - start_date).days + 1
+    fx_rates = np.full((days, len(currencies)), np.nan)
+    if currency in currencies:
+        fx_rates[0, currencies.index(currency)] = 1.0
+
+    # Stored pair is alphabetical (1 base = rate quote): divide when the target is the base
+    pairs = {tuple(sorted((c, currency))): i for i, c in enumerate(currencies) if c != currency}
+    if not pairs:
+        return fx_rates
+
+    def rate_columns(table):
+        return (
+            case(*((and_(table.base == base, table.quote == quote), i) for (base, quote), i in pairs.items())).label("currency_column"),
+            day_offset(table.date, start_date).label("day"),
+            type_coerce(table.rate, Float),
+            )
+
+    pair_filters = [or_(*(and_(FxRate.base == base, FxRate.quote == quote) for base, quote in pairs))]
+    # Pairs whose newest rate is before start: that rate is the last one before start
+    latest_filters = [or_(*(and_(FxLatestRate.base == base, FxLatestRate.quote == quote) for base, quote in pairs)), FxLatestRate.date < start_date]
+    last_rate = (
+        select(FxRate.base, FxRate.quote, func.max(FxRate.date).label("date"))
+        .where(
+            *pair_filters, FxRate.date < start_date,
+            tuple_(FxRate.base, FxRate.quote).not_in(select(FxLatestRate.base, FxLatestRate.quote).where(*latest_filters)),
+            )
+        .group_by(FxRate.base, FxRate.quote)
+        .subquery()
+    )
+    rate_rows = (await session.execute(
+        union_all(
+            select(*rate_columns(FxLatestRate)).where(*latest_filters),
+            select(*rate_columns(FxRate)).join(last_rate, and_(
+                last_rate.c.base == FxRate.base, last_rate.c.quote == FxRate.quote, last_rate.c.date == FxRate.date,
+                )),
+            select(*rate_columns(FxRate)).where(*pair_filters, FxRate.date >= start_date, FxRate.date <= end_date),
+            ).order_by("currency_column", "day")
+        )).all()
+    if rate_rows:
+        r = rows_to_matrix(rate_rows, 3)
+        columns = r[:, 0].astype(np.int64)
+        inverse = np.array([c > currency for c in currencies])[columns]
+        fx_rates[np.maximum(r[:, 1].astype(np.int64), 0), columns] = np.where(inverse, 1.0 / r[:, 2], r[:, 2])
+    return fx_rates
+
+
+async def value_positions(
+    session: AsyncSession,
+    start_date: date_type,
+    end_date: date_type,
+    currency: str,
+    broker_ids: Optional[list[int]] = None,
+    asset_ids: Optional[list[int]] = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Daily value of every (asset, broker) position over [start_date, end_date] (three queries).
+
+    Reads position_history as stored: callers sync positions first.
+
+    Args:
+        session: Database session
+        start_date: First day (row 0)
+        end_date: Last day
+        currency: Target currency
+        broker_ids: Filter by brokers (None = all)
+        asset_ids: Filter by assets (None = all)
+
+    Returns:
+        (pairs (n × 2) int64 asset_id, broker_id sorted, contributions (days × n), unvalued (days × n))
+        from compute_nav (n = 0 if nothing is held)
+    """
+    days = (end_date - start_date).days + 1
+
+    # Quantities: history rows in the range plus the last row before it, per (asset, broker)
+    ph = PositionHistory
+    filters = [ph.trade_date <= end_date]
+    if broker_ids is not None:
+        filters.append(ph.broker_id.in_(broker_ids))
+    if asset_ids is not None:
+        filters.append(ph.asset_id.in_(asset_ids))
+    last_before = (
+        select(ph.asset_id, ph.broker_id, func.max(ph.trade_date).label("trade_date"))
+        .where(ph.trade_date < start_date, *filters)
+        .group_by(ph.asset_id, ph.broker_id)
+        .subquery()
+    )
+    quantity_columns = (
+        ph.asset_id, ph.broker_id, day_offset(ph.trade_date, start_date).label("day"), type_coerce(ph.quantity, Float),
+        )
+    quantity_rows = (await session.execute(
+        union_all(
+            select(*quantity_columns).join(last_before, and_(
+                last_before.c.asset_id == ph.asset_id,
+                last_before.c.broker_id == ph.broker_id,
+                last_before.c.trade_date == ph.trade_date,
+                )),
+            select(*quantity_columns).where(ph.trade_date >= start_date, *filters),
+            ).order_by("asset_id", "broker_id", "day")
+        )).all()
+    if not quantity_rows:
+        return np.zeros((0, 2), dtype=np.int64), np.zeros((days, 0)), np.zeros((days, 0), dtype=bool)
+
+    q = rows_to_matrix(quantity_rows, 4)
+    row_pairs = q[:, :2].astype(np.int64)
+    new_pair = np.ones(len(q), dtype=bool)
+    new_pair[1:] = (row_pairs[1:] != row_pairs[:-1]).any(axis=1)
+    pairs = row_pairs[new_pair]
+    previous_quantity = np.where(new_pair, 0.0, np.roll(q[:, 3], 1))
+    quantity_deltas = np.zeros((days, len(pairs)))
+    np.add.at(quantity_deltas, (np.maximum(q[:, 2].astype(np.int64), 0), np.cumsum(new_pair) - 1), q[:, 3] - previous_quantity)
+
+    # Prices of the held assets, with the currency of each price as a column of the FX matrix
+    held_assets, pair_assets = np.unique(pairs[:, 0], return_inverse=True)
+    price_filters = [PriceHistory.asset_id.in_(held_assets.tolist()), PriceHistory.close.is_not(None)]
+    currencies = sorted(set((await session.execute(
+        select(PriceHistory.currency).distinct().where(*price_filters, PriceHistory.date <= end_date)
+        )).scalars().all()) | {currency})
+
+    def price_columns(table):
+        return (
+            table.asset_id,
+            day_offset(table.date, start_date).label("day"),
+            type_coerce(table.close, Float),
+            case({c: i for i, c in enumerate(currencies)}, value=table.currency).label("currency_column"),
+            )
+
+    # Assets whose newest price is before start: that price is the last one before start
+    latest_filters = [AssetLatestPrice.asset_id.in_(held_assets.tolist()), AssetLatestPrice.date < start_date]
+    last_price = (
+        select(PriceHistory.asset_id, func.max(PriceHistory.date).label("date"))
+        .where(
+            *price_filters, PriceHistory.date < start_date,
+            PriceHistory.asset_id.not_in(select(AssetLatestPrice.asset_id).where(*latest_filters)),
+            )
+        .group_by(PriceHistory.asset_id)
+        .subquery()
+    )
+    price_rows = (await session.execute(
+        union_all(
+            select(*price_columns(AssetLatestPrice)).where(*latest_filters),
+            select(*price_columns(PriceHistory)).join(last_price, and_(
+                last_price.c.asset_id == PriceHistory.asset_id, last_price.c.date == PriceHistory.date,
+                )),
+            select(*price_columns(PriceHistory)).where(*price_filters, PriceHistory.date >= start_date, PriceHistory.date <= end_date),
+            ).order_by("asset_id", "day")
+        )).all()
+    prices = np.full((days, len(held_assets)), np.nan)
+    price_currencies = np.zeros((days, len(held_assets)), dtype=np.int64)
+    if price_rows:
+        p = rows_to_matrix(price_rows, 4)
+        cells = (np.maximum(p[:, 1].astype(np.int64), 0), np.searchsorted(held_assets, p[:, 0].astype(np.int64)))
+        prices[cells] = p[:, 2]
+        price_currencies[cells] = p[:, 3].astype(np.int64)
+
+    fx_rates = await load_fx_matrix(session, start_date, end_date, currency, currencies)
+    _, contributions, unvalued = compute_nav(
+        quantity_deltas, prices[:, pair_assets], price_currencies[:, pair_assets], fx_rates,
+        )
+    return pairs, contributions, unvalued
+
+
+class PortfolioNavManager:
+    """Daily NAV series of the portfolio (vectorized valuation of positions, prices and FX)."""
+
+    @staticmethod
+    async def get_nav_series(
+        session: AsyncSession,
+        start_date: date_type,
+        end_date: date_type,
+        currency: str,
+        broker_ids: Optional[list[int]] = None,
+        asset_ids: Optional[list[int]] = None,
+        include_contributions: bool = False,
+        ) -> FANavSeries:
+        """
+        Daily value of the held assets over [start_date, end_date] in one currency.
+
+        Args:
+            session: Database session (positions are synced first)
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+            currency: Target currency (ISO 4217)
+            broker_ids: Filter by brokers (None = all)
+            asset_ids: Filter by assets (None = all)
+            include_contributions: Also return the per-asset series (all selected brokers)
+
+        Returns:
+            FANavSeries with one value per calendar day
+
+        Raises:
+            ValueError: If start_date > end_date
+        """
+        if start_date > end_date:
+            raise ValueError(f"Start date {start_date} is after end date {end_date}")
+        await PositionManager.sync(session)
+
+        days = (end_date - start_date).days + 1
+        dates = [start_date + timedelta(days=i) for i in range(days)]
+        pairs, contributions, unvalued = await value_positions(session, start_date, end_date, currency, broker_ids, asset_ids)
+        if not len(pairs):
+            return FANavSeries(currency=currency, dates=dates, totals=[0.0] * days)
+
+        # Pairs are sorted by asset: sum the brokers of each asset
+        held_assets, first_columns = np.unique(pairs[:, 0], return_index=True)
+        asset_values = np.add.reduceat(contributions, first_columns, axis=1)
+        unvalued_assets = np.logical_or.reduceat(unvalued, first_columns, axis=1).any(axis=0)
+
+        result = FANavSeries(
+            currency=currency,
+            dates=dates,
+            totals=asset_values.sum(axis=1).tolist(),
+            contributions=[
+                FANavContribution(asset_id=asset_id, values=asset_values[:, i].tolist())
+                for i, asset_id in enumerate(held_assets.tolist())
+                ] if include_contributions else [],
+            unvalued_asset_ids=held_assets[unvalued_assets].tolist(),
+            )
+        if result.unvalued_asset_ids:
+            logger.warning("NAV series has assets without price or FX rate", currency=currency, asset_ids=result.unvalued_asset_ids)
+        return result
@@ -0,0 +1,393 @@
+"""
+Daily portfolio snapshots.
+
+Persists the daily portfolio value (held assets and cash, per broker and in
+total, in PORTFOLIO_BASE_CURRENCY) in portfolio_daily_snapshots, so reads are
+range scans on (broker_id, snapshot_date) instead of a full valuation.
+
+Invalidation:
+- SQLite triggers on transactions, cash_movements, price_history (assets with a
+  position history) and fx_rates lower portfolio_snapshot_invalidations.from_date to the
+  date of every write, whatever the write path
+- sync() recomputes only the days from that date (or from the day after the
+  last snapshot, to extend the table up to today) with the NAV engine
+  (services/portfolio_nav.py) and the cash balance ledger, replaces them and
+  clears the marker unless a write lowered it meanwhile; cached returns
+  (return_cache, services/returns.py) of periods ending on or after the first
+  recomputed day are deleted in the same transaction
+- an empty table or a change of PORTFOLIO_BASE_CURRENCY recomputes everything
+
+The sync runs in the background (PortfolioSnapshotScheduler, started by the
+FastAPI lifespan): reads report pending_from while days are stale.
+
+Maintenance commands (also via ./dev.sh db:snapshots):
+    python -m backend.app.services.portfolio_snapshots sync      # recompute pending days
+    python -m backend.app.services.portfolio_snapshots rebuild   # recompute everything
+"""
+import asyncio
+import sys
+from datetime import date as date_type, timedelta, timezone
+from typing import Optional
+
+import numpy as np
+import structlog
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy import select, delete, func, and_, union_all, type_coerce, Float
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.config import get_settings
+from backend.app.db.models import (
+    CashAccount,
+    CashBalanceHistory,
+    PortfolioDailySnapshot,
+    PortfolioSnapshotInvalidation,
+    PositionHistory,
+    ReturnCache,
+    )
+from backend.app.db.session import get_session_generator
+from backend.app.schemas.portfolio import (
+    FAPortfolioSnapshot,
+    FAPortfolioSnapshotSeries,
+    FAPortfolioSnapshotSyncResult,
+    )
+from backend.app.services.portfolio_nav import backward_fill, day_offset, load_fx_matrix, rows_to_matrix, value_positions
+from backend.app.services.positions import PositionManager
+from backend.app.utils.datetime_utils import utcnow
+
+logger = structlog.get_logger(__name__)
+
+# Rows per INSERT statement when writing snapshots
+SNAPSHOT_WRITE_CHUNK_SIZE = 5000
+
+# Stored values have the precision of Numeric(18, 6)
+_VALUE_DECIMALS = 6
+
+
+async def _first_activity_dates(session: AsyncSession) -> dict[int, date_type]:
+    """First day with a position or a cash balance, per broker (two grouped queries)."""
+    first: dict[int, date_type] = {}
+    position_rows = (await session.execute(
+        select(PositionHistory.broker_id, func.min(PositionHistory.trade_date)).group_by(PositionHistory.broker_id)
+        )).all()
+    cash_rows = (await session.execute(
+        select(CashAccount.broker_id, func.min(CashBalanceHistory.trade_date))
+        .join(CashAccount, CashAccount.id == CashBalanceHistory.cash_account_id)
+        .group_by(CashAccount.broker_id)
+        )).all()
+    for broker_id, first_date in [*position_rows, *cash_rows]:
+        if broker_id not in first or first_date < first[broker_id]:
+            first[broker_id] = first_date
+    return first
+
+
+async def _value_cash(
+    session: AsyncSession,
+    start_date: date_type,
+    end_date: date_type,
+    currency: str,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Daily value of every cash account over [start_date, end_date] (two queries plus the FX matrix).
+
+    Returns:
+        (broker_id per account (n,), values (days × n), unvalued (days × n): nonzero balance without a rate)
+    """
+    days = (end_date - start_date).days + 1
+    accounts = (await session.execute(
+        select(CashAccount.id, CashAccount.broker_id, CashAccount.currency).order_by(CashAccount.id)
+        )).all()
+    if not accounts:
+        return np.zeros(0, dtype=np.int64), np.zeros((days, 0)), np.zeros((days, 0), dtype=bool)
+    account_ids = np.array([a.id for a in accounts], dtype=np.int64)
+
+    # Ledger rows in the range plus the last row before it, per account
+    cbh = CashBalanceHistory
+    last_before = (
+        select(cbh.cash_account_id, func.max(cbh.trade_date).label("trade_date"))
+        .where(cbh.trade_date < start_date)
+        .group_by(cbh.cash_account_id)
+        .subquery()
+    )
+    balance_columns = (cbh.cash_account_id, day_offset(cbh.trade_date, start_date).label("day"), type_coerce(cbh.balance, Float))
+    balance_rows = (await session.execute(
+        union_all(
+            select(*balance_columns).join(last_before, and_(
+                last_before.c.cash_account_id == cbh.cash_account_id, last_before.c.trade_date == cbh.trade_date,
+                )),
+            select(*balance_columns).where(cbh.trade_date >= start_date, cbh.trade_date <= end_date),
+            ).order_by("cash_account_id", "day")
+        )).all()
+    balances = np.full((days, len(accounts)), np.nan)
+    if balance_rows:
+        b = rows_to_matrix(balance_rows, 3)
+        balances[np.maximum(b[:, 1].astype(np.int64), 0), np.searchsorted(account_ids, b[:, 0].astype(np.int64))] = b[:, 2]
+    balances = np.nan_to_num(backward_fill(balances), nan=0.0)
+
+    currencies = sorted({a.currency for a in accounts} | {currency})
+    fx_rates = backward_fill(await load_fx_matrix(session, start_date, end_date, currency, currencies))
+    rates = fx_rates[:, [currencies.index(a.currency) for a in accounts]]
+    values = balances * rates
+    missing = np.isnan(values)
+    values[missing] = 0.0
+    return np.array([a.broker_id for a in accounts], dtype=np.int64), values, missing & (balances != 0)
+
+
+def _sum_by_broker(brokers: list[int], column_brokers: np.ndarray, values: np.ndarray, unvalued: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sum the columns of each broker: (days × brokers) values and unvalued flags."""
+    one_hot = np.zeros((len(column_brokers), len(brokers)))
+    one_hot[np.arange(len(column_brokers)), np.searchsorted(brokers, column_brokers)] = 1.0
+    return values @ one_hot, (unvalued.astype(np.float64) @ one_hot) > 0
+
+
+class PortfolioSnapshotManager:
+    """Daily portfolio snapshots: incremental recompute, rebuild and range reads."""
+
+    @staticmethod
+    async def get_pending_from(session: AsyncSession) -> Optional[date_type]:
+        """Earliest day waiting for a recompute (None = snapshots up to date with the writes)."""
+        return (await session.execute(
+            select(PortfolioSnapshotInvalidation.from_date).where(PortfolioSnapshotInvalidation.id == 1)
+            )).scalar_one_or_none()
+
+    @staticmethod
+    async def sync(session: AsyncSession, today: Optional[date_type] = None) -> FAPortfolioSnapshotSyncResult:
+        """
+        Recompute the pending days (from the invalidation marker or the day after the last snapshot).
+
+        Args:
+            session: Database session (positions are synced first; committed)
+            today: Last day to snapshot (None = today UTC)
+
+        Returns:
+            FAPortfolioSnapshotSyncResult (from_date None when nothing was pending)
+        """
+        currency = get_settings().PORTFOLIO_BASE_CURRENCY
+        end_date = today or utcnow().date()
+        await PositionManager.sync(session)
+
+        pending = await PortfolioSnapshotManager.get_pending_from(session)
+        last_date, min_currency, max_currency = (await session.execute(
+            select(
+                func.max(PortfolioDailySnapshot.snapshot_date),
+                func.min(PortfolioDailySnapshot.currency),
+                func.max(PortfolioDailySnapshot.currency),
+                )
+            )).one()
+        first_dates = await _first_activity_dates(session)
+
+        full = last_date is None or min_currency != currency or max_currency != currency
+        if not first_dates:
+            from_date = None
+        elif full:
+            from_date = min(first_dates.values())
+        else:
+            from_date = last_date + timedelta(days=1)
+            if pending is not None:
+                from_date = min(from_date, pending)
+            from_date = max(from_date, min(first_dates.values()))
+
+        if from_date is None or from_date > end_date:
+            if full and last_date is not None:
+                await session.execute(delete(PortfolioDailySnapshot))
+            await PortfolioSnapshotManager._consume_pending(session, pending, None, full and last_date is not None)
+            await session.commit()
+            return FAPortfolioSnapshotSyncResult()
+
+        days = (end_date - from_date).days + 1
+        brokers = sorted(first_dates)
+        pairs, asset_values, asset_unvalued = await value_positions(session, from_date, end_date, currency)
+        account_brokers, cash_values, cash_unvalued = await _value_cash(session, from_date, end_date, currency)
+        assets_by_broker, assets_unvalued = _sum_by_broker(brokers, pairs[:, 1], asset_values, asset_unvalued)
+        cash_by_broker, cash_unvalued = _sum_by_broker(brokers, account_brokers, cash_values, cash_unvalued)
+
+        # Broker columns plus the total column (broker_id NULL), rounded to the stored precision
+        assets = np.round(np.column_stack([assets_by_broker, assets_by_broker.sum(axis=1)]), _VALUE_DECIMALS)
+        cash = np.round(np.column_stack([cash_by_broker, cash_by_broker.sum(axis=1)]), _VALUE_DECIMALS)
+        totals = np.round(assets + cash, _VALUE_DECIMALS)
+        unvalued = assets_unvalued | cash_unvalued
+        unvalued = np.column_stack([unvalued, unvalued.any(axis=1)])
+
+        # Broker rows start at the broker's first activity, total rows at from_date
+        dates = [from_date + timedelta(days=i) for i in range(days)]
+        columns = [(b, max((first_dates[b] - from_date).days, 0)) for b in brokers] + [(None, 0)]
+        assets, cash, totals, unvalued = assets.T.tolist(), cash.T.tolist(), totals.T.tolist(), unvalued.T.tolist()
+        rows = [
+            {
+                "snapshot_date": dates[day], "broker_id": broker_id, "currency": currency,
+                "assets_value": assets[column][day], "cash_value": cash[column][day],
+                "total_value": totals[column][day], "unvalued": unvalued[column][day],
+                }
+            for column, (broker_id, first_row) in enumerate(columns)
+            for day in range(first_row, days)
+            ]
+
+        stale = delete(PortfolioDailySnapshot)
+        if not full:
+            stale = stale.where(PortfolioDailySnapshot.snapshot_date >= from_date)
+        await session.execute(stale)
+        for i in range(0, len(rows), SNAPSHOT_WRITE_CHUNK_SIZE):
+            await session.execute(PortfolioDailySnapshot.__table__.insert(), rows[i:i + SNAPSHOT_WRITE_CHUNK_SIZE])
+        await PortfolioSnapshotManager._consume_pending(session, pending, from_date, full)
+        await session.commit()
+
+        logger.info("Portfolio snapshots recomputed", from_date=str(from_date), to_date=str(end_date), rows=len(rows), full=full)
+        return FAPortfolioSnapshotSyncResult(from_date=from_date, to_date=end_date, rows_written=len(rows), full=full)
+
+    @staticmethod
+    async def _consume_pending(
+        session: AsyncSession, pending: Optional[date_type], from_date: Optional[date_type], full: bool,
+        ) -> None:
+        """Drop the cached returns of the recomputed days and the marker (unless a write lowered it after it was read)."""
+        invalid_dates = [d for d in (pending, from_date) if d is not None]
+        if full or invalid_dates:
+            stale_returns = delete(ReturnCache)
+            if not full:
+                stale_returns = stale_returns.where(ReturnCache.end_date >= min(invalid_dates))
+            await session.execute(stale_returns)
+        if pending is not None:
+            await session.execute(delete(PortfolioSnapshotInvalidation).where(
+                PortfolioSnapshotInvalidation.id == 1, PortfolioSnapshotInvalidation.from_date == pending,
+                ))
+
+    @staticmethod
+    async def rebuild(session: AsyncSession, today: Optional[date_type] = None) -> FAPortfolioSnapshotSyncResult:
+        """
+        Drop every snapshot and recompute from the first activity date.
+
+        Args:
+            session: Database session (committed)
+            today: Last day to snapshot (None = today UTC)
+        """
+        await session.execute(delete(PortfolioDailySnapshot))
+        return await PortfolioSnapshotManager.sync(session, today=today)
+
+    @staticmethod
+    async def get_snapshots(
+        session: AsyncSession,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None,
+        broker_id: Optional[int] = None,
+        ) -> FAPortfolioSnapshotSeries:
+        """
+        Stored snapshots of one broker (or the total) in [start_date, end_date] (range scan).
+
+        Args:
+            session: Database session
+            start_date: First day (None = first snapshot)
+            end_date: Last day, inclusive (None = last snapshot)
+            broker_id: Broker (None = all brokers)
+
+        Returns:
+            FAPortfolioSnapshotSeries (pending_from set while days are waiting for a recompute)
+
+        Raises:
+            ValueError: If start_date > end_date
+        """
+        if start_date is not None and end_date is not None and start_date > end_date:
+            raise ValueError(f"Start date {start_date} is after end date {end_date}")
+        stmt = (
+            select(PortfolioDailySnapshot)
+            .where(
+                PortfolioDailySnapshot.broker_id.is_(None) if broker_id is None else PortfolioDailySnapshot.broker_id == broker_id,
+                PortfolioDailySnapshot.currency == get_settings().PORTFOLIO_BASE_CURRENCY,
+                )
+            .order_by(PortfolioDailySnapshot.snapshot_date)
+        )
+        if start_date is not None:
+            stmt = stmt.where(PortfolioDailySnapshot.snapshot_date >= start_date)
+        if end_date is not None:
+            stmt = stmt.where(PortfolioDailySnapshot.snapshot_date <= end_date)
+
+        return FAPortfolioSnapshotSeries(
+            broker_id=broker_id,
+            currency=get_settings().PORTFOLIO_BASE_CURRENCY,
+            pending_from=await PortfolioSnapshotManager.get_pending_from(session),
+            points=[
+                FAPortfolioSnapshot(
+                    snapshot_date=s.snapshot_date, assets_value=s.assets_value, cash_value=s.cash_value,
+                    total_value=s.total_value, unvalued=s.unvalued,
+                    )
+                for s in (await session.execute(stmt)).scalars().all()
+                ],
+            )
+
+
+class PortfolioSnapshotScheduler:
+    """Background job: runs PortfolioSnapshotManager.sync() every tick (lifecycle managed by main.lifespan)."""
+
+    def __init__(self, tick_seconds: int):
+        self.tick_seconds = tick_seconds
+        self._scheduler: Optional[AsyncIOScheduler] = None
+
+    @property
+    def running(self) -> bool:
+        return self._scheduler is not None and self._scheduler.running
+
+    async def run_once(self) -> FAPortfolioSnapshotSyncResult:
+        """Run a single tick: recompute the pending days."""
+        async for session in get_session_generator():
+            return await PortfolioSnapshotManager.sync(session)
+
+    async def _safe_run_once(self) -> None:
+        try:
+            await self.run_once()
+        except Exception as e:
+            logger.error("Scheduled portfolio snapshot sync failed", error=str(e))
+
+    def start(self) -> None:
+        """Start the periodic tick (first tick runs immediately)."""
+        if self.running:
+            return
+        self._scheduler = AsyncIOScheduler(timezone=timezone.utc)
+        self._scheduler.add_job(
+            self._safe_run_once,
+            "interval",
+            seconds=self.tick_seconds,
+            id="portfolio_snapshots",
+            max_instances=1,
+            coalesce=True,
+            next_run_time=utcnow(),
+            )
+        self._scheduler.start()
+        logger.info("Portfolio snapshot scheduler started", tick_seconds=self.tick_seconds)
+
+    def stop(self) -> None:
+        """Stop the periodic tick (in-flight sync is not awaited)."""
+        if not self.running:
+            return
+        self._scheduler.shutdown(wait=False)
+        self._scheduler = None
+        logger.info("Portfolio snapshot scheduler stopped")
+
+
+# Process-wide scheduler instance (started/stopped by main.lifespan)
+portfolio_snapshot_scheduler = PortfolioSnapshotScheduler(tick_seconds=get_settings().PORTFOLIO_SNAPSHOT_TICK_SECONDS)
+
+
+async def _run_command(command: str) -> bool:
+    from backend.app.db.session import get_async_engine
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        if command == "rebuild":
+            result = await PortfolioSnapshotManager.rebuild(session)
+        else:
+            result = await PortfolioSnapshotManager.sync(session)
+        if result.from_date is None:
+            print("✅ Portfolio snapshots up to date")
+        else:
+            print(f"✅ Portfolio snapshots recomputed from {result.from_date} to {result.to_date}: {result.rows_written} rows")
+        return True
+
+
+def main():
+    """Portfolio snapshot maintenance commands (sync, rebuild)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Portfolio snapshot maintenance")
+    parser.add_argument("command", choices=["sync", "rebuild"], help="sync: recompute pending days, rebuild: recompute everything")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(_run_command(args.command)) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,621 @@
+"""
+Positions engine.
+
+Materializes holdings per (asset, broker) from transactions:
+- position_history: running (quantity, cost_basis) at the end of each trade date
+- positions: current position (last history row)
+
+Incremental maintenance:
+- SQLite triggers on transactions record the earliest affected trade_date per
+  (asset, broker) in position_invalidations (insert, update, delete, and
+  deletes cascaded from cash_movements), whatever the write path
+- sync() replays only those pairs, only from the recorded date: it starts from
+  the last stored history row before it and rewrites the rows after it
+- readers call sync() first, so queries never see stale positions
+
+Cost basis uses the average cost method (transaction currency):
+- BUY, ADD_HOLDING, TRANSFER_IN add quantity * price (price NULL counts as 0)
+- SELL, REMOVE_HOLDING, TRANSFER_OUT remove the average cost of the quantity sold
+
+Oversell guard (validate_batch): a transaction batch is sorted by
+(asset, broker, trade_date, batch order) and merged with the stored running
+quantities in one linear pass; every batch row and every later stored day is
+checked, so a large broker import is validated in a single sweep.
+
+Maintenance commands (also via ./dev.sh db:positions):
+    python -m backend.app.services.positions rebuild   # full recompute
+    python -m backend.app.services.positions check     # compare with a from-scratch replay
+
+Design principles:
+- Set-based: a sync is a fixed number of statements, whatever the number of pairs
+- Replay is pure (replay_transactions), shared by sync and the consistency checker
+"""
+import asyncio
+import sys
+from datetime import date as date_type
+from decimal import Decimal, ROUND_DOWN
+from itertools import groupby
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+import structlog
+from sqlalchemy import select, delete, exists, func, tuple_, and_, literal, column, values, Date, Integer
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from backend.app.db.models import (
+    Position,
+    PositionHistory,
+    PositionInvalidation,
+    Transaction,
+    TransactionType,
+    TRANSACTION_QUANTITY_SIGN,
+    )
+from backend.app.schemas.positions import (
+    FAOversellCheckResult,
+    FAOversellViolation,
+    FAPosition,
+    FAPositionCheckResult,
+    FAPositionMismatch,
+    FAPositionSyncResult,
+    )
+from backend.app.utils.datetime_utils import utcnow
+from backend.app.utils.decimal_utils import get_model_column_precision
+
+logger = structlog.get_logger(__name__)
+
+# Rows per executemany batch when writing position history
+HISTORY_WRITE_CHUNK_SIZE = 5000
+# Keys per DELETE statement when clearing processed invalidations (3 params/key)
+INVALIDATION_DELETE_CHUNK_SIZE = 500
+# (asset, broker) pairs per history read of validate_batch (3 params/pair)
+OVERSELL_PAIR_CHUNK_SIZE = 500
+# Mismatches reported by check_consistency (the check itself covers all rows)
+MAX_REPORTED_MISMATCHES = 100
+
+ZERO = Decimal("0")
+
+
+# Truncation quantum of quantity/cost_basis columns (same as truncate_to_db_precision)
+_QUANTUM = Decimal(10) ** -get_model_column_precision(PositionHistory, "quantity")[1]
+
+
+def _truncate(value: Decimal) -> Decimal:
+    return value.quantize(_QUANTUM, rounding=ROUND_DOWN)
+
+
+def apply_transaction(
+    quantity: Decimal,
+    cost_basis: Decimal,
+    txn_type: TransactionType,
+    txn_quantity: Decimal,
+    price: Optional[Decimal],
+    ) -> tuple[Decimal, Decimal]:
+    """
+    Apply one quantity-affecting transaction to a running position.
+
+    Args:
+        quantity: Held quantity before the transaction
+        cost_basis: Average cost of the held quantity before the transaction
+        txn_type: Transaction type (key of TRANSACTION_QUANTITY_SIGN)
+        txn_quantity: Transaction quantity (positive)
+        price: Unit price (None for ADD_HOLDING/TRANSFER_IN without price)
+
+    Returns:
+        (quantity, cost_basis) after the transaction
+    """
+    if TRANSACTION_QUANTITY_SIGN[txn_type] > 0:
+        return quantity + txn_quantity, cost_basis + txn_quantity * (price or ZERO)
+
+    if quantity > 0:
+        removed = min(txn_quantity, quantity)
+        cost_basis -= cost_basis * removed / quantity
+    quantity -= txn_quantity
+    if quantity <= 0:
+        cost_basis = ZERO  # Closed (or oversold) position carries no cost
+    return quantity, cost_basis
+
+
+def replay_transactions(
+    rows: Iterable,
+    start_states: dict[tuple[int, int], tuple[Decimal, Decimal]],
+    ) -> dict[tuple[int, int], list[tuple[date_type, Decimal, Decimal]]]:
+    """
+    Replay quantity-affecting transactions into end-of-day running positions.
+
+    Args:
+        rows: (asset_id, broker_id, trade_date, type, quantity, price),
+              sorted by asset_id, broker_id, trade_date, id
+        start_states: (asset_id, broker_id) -> (quantity, cost_basis) before the first row
+                      (missing pairs start from zero)
+
+    Returns:
+        (asset_id, broker_id) -> [(trade_date, quantity, cost_basis)], one entry per trade date,
+        values truncated to DB precision (same values a later replay starts from)
+    """
+    history: dict[tuple[int, int], list[tuple[date_type, Decimal, Decimal]]] = {}
+    for key, key_rows in groupby(rows, key=lambda r: (r[0], r[1])):
+        quantity, cost_basis = start_states.get(key, (ZERO, ZERO))
+        days = history.setdefault(key, [])
+        for trade_date, day_rows in groupby(key_rows, key=lambda r: r[2]):
+            for _, _, _, txn_type, txn_quantity, price in day_rows:
+                quantity, cost_basis = apply_transaction(quantity, cost_basis, txn_type, txn_quantity, price)
+            quantity = _truncate(quantity)
+            cost_basis = _truncate(cost_basis)
+            days.append((trade_date, quantity, cost_basis))
+    return history
+
+
+def find_oversells(
+    batch: Iterable[tuple[int, int, date_type, int, Decimal]],
+    stored: dict[tuple[int, int], tuple[Decimal, list[tuple[date_type, Decimal]]]],
+    ) -> list[FAOversellViolation]:
+    """
+    Merge a batch with stored running quantities and report every negative position (one pass).
+
+    Batch rows of a trade_date are applied after the stored transactions of that date
+    (they get higher ids), so a stored end-of-day quantity is taken before them.
+
+    Args:
+        batch: (asset_id, broker_id, trade_date, index, signed_quantity),
+               sorted by asset_id, broker_id, trade_date, index
+        stored: (asset_id, broker_id) -> (quantity before the first batch date,
+                [(trade_date, quantity)] end-of-day quantities from the first batch date, ascending)
+                (missing pairs start from zero without history)
+
+    Returns:
+        Violations: batch rows (index set) whose running quantity goes below zero, and for each
+        pair the first later stored day (index None) that a batch row would turn negative
+    """
+    violations: list[FAOversellViolation] = []
+    for key, key_rows in groupby(batch, key=lambda r: (r[0], r[1])):
+        base, days = stored.get(key, (ZERO, []))
+        delta = ZERO  # Cumulative batch quantity applied so far
+        stored_reported = False
+        i = 0
+
+        def advance(until: Optional[date_type]):
+            """Take the stored days up to until (all if None), checking them against the batch so far."""
+            nonlocal base, i, stored_reported
+            while i < len(days) and (until is None or days[i][0] <= until):
+                trade_date, base = days[i]
+                i += 1
+                if not stored_reported and base + delta < 0 <= base:
+                    violations.append(FAOversellViolation(
+                        asset_id=key[0], broker_id=key[1], trade_date=trade_date, index=None, quantity=base + delta,
+                        ))
+                    stored_reported = True
+
+        for _, _, trade_date, index, signed_quantity in key_rows:
+            advance(trade_date)
+            delta += signed_quantity
+            if signed_quantity < 0 and base + delta < 0:
+                violations.append(FAOversellViolation(
+                    asset_id=key[0], broker_id=key[1], trade_date=trade_date, index=index, quantity=base + delta,
+                    ))
+        advance(None)
+    return violations
+
+
+def _transaction_rows_query():
+    """Quantity-affecting transactions in replay order."""
+    return (
+        select(
+            Transaction.asset_id, Transaction.broker_id, Transaction.trade_date,
+            Transaction.type, Transaction.quantity, Transaction.price,
+            )
+        .where(Transaction.type.in_(list(TRANSACTION_QUANTITY_SIGN)))
+        .order_by(Transaction.asset_id, Transaction.broker_id, Transaction.trade_date, Transaction.id)
+    )
+
+
+class PositionManager:
+    """Materialized positions: incremental sync, queries, rebuild and consistency check."""
+
+    @staticmethod
+    async def sync(session: AsyncSession) -> FAPositionSyncResult:
+        """
+        Replay every invalidated (asset, broker) pair from its earliest affected trade_date.
+
+        Statements (independent of the number of pairs, except write chunking):
+        1. read invalidations
+        2. read start states (last history row before from_date)
+        3. read transactions from from_date
+        4. delete history rows from from_date, insert replayed rows
+        5. rebuild positions rows of the replayed pairs from history
+        6. clear processed invalidations, commit
+
+        Args:
+            session: Database session (committed on success)
+
+        Returns:
+            FAPositionSyncResult with counts (all zero if nothing was invalidated)
+        """
+        invalidations = (await session.execute(
+            select(PositionInvalidation.asset_id, PositionInvalidation.broker_id, PositionInvalidation.from_date)
+            )).all()
+        if not invalidations:
+            return FAPositionSyncResult(pairs_replayed=0, transactions_replayed=0, history_rows_written=0)
+
+        inv = PositionInvalidation
+        pairs_invalidated = select(inv.asset_id, inv.broker_id)
+
+        # Start state: last history row before from_date
+        previous = aliased(PositionHistory)
+        last_before = (
+            select(func.max(previous.trade_date))
+            .where(previous.asset_id == inv.asset_id, previous.broker_id == inv.broker_id, previous.trade_date < inv.from_date)
+            .scalar_subquery()
+        )
+        start_rows = (await session.execute(
+            select(PositionHistory.asset_id, PositionHistory.broker_id, PositionHistory.quantity, PositionHistory.cost_basis)
+            .join(inv, and_(inv.asset_id == PositionHistory.asset_id, inv.broker_id == PositionHistory.broker_id))
+            .where(PositionHistory.trade_date == last_before)
+            )).all()
+        start_states = {(r.asset_id, r.broker_id): (r.quantity, r.cost_basis) for r in start_rows}
+
+        txn_rows = (await session.execute(
+            _transaction_rows_query().join(inv, and_(
+                inv.asset_id == Transaction.asset_id,
+                inv.broker_id == Transaction.broker_id,
+                Transaction.trade_date >= inv.from_date,
+                ))
+            )).all()
+        history = replay_transactions(txn_rows, start_states)
+
+        # Rewrite history from each from_date
+        await session.execute(
+            delete(PositionHistory).where(exists(select(1).where(
+                inv.asset_id == PositionHistory.asset_id,
+                inv.broker_id == PositionHistory.broker_id,
+                PositionHistory.trade_date >= inv.from_date,
+                )))
+            )
+        values = [
+            {"asset_id": asset_id, "broker_id": broker_id, "trade_date": trade_date, "quantity": quantity, "cost_basis": cost_basis}
+            for (asset_id, broker_id), days in history.items()
+            for trade_date, quantity, cost_basis in days
+            ]
+        for i in range(0, len(values), HISTORY_WRITE_CHUNK_SIZE):
+            await session.execute(insert(PositionHistory), values[i:i + HISTORY_WRITE_CHUNK_SIZE])
+
+        # Positions of replayed pairs = last history row (pairs without history are removed)
+        removed = (await session.execute(
+            delete(Position)
+            .where(tuple_(Position.asset_id, Position.broker_id).in_(pairs_invalidated))
+            .returning(Position.asset_id, Position.broker_id)
+            )).all()
+        bounds = (
+            select(
+                PositionHistory.asset_id.label("asset_id"),
+                PositionHistory.broker_id.label("broker_id"),
+                func.min(PositionHistory.trade_date).label("first_trade_date"),
+                func.max(PositionHistory.trade_date).label("last_trade_date"),
+                )
+            .where(tuple_(PositionHistory.asset_id, PositionHistory.broker_id).in_(pairs_invalidated))
+            .group_by(PositionHistory.asset_id, PositionHistory.broker_id)
+            .subquery()
+        )
+        await session.execute(
+            insert(Position).from_select(
+                ["asset_id", "broker_id", "quantity", "cost_basis", "first_trade_date", "last_trade_date", "updated_at"],
+                select(
+                    PositionHistory.asset_id, PositionHistory.broker_id, PositionHistory.quantity, PositionHistory.cost_basis,
+                    bounds.c.first_trade_date, bounds.c.last_trade_date, literal(utcnow()),
+                    ).join(bounds, and_(
+                    bounds.c.asset_id == PositionHistory.asset_id,
+                    bounds.c.broker_id == PositionHistory.broker_id,
+                    bounds.c.last_trade_date == PositionHistory.trade_date,
+                    )),
+                )
+            )
+        remaining = set(start_states) | set(history)
+        positions_removed = sum(1 for r in removed if (r.asset_id, r.broker_id) not in remaining)
+
+        # Clear processed invalidations (exact from_date: a lower one written meanwhile stays)
+        processed = [(r.asset_id, r.broker_id, r.from_date) for r in invalidations]
+        for i in range(0, len(processed), INVALIDATION_DELETE_CHUNK_SIZE):
+            await session.execute(
+                delete(inv).where(tuple_(inv.asset_id, inv.broker_id, inv.from_date).in_(processed[i:i + INVALIDATION_DELETE_CHUNK_SIZE]))
+                )
+        await session.commit()
+
+        result = FAPositionSyncResult(
+            pairs_replayed=len(invalidations),
+            transactions_replayed=len(txn_rows),
+            history_rows_written=len(values),
+            positions_removed=positions_removed,
+            )
+        logger.info("Positions synced", **result.model_dump())
+        return result
+
+    @staticmethod
+    async def rebuild(session: AsyncSession) -> FAPositionSyncResult:
+        """
+        Full rebuild: drop all materialized rows and replay every pair from its first transaction.
+
+        Args:
+            session: Database session (committed)
+
+        Returns:
+            FAPositionSyncResult of the full replay
+        """
+        await session.execute(delete(PositionHistory))
+        await session.execute(delete(Position))
+        await session.execute(delete(PositionInvalidation))
+        await session.execute(
+            insert(PositionInvalidation).from_select(
+                ["asset_id", "broker_id", "from_date"],
+                select(Transaction.asset_id, Transaction.broker_id, func.min(Transaction.trade_date))
+                .where(Transaction.type.in_(list(TRANSACTION_QUANTITY_SIGN)))
+                .group_by(Transaction.asset_id, Transaction.broker_id),
+                )
+            )
+        return await PositionManager.sync(session)
+
+    @staticmethod
+    async def check_consistency(session: AsyncSession, sync_first: bool = True) -> FAPositionCheckResult:
+        """
+        Compare materialized positions with a from-scratch replay of all transactions.
+
+        Args:
+            session: Database session
+            sync_first: Apply pending invalidations before checking (False checks the
+                        stored rows as they are, pending pairs then show as mismatches)
+
+        Returns:
+            FAPositionCheckResult (consistent=False with mismatches on any difference)
+        """
+        if sync_first:
+            await PositionManager.sync(session)
+
+        expected = replay_transactions((await session.execute(_transaction_rows_query())).all(), {})
+        stored_rows = (await session.execute(
+            select(PositionHistory.asset_id, PositionHistory.broker_id, PositionHistory.trade_date,
+                   PositionHistory.quantity, PositionHistory.cost_basis)
+            .order_by(PositionHistory.asset_id, PositionHistory.broker_id, PositionHistory.trade_date)
+            )).all()
+        stored: dict[tuple[int, int], list[tuple[date_type, Decimal, Decimal]]] = {}
+        for r in stored_rows:
+            stored.setdefault((r.asset_id, r.broker_id), []).append((r.trade_date, r.quantity, r.cost_basis))
+        stored_positions = {
+            (p.asset_id, p.broker_id): p
+            for p in (await session.execute(select(Position))).scalars().all()
+            }
+
+        mismatches: list[FAPositionMismatch] = []
+
+        def report(key, trade_date, field, stored_value, expected_value):
+            mismatches.append(FAPositionMismatch(
+                asset_id=key[0], broker_id=key[1], trade_date=trade_date, field=field,
+                stored=None if stored_value is None else str(stored_value),
+                expected=None if expected_value is None else str(expected_value),
+                ))
+
+        for key in sorted(set(expected) | set(stored) | set(stored_positions)):
+            expected_days = {d: (q, c) for d, q, c in expected.get(key, [])}
+            stored_days = {d: (q, c) for d, q, c in stored.get(key, [])}
+            for trade_date in sorted(set(expected_days) | set(stored_days)):
+                exp, got = expected_days.get(trade_date), stored_days.get(trade_date)
+                if exp is None or got is None:
+                    report(key, trade_date, "row", got and got[0], exp and exp[0])
+                    continue
+                if exp[0] != got[0]:
+                    report(key, trade_date, "quantity", got[0], exp[0])
+                if exp[1] != got[1]:
+                    report(key, trade_date, "cost_basis", got[1], exp[1])
+
+            position = stored_positions.get(key)
+            last = expected.get(key, [])[-1:] or [None]
+            last = last[0]
+            if position is None or last is None:
+                if position is not None or last is not None:
+                    report(key, None, "row", position and position.quantity, last and last[1])
+                continue
+            if position.quantity != last[1]:
+                report(key, None, "quantity", position.quantity, last[1])
+            if position.cost_basis != last[2]:
+                report(key, None, "cost_basis", position.cost_basis, last[2])
+            if position.last_trade_date != last[0]:
+                report(key, None, "last_trade_date", position.last_trade_date, last[0])
+
+        result = FAPositionCheckResult(
+            consistent=not mismatches,
+            pairs_checked=len(set(expected) | set(stored)),
+            history_rows_checked=len(stored_rows),
+            mismatches=mismatches[:MAX_REPORTED_MISMATCHES],
+            )
+        if mismatches:
+            logger.warning("Positions inconsistent with transactions", mismatch_count=len(mismatches))
+        return result
+
+    @staticmethod
+    async def validate_batch(session: AsyncSession, rows: Sequence[Mapping[str, Any]]) -> FAOversellCheckResult:
+        """
+        Oversell guard for a batch of new transactions (synced first).
+
+        The batch is sorted by (asset, broker, trade_date, batch order) and merged with the
+        stored end-of-day quantities in one linear pass (find_oversells). History is read once
+        per chunk of pairs: for each pair, from the last row before its first batch date.
+
+        Args:
+            session: Database session
+            rows: Transactions to insert, as mappings with asset_id, broker_id, type, quantity,
+                  trade_date (the rows passed to insert(Transaction)); not yet written
+
+        Returns:
+            FAOversellCheckResult (valid=False with violations if any running quantity goes below zero)
+        """
+        await PositionManager.sync(session)
+
+        batch = []
+        first_dates: dict[tuple[int, int], date_type] = {}
+        for index, row in enumerate(rows):
+            sign = TRANSACTION_QUANTITY_SIGN.get(TransactionType(row["type"]))
+            if sign is None:
+                continue
+            key = (row["asset_id"], row["broker_id"])
+            trade_date = row["trade_date"]
+            batch.append((key[0], key[1], trade_date, index, sign * Decimal(str(row["quantity"]))))
+            if key not in first_dates or trade_date < first_dates[key]:
+                first_dates[key] = trade_date
+        batch.sort(key=lambda r: r[:4])
+
+        # Stored quantities per pair: last row before its first batch date, then every later row
+        stored: dict[tuple[int, int], tuple[Decimal, list[tuple[date_type, Decimal]]]] = {}
+        pairs = [(asset_id, broker_id, from_date) for (asset_id, broker_id), from_date in first_dates.items()]
+        for i in range(0, len(pairs), OVERSELL_PAIR_CHUNK_SIZE):
+            bounds = values(
+                column("asset_id", Integer), column("broker_id", Integer), column("from_date", Date), name="batch_pairs",
+                ).data(pairs[i:i + OVERSELL_PAIR_CHUNK_SIZE]).cte()
+            previous = aliased(PositionHistory)
+            last_before = (
+                select(func.max(previous.trade_date))
+                .where(previous.asset_id == bounds.c.asset_id, previous.broker_id == bounds.c.broker_id,
+                       previous.trade_date < bounds.c.from_date)
+                .scalar_subquery()
+            )
+            history_rows = (await session.execute(
+                select(PositionHistory.asset_id, PositionHistory.broker_id, PositionHistory.trade_date, PositionHistory.quantity)
+                .join(bounds, and_(
+                    bounds.c.asset_id == PositionHistory.asset_id,
+                    bounds.c.broker_id == PositionHistory.broker_id,
+                    PositionHistory.trade_date >= func.coalesce(last_before, bounds.c.from_date),
+                    ))
+                .order_by(PositionHistory.asset_id, PositionHistory.broker_id, PositionHistory.trade_date)
+                )).all()
+            for key, key_rows in groupby(history_rows, key=lambda r: (r.asset_id, r.broker_id)):
+                days = [(r.trade_date, r.quantity) for r in key_rows]
+                if days[0][0] < first_dates[key]:
+                    stored[key] = (days[0][1], days[1:])
+                else:
+                    stored[key] = (ZERO, days)
+
+        violations = find_oversells(batch, stored)
+        result = FAOversellCheckResult(
+            valid=not violations, rows_checked=len(rows), pairs_checked=len(first_dates), violations=violations,
+            )
+        if violations:
+            logger.warning("Transaction batch oversells positions", violation_count=len(violations), rows=len(rows))
+        return result
+
+    @staticmethod
+    async def get_positions(
+        session: AsyncSession,
+        asset_ids: Optional[list[int]] = None,
+        broker_ids: Optional[list[int]] = None,
+        include_closed: bool = False,
+        ) -> list[FAPosition]:
+        """
+        Current positions (synced first).
+
+        Args:
+            session: Database session
+            asset_ids: Filter by assets (None = all)
+            broker_ids: Filter by brokers (None = all)
+            include_closed: Include positions with quantity 0
+
+        Returns:
+            List of FAPosition ordered by asset_id, broker_id
+        """
+        await PositionManager.sync(session)
+        stmt = select(Position).order_by(Position.asset_id, Position.broker_id)
+        if asset_ids is not None:
+            stmt = stmt.where(Position.asset_id.in_(asset_ids))
+        if broker_ids is not None:
+            stmt = stmt.where(Position.broker_id.in_(broker_ids))
+        if not include_closed:
+            stmt = stmt.where(Position.quantity != 0)
+        return [
+            FAPosition(
+                asset_id=p.asset_id, broker_id=p.broker_id, quantity=p.quantity, cost_basis=p.cost_basis,
+                first_trade_date=p.first_trade_date, last_trade_date=p.last_trade_date,
+                )
+            for p in (await session.execute(stmt)).scalars().all()
+            ]
+
+    @staticmethod
+    async def get_positions_at(
+        as_of: date_type,
+        session: AsyncSession,
+        asset_ids: Optional[list[int]] = None,
+        broker_ids: Optional[list[int]] = None,
+        include_closed: bool = False,
+        ) -> list[FAPosition]:
+        """
+        Positions at the end of a date (synced first).
+
+        One indexed lookup per pair: last position_history row with trade_date <= as_of
+        (uq_position_history_asset_broker_date index).
+
+        Args:
+            as_of: Date (inclusive)
+            session: Database session
+            asset_ids: Filter by assets (None = all)
+            broker_ids: Filter by brokers (None = all)
+            include_closed: Include positions with quantity 0
+
+        Returns:
+            List of FAPosition ordered by asset_id, broker_id (pairs without trades up to as_of are omitted)
+        """
+        await PositionManager.sync(session)
+        previous = aliased(PositionHistory)
+        last_until = (
+            select(func.max(previous.trade_date))
+            .where(previous.asset_id == Position.asset_id, previous.broker_id == Position.broker_id, previous.trade_date <= as_of)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(PositionHistory, Position.first_trade_date)
+            .join(Position, and_(Position.asset_id == PositionHistory.asset_id, Position.broker_id == PositionHistory.broker_id))
+            .where(PositionHistory.trade_date == last_until)
+            .order_by(PositionHistory.asset_id, PositionHistory.broker_id)
+        )
+        if asset_ids is not None:
+            stmt = stmt.where(Position.asset_id.in_(asset_ids))
+        if broker_ids is not None:
+            stmt = stmt.where(Position.broker_id.in_(broker_ids))
+        if not include_closed:
+            stmt = stmt.where(PositionHistory.quantity != 0)
+        return [
+            FAPosition(
+                asset_id=h.asset_id, broker_id=h.broker_id, quantity=h.quantity, cost_basis=h.cost_basis,
+                first_trade_date=first_trade_date, last_trade_date=h.trade_date,
+                )
+            for h, first_trade_date in (await session.execute(stmt)).all()
+            ]
+
+
+async def _run_command(command: str) -> bool:
+    from backend.app.db.session import get_async_engine
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        if command == "rebuild":
+            result = await PositionManager.rebuild(session)
+            print(f"✅ Positions rebuilt: {result.pairs_replayed} pairs, "
+                  f"{result.transactions_replayed} transactions, {result.history_rows_written} history rows")
+            return True
+
+        result = await PositionManager.check_consistency(session)
+        if result.consistent:
+            print(f"✅ Positions consistent: {result.pairs_checked} pairs, {result.history_rows_checked} history rows")
+            return True
+        print(f"❌ Positions inconsistent ({len(result.mismatches)} mismatches shown):")
+        for m in result.mismatches:
+            print(f"  asset={m.asset_id} broker={m.broker_id} date={m.trade_date} {m.field}: stored={m.stored} expected={m.expected}")
+        print("Run: ./dev.sh db:positions rebuild")
+        return False
+
+
+def main():
+    """Positions maintenance commands (rebuild, check)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Materialized positions maintenance")
+    parser.add_argument("command", choices=["rebuild", "check"], help="rebuild: full recompute, check: compare with a from-scratch replay")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(_run_command(args.command)) else 1)
+
+
+if __name__ == "__main__":
+    main()
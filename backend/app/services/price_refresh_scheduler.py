@@ -0,0 +1,281 @@
+"""
+Background price refresh scheduler.
+
+Keeps asset prices fresh without manual calls to POST /assets/prices/refresh.
+
+How it works:
+- Every tick (PRICE_REFRESH_TICK_SECONDS) the queue is rebuilt from
+  asset_provider_assignments: one entry per asset, keyed by staleness
+  (due_at = last_fetch_at + fetch_interval, never fetched = due immediately)
+- Entries are popped from a min-heap (most stale first) until the batch is full
+- Per-provider budget: at most provider.refresh_budget assets per tick
+- Market-hour hint: outside provider.market_hours an asset is refreshed once
+  after the last close, then deferred until the next open
+- The batch is fed to AssetSourceManager.bulk_refresh_prices_incremental()
+- Failed assets are retried after PRICE_REFRESH_RETRY_MINUTES instead of every tick
+
+The DB (last_fetch_at) is the source of truth: the in-memory state is only the
+retry backoff map and run statistics, so restarts lose nothing important.
+
+Lifecycle is managed by the FastAPI lifespan (see main.py).
+"""
+import heapq
+from datetime import datetime, timedelta, timezone, time as time_type
+from typing import Optional
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.config import get_settings
+from backend.app.db.models import AssetProviderAssignment
+from backend.app.db.session import get_session_generator
+from backend.app.logging_config import get_logger
+from backend.app.schemas.refresh import FARefreshSchedulerStatus
+from backend.app.services.asset_source import AssetSourceManager, DEFAULT_FETCH_INTERVAL_MINUTES
+from backend.app.services.provider_registry import AssetProviderRegistry
+from backend.app.utils.datetime_utils import utcnow
+
+logger = get_logger(__name__)
+
+# Due time for assets never fetched (always first in queue)
+NEVER_FETCHED = datetime.min.replace(tzinfo=timezone.utc)
+
+# Queue entry: (due_at, asset_id, provider_code, last_fetch_at)
+QueueEntry = tuple[datetime, int, str, Optional[datetime]]
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """SQLite returns naive datetimes: stored values are UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def is_market_open(hours: tuple[time_type, time_type], now: datetime) -> bool:
+    """Check if now (UTC) falls in the Monday-Friday trading window."""
+    open_time, close_time = hours
+    return now.weekday() < 5 and open_time <= now.time() < close_time
+
+
+def last_market_close(hours: tuple[time_type, time_type], now: datetime) -> datetime:
+    """Return the most recent weekday close (UTC) at or before now."""
+    close_time = hours[1]
+    for days_back in range(8):
+        day = (now - timedelta(days=days_back)).date()
+        if day.weekday() >= 5:
+            continue
+        close_dt = datetime.combine(day, close_time, tzinfo=timezone.utc)
+        if close_dt <= now:
+            return close_dt
+    return now  # Unreachable: a weekday always exists in the last 8 days
+
+
+class PriceRefreshScheduler:
+    """
+    Staleness-prioritized price refresh scheduler.
+
+    The queue building and batch selection are plain methods so they can be
+    tested without running the APScheduler loop.
+    """
+
+    def __init__(self, tick_seconds: int, batch_size: int, retry_minutes: int):
+        self.tick_seconds = tick_seconds
+        self.batch_size = batch_size
+        self.retry_minutes = retry_minutes
+
+        self._scheduler: Optional[AsyncIOScheduler] = None
+        # asset_id -> earliest retry time after a failed refresh
+        self._retry_after: dict[int, datetime] = {}
+
+        # Statistics of last tick (exposed via status endpoint)
+        self.last_run_at: Optional[datetime] = None
+        self.last_batch_size = 0
+        self.last_failed_count = 0
+
+    @property
+    def running(self) -> bool:
+        return self._scheduler is not None and self._scheduler.running
+
+    # ========================================================================
+    # QUEUE
+    # ========================================================================
+
+    async def build_queue(self, session: AsyncSession) -> list[QueueEntry]:
+        """
+        Load all provider assignments as a staleness min-heap (1 query).
+
+        Returns:
+            Heap of (due_at, asset_id, provider_code, last_fetch_at)
+        """
+        stmt = select(
+            AssetProviderAssignment.asset_id,
+            AssetProviderAssignment.provider_code,
+            AssetProviderAssignment.last_fetch_at,
+            AssetProviderAssignment.fetch_interval,
+            )
+        rows = (await session.execute(stmt)).all()
+
+        queue: list[QueueEntry] = []
+        for asset_id, provider_code, last_fetch_at, fetch_interval in rows:
+            last_fetch_at = _as_utc(last_fetch_at)
+            if last_fetch_at is None:
+                due_at = NEVER_FETCHED
+            else:
+                due_at = last_fetch_at + timedelta(minutes=fetch_interval or DEFAULT_FETCH_INTERVAL_MINUTES)
+            retry_at = self._retry_after.get(asset_id)
+            if retry_at is not None and retry_at > due_at:
+                due_at = retry_at
+            queue.append((due_at, asset_id, provider_code, last_fetch_at))
+
+        heapq.heapify(queue)
+        return queue
+
+    def select_batch(self, queue: list[QueueEntry], now: datetime) -> tuple[list[int], int]:
+        """
+        Pop due entries (most stale first) respecting batch size, provider budgets and market hours.
+
+        Entries over budget stay due and are picked up on a following tick.
+
+        Args:
+            queue: Heap built by build_queue() (consumed)
+            now: Current UTC datetime
+
+        Returns:
+            (asset_ids to refresh, number of entries deferred by market hours)
+        """
+        batch: list[int] = []
+        deferred = 0
+        used_budget: dict[str, int] = {}
+        providers: dict[str, object] = {}
+
+        while queue and queue[0][0] <= now and len(batch) < self.batch_size:
+            _, asset_id, provider_code, last_fetch_at = heapq.heappop(queue)
+
+            if provider_code not in providers:
+                providers[provider_code] = AssetProviderRegistry.get_provider_instance(provider_code)
+            provider = providers[provider_code]
+            if provider is None:
+                # Unknown provider: let refresh report the error, no special handling
+                batch.append(asset_id)
+                continue
+
+            hours = provider.market_hours
+            if hours and not is_market_open(hours, now):
+                if last_fetch_at is not None and last_fetch_at >= last_market_close(hours, now):
+                    deferred += 1
+                    continue
+
+            if used_budget.get(provider_code, 0) >= provider.refresh_budget:
+                continue
+            used_budget[provider_code] = used_budget.get(provider_code, 0) + 1
+            batch.append(asset_id)
+
+        return batch, deferred
+
+    # ========================================================================
+    # EXECUTION
+    # ========================================================================
+
+    async def run_once(self) -> None:
+        """Run a single scheduler tick: pick the stalest due assets and refresh them."""
+        now = utcnow()
+        async for session in get_session_generator():
+            queue = await self.build_queue(session)
+            batch, deferred = self.select_batch(queue, now)
+
+            self.last_run_at = now
+            self.last_batch_size = len(batch)
+            self.last_failed_count = 0
+            if not batch:
+                return
+
+            logger.info("Scheduled price refresh", batch_size=len(batch), deferred=deferred, queue_depth=len(queue) + len(batch))
+            response = await AssetSourceManager.bulk_refresh_prices_incremental(batch, session, force=True)
+
+            for result in response.results:
+                if result.errors:
+                    self.last_failed_count += 1
+                    self._retry_after[result.asset_id] = now + timedelta(minutes=self.retry_minutes)
+                else:
+                    self._retry_after.pop(result.asset_id, None)
+
+            if self.last_failed_count:
+                logger.warning("Scheduled price refresh had failures", failed=self.last_failed_count, batch_size=len(batch))
+
+    async def _safe_run_once(self) -> None:
+        try:
+            await self.run_once()
+        except Exception as e:
+            logger.error("Scheduled price refresh tick failed", error=str(e))
+
+    async def get_status(self, session: AsyncSession) -> FARefreshSchedulerStatus:
+        """
+        Snapshot of queue depth and lag (builds the queue, does not refresh).
+
+        Lag is how long the stalest due asset has been waiting past its due time
+        (never-fetched assets are counted as due but excluded from lag).
+        """
+        now = utcnow()
+        queue = await self.build_queue(session)
+
+        due = [entry for entry in queue if entry[0] <= now]
+        due_by_provider: dict[str, int] = {}
+        for _, _, provider_code, _ in due:
+            due_by_provider[provider_code] = due_by_provider.get(provider_code, 0) + 1
+
+        fetched_due = [entry[0] for entry in due if entry[0] != NEVER_FETCHED]
+        max_lag = (now - min(fetched_due)).total_seconds() if fetched_due else 0.0
+
+        return FARefreshSchedulerStatus(
+            running=self.running,
+            queue_depth=len(queue),
+            due_count=len(due),
+            never_fetched_count=sum(1 for entry in due if entry[0] == NEVER_FETCHED),
+            max_lag_seconds=max_lag,
+            due_by_provider=due_by_provider,
+            retrying_count=len(self._retry_after),
+            tick_seconds=self.tick_seconds,
+            last_run_at=self.last_run_at,
+            last_batch_size=self.last_batch_size,
+            last_failed_count=self.last_failed_count,
+            )
+
+    # ========================================================================
+    # LIFECYCLE
+    # ========================================================================
+
+    def start(self) -> None:
+        """Start the periodic tick (first tick runs immediately)."""
+        if self.running:
+            return
+        self._scheduler = AsyncIOScheduler(timezone=timezone.utc)
+        self._scheduler.add_job(
+            self._safe_run_once,
+            "interval",
+            seconds=self.tick_seconds,
+            id="price_refresh",
+            max_instances=1,
+            coalesce=True,
+            next_run_time=utcnow(),
+            )
+        self._scheduler.start()
+        logger.info("Price refresh scheduler started", tick_seconds=self.tick_seconds, batch_size=self.batch_size)
+
+    def stop(self) -> None:
+        """Stop the periodic tick (in-flight refresh is not awaited)."""
+        if not self.running:
+            return
+        self._scheduler.shutdown(wait=False)
+        self._scheduler = None
+        logger.info("Price refresh scheduler stopped")
+
+
+_settings = get_settings()
+
+# Process-wide scheduler instance (started/stopped by main.lifespan)
+price_refresh_scheduler = PriceRefreshScheduler(
+    tick_seconds=_settings.PRICE_REFRESH_TICK_SECONDS,
+    batch_size=_settings.PRICE_REFRESH_BATCH_SIZE,
+    retry_minutes=_settings.PRICE_REFRESH_RETRY_MINUTES,
+    )
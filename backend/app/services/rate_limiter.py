@@ -0,0 +1,310 @@
+"""
+Rate limiting for outbound provider calls (asset + FX providers).
+
+Each (provider_code, host) pair gets its own adaptive token bucket, so fast
+sources are not slowed down by strict ones and every scraped site has its own
+budget.
+
+Features:
+- Token bucket: sustained `rate` requests/second with `burst` capacity
+- Concurrency cap: at most `max_concurrency` in-flight calls per bucket
+- Throttle handling: HTTP 429/503 (or provider RATE_LIMITED errors) block the
+  bucket until Retry-After (or DEFAULT_THROTTLE_SECONDS) and halve the rate
+- Adaptive rate (AIMD): error-rate EWMA above SHRINK_ERROR_RATE halves the rate,
+  below GROW_ERROR_RATE the rate grows additively, within
+  [rate * min_rate_factor, rate * max_rate_factor]. Only upstream errors count
+  (transport, timeout, 5xx): unsupported/invalid requests do not shrink the rate
+
+Usage:
+    async with rate_limiter.limit(provider.provider_code, host, provider.rate_limit_policy) as slot:
+        try:
+            data = await fetch(...)
+        except SomeHandledError as e:
+            slot.record_error(e)  # Errors swallowed by the caller still count
+
+Exceptions raised inside the block are recorded automatically and re-raised.
+A None policy means "no limit" (local/computed providers).
+
+Per-provider rate overrides: Settings.PROVIDER_RATE_LIMITS ({"yfinance": 0.5}).
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlparse
+
+import httpx
+from pydantic import BaseModel, ConfigDict, Field
+
+from backend.app.config import get_settings
+from backend.app.logging_config import get_logger
+from backend.app.utils.datetime_utils import utcnow
+
+logger = get_logger(__name__)
+
+# Block duration when a throttle response has no usable Retry-After
+DEFAULT_THROTTLE_SECONDS = 30.0
+# Never honour Retry-After longer than this (protects refresh timeouts)
+MAX_THROTTLE_SECONDS = 300.0
+# HTTP status codes treated as throttling
+THROTTLE_STATUS_CODES = {429, 503}
+# Provider error codes (AssetSourceError.error_code) signalling upstream failures
+UPSTREAM_ERROR_CODES = {"FETCH_ERROR", "PROVIDER_FETCH_ERROR"}
+
+# Adaptive rate tuning
+ERROR_RATE_ALPHA = 0.2  # EWMA weight of latest outcome
+SHRINK_ERROR_RATE = 0.25  # Halve rate above this error rate
+GROW_ERROR_RATE = 0.05  # Grow rate below this error rate
+GROW_STEP_FACTOR = 0.1  # Additive increase: rate * factor per success
+
+
+class RateLimitPolicy(BaseModel):
+    """Rate limit configuration of a provider (per host)."""
+    model_config = ConfigDict(frozen=True)
+
+    rate: float = Field(2.0, gt=0, description="Sustained requests per second")
+    burst: int = Field(5, ge=1, description="Max requests issued back-to-back")
+    max_concurrency: int = Field(5, ge=1, description="Max in-flight requests")
+    min_rate_factor: float = Field(0.1, gt=0, le=1, description="Adaptive floor (fraction of rate)")
+    max_rate_factor: float = Field(2.0, ge=1, description="Adaptive ceiling (fraction of rate)")
+
+
+def host_from_url(value: Optional[str]) -> Optional[str]:
+    """Return lowercase host of an http(s) URL, None for non-URL identifiers."""
+    if not value or not value.startswith(("http://", "https://")):
+        return None
+    return urlparse(value).hostname
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - utcnow()).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def throttle_delay(exc: BaseException) -> Optional[float]:
+    """
+    Detect a throttling error and return how long to back off (seconds).
+
+    Walks the exception chain (providers often wrap the original error):
+    - httpx.HTTPStatusError with status 429/503 (Retry-After honoured)
+    - Errors with error_code == "RATE_LIMITED" (details["retry_after"] honoured)
+    - Library rate-limit exceptions (class name containing "RateLimit", e.g. YFRateLimitError)
+
+    Message text is not inspected: ids, ISINs, prices and URLs can contain "429".
+
+    Returns:
+        Back-off seconds, or None if the error is not a throttle
+    """
+    current: Optional[BaseException] = exc
+    for _ in range(5):
+        if current is None:
+            break
+        if isinstance(current, httpx.HTTPStatusError) and current.response.status_code in THROTTLE_STATUS_CODES:
+            delay = _parse_retry_after(current.response.headers.get("Retry-After"))
+            return min(delay if delay is not None else DEFAULT_THROTTLE_SECONDS, MAX_THROTTLE_SECONDS)
+        if getattr(current, "error_code", None) == "RATE_LIMITED":
+            details = getattr(current, "details", None) or {}
+            delay = details.get("retry_after")
+            return min(float(delay) if delay is not None else DEFAULT_THROTTLE_SECONDS, MAX_THROTTLE_SECONDS)
+        if "RateLimit" in type(current).__name__:
+            return DEFAULT_THROTTLE_SECONDS
+        current = current.__cause__ or current.__context__
+    return None
+
+
+def is_upstream_error(exc: BaseException) -> bool:
+    """
+    Check if an error signals upstream load problems (counts toward the adaptive error rate).
+
+    Transport errors, timeouts, HTTP 5xx and generic provider fetch errors count.
+    Client-side errors (unsupported operation, missing library, invalid params,
+    no data) say nothing about the source's load and are ignored.
+    """
+    current: Optional[BaseException] = exc
+    for _ in range(5):
+        if current is None:
+            break
+        if isinstance(current, (httpx.TransportError, asyncio.TimeoutError, TimeoutError)):
+            return True
+        if isinstance(current, httpx.HTTPStatusError) and current.response.status_code >= 500:
+            return True
+        if getattr(current, "error_code", None) in UPSTREAM_ERROR_CODES:
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+class RateLimitSlot:
+    """Handle yielded by RateLimiter.limit() to report errors handled by the caller."""
+
+    def __init__(self):
+        self.error: Optional[BaseException] = None
+
+    def record_error(self, exc: BaseException) -> None:
+        """Record a failure that was caught (and not re-raised) inside the block."""
+        self.error = exc
+
+
+class TokenBucket:
+    """Adaptive token bucket for one (provider_code, host) key."""
+
+    def __init__(self, key: tuple[str, Optional[str]], policy: RateLimitPolicy):
+        self.key = key
+        self.policy = policy
+        self.rate = policy.rate
+        self.tokens = float(policy.burst)
+        self.error_rate = 0.0
+        self.blocked_until = 0.0  # time.monotonic() deadline from Retry-After
+        self.throttled_count = 0
+        self.request_count = 0
+        self._updated_at = time.monotonic()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def min_rate(self) -> float:
+        return self.policy.rate * self.policy.min_rate_factor
+
+    @property
+    def max_rate(self) -> float:
+        return self.policy.rate * self.policy.max_rate_factor
+
+    def _bind_loop(self) -> None:
+        """(Re)create asyncio primitives if the running loop changed (e.g. between tests)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.policy.max_concurrency)
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(float(self.policy.burst), self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Wait for a token (and for any Retry-After block to expire)."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.request_count += 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def record_success(self) -> None:
+        self.error_rate *= (1 - ERROR_RATE_ALPHA)
+        if self.error_rate < GROW_ERROR_RATE and self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.policy.rate * GROW_STEP_FACTOR)
+
+    def record_failure(self, exc: BaseException) -> None:
+        delay = throttle_delay(exc)
+        if delay is None and not is_upstream_error(exc):
+            return  # Client-side error: no signal about source load
+        self.error_rate = self.error_rate * (1 - ERROR_RATE_ALPHA) + ERROR_RATE_ALPHA
+        if delay is not None:
+            self.throttled_count += 1
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self.tokens = 0.0
+            self.rate = max(self.min_rate, self.rate / 2)
+            logger.warning(
+                "Provider throttled, backing off",
+                provider=self.key[0],
+                host=self.key[1],
+                retry_after_seconds=round(delay, 1),
+                new_rate=round(self.rate, 3)
+                )
+        elif self.error_rate > SHRINK_ERROR_RATE:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def snapshot(self) -> dict:
+        """Current state for diagnostics."""
+        return {
+            "provider": self.key[0],
+            "host": self.key[1],
+            "rate": round(self.rate, 4),
+            "configured_rate": self.policy.rate,
+            "error_rate": round(self.error_rate, 4),
+            "blocked_for_seconds": round(max(0.0, self.blocked_until - time.monotonic()), 1),
+            "requests": self.request_count,
+            "throttled": self.throttled_count,
+            }
+
+
+class RateLimiter:
+    """Registry of token buckets keyed by (provider_code, host)."""
+
+    def __init__(self):
+        self._buckets: dict[tuple[str, Optional[str]], TokenBucket] = {}
+
+    def get_bucket(self, provider_code: str, host: Optional[str], policy: RateLimitPolicy) -> TokenBucket:
+        """Return bucket for key, creating it (with Settings overrides applied) on first use."""
+        key = (provider_code, host)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            override = get_settings().PROVIDER_RATE_LIMITS.get(provider_code)
+            if override:
+                policy = policy.model_copy(update={"rate": float(override)})
+            bucket = TokenBucket(key, policy)
+            self._buckets[key] = bucket
+        return bucket
+
+    @asynccontextmanager
+    async def limit(self, provider_code: str, host: Optional[str] = None, policy: Optional[RateLimitPolicy] = None):
+        """
+        Acquire a rate-limited slot for one outbound call.
+
+        Args:
+            provider_code: Provider code (asset provider_code or FX code)
+            host: Target host (None = provider-wide bucket)
+            policy: Provider policy; None disables limiting
+
+        Yields:
+            RateLimitSlot to report errors handled inside the block
+        """
+        slot = RateLimitSlot()
+        if policy is None:
+            yield slot
+            return
+
+        bucket = self.get_bucket(provider_code, host, policy)
+        bucket._bind_loop()
+        async with bucket._semaphore:
+            await bucket.acquire()
+            try:
+                yield slot
+            except Exception as e:
+                bucket.record_failure(e)
+                raise
+            if slot.error is not None:
+                bucket.record_failure(slot.error)
+            else:
+                bucket.record_success()
+
+    def snapshot(self) -> list[dict]:
+        """State of all buckets (diagnostics)."""
+        return [bucket.snapshot() for bucket in self._buckets.values()]
+
+    def reset(self) -> None:
+        """Drop all buckets (tests / configuration reload)."""
+        self._buckets.clear()
+
+
+# Process-wide limiter shared by all asset and FX providers
+rate_limiter = RateLimiter()
@@ -0,0 +1,377 @@
+"""
+Return engine.
+
+Time-weighted (TWR) and money-weighted (MWR, XIRR) returns of the portfolio,
+a broker or an asset over a period, in PORTFOLIO_BASE_CURRENCY:
+- values: end-of-day values from portfolio_daily_snapshots (portfolio, broker)
+  or the NAV engine (asset: value_positions summed over brokers)
+- flows: external flows of the scope (see ReturnScope), converted with the FX
+  rate of their day (backward-filled); holdings added or removed without cash
+  are valued at the transaction price, else at the last close
+- TWR: daily factors V(t) / (V(t-1) + F(t)) chained over the period (flows at
+  the start of the day; days without capital are skipped)
+- MWR: annualized rate r solving NPV = 0 for -V(0), -F(t) and +V(end), with a
+  bracketed Newton solver (bisection when a Newton step leaves the bracket)
+
+Each request is one batch: values and flows are (days × columns) matrices and
+both kernels are vectorized over the columns (all brokers or assets at once).
+
+Results are cached in return_cache per (scope, id, period). Every input goes
+through the snapshot invalidation marker: pending days are recomputed by
+PortfolioSnapshotManager.sync() before reading, and that sync deletes the
+cached periods ending on or after the first invalidated day.
+"""
+from datetime import date as date_type, timedelta
+from typing import Optional
+
+import numpy as np
+import structlog
+from sqlalchemy import select, func, case, literal, union_all, type_coerce, Float
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.config import get_settings
+from backend.app.db.models import (
+    CashAccount,
+    CashMovement,
+    CashMovementType,
+    PortfolioDailySnapshot,
+    PositionHistory,
+    PriceHistory,
+    ReturnCache,
+    Transaction,
+    TransactionType,
+    )
+from backend.app.schemas.portfolio import FAPeriodReturn, FAPeriodReturns, ReturnScope
+from backend.app.services.portfolio_nav import backward_fill, day_offset, load_fx_matrix, rows_to_matrix, value_positions
+from backend.app.services.portfolio_snapshots import PortfolioSnapshotManager
+from backend.app.utils.datetime_utils import utcnow
+
+logger = structlog.get_logger(__name__)
+
+# XIRR solver: bracket [MIN_RATE, 1] widened ×10 up to MAX_RATE until NPV changes sign
+XIRR_MIN_RATE = -0.9999
+XIRR_MAX_RATE = 1e6
+XIRR_TOLERANCE = 1e-10
+XIRR_MAX_ITERATIONS = 100
+
+# Days with less capital than this (base currency) are skipped by TWR (rounding residue of closed positions)
+MIN_CAPITAL = 1e-6
+
+# External flows per scope (+ money into the scope, - money out of it)
+_PORTFOLIO_CASH_FLOW_SIGN = {CashMovementType.DEPOSIT: 1, CashMovementType.WITHDRAWAL: -1}
+_BROKER_CASH_FLOW_SIGN = {**_PORTFOLIO_CASH_FLOW_SIGN, CashMovementType.TRANSFER_IN: 1, CashMovementType.TRANSFER_OUT: -1}
+_PORTFOLIO_HOLDING_FLOW_SIGN = {TransactionType.ADD_HOLDING: 1, TransactionType.REMOVE_HOLDING: -1}
+_BROKER_HOLDING_FLOW_SIGN = {**_PORTFOLIO_HOLDING_FLOW_SIGN, TransactionType.TRANSFER_IN: 1, TransactionType.TRANSFER_OUT: -1}
+# Asset scope: cash paid into (+) or taken out of (-) the asset through the linked movements
+_ASSET_CASH_FLOW_SIGN = {
+    TransactionType.BUY: 1,
+    TransactionType.FEE: 1,
+    TransactionType.TAX: 1,
+    TransactionType.SELL: -1,
+    TransactionType.DIVIDEND: -1,
+    TransactionType.INTEREST: -1,
+    }
+
+
+def time_weighted_returns(values: np.ndarray, flows: np.ndarray) -> np.ndarray:
+    """
+    Vectorized TWR kernel.
+
+    Args:
+        values: ((days + 1) × columns) end-of-day values, row 0 is the day before the period
+        flows: (days × columns) external flows at the start of each day
+
+    Returns:
+        (columns,) return over the period, NaN for columns without capital on any day
+    """
+    capital = values[:-1] + flows
+    invested = capital > MIN_CAPITAL
+    factors = np.ones_like(flows)
+    np.divide(values[1:], capital, out=factors, where=invested)
+    returns = factors.prod(axis=0) - 1.0
+    returns[~invested.any(axis=0)] = np.nan
+    return returns
+
+
+def xirr(amounts: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """
+    Vectorized XIRR: rate r with sum(amounts × (1 + r) ** -years) = 0, per column.
+
+    Bracketed Newton: the bracket keeps the sign change, Newton steps leaving it
+    are replaced by bisection, so every column converges.
+
+    Args:
+        amounts: (points × columns) cash flows (- invested, + returned)
+        years: (points,) time of each point in years from the first one
+
+    Returns:
+        (columns,) annualized rates, NaN without a root in [XIRR_MIN_RATE, XIRR_MAX_RATE]
+    """
+    columns = amounts.shape[1]
+    # Cash flows are sparse (a few per column over years of days): only non-zero points change the NPV
+    points, owners = np.nonzero(amounts)
+    flows, times = amounts[points, owners], years[points]
+
+    def npv(rates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        discounted = flows * np.exp(-times * np.log1p(rates[owners]))
+        value = np.bincount(owners, weights=discounted, minlength=columns)
+        return value, -np.bincount(owners, weights=discounted * times, minlength=columns) / (1.0 + rates)
+
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        low = np.full(columns, XIRR_MIN_RATE)
+        high = np.ones(columns)
+        npv_low, npv_high = npv(low)[0], npv(high)[0]
+        while True:
+            widen = (np.sign(npv_low) == np.sign(npv_high)) & (high < XIRR_MAX_RATE)
+            if not widen.any():
+                break
+            high = np.where(widen, high * 10.0, high)
+            npv_high = npv(high)[0]
+        solvable = (np.sign(npv_low) != np.sign(npv_high)) & (amounts > 0).any(axis=0) & (amounts < 0).any(axis=0)
+
+        rates = np.full(columns, 0.1)
+        active = solvable.copy()
+        for _ in range(XIRR_MAX_ITERATIONS):
+            value, derivative = npv(rates)
+            below = np.sign(value) == np.sign(npv_low)
+            low = np.where(active & below, rates, low)
+            npv_low = np.where(active & below, value, npv_low)
+            high = np.where(active & ~below, rates, high)
+
+            step = rates - value / derivative
+            bisect = ~np.isfinite(step) | (step <= low) | (step >= high)
+            step = np.where(bisect, (low + high) / 2.0, step)
+            # An exact root has nothing left to bracket: keep it
+            step = np.where(value == 0, rates, step)
+            converged = np.abs(step - rates) <= XIRR_TOLERANCE * (1.0 + np.abs(rates))
+            rates = np.where(active, step, rates)
+            active &= ~converged
+            if not active.any():
+                break
+    rates[~solvable] = np.nan
+    return rates
+
+
+def money_weighted_returns(values: np.ndarray, flows: np.ndarray) -> np.ndarray:
+    """
+    Vectorized MWR (XIRR) of the same inputs as time_weighted_returns().
+
+    Returns:
+        (columns,) annualized rates, NaN without a solution (e.g. no capital)
+    """
+    days = flows.shape[0]
+    # Point j is the end of values row j: flows[j] (start of the next day) happen at the same point
+    amounts = np.zeros((days + 1, flows.shape[1]))
+    amounts[:-1] = -flows
+    amounts[0] -= values[0]
+    amounts[-1] += values[-1]
+    return xirr(amounts, np.arange(days + 1) / 365.0)
+
+
+def _sign_case(column, signs: dict) -> case:
+    return case({t.value: sign for t, sign in signs.items()}, value=column)
+
+
+async def _load_values(
+    session: AsyncSession, scope: ReturnScope, start_date: date_type, end_date: date_type, currency: str, ids: list[int],
+    ) -> np.ndarray:
+    """End-of-day values ((days + 1) × ids), row 0 is the day before start_date."""
+    day_zero = start_date - timedelta(days=1)
+    values = np.zeros(((end_date - day_zero).days + 1, len(ids)))
+    id_array = np.array(ids, dtype=np.int64)
+
+    if scope == ReturnScope.ASSET:
+        pairs, contributions, _ = await value_positions(session, day_zero, end_date, currency, asset_ids=ids)
+        if len(pairs):
+            held_assets, first_columns = np.unique(pairs[:, 0], return_index=True)
+            values[:, np.searchsorted(id_array, held_assets)] = np.add.reduceat(contributions, first_columns, axis=1)
+        return values
+
+    s = PortfolioDailySnapshot
+    stmt = select(
+        func.coalesce(s.broker_id, 0), day_offset(s.snapshot_date, day_zero), type_coerce(s.total_value, Float),
+        ).where(s.snapshot_date >= day_zero, s.snapshot_date <= end_date)
+    stmt = stmt.where(s.broker_id.is_(None) if scope == ReturnScope.PORTFOLIO else s.broker_id.in_(ids))
+    rows = (await session.execute(stmt)).all()
+    if rows:
+        v = rows_to_matrix(rows, 3)
+        values[v[:, 1].astype(np.int64), np.searchsorted(id_array, v[:, 0].astype(np.int64))] = v[:, 2]
+    return values
+
+
+async def _load_flows(
+    session: AsyncSession, scope: ReturnScope, start_date: date_type, end_date: date_type, currency: str, ids: list[int],
+    ) -> np.ndarray:
+    """External flows (days × ids) of the scope in the target currency (one query plus the FX matrix)."""
+    days = (end_date - start_date).days + 1
+
+    # Holdings moved without cash: transaction price, else the last close up to the trade date
+    last_price = (
+        select(PriceHistory.close, PriceHistory.currency)
+        .where(PriceHistory.asset_id == Transaction.asset_id, PriceHistory.date <= Transaction.trade_date, PriceHistory.close.is_not(None))
+        .order_by(PriceHistory.date.desc())
+        .limit(1)
+    )
+    holding_signs = _BROKER_HOLDING_FLOW_SIGN if scope == ReturnScope.BROKER else _PORTFOLIO_HOLDING_FLOW_SIGN
+    holding_key = {ReturnScope.PORTFOLIO: literal(0), ReturnScope.BROKER: Transaction.broker_id, ReturnScope.ASSET: Transaction.asset_id}[scope]
+    statements = [
+        select(
+            holding_key.label("key"),
+            day_offset(Transaction.trade_date, start_date).label("day"),
+            case((Transaction.price.is_(None), last_price.with_only_columns(PriceHistory.currency).scalar_subquery()), else_=Transaction.currency).label("currency"),
+            type_coerce(
+                _sign_case(Transaction.type, holding_signs) * Transaction.quantity
+                * func.coalesce(Transaction.price, last_price.with_only_columns(PriceHistory.close).scalar_subquery()),
+                Float,
+                ).label("amount"),
+            ).where(Transaction.type.in_([t.value for t in holding_signs]), Transaction.trade_date.between(start_date, end_date)),
+        ]
+    if scope == ReturnScope.ASSET:
+        statements.append(
+            select(
+                Transaction.asset_id, day_offset(Transaction.trade_date, start_date), CashAccount.currency,
+                type_coerce(_sign_case(Transaction.type, _ASSET_CASH_FLOW_SIGN) * CashMovement.amount, Float),
+                )
+            .join(CashMovement, CashMovement.id == Transaction.cash_movement_id)
+            .join(CashAccount, CashAccount.id == CashMovement.cash_account_id)
+            .where(Transaction.type.in_([t.value for t in _ASSET_CASH_FLOW_SIGN]), Transaction.trade_date.between(start_date, end_date))
+            )
+        statements = [stmt.where(Transaction.asset_id.in_(ids)) for stmt in statements]
+    else:
+        cash_signs = _BROKER_CASH_FLOW_SIGN if scope == ReturnScope.BROKER else _PORTFOLIO_CASH_FLOW_SIGN
+        statements.append(
+            select(
+                CashAccount.broker_id if scope == ReturnScope.BROKER else literal(0),
+                day_offset(CashMovement.trade_date, start_date), CashAccount.currency,
+                type_coerce(_sign_case(CashMovement.type, cash_signs) * CashMovement.amount, Float),
+                )
+            .join(CashAccount, CashAccount.id == CashMovement.cash_account_id)
+            .where(CashMovement.type.in_([t.value for t in cash_signs]), CashMovement.trade_date.between(start_date, end_date))
+            )
+        if scope == ReturnScope.BROKER:
+            statements[0] = statements[0].where(Transaction.broker_id.in_(ids))
+            statements[1] = statements[1].where(CashAccount.broker_id.in_(ids))
+
+    flows = np.zeros((days, len(ids)))
+    rows = (await session.execute(union_all(*statements))).all()
+    if not rows:
+        return flows
+    currencies = sorted({r.currency for r in rows if r.currency is not None} | {currency})
+    fx_rates = backward_fill(await load_fx_matrix(session, start_date, end_date, currency, currencies))
+    currency_columns = {c: i for i, c in enumerate(currencies)}
+    keys = np.array([r.key for r in rows], dtype=np.int64)
+    rows_days = np.array([r.day for r in rows], dtype=np.int64)
+    amounts = np.array([np.nan if r.amount is None or r.currency is None else r.amount for r in rows])
+    rates = fx_rates[rows_days, [currency_columns.get(r.currency, 0) for r in rows]]
+    np.add.at(flows, (rows_days, np.searchsorted(np.array(ids, dtype=np.int64), keys)), np.nan_to_num(amounts * rates))
+    return flows
+
+
+class ReturnManager:
+    """Period returns (TWR, XIRR) of the portfolio, brokers and assets, cached per period."""
+
+    @staticmethod
+    async def get_returns(
+        session: AsyncSession,
+        scope: ReturnScope,
+        start_date: date_type,
+        end_date: Optional[date_type] = None,
+        ids: Optional[list[int]] = None,
+        ) -> FAPeriodReturns:
+        """
+        TWR and MWR over [start_date, end_date] of every requested id (one vectorized batch).
+
+        Args:
+            session: Database session (pending snapshot days are recomputed first; committed)
+            scope: Portfolio, broker or asset
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive, None = today UTC)
+            ids: Broker or asset ids (None = all with activity up to end_date; ignored for the portfolio)
+
+        Returns:
+            FAPeriodReturns ordered by scope_id
+
+        Raises:
+            ValueError: If start_date > end_date or end_date is in the future
+        """
+        today = utcnow().date()
+        end_date = end_date or today
+        if start_date > end_date:
+            raise ValueError(f"Start date {start_date} is after end date {end_date}")
+        if end_date > today:
+            raise ValueError(f"End date {end_date} is in the future")
+        currency = get_settings().PORTFOLIO_BASE_CURRENCY
+        await ReturnManager._refresh_inputs(session, end_date)
+
+        if scope == ReturnScope.PORTFOLIO:
+            ids = [0]
+        elif ids is None:
+            ids = await ReturnManager._active_ids(session, scope, end_date)
+        ids = sorted(set(ids))
+
+        results = {
+            r.scope_id: r
+            for r in (await session.execute(
+                select(ReturnCache).where(
+                    ReturnCache.scope == scope.value, ReturnCache.scope_id.in_(ids),
+                    ReturnCache.start_date == start_date, ReturnCache.end_date == end_date, ReturnCache.currency == currency,
+                    )
+                )).scalars().all()
+            }
+        cached_count = len(results)
+        missing = [scope_id for scope_id in ids if scope_id not in results]
+        if missing:
+            values = await _load_values(session, scope, start_date, end_date, currency, missing)
+            flows = await _load_flows(session, scope, start_date, end_date, currency, missing)
+            twr = time_weighted_returns(values, flows)
+            mwr = money_weighted_returns(values, flows)
+            rows = [
+                {
+                    "scope": scope.value, "scope_id": scope_id, "start_date": start_date, "end_date": end_date,
+                    "currency": currency, "start_value": float(values[0, i]), "end_value": float(values[-1, i]),
+                    "net_flows": float(flows[:, i].sum()),
+                    "twr": None if np.isnan(twr[i]) else float(twr[i]),
+                    "mwr": None if np.isnan(mwr[i]) else float(mwr[i]),
+                    }
+                for i, scope_id in enumerate(missing)
+                ]
+            await session.execute(insert(ReturnCache).on_conflict_do_nothing(), rows)
+            await session.commit()
+            results.update({row["scope_id"]: ReturnCache(**row) for row in rows})
+            logger.info("Returns computed", scope=scope.value, computed=len(missing), cached=cached_count)
+
+        return FAPeriodReturns(
+            scope=scope,
+            currency=currency,
+            start_date=start_date,
+            end_date=end_date,
+            cached_count=cached_count,
+            results=[
+                FAPeriodReturn(
+                    scope_id=scope_id, start_value=r.start_value, end_value=r.end_value,
+                    net_flows=r.net_flows, twr=r.twr, mwr=r.mwr,
+                    )
+                for scope_id in ids
+                for r in [results[scope_id]]
+                ],
+            )
+
+    @staticmethod
+    async def _refresh_inputs(session: AsyncSession, end_date: date_type) -> None:
+        """Recompute pending snapshot days up to end_date (also syncs positions and drops stale cached returns)."""
+        pending = await PortfolioSnapshotManager.get_pending_from(session)
+        last_date = (await session.execute(select(func.max(PortfolioDailySnapshot.snapshot_date)))).scalar_one_or_none()
+        if last_date is None or last_date < end_date or (pending is not None and pending <= end_date):
+            await PortfolioSnapshotManager.sync(session, today=max(end_date, last_date or end_date))
+
+    @staticmethod
+    async def _active_ids(session: AsyncSession, scope: ReturnScope, end_date: date_type) -> list[int]:
+        """Brokers with snapshots or assets with positions up to end_date."""
+        if scope == ReturnScope.BROKER:
+            stmt = select(PortfolioDailySnapshot.broker_id).distinct().where(
+                PortfolioDailySnapshot.broker_id.is_not(None), PortfolioDailySnapshot.snapshot_date <= end_date,
+                )
+        else:
+            stmt = select(PositionHistory.asset_id).distinct().where(PositionHistory.trade_date <= end_date)
+        return list((await session.execute(stmt)).scalars().all())
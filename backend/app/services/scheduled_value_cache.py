@@ -0,0 +1,108 @@
+"""
+In-process cache of scheduled-yield value curves.
+
+ScheduledInvestmentProvider values are a pure function of two inputs:
+- the schedule (AssetProviderAssignment.provider_params JSON)
+- the asset transactions (type, quantity, price, trade_date)
+
+Curves are cached per asset and tagged with the input version of the asset:
+- version = scheduled_value_versions.version (0 when the asset has no row), a
+  counter bumped by SQLite triggers on every write of transactions of
+  scheduled_investment assets and of provider assignments (migration 011)
+- validating a curve is one primary key lookup: stale curves are never served,
+  also for writes made outside this process
+- provider assignment changes (bulk_assign_providers / bulk_remove_providers)
+  also evict entries eagerly
+
+A curve holds daily values for one contiguous date range: range queries inside
+it are served as slices, other ranges extend it (recomputed once with the sweep
+engine) up to Settings.SCHEDULED_VALUE_CURVE_MAX_DAYS days. The cache is
+LRU-bounded by Settings.SCHEDULED_VALUE_CACHE_SIZE assets.
+"""
+from collections import OrderedDict
+from datetime import date as date_type, timedelta
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from backend.app.config import get_settings
+from backend.app.schemas.assets import FAScheduledInvestmentSchedule
+
+
+class ValueCurve:
+    """Daily values of one asset over a contiguous date range."""
+
+    def __init__(self, version: int, schedule: FAScheduledInvestmentSchedule, start_date: date_type, values: list[Decimal]):
+        self.version = version
+        self.schedule = schedule  # Validated schedule, reused when the curve is extended
+        self.start_date = start_date
+        self.values = values
+
+    @property
+    def end_date(self) -> date_type:
+        return self.start_date + timedelta(days=len(self.values) - 1)
+
+    def covers(self, start_date: date_type, end_date: date_type) -> bool:
+        return self.start_date <= start_date and end_date <= self.end_date
+
+    def slice(self, start_date: date_type, end_date: date_type) -> list[tuple[date_type, Decimal]]:
+        """Return (date, value) pairs for [start_date, end_date] (must be covered)."""
+        offset = (start_date - self.start_date).days
+        count = (end_date - start_date).days + 1
+        return [(start_date + timedelta(days=i), value) for i, value in enumerate(self.values[offset:offset + count])]
+
+
+class ScheduledValueCache:
+    """LRU map asset_id -> ValueCurve, validated against the current input version."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._curves: OrderedDict[int, ValueCurve] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, asset_id: int, version: int, start_date: date_type, end_date: date_type) -> Optional[ValueCurve]:
+        """
+        Return the cached curve if it matches version and covers the range.
+
+        A curve with a different version is dropped. A curve with the same version
+        that does not cover the range is left in place (the caller extends it).
+        """
+        curve = self._curves.get(asset_id)
+        if curve is not None and curve.version != version:
+            del self._curves[asset_id]
+            curve = None
+        if curve is None or not curve.covers(start_date, end_date):
+            self.misses += 1
+            return None
+        self._curves.move_to_end(asset_id)
+        self.hits += 1
+        return curve
+
+    def peek(self, asset_id: int, version: int) -> Optional[ValueCurve]:
+        """Return the curve for asset_id if its version matches (no stats, no LRU update)."""
+        curve = self._curves.get(asset_id)
+        return curve if curve is not None and curve.version == version else None
+
+    def put(self, asset_id: int, curve: ValueCurve) -> None:
+        self._curves[asset_id] = curve
+        self._curves.move_to_end(asset_id)
+        while len(self._curves) > self.max_entries:
+            self._curves.popitem(last=False)
+
+    def invalidate(self, asset_ids: Optional[Iterable[int]] = None) -> None:
+        """Evict curves of the given assets (None = all)."""
+        if asset_ids is None:
+            self._curves.clear()
+            return
+        for asset_id in asset_ids:
+            self._curves.pop(asset_id, None)
+
+    def __contains__(self, asset_id: int) -> bool:
+        return asset_id in self._curves
+
+    def __len__(self) -> int:
+        return len(self._curves)
+
+
+# Process-wide cache used by ScheduledInvestmentProvider
+scheduled_value_cache = ScheduledValueCache(max_entries=get_settings().SCHEDULED_VALUE_CACHE_SIZE)
@@ -3,5 +3,8 @@ Utility functions for LibreFolio.
 
 This package contains:
 - financial_math: Financial calculations (ACT/365, interest, etc.)
+- day_count: Day count service (year tables, cached and batch fractions)
 - number: Number formatting and precision handling
+- streaming: Chunked JSON serialization of long series for streaming responses
+- fast_json: orjson-based encoding and response class for JSON-ready data
 """
@@ -0,0 +1,141 @@
+"""
+Day count service.
+
+Year fractions for the supported day count conventions (ACT/365, ACT/360,
+ACT/ACT, 30/360), used by financial_math.calculate_day_count_fraction and by
+the scheduled-yield valuation loop.
+
+Design:
+- Per-year tables (days in year, ordinal of Jan 1, ACT/ACT full-year term) are
+  precomputed for YEAR_TABLE_START..YEAR_TABLE_END, so no date is built and no
+  leap-year check is made while evaluating a fraction
+- ACT/ACT is evaluated in closed form per year segment (first, full, last year)
+  from ordinals; 30/360 directly from the date fields
+- day_count_fraction is LRU-cached (Settings.DAY_COUNT_CACHE_SIZE): period
+  boundaries repeat across days, assets and recomputations
+
+ACT/ACT semantics (kept identical to the original year-by-year walk):
+- each year contributes (period_end - period_start).days / days_in_year, where
+  the first year ends on Dec 31 and middle years span Jan 1 - Dec 31
+- if end_date is Jan 1, the end year is not processed (0 days)
+- terms are summed in year order (same Decimal rounding as before)
+"""
+import calendar
+from datetime import date as date_type
+from decimal import Decimal
+from functools import lru_cache
+
+from backend.app.config import get_settings
+from backend.app.schemas.assets import DayCountConvention
+
+# Range of the precomputed year tables (years outside fall back to calendar)
+YEAR_TABLE_START = 1900
+YEAR_TABLE_END = 2200
+
+_YEARS = range(YEAR_TABLE_START, YEAR_TABLE_END + 2)  # +1 so Jan 1 of END+1 is available
+_DAYS_IN_YEAR = [366 if calendar.isleap(year) else 365 for year in _YEARS]
+_YEAR_START_ORDINAL = [date_type(year, 1, 1).toordinal() for year in _YEARS]
+# ACT/ACT term of a full middle year (Jan 1 -> Dec 31, as in the year walk)
+_FULL_YEAR_FRACTION = [Decimal(days - 1) / Decimal(days) for days in _DAYS_IN_YEAR]
+
+_DECIMAL_365 = Decimal(365)
+_DECIMAL_366 = Decimal(366)
+_DECIMAL_360 = Decimal(360)
+
+
+def days_in_year(year: int) -> int:
+    """Number of days of year (precomputed table, calendar fallback)."""
+    if YEAR_TABLE_START <= year <= YEAR_TABLE_END:
+        return _DAYS_IN_YEAR[year - YEAR_TABLE_START]
+    return 366 if calendar.isleap(year) else 365
+
+
+def _year_start_ordinal(year: int) -> int:
+    if YEAR_TABLE_START <= year <= YEAR_TABLE_END + 1:
+        return _YEAR_START_ORDINAL[year - YEAR_TABLE_START]
+    return date_type(year, 1, 1).toordinal()
+
+
+def _full_year_fraction(year: int) -> Decimal:
+    if YEAR_TABLE_START <= year <= YEAR_TABLE_END:
+        return _FULL_YEAR_FRACTION[year - YEAR_TABLE_START]
+    days = days_in_year(year)
+    return Decimal(days - 1) / Decimal(days)
+
+
+def _year_denominator(year: int) -> Decimal:
+    return _DECIMAL_366 if days_in_year(year) == 366 else _DECIMAL_365
+
+
+def act_act_fraction(start_date: date_type, end_date: date_type) -> Decimal:
+    """
+    ACT/ACT: Actual days / actual days in year, one term per calendar year.
+
+    Closed form per year segment: first year (start -> Dec 31), full middle
+    years (precomputed terms), last year (Jan 1 -> end).
+    """
+    start_year = start_date.year
+    start_ordinal = start_date.toordinal()
+    end_ordinal = end_date.toordinal()
+
+    if start_year == end_date.year:
+        return Decimal(end_ordinal - start_ordinal) / _year_denominator(start_year)
+
+    # If end_date is Jan 1, that year contributes no days and is not processed
+    last_year = end_date.year
+    if end_date.month == 1 and end_date.day == 1:
+        last_year -= 1
+
+    if start_year > last_year:
+        # end_date before start_date across a year boundary: walk processes no year
+        return Decimal("0")
+
+    if start_year == last_year:
+        # end_date is Jan 1 of the following year
+        return Decimal(end_ordinal - start_ordinal) / _year_denominator(start_year)
+
+    first_days = _year_start_ordinal(start_year + 1) - 1 - start_ordinal
+    total = Decimal(first_days) / _year_denominator(start_year)
+    for year in range(start_year + 1, last_year):
+        total += _full_year_fraction(year)
+    last_days = end_ordinal - _year_start_ordinal(last_year)
+    return total + Decimal(last_days) / _year_denominator(last_year)
+
+
+def thirty_360_days(start_date: date_type, end_date: date_type) -> int:
+    """30/360 US (NASD) day count between two dates."""
+    d1 = start_date.day
+    d2 = end_date.day
+    if d1 == 31:
+        d1 = 30
+    if d2 == 31 and d1 >= 30:
+        d2 = 30
+    return (end_date.year - start_date.year) * 360 + (end_date.month - start_date.month) * 30 + (d2 - d1)
+
+
+@lru_cache(maxsize=get_settings().DAY_COUNT_CACHE_SIZE)
+def day_count_fraction(start_date: date_type, end_date: date_type, convention: DayCountConvention) -> Decimal:
+    """
+    Year fraction between two dates for a day count convention (LRU-cached).
+
+    Args:
+        start_date: Start date
+        end_date: End date
+        convention: Day count convention
+
+    Returns:
+        Decimal year fraction
+
+    Raises:
+        ValueError: If convention is not supported
+    """
+    if convention == DayCountConvention.ACT_365:
+        return Decimal((end_date - start_date).days) / _DECIMAL_365
+    elif convention == DayCountConvention.ACT_360:
+        return Decimal((end_date - start_date).days) / _DECIMAL_360
+    elif convention == DayCountConvention.ACT_ACT:
+        return act_act_fraction(start_date, end_date)
+    elif convention == DayCountConvention.THIRTY_360:
+        return Decimal(thirty_360_days(start_date, end_date)) / _DECIMAL_360
+    else:
+        raise ValueError(f"Unsupported day count convention: {convention}")
@@ -0,0 +1,77 @@
+"""
+Fast JSON serialization for hot read endpoints.
+
+Endpoints with a response_model are serialized by FastAPI with pydantic-core
+(dump_json), which is already fast for models. This module covers the paths
+where the API builds plain JSON-ready data itself (streamed series, bulk
+conversion results): those skip pydantic models entirely and are encoded with
+orjson when installed (optional dependency, falls back to the standard json
+module with the same output).
+
+Decimals are expected as strings already (same form as the pydantic JSON
+serialization of Decimal fields, str(value)): callers format them once, e.g.
+once per stored price row instead of once per backward-filled day. Leftover
+Decimal / Enum / pydantic values are still handled by _default.
+
+Usage:
+    from backend.app.utils.fast_json import FastJSONResponse, dumps
+
+    return FastJSONResponse({"results": results, "success_count": len(results), "errors": []})
+"""
+import json
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj: Any) -> Any:
+    """Values the encoder does not handle natively (same JSON form as pydantic)."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, date):  # date / datetime, standard json only (orjson encodes them natively)
+        text = obj.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Compact JSON bytes of obj with the standard json module (fallback encoder)."""
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    """Compact JSON bytes of obj with orjson (dates as ISO strings, UTC as Z like pydantic)."""
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+# Encoder of this process: dumps(obj) -> compact JSON bytes
+dumps = _orjson_dumps if ORJSON_AVAILABLE else _json_dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with dumps.
+
+    Returned directly by an endpoint, it also skips the response_model validation
+    (the response_model still documents the shape in OpenAPI): content must already
+    have the JSON form of the response_model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
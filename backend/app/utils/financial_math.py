@@ -10,24 +10,29 @@ Key concepts:
 - Day count conventions: ACT/365, ACT/360, 30/360, ACT/ACT
 - Interest types: SIMPLE and COMPOUND interest
 - Rate format: Annual rate as Decimal (0.05 = 5%)
+- Vectorized accrual: calculate_interest_vectorized (NumPy float kernel for projections
+  and analytics, with an exact Decimal mode as verification reference)
 
 Note:
     All functions require Pydantic models from backend.app.schemas.assets.
     To convert from dict/JSON, use: FAInterestRatePeriod(**dict_data)
     To get dict/JSON from model: model.dict() or model.json()
 """
-import calendar
 import math
 from datetime import date as date_type, timedelta
 from decimal import Decimal
-from typing import Optional, List
+from typing import Optional, List, Sequence
+
+import numpy as np
 
 from backend.app.schemas.assets import (
     FAInterestRatePeriod,
     FALateInterestConfig,
     DayCountConvention,
     CompoundFrequency,
+    CompoundingType,
     )
+from backend.app.utils.day_count import day_count_fraction
 
 
 # ============================================================================
@@ -44,6 +49,9 @@ def calculate_day_count_fraction(start_date: date_type, end_date: date_type, con
     - ACT/ACT: Actual days / actual days in year (365 or 366 if leap year)
     - 30/360: Assumes 30 days per month, 360 days per year
 
+    Evaluated by the day count service (backend.app.utils.day_count): precomputed
+    year tables, closed-form ACT/ACT and 30/360, LRU-cached per (start, end, convention).
+
     Args:
         start_date: Start date (inclusive)
         end_date: End date (inclusive)
@@ -59,105 +67,7 @@ def calculate_day_count_fraction(start_date: date_type, end_date: date_type, con
         >>> calculate_day_count_fraction(date(2025, 1, 1), date(2025, 1, 31), DayCountConvention.ACT_360)
         Decimal('0.0833333333333333333333333333333333')  # 30 days / 360
     """
-    if convention == DayCountConvention.ACT_365:
-        return _calculate_act_365(start_date, end_date)
-    elif convention == DayCountConvention.ACT_360:
-        return _calculate_act_360(start_date, end_date)
-    elif convention == DayCountConvention.ACT_ACT:
-        return _calculate_act_act(start_date, end_date)
-    elif convention == DayCountConvention.THIRTY_360:
-        return _calculate_30_360(start_date, end_date)
-    else:
-        raise ValueError(f"Unsupported day count convention: {convention}")
-
-
-def _calculate_act_365(start_date: date_type, end_date: date_type) -> Decimal:
-    """ACT/365: Actual days / 365."""
-    days = (end_date - start_date).days
-    return Decimal(days) / Decimal(365)
-
-
-def _calculate_act_360(start_date: date_type, end_date: date_type) -> Decimal:
-    """ACT/360: Actual days / 360 (common in money markets)."""
-    days = (end_date - start_date).days
-    return Decimal(days) / Decimal(360)
-
-
-def _calculate_act_act(start_date: date_type, end_date: date_type) -> Decimal:
-    """
-    ACT/ACT: Actual days / actual days in year.
-
-    Handles leap years correctly by calculating the fraction for each year separately.
-    """
-    if start_date.year == end_date.year:
-        # Same year - simple calculation
-        days = (end_date - start_date).days
-        days_in_year = 366 if calendar.isleap(start_date.year) else 365
-        return Decimal(days) / Decimal(days_in_year)
-
-    # Multiple years - calculate fraction for each year
-    total_fraction = Decimal("0")
-    current_year = start_date.year
-
-    # Determine actual last year to process
-    # If end_date is Jan 1, don't process that year (0 days)
-    last_year = end_date.year
-    if end_date.month == 1 and end_date.day == 1:
-        last_year -= 1
-
-    while current_year <= last_year:
-        # Determine the actual period within this year
-        if current_year == start_date.year:
-            # First year: from start_date to end of year (or end_date if in same year)
-            period_start = start_date
-            if current_year == last_year:
-                period_end = end_date
-            else:
-                period_end = date_type(current_year, 12, 31)
-        elif current_year == last_year:
-            # Last year: from start of year to end_date
-            period_start = date_type(current_year, 1, 1)
-            period_end = end_date
-        else:
-            # Middle years: full year
-            period_start = date_type(current_year, 1, 1)
-            period_end = date_type(current_year, 12, 31)
-
-        days = (period_end - period_start).days
-        days_in_year = 366 if calendar.isleap(current_year) else 365
-
-        total_fraction += Decimal(days) / Decimal(days_in_year)
-
-        # Move to next year
-        current_year += 1
-
-    return total_fraction
-
-
-def _calculate_30_360(start_date: date_type, end_date: date_type) -> Decimal:
-    """
-    30/360: Assumes 30 days per month, 360 days per year.
-
-    Uses the US (NASD) 30/360 convention:
-    - Each month is treated as having 30 days
-    - The year has 360 days
-    - Special rules for end-of-month dates
-    """
-    d1 = start_date.day
-    d2 = end_date.day
-    m1 = start_date.month
-    m2 = end_date.month
-    y1 = start_date.year
-    y2 = end_date.year
-
-    # Apply 30/360 US (NASD) rules
-    if d1 == 31:
-        d1 = 30
-    if d2 == 31 and d1 >= 30:
-        d2 = 30
-
-    days = (y2 - y1) * 360 + (m2 - m1) * 30 + (d2 - d1)
-    return Decimal(days) / Decimal(360)
+    return day_count_fraction(start_date, end_date, convention)
 
 
 # ============================================================================
@@ -285,6 +195,120 @@ def calculate_simple_interest(
     return principal * annual_rate * time_fraction
 
 
+# ============================================================================
+# VECTORIZED ACCRUAL KERNEL
+# ============================================================================
+
+# Compounding codes for the vectorized kernel (periods per year for periodic compounding)
+SIMPLE_INTEREST_CODE = 0
+CONTINUOUS_COMPOUNDING_CODE = -1
+
+
+def get_compounding_code(compounding: CompoundingType, frequency: Optional[CompoundFrequency] = None) -> int:
+    """
+    Encode compounding type + frequency as an integer for calculate_interest_vectorized.
+
+    Returns:
+        SIMPLE_INTEREST_CODE, CONTINUOUS_COMPOUNDING_CODE or periods per year (365, 12, 4, 2, 1)
+
+    Raises:
+        ValueError: If COMPOUND without frequency
+    """
+    if compounding == CompoundingType.SIMPLE:
+        return SIMPLE_INTEREST_CODE
+    if frequency is None:
+        raise ValueError("compound_frequency required for COMPOUND interest")
+    if frequency == CompoundFrequency.CONTINUOUS:
+        return CONTINUOUS_COMPOUNDING_CODE
+    return get_compounding_periods_per_year(frequency)
+
+
+# Inverse of get_compounding_code for compound codes (exact mode)
+_FREQUENCY_BY_CODE = {get_compounding_code(CompoundingType.COMPOUND, frequency): frequency for frequency in CompoundFrequency}
+
+
+def _frequency_from_code(code: int) -> CompoundFrequency:
+    """Inverse of get_compounding_code for compound codes (exact mode)."""
+    try:
+        return _FREQUENCY_BY_CODE[code]
+    except KeyError:
+        raise ValueError(f"Unsupported compounding code: {code}") from None
+
+
+def calculate_interest_vectorized(
+    principals: Sequence,
+    annual_rates: Sequence,
+    time_fractions: Sequence,
+    compounding_codes: Sequence[int],
+    exact: bool = False,
+    ) -> np.ndarray | list[Decimal]:
+    """
+    Calculate interest for many periods at once.
+
+    Vectorized counterpart of calculate_simple_interest / calculate_compound_interest:
+    element i is the interest of principals[i] at annual_rates[i] over
+    time_fractions[i], with compounding_codes[i] from get_compounding_code().
+    Scalars are broadcast (e.g. one principal for all periods).
+
+    Modes:
+    - exact=False: float64 NumPy kernel (thousands of periods per call), for
+      projections and analytics where float precision is enough
+    - exact=True: Decimal mode, element-wise calls to the scalar functions
+      (results identical to them, same rounding): verification reference for
+      the float kernel; Decimal callers with few periods (e.g.
+      ScheduledInvestmentProvider._segments_interest) call the scalar functions directly
+
+    Args:
+        principals: Principal amounts
+        annual_rates: Annual rates (0.05 = 5%)
+        time_fractions: Year fractions (from day count convention)
+        compounding_codes: SIMPLE_INTEREST_CODE, CONTINUOUS_COMPOUNDING_CODE or periods per year
+        exact: Use Decimal scalar functions instead of the float kernel
+
+    Returns:
+        np.ndarray of float64 interest amounts, or list[Decimal] when exact=True
+
+    Example:
+        >>> calculate_interest_vectorized([10000, 10000], [0.05, 0.05], [1, 1], [SIMPLE_INTEREST_CODE, 12])
+        array([500.        , 511.61897881])
+    """
+    if exact:
+        p, r, t, c = np.broadcast_arrays(
+            np.asarray(principals, dtype=object),
+            np.asarray(annual_rates, dtype=object),
+            np.asarray(time_fractions, dtype=object),
+            np.asarray(compounding_codes, dtype=object),
+            )
+        results: list[Decimal] = []
+        for principal, rate, fraction, code in zip(p.ravel(), r.ravel(), t.ravel(), c.ravel()):
+            principal, rate, fraction = Decimal(str(principal)), Decimal(str(rate)), Decimal(str(fraction))
+            if int(code) == SIMPLE_INTEREST_CODE:
+                results.append(calculate_simple_interest(principal, rate, fraction))
+            else:
+                results.append(calculate_compound_interest(principal, rate, fraction, _frequency_from_code(int(code))))
+        return results
+
+    p, r, t, c = np.broadcast_arrays(
+        np.asarray(principals, dtype=np.float64),
+        np.asarray(annual_rates, dtype=np.float64),
+        np.asarray(time_fractions, dtype=np.float64),
+        np.asarray(compounding_codes, dtype=np.int64),
+        )
+
+    simple = c == SIMPLE_INTEREST_CODE
+    continuous = c == CONTINUOUS_COMPOUNDING_CODE
+    periodic = ~(simple | continuous)
+
+    # Periods per year only meaningful where periodic (avoid division by 0 / negatives)
+    n = np.where(periodic, c, 1).astype(np.float64)
+    growth = np.where(
+        continuous,
+        np.expm1(r * t),
+        np.expm1(n * t * np.log1p(r / n)),  # (1 + r/n)^(n*t) - 1, stable for small rates
+        )
+    return np.where(simple, p * r * t, p * growth)
+
+
 # ============================================================================
 # INTEREST SCHEDULE HELPERS
 # ============================================================================
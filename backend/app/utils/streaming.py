@@ -0,0 +1,165 @@
+"""
+Streaming serialization utilities for LibreFolio.
+
+Long series (price history or FX rates over decades, multi-day conversions)
+are serialized item by item while the response is being sent, instead of
+building every response model first. Items come from async iterators that
+read the database with server-side cursors (session.stream), so memory stays
+flat whatever the range size. JSON items are encoded with fast_json.dumps
+(orjson when installed).
+
+Formats (StreamFormat):
+- json: one JSON array (same shape as the response_model list)
+- ndjson: one JSON object per line
+- csv: header line + one row per item
+
+Usage:
+    from backend.app.utils.streaming import StreamFormat, streaming_response
+
+    points = await AssetSourceManager.iter_prices(asset_id, start, end, session)
+    return streaming_response(points, fmt, PriceSeriesPoint.json_serializer(), PriceSeriesPoint.to_csv_row, PriceSeriesPoint.CSV_COLUMNS, "prices")
+"""
+import csv
+import io
+from datetime import date, timedelta
+from enum import Enum
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.utils.fast_json import dumps
+
+# Items per chunk sent to the client (one chunk per item would mean one send per item)
+STREAM_CHUNK_SIZE = 1000
+
+
+class StreamFormat(str, Enum):
+    """Output format of a streamed series."""
+    JSON = "json"
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+async def iter_stream_rows(session: AsyncSession, stmt: Select, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator:
+    """Rows of stmt read with a server-side cursor, chunk_size rows per fetch."""
+    result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+    async for partition in result.partitions():
+        for row in partition:
+            yield row
+
+
+async def iter_backward_filled(rows: AsyncIterable, start_date: date, end_date: date, previous=None) -> AsyncIterator[tuple[date, Any]]:
+    """
+    One (day, row) per calendar day, each day carrying the last row on or before it.
+
+    Args:
+        rows: Rows with a date attribute, sorted by date, within [start_date, end_date]
+        start_date: First day (inclusive)
+        end_date: Last day (inclusive)
+        previous: Last row before start_date (None = days before the first row are skipped)
+
+    Yields:
+        (day, row) with row shared, not copied (row.date < day when backward-filled)
+    """
+    last_known = previous
+    current = start_date
+    async for row in rows:
+        if last_known is None:
+            current = row.date
+        while current < row.date:
+            yield current, last_known
+            current += timedelta(days=1)
+        last_known = row
+    if last_known is None:
+        return
+    while current <= end_date:
+        yield current, last_known
+        current += timedelta(days=1)
+
+
+async def iter_json_array(items: AsyncIterable[dict], chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Serialize JSON-ready items as one JSON array, in chunks of chunk_size items.
+
+    Yields:
+        Consecutive UTF-8 fragments of the array (b"[...", b",...", b"]")
+    """
+    separator = b"["
+    chunk: list[bytes] = []
+    async for item in items:
+        chunk.append(dumps(item))
+        if len(chunk) == chunk_size:
+            yield separator + b",".join(chunk)
+            separator = b","
+            chunk = []
+    if chunk:
+        yield separator + b",".join(chunk)
+        separator = b","
+    yield b"]" if separator == b"," else b"[]"
+
+
+async def iter_ndjson(items: AsyncIterable[dict], chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Serialize JSON-ready items as newline-delimited JSON (UTF-8), in chunks of chunk_size lines."""
+    chunk: list[bytes] = []
+    async for item in items:
+        chunk.append(dumps(item))
+        if len(chunk) == chunk_size:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+async def iter_csv(rows: AsyncIterable[Sequence], columns: Sequence[str], chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[str]:
+    """Serialize rows as CSV (header first, None as empty field), in chunks of chunk_size rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    count = 0
+    async for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+async def _mapped(items: AsyncIterable, func: Callable[[Any], Any]) -> AsyncIterator:
+    async for item in items:
+        yield func(item)
+
+
+def streaming_response(
+    items: AsyncIterable,
+    fmt: StreamFormat,
+    to_json: Callable[[Any], dict],
+    to_csv_row: Callable[[Any], Sequence],
+    csv_columns: Sequence[str],
+    filename: str,
+    ) -> StreamingResponse:
+    """
+    Stream items in the requested format.
+
+    Args:
+        items: Series items (consumed while the response is sent)
+        fmt: Output format
+        to_json: Item -> JSON-ready dict (json / ndjson)
+        to_csv_row: Item -> CSV row, in csv_columns order (csv)
+        csv_columns: CSV header
+        filename: Download name for CSV (without extension)
+
+    Returns:
+        StreamingResponse with the media type of the format
+    """
+    if fmt == StreamFormat.CSV:
+        return StreamingResponse(
+            iter_csv(_mapped(items, to_csv_row), csv_columns), media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.csv"'},
+            )
+    if fmt == StreamFormat.NDJSON:
+        return StreamingResponse(iter_ndjson(_mapped(items, to_json)), media_type="application/x-ndjson")
+    return StreamingResponse(iter_json_array(_mapped(items, to_json)), media_type="application/json")
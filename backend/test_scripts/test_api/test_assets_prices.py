@@ -4,10 +4,13 @@ Test Suite: Asset Prices API Endpoints
 Tests for price-related endpoints:
 - POST /api/v1/assets/prices - Bulk upsert prices
 - DELETE /api/v1/assets/prices - Bulk delete prices
-- GET /api/v1/assets/prices/{asset_id} - Get price history
+- GET /api/v1/assets/prices/{asset_id} - Get price history (json / ndjson / csv streams)
 - POST /api/v1/assets/prices/refresh - Refresh prices from providers
 """
 
+import csv
+import json
+
 import pytest
 import httpx
 from datetime import date, timedelta
@@ -306,3 +309,47 @@ async def test_refresh_prices_from_provider(test_server):
         )
         price_history = get_resp.json()
         print_success(f"Prices after refresh: {len(price_history)}")
+
+
+# ============================================================
+# Test 5: GET /assets/prices/{asset_id} - Streamed formats
+# ============================================================
+@pytest.mark.asyncio
+async def test_get_price_history_formats(test_server):
+    """Test 5: GET /assets/prices/{asset_id}?format=ndjson|csv - Same series as json."""
+    print_section("Test 5: GET /assets/prices/{asset_id} - Streamed formats")
+
+    async with httpx.AsyncClient() as client:
+        create_item = FAAssetCreateItem(display_name=f"Price Stream Test {unique_id('PRICESTREAM')}", currency="EUR")
+        create_resp = await client.post(f"{API_BASE}/assets", json=[create_item.model_dump(mode="json")], timeout=TIMEOUT)
+        asset_id = FABulkAssetCreateResponse(**create_resp.json()).results[0].asset_id
+
+        prices = [
+            FAPricePoint(date=date(1939, 1, 1), close=Decimal("10.50"), volume=Decimal("100"), currency="EUR"),
+            FAPricePoint(date=date(1939, 1, 4), close=Decimal("11.00"), currency="EUR"),
+        ]
+        await client.post(f"{API_BASE}/assets/prices", json=[FAUpsert(asset_id=asset_id, prices=prices).model_dump(mode="json")], timeout=TIMEOUT)
+
+        params = {"start_date": "1939-01-02", "end_date": "1939-01-05"}
+        json_resp = await client.get(f"{API_BASE}/assets/prices/{asset_id}", params=params, timeout=TIMEOUT)
+        assert json_resp.status_code == 200, f"Expected 200, got {json_resp.status_code}: {json_resp.text}"
+        series = [FAPricePoint(**p) for p in json_resp.json()]
+        # Starts from the close before start_date, backward-filled
+        assert [p.date.day for p in series] == [2, 3, 4, 5]
+        assert [p.backward_fill_info.days_back if p.backward_fill_info else 0 for p in series] == [1, 2, 0, 1]
+
+        ndjson_resp = await client.get(f"{API_BASE}/assets/prices/{asset_id}", params={**params, "format": "ndjson"}, timeout=TIMEOUT)
+        assert ndjson_resp.headers["content-type"].startswith("application/x-ndjson")
+        assert [json.loads(line) for line in ndjson_resp.text.splitlines()] == json_resp.json()
+        print_success("✓ NDJSON lines match the JSON list")
+
+        csv_resp = await client.get(f"{API_BASE}/assets/prices/{asset_id}", params={**params, "format": "csv"}, timeout=TIMEOUT)
+        assert csv_resp.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(csv_resp.text.splitlines()))
+        assert [(r["date"], Decimal(r["close"]), r["days_back"]) for r in rows] == [
+            (p.date.isoformat(), p.close, str(p.backward_fill_info.days_back) if p.backward_fill_info else "") for p in series
+            ]
+        print_success("✓ CSV rows match the JSON list")
+
+        bad_resp = await client.get(f"{API_BASE}/assets/prices/{asset_id}", params={**params, "format": "xml"}, timeout=TIMEOUT)
+        assert bad_resp.status_code == 422, f"Expected 422 for unknown format, got {bad_resp.status_code}"
@@ -6,10 +6,13 @@ Tests for Foreign Exchange (FX) endpoints:
 - GET /fx/providers (list FX providers)
 - POST /fx/providers/pair-sources (CRUD for pair sources)
 - POST /fx/sync (sync rates from providers)
-- POST /fx/convert (currency conversion)
+- POST /fx/convert (currency conversion, json / ndjson / csv streams)
+- GET /fx/currencies/rate (rate series, json / ndjson / csv streams)
 - POST /fx/rates (manual rate upsert)
 - DELETE /fx/rates (rate deletion)
 """
+import csv
+import json
 import time
 from datetime import date, timedelta
 from decimal import Decimal
@@ -684,3 +687,57 @@ async def test_invalid_requests(test_server):
             )
         assert response.status_code == 422, f"Expected 422 for invalid date, got {response.status_code}"
         print_success("✓ Invalid date rejected with 422")
+
+
+@pytest.mark.asyncio
+async def test_rate_series_and_streamed_conversions(test_server):
+    """Test 12: GET /fx/currencies/rate and POST /fx/currencies/convert?format=ndjson|csv - Streamed series."""
+    print_section("Test 12: Rate series and streamed conversions")
+
+    async with httpx.AsyncClient() as client:
+        rates = [
+            FXUpsertItem(**{"date": date(1939, 2, 2)}, base="DKK", quote="PLN", rate=Decimal("0.75"), source="MANUAL"),
+            FXUpsertItem(**{"date": date(1939, 2, 4)}, base="DKK", quote="PLN", rate=Decimal("0.80"), source="MANUAL"),
+            ]
+        response = await client.post(f"{API_BASE}/fx/currencies/rate", json=[r.model_dump(mode="json") for r in rates], timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
+
+        # 12a. Rate series in the inverse direction: days before the first rate omitted, gaps backward-filled
+        params = {"base": "PLN", "quote": "DKK", "start_date": "1939-02-01", "end_date": "1939-02-05"}
+        response = await client.get(f"{API_BASE}/fx/currencies/rate", params=params, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
+        series = response.json()
+        assert [p["date"] for p in series] == ["1939-02-02", "1939-02-03", "1939-02-04", "1939-02-05"]
+        assert Decimal(series[0]["rate"]) == 1 / Decimal("0.75") and Decimal(series[3]["rate"]) == 1 / Decimal("0.80")
+        assert series[1]["backward_fill_info"] == {"actual_rate_date": "1939-02-02", "days_back": 1}
+
+        response = await client.get(f"{API_BASE}/fx/currencies/rate", params={**params, "format": "ndjson"}, timeout=TIMEOUT)
+        assert [json.loads(line) for line in response.text.splitlines()] == series
+        response = await client.get(f"{API_BASE}/fx/currencies/rate", params={**params, "format": "csv"}, timeout=TIMEOUT)
+        assert [(r["date"], r["rate"]) for r in csv.DictReader(response.text.splitlines())] == [(p["date"], p["rate"]) for p in series]
+        print_success("✓ Rate series identical in json / ndjson / csv")
+
+        # 12b. Streamed conversions: same results as the JSON envelope, missing rates as error lines
+        conversions = [
+            FXConversionRequest(amount=Decimal("100"), **{"from": "DKK", "to": "PLN"}, date_range=DateRangeModel(start=date(1939, 2, 1), end=date(1939, 2, 4))),
+            FXConversionRequest(amount=Decimal("5"), **{"from": "PLN", "to": "PLN"}, date_range=DateRangeModel(start=date(1939, 2, 3))),
+            ]
+        body = [c.model_dump(mode="json") for c in conversions]
+        response = await client.post(f"{API_BASE}/fx/currencies/convert", json=body, timeout=TIMEOUT)
+        convert_response = FXConvertResponse(**response.json())
+
+        response = await client.post(f"{API_BASE}/fx/currencies/convert", params={"format": "ndjson"}, json=body, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 5 and "No FX rate found" in lines[0]["error"]
+        assert lines[1:] == [r.model_dump(mode="json") for r in convert_response.results]
+
+        response = await client.post(f"{API_BASE}/fx/currencies/convert", params={"format": "csv"}, json=body, timeout=TIMEOUT)
+        rows = list(csv.DictReader(response.text.splitlines()))
+        assert [r["converted_amount"] for r in rows[1:]] == [str(r.converted_amount) for r in convert_response.results]
+        assert rows[0]["converted_amount"] == "" and rows[0]["error"]
+        print_success("✓ Streamed conversions match the JSON results")
+
+        # 12c. Invalid range rejected before streaming
+        response = await client.get(f"{API_BASE}/fx/currencies/rate", params={**params, "start_date": "1939-02-06"}, timeout=TIMEOUT)
+        assert response.status_code == 400, f"Expected 400 for invalid range, got {response.status_code}"
@@ -0,0 +1,154 @@
+"""
+Tests for portfolio API endpoints.
+
+Tests the /api/v1/portfolio endpoints:
+- GET /portfolio/nav - Daily NAV series (valuation logic: test_services/test_portfolio_nav.py)
+- GET /portfolio/snapshots - Stored daily snapshots (recompute logic: test_services/test_portfolio_snapshots.py)
+- GET /portfolio/returns - TWR and XIRR per scope (return logic: test_services/test_returns.py)
+- GET /portfolio/allocation - Country/sector exposure (index and aggregation: test_services/test_asset_allocation.py)
+"""
+import pytest
+import httpx
+
+from backend.app.config import get_settings
+from backend.app.schemas.portfolio import FAAllocationBreakdown, FANavSeries, FAPeriodReturns, FAPortfolioSnapshotSeries
+from backend.test_scripts.test_server_helper import _TestingServerManager
+from backend.test_scripts.test_utils import print_section, print_success
+
+settings = get_settings()
+API_BASE = f"http://localhost:{settings.TEST_PORT}/api/v1"
+TIMEOUT = 30
+
+
+@pytest.fixture(scope="module")
+def test_server():
+    """Start test server once for all tests in this module."""
+    with _TestingServerManager() as server_manager:
+        if not server_manager.start_server():
+            pytest.fail("Failed to start test server")
+        yield server_manager
+
+
+@pytest.mark.asyncio
+async def test_nav_series(test_server):
+    """Test 1: GET /portfolio/nav - One value per calendar day."""
+    print_section("Test 1: GET /portfolio/nav")
+
+    async with httpx.AsyncClient() as client:
+        response = await client.get(
+            f"{API_BASE}/portfolio/nav",
+            params={"start_date": "2024-02-27", "end_date": "2024-03-01", "currency": "eur", "asset_ids": "-1", "include_contributions": True},
+            timeout=TIMEOUT,
+            )
+        assert response.status_code == 200, response.text
+        nav = FANavSeries(**response.json())
+        assert nav.currency == "EUR"
+        assert [d.isoformat() for d in nav.dates] == ["2024-02-27", "2024-02-28", "2024-02-29", "2024-03-01"]
+        assert nav.totals == [0.0] * 4
+        assert nav.contributions == [] and nav.unvalued_asset_ids == []
+
+    print_success("✓ NAV series returned")
+
+
+@pytest.mark.asyncio
+async def test_nav_series_validation(test_server):
+    """Test 2: GET /portfolio/nav - Invalid range, ids and currency."""
+    print_section("Test 2: GET /portfolio/nav - Validation")
+
+    async with httpx.AsyncClient() as client:
+        response = await client.get(
+            f"{API_BASE}/portfolio/nav", params={"start_date": "2024-03-01", "end_date": "2024-02-01", "currency": "EUR"}, timeout=TIMEOUT,
+            )
+        assert response.status_code == 400
+
+        response = await client.get(
+            f"{API_BASE}/portfolio/nav", params={"start_date": "2024-01-01", "currency": "EUR", "broker_ids": "1,x"}, timeout=TIMEOUT,
+            )
+        assert response.status_code == 400
+
+        response = await client.get(f"{API_BASE}/portfolio/nav", params={"start_date": "2024-01-01", "currency": "EURO"}, timeout=TIMEOUT)
+        assert response.status_code == 422
+
+    print_success("✓ Invalid requests rejected")
+
+
+@pytest.mark.asyncio
+async def test_snapshots(test_server):
+    """Test 3: GET /portfolio/snapshots - Range scan in the base currency."""
+    print_section("Test 3: GET /portfolio/snapshots")
+
+    async with httpx.AsyncClient() as client:
+        response = await client.get(
+            f"{API_BASE}/portfolio/snapshots", params={"start_date": "1000-01-01", "end_date": "1000-01-31"}, timeout=TIMEOUT,
+            )
+        assert response.status_code == 200, response.text
+        series = FAPortfolioSnapshotSeries(**response.json())
+        assert series.currency == settings.PORTFOLIO_BASE_CURRENCY
+        assert series.broker_id is None and series.points == []
+
+        response = await client.get(
+            f"{API_BASE}/portfolio/snapshots", params={"start_date": "2024-03-01", "end_date": "2024-02-01"}, timeout=TIMEOUT,
+            )
+        assert response.status_code == 400
+
+    print_success("✓ Snapshots returned")
+
+
+@pytest.mark.asyncio
+async def test_returns(test_server):
+    """Test 4: GET /portfolio/returns - Scopes, ids and validation."""
+    print_section("Test 4: GET /portfolio/returns")
+    period = {"start_date": "1000-01-01", "end_date": "1000-01-05"}
+
+    async with httpx.AsyncClient() as client:
+        response = await client.get(f"{API_BASE}/portfolio/returns", params=period, timeout=TIMEOUT)
+        assert response.status_code == 200, response.text
+        returns = FAPeriodReturns(**response.json())
+        assert returns.currency == settings.PORTFOLIO_BASE_CURRENCY
+        assert [r.scope_id for r in returns.results] == [0]
+        assert returns.results[0].twr is None and returns.results[0].mwr is None
+
+        response = await client.get(f"{API_BASE}/portfolio/returns", params={**period, "scope": "asset", "ids": "999999999"}, timeout=TIMEOUT)
+        assert response.status_code == 200, response.text
+        assert [r.scope_id for r in FAPeriodReturns(**response.json()).results] == [999999999]
+
+        for params, status in [
+            ({"start_date": "2024-03-01", "end_date": "2024-02-01"}, 400),
+            ({"start_date": "2024-03-01", "end_date": "2999-01-01"}, 400),
+            ({**period, "scope": "broker", "ids": "1,x"}, 400),
+            ({**period, "scope": "fund"}, 422),
+            ]:
+            response = await client.get(f"{API_BASE}/portfolio/returns", params=params, timeout=TIMEOUT)
+            assert response.status_code == status, f"{params}: {response.status_code}"
+
+    print_success("✓ Returns computed")
+
+
+@pytest.mark.asyncio
+async def test_allocation(test_server):
+    """Test 5: GET /portfolio/allocation - Dimensions, filters and validation."""
+    print_section("Test 5: GET /portfolio/allocation")
+
+    async with httpx.AsyncClient() as client:
+        response = await client.get(
+            f"{API_BASE}/portfolio/allocation", params={"dimension": "SECTOR", "as_of": "1000-01-01"}, timeout=TIMEOUT,
+            )
+        assert response.status_code == 200, response.text
+        allocation = FAAllocationBreakdown(**response.json())
+        assert allocation.currency == settings.PORTFOLIO_BASE_CURRENCY
+        assert allocation.total_value == 0 and allocation.exposures == []
+
+        response = await client.get(f"{API_BASE}/portfolio/allocation", params={"dimension": "COUNTRY"}, timeout=TIMEOUT)
+        assert response.status_code == 200, response.text
+        allocation = FAAllocationBreakdown(**response.json())
+        assert sum(e.value for e in allocation.exposures) + allocation.unclassified_value == pytest.approx(allocation.total_value)
+
+        for params, status in [
+            ({"dimension": "CURRENCY"}, 422),
+            ({}, 422),
+            ({"dimension": "COUNTRY", "broker_ids": "1,x"}, 400),
+            ]:
+            response = await client.get(f"{API_BASE}/portfolio/allocation", params=params, timeout=TIMEOUT)
+            assert response.status_code == status, f"{params}: {response.status_code}"
+
+    print_success("✓ Allocation computed")
@@ -0,0 +1,217 @@
+"""
+Tests for the asset allocation index and portfolio exposures.
+
+Covers the trigger-maintained asset_allocation_weights (asset create, patch,
+metadata update, clear, delete), the consistency check against
+classification_params, country/sector exposures of the holdings at a date
+(FX conversion, unclassified and unvalued assets, broker filter), and a
+500-asset benchmark of the GROUP BY against per-request JSON parsing.
+"""
+import json
+import time
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import (
+    AllocationDimension,
+    Asset,
+    AssetAllocationWeight,
+    AssetType,
+    FxRate,
+    PriceHistory,
+    Transaction,
+    TransactionType,
+    )
+from backend.app.db.session import get_async_engine
+from backend.app.schemas.assets import FAAssetCreateItem, FAAssetPatchItem, FAClassificationParams, FAGeographicArea, FASectorArea
+from backend.app.services.asset_allocation import AssetAllocationManager
+from backend.app.services.asset_crud import AssetCRUDService
+from backend.app.services.asset_metadata import AssetMetadataService
+from backend.app.services.positions import PositionManager
+from backend.app.utils.datetime_utils import utcnow
+from backend.test_scripts.test_utils import (
+    Stopwatch,
+    create_broker,
+    price_row,
+    print_info,
+    print_section,
+    print_success,
+    timed,
+    transaction_row,
+    )
+
+AS_OF = date(1932, 1, 10)
+HELD_ON, PRICED_ON = date(1932, 1, 2), date(1932, 1, 5)
+
+
+async def _weights(session: AsyncSession, asset_id: int) -> dict[tuple[str, str], Decimal]:
+    rows = (await session.execute(select(AssetAllocationWeight).where(AssetAllocationWeight.asset_id == asset_id))).scalars().all()
+    return {(r.dimension.value, r.key): r.weight for r in rows}
+
+
+def _classified_asset(label: str, currency: str, geographic: dict, sector: dict = None) -> dict:
+    params = FAClassificationParams(
+        geographic_area=FAGeographicArea(distribution=geographic),
+        sector_area=FASectorArea(distribution=sector) if sector else None,
+        )
+    now = utcnow()
+    return {
+        "display_name": f"Allocation {label} {time.time_ns()}", "currency": currency, "asset_type": AssetType.STOCK, "active": True,
+        "classification_params": params.model_dump_json(exclude_none=True), "created_at": now, "updated_at": now,
+        }
+
+
+@pytest.mark.asyncio
+async def test_weights_follow_asset_writes():
+    """Create, patch, metadata assignment, clear and delete keep the index in sync with classification_params."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        created = await AssetCRUDService.create_assets_bulk([FAAssetCreateItem(
+            display_name=f"Allocation CRUD {time.time_ns()}", currency="USD", asset_type=AssetType.ETF,
+            classification_params=FAClassificationParams(
+                geographic_area=FAGeographicArea(distribution={"US": "0.6", "Italy": "0.4"}),
+                sector_area=FASectorArea(distribution={"technology": "1"}),
+                ),
+            )], session)
+        asset_id = created.results[0].asset_id
+        assert await _weights(session, asset_id) == {
+            ("COUNTRY", "USA"): Decimal("0.6"), ("COUNTRY", "ITA"): Decimal("0.4"), ("SECTOR", "Technology"): Decimal("1"),
+            }
+
+        # Patch replaces the geographic block only
+        await AssetCRUDService.patch_assets_bulk([FAAssetPatchItem(
+            asset_id=asset_id, classification_params=FAClassificationParams(geographic_area=FAGeographicArea(distribution={"FRA": "1"})),
+            )], session)
+        assert await _weights(session, asset_id) == {("COUNTRY", "FRA"): Decimal("1"), ("SECTOR", "Technology"): Decimal("1")}
+
+        # Direct assignment (provider metadata auto-populate path)
+        asset = await session.get(Asset, asset_id)
+        current = FAClassificationParams.model_validate_json(asset.classification_params)
+        updated = AssetMetadataService.apply_partial_update(
+            current, FAClassificationParams(sector_area=FASectorArea(distribution={"Energy": "0.25", "Utilities": "0.75"})),
+            )
+        asset.classification_params = json.dumps(updated.model_dump(mode="json", exclude_none=True))
+        await session.commit()
+        assert await _weights(session, asset_id) == {
+            ("COUNTRY", "FRA"): Decimal("1"), ("SECTOR", "Energy"): Decimal("0.25"), ("SECTOR", "Utilities"): Decimal("0.75"),
+            }
+        check = await AssetAllocationManager.check_consistency(session)
+        assert asset_id not in check.mismatched_asset_ids
+
+        # Clearing classification_params drops the rows, deleting the asset cascades
+        await AssetCRUDService.patch_assets_bulk([FAAssetPatchItem(asset_id=asset_id, classification_params=None)], session)
+        assert await _weights(session, asset_id) == {}
+        await session.execute(insert(Asset), [_classified_asset("delete", "EUR", {"DEU": "1"})])
+        await session.commit()
+        deleted_id = (await session.execute(select(Asset.id).order_by(Asset.id.desc()).limit(1))).scalar_one()
+        assert await _weights(session, deleted_id) == {("COUNTRY", "DEU"): Decimal("1")}
+        await AssetCRUDService.delete_assets_bulk([deleted_id], session)
+        assert await _weights(session, deleted_id) == {}
+
+
+@pytest.mark.asyncio
+async def test_exposure_at_date():
+    """Country and sector exposure: FX-converted values split by weight, unclassified and unvalued assets."""
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        broker_id, *_ = await create_broker(session, "Allocation Broker", currencies=())
+        other_id, *_ = await create_broker(session, "Allocation Other", currencies=())
+
+        specs = [
+            _classified_asset("chf", "CHF", {"USA": "0.6", "ITA": "0.4"}, {"Technology": "1"}),
+            _classified_asset("eur", "EUR", {"ITA": "1"}),
+            _classified_asset("unpriced", "EUR", {"USA": "1"}),
+            ]
+        asset_ids = (await session.execute(insert(Asset).returning(Asset.id), specs)).scalars().all()
+        chf_asset, eur_asset, unpriced = asset_ids
+        await session.execute(insert(Transaction), [
+            transaction_row(chf_asset, broker_id, TransactionType.ADD_HOLDING, "10", HELD_ON),
+            transaction_row(eur_asset, broker_id, TransactionType.ADD_HOLDING, "5", HELD_ON),
+            transaction_row(unpriced, broker_id, TransactionType.ADD_HOLDING, "1", HELD_ON),
+            transaction_row(eur_asset, other_id, TransactionType.ADD_HOLDING, "100", HELD_ON),
+            ])
+        await session.execute(insert(PriceHistory), [price_row(chf_asset, PRICED_ON, "100", "CHF"), price_row(eur_asset, PRICED_ON, "40", "EUR")])
+        # 1 CHF = 0.9 EUR: 10 × 100 CHF = 900 EUR (dates before any provider data)
+        await session.execute(sqlite_insert(FxRate).on_conflict_do_nothing(), [
+            {"date": date(1931, 12, 31), "base": "CHF", "quote": "EUR", "rate": Decimal("0.9"), "source": "TEST", "fetched_at": utcnow()},
+            ])
+        await session.commit()
+
+        countries = await AssetAllocationManager.get_exposure(session, AllocationDimension.COUNTRY, broker_ids=[broker_id], as_of=AS_OF)
+        assert countries.total_value == pytest.approx(1100.0)
+        assert [(e.key, e.asset_count) for e in countries.exposures] == [("ITA", 2), ("USA", 1)]
+        assert [e.value for e in countries.exposures] == pytest.approx([560.0, 540.0])
+        assert [e.weight for e in countries.exposures] == pytest.approx([560 / 1100, 540 / 1100])
+        assert countries.unclassified_value == 0.0
+        assert countries.unvalued_asset_ids == [unpriced]
+
+        sectors = await AssetAllocationManager.get_exposure(session, AllocationDimension.SECTOR, broker_ids=[broker_id], as_of=AS_OF)
+        assert [(e.key, e.value) for e in sectors.exposures] == [("Technology", pytest.approx(900.0))]
+        assert sectors.unclassified_value == pytest.approx(200.0)
+
+        # Before the holdings: nothing held
+        empty = await AssetAllocationManager.get_exposure(session, AllocationDimension.COUNTRY, broker_ids=[broker_id], as_of=date(1932, 1, 1))
+        assert empty.total_value == 0 and empty.exposures == [] and empty.unvalued_asset_ids == []
+
+        # Current holdings (latest price and rate tables) match an as-of date after every stored point
+        current = await AssetAllocationManager.get_exposure(session, AllocationDimension.COUNTRY, broker_ids=[broker_id])
+        at_end = await AssetAllocationManager.get_exposure(session, AllocationDimension.COUNTRY, broker_ids=[broker_id], as_of=date(2999, 1, 1))
+        assert current.as_of is None and current.unvalued_asset_ids == [unpriced]
+        assert [(e.key, e.asset_count) for e in current.exposures] == [(e.key, e.asset_count) for e in at_end.exposures]
+        assert [e.value for e in current.exposures] == pytest.approx([e.value for e in at_end.exposures])
+
+
+@pytest.mark.asyncio
+async def test_exposure_benchmark():
+    """Benchmark: GROUP BY over the index vs parsing classification_params of 500 held assets per request."""
+    print_section("Benchmark: allocation exposure (500 assets)")
+    countries = ["USA", "ITA", "FRA", "DEU", "JPN", "GBR", "CHN", "BRA"]
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        broker_id, *_ = await create_broker(session, "Allocation Bench", currencies=())
+        specs = [
+            _classified_asset(f"bench {i}", "EUR", {countries[i % 8]: "0.7", countries[(i + 3) % 8]: "0.3"}, {"Energy": "1"})
+            for i in range(500)
+            ]
+        asset_ids = (await session.execute(insert(Asset).returning(Asset.id), specs)).scalars().all()
+        await session.execute(insert(Transaction), [
+            transaction_row(asset_id, broker_id, TransactionType.ADD_HOLDING, str(i % 7 + 1), HELD_ON) for i, asset_id in enumerate(asset_ids)
+            ])
+        await session.execute(insert(PriceHistory), [price_row(asset_id, PRICED_ON, str(10 + i % 13), "EUR") for i, asset_id in enumerate(asset_ids)])
+        await session.commit()
+        await PositionManager.sync(session)
+        # Warm-up: statement compilation is cached after the first call
+        await AssetAllocationManager.get_exposure(session, AllocationDimension.COUNTRY, broker_ids=[broker_id], as_of=AS_OF)
+
+        exposure, index_seconds = await timed(
+            AssetAllocationManager.get_exposure(session, AllocationDimension.COUNTRY, broker_ids=[broker_id], as_of=AS_OF)
+            )
+
+        # Per-request path: load every held asset, parse and validate its JSON, aggregate in Python
+        with Stopwatch() as parse:
+            rows = (await session.execute(select(Asset.id, Asset.classification_params).where(Asset.id.in_(asset_ids)))).all()
+            values = {asset_id: (i % 7 + 1) * (10 + i % 13) for i, asset_id in enumerate(asset_ids)}
+            parsed: dict[str, float] = {}
+            for asset_id, params in rows:
+                distribution = FAClassificationParams(**json.loads(params)).geographic_area.distribution
+                for key, weight in distribution.items():
+                    parsed[key] = parsed.get(key, 0.0) + values[asset_id] * float(weight)
+
+        print_info(f"Allocation index GROUP BY: {index_seconds * 1000:.1f}ms")
+        print_info(f"Parse + validate JSON per asset: {parse.seconds * 1000:.1f}ms")
+        assert {e.key: e.value for e in exposure.exposures} == pytest.approx(parsed)
+        assert index_seconds < parse.seconds
+    print_success("✓ Benchmark completed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
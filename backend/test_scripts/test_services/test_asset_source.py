@@ -717,5 +717,42 @@ async def test_bulk_delete_prices(asset_ids: list[int]):
         assert all(r.message for r in bulkDelresult.results), "All results should have a message"
 
 
+@pytest.mark.asyncio
+async def test_bulk_delete_prices_chunked_counts(asset_ids: list[int]):
+    """Test bulk_delete_prices() per-asset counts across chunked statements and overlapping ranges."""
+    print_section("Test 15: Bulk Delete Prices (chunked)")
+    from datetime import timedelta
+    from backend.app.services.asset_source import PRICE_DELETE_CHUNK_SIZE
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset_a, asset_b = asset_ids[1], asset_ids[2]
+        base = date(2024, 1, 1)
+        await AssetSourceManager.bulk_upsert_prices([
+            FAUpsert(asset_id=asset_a, prices=[FAPricePoint(date=base + timedelta(days=i), close=Decimal("10"), currency="USD") for i in range(40)]),
+            FAUpsert(asset_id=asset_b, prices=[FAPricePoint(date=base + timedelta(days=i), close=Decimal("20"), currency="USD") for i in range(10)]),
+            ], session)
+
+        # More single-day ranges than one chunk holds (mostly on empty dates) + overlapping ranges
+        single_days = [DateRangeModel(start=base + timedelta(days=i), end=None) for i in range(PRICE_DELETE_CHUNK_SIZE + 50)]
+        data = [
+            FAAssetDelete(asset_id=asset_a, date_ranges=single_days[:20] + [DateRangeModel(start=base + timedelta(days=10), end=base + timedelta(days=29))]),
+            FAAssetDelete(asset_id=asset_b, date_ranges=single_days),
+            ]
+
+        result = await AssetSourceManager.bulk_delete_prices(data, session)
+        counts = {r.asset_id: r.deleted_count for r in result.results}
+        print_info(f"Chunked delete counts: {counts}")
+
+        # Overlapping rows are counted once (they are deleted once)
+        assert counts == {asset_a: 30, asset_b: 10}, f"Unexpected per-asset counts: {counts}"
+        assert result.total_deleted == 40
+
+        remaining = (await session.execute(
+            select(PriceHistory.date).where(PriceHistory.asset_id == asset_a).where(PriceHistory.date >= base).where(PriceHistory.date < base + timedelta(days=40))
+            )).scalars().all()
+        assert len(remaining) == 10
+        print_success("✓ Per-asset counts correct across chunks")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
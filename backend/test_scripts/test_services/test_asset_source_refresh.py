@@ -62,5 +62,247 @@ async def test_bulk_refresh_prices_orchestration():
         assert len(results.results) > 0
 
 
+
+@pytest.mark.asyncio
+async def test_bulk_refresh_prices_incremental():
+    """Incremental refresh starts from last stored date, writes only new rows and honours fetch_interval."""
+    assert initialize_test_database(), "Failed to initialize test database"
+    AssetProviderRegistry.auto_discover()
+
+    import time
+    from datetime import timedelta
+    from decimal import Decimal
+    from backend.app.db.models import IdentifierType
+    from backend.app.schemas.prices import FAUpsert
+    from backend.app.schemas.assets import FAPricePoint
+    timestamp = int(time.time() * 1000)
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset = Asset(display_name=f"Incremental Refresh Asset {timestamp}", currency="USD", asset_type=AssetType.STOCK, active=True)
+        orphan = Asset(display_name=f"Incremental Orphan Asset {timestamp}", currency="USD", asset_type=AssetType.STOCK, active=True)
+        session.add_all([asset, orphan])
+        await session.commit()
+        await session.refresh(asset)
+        await session.refresh(orphan)
+
+        await AssetSourceManager.bulk_assign_providers([
+            FAProviderAssignmentItem(
+                asset_id=asset.id,
+                provider_code="mockprov",
+                identifier="INCREMENTAL_TEST",
+                identifier_type=IdentifierType.UUID,
+                provider_params={},
+                fetch_interval=1440
+                )
+            ], session)
+
+        # Stored history 2025-01-01..2025-01-10 with the same values mockprov returns
+        stored = [
+            FAPricePoint(date=date(2025, 1, 1) + timedelta(days=i), open=Decimal("100"), high=Decimal("100"), low=Decimal("100"), close=Decimal("100"), currency="USD")
+            for i in range(10)
+            ]
+        await AssetSourceManager.bulk_upsert_prices([FAUpsert(asset_id=asset.id, prices=stored)], session)
+
+        # Refresh up to 2025-01-12: window = last date (01-10) - overlap (3d) .. 01-12
+        response = await AssetSourceManager.bulk_refresh_prices_incremental([asset.id, orphan.id], session, end_date=date(2025, 1, 12))
+        assert [r.asset_id for r in response.results] == [asset.id, orphan.id]
+
+        refreshed, missing = response.results
+        assert not refreshed.errors, refreshed.errors
+        assert not refreshed.skipped
+        assert refreshed.fetched_count == 6, f"Expected 6 fetched prices (01-07..01-12), got {refreshed.fetched_count}"
+        assert refreshed.inserted_count == 2, f"Only 01-11 and 01-12 are new, got {refreshed.inserted_count}"
+        assert missing.errors == ["No provider assigned for asset"]
+
+        # Second run: fetch_interval (24h) not elapsed -> skipped without provider call
+        response = await AssetSourceManager.bulk_refresh_prices_incremental([asset.id], session, end_date=date(2025, 1, 12))
+        assert response.results[0].skipped
+        assert response.results[0].fetched_count == 0
+
+        # force=True bypasses fetch_interval, nothing new to write
+        response = await AssetSourceManager.bulk_refresh_prices_incremental([asset.id], session, end_date=date(2025, 1, 12), force=True)
+        assert not response.results[0].skipped
+        assert response.results[0].inserted_count == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_refresh_prices_skips_unchanged_rows():
+    """Refresh reports inserted/updated/unchanged separately and only rewrites changed rows."""
+    assert initialize_test_database(), "Failed to initialize test database"
+    AssetProviderRegistry.auto_discover()
+
+    import time
+    from decimal import Decimal
+    from sqlalchemy import select
+    from backend.app.db.models import IdentifierType, PriceHistory
+    from backend.app.schemas.common import DateRangeModel
+    from backend.app.schemas.prices import FAUpsert
+    from backend.app.schemas.assets import FAPricePoint
+    timestamp = int(time.time() * 1000)
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset = Asset(display_name=f"Change Detection Asset {timestamp}", currency="USD", asset_type=AssetType.STOCK, active=True)
+        session.add(asset)
+        await session.commit()
+        await session.refresh(asset)
+
+        await AssetSourceManager.bulk_assign_providers([
+            FAProviderAssignmentItem(
+                asset_id=asset.id,
+                provider_code="mockprov",
+                identifier="CHANGE_DETECTION_TEST",
+                identifier_type=IdentifierType.UUID,
+                provider_params={},
+                fetch_interval=1440
+                )
+            ], session)
+
+        # 01-01..01-03 match mockprov values, 01-04 differs, 01-05 missing
+        stored = [
+            FAPricePoint(date=date(2025, 1, day), open=Decimal("100"), high=Decimal("100"), low=Decimal("100"), close=Decimal("100"), currency="USD")
+            for day in (1, 2, 3)
+            ]
+        stored.append(FAPricePoint(date=date(2025, 1, 4), open=Decimal("100"), high=Decimal("100"), low=Decimal("100"), close=Decimal("99.5"), currency="USD"))
+        await AssetSourceManager.bulk_upsert_prices([FAUpsert(asset_id=asset.id, prices=stored)], session)
+
+        payload = [FARefreshItem(asset_id=asset.id, date_range=DateRangeModel(start=date(2025, 1, 1), end=date(2025, 1, 5)))]
+        result = (await AssetSourceManager.bulk_refresh_prices(payload, session)).results[0]
+
+        assert not result.errors, result.errors
+        assert result.fetched_count == 5
+        assert result.inserted_count == 1, f"Only 01-05 is new, got {result.inserted_count}"
+        assert result.updated_count == 1, f"Only 01-04 changed, got {result.updated_count}"
+        assert result.unchanged_count == 3
+
+        rows = (await session.execute(
+            select(PriceHistory).where(PriceHistory.asset_id == asset.id).order_by(PriceHistory.date)
+            )).scalars().all()
+        by_day = {row.date.day: row for row in rows}
+        assert len(rows) == 5
+        assert by_day[4].close == Decimal("100")
+        # Rewritten rows carry the provider key, untouched rows keep their original source
+        assert by_day[4].source_plugin_key == "mockprov"
+        assert by_day[5].source_plugin_key == "mockprov"
+        assert all(by_day[day].source_plugin_key == "MANUAL" for day in (1, 2, 3))
+
+        # Identical second refresh writes nothing
+        result = (await AssetSourceManager.bulk_refresh_prices(payload, session)).results[0]
+        assert (result.inserted_count, result.updated_count, result.unchanged_count) == (0, 0, 5)
+
+
+@pytest.mark.asyncio
+async def test_bulk_refresh_timeout_excludes_rate_limit_wait(monkeypatch):
+    """The per-asset timeout covers the provider calls only, not the wait for a rate-limit slot."""
+    assert initialize_test_database(), "Failed to initialize test database"
+    AssetProviderRegistry.auto_discover()
+
+    import asyncio
+    import time
+    from backend.app.db.models import IdentifierType
+    from backend.app.schemas.common import DateRangeModel
+    from backend.app.services.asset_source_providers.mockprov import MockProvider
+    from backend.app.services.rate_limiter import RateLimitPolicy, rate_limiter
+    timestamp = int(time.time() * 1000)
+
+    policy = RateLimitPolicy(rate=100.0, burst=1, max_concurrency=1)
+    monkeypatch.setattr(MockProvider, "rate_limit_policy", property(lambda self: policy))
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset = Asset(display_name=f"Refresh Timeout Asset {timestamp}", currency="USD", asset_type=AssetType.STOCK, active=True)
+        session.add(asset)
+        await session.commit()
+        await session.refresh(asset)
+        await AssetSourceManager.bulk_assign_providers([
+            FAProviderAssignmentItem(
+                asset_id=asset.id, provider_code="mockprov", identifier="REFRESH_TIMEOUT_TEST",
+                identifier_type=IdentifierType.UUID, provider_params={}, fetch_interval=1440,
+                )
+            ], session)
+        payload = [FARefreshItem(asset_id=asset.id, date_range=DateRangeModel(start=date(2025, 2, 1), end=date(2025, 2, 3)))]
+
+        try:
+            # Bucket blocked (e.g. Retry-After) longer than the timeout: the refresh still succeeds
+            bucket = rate_limiter.get_bucket("mockprov", None, policy)
+            bucket.blocked_until = time.monotonic() + 0.6
+            result = (await AssetSourceManager.bulk_refresh_prices(payload, session, timeout=0.3)).results[0]
+            assert not result.errors, result.errors
+            assert result.fetched_count == 3
+
+            # Slow provider call inside the slot: timed out, reported explicitly
+            original = MockProvider.get_history_value
+
+            async def _slow_history(self, *args, **kwargs):
+                await asyncio.sleep(1)
+                return await original(self, *args, **kwargs)
+
+            monkeypatch.setattr(MockProvider, "get_history_value", _slow_history)
+            result = (await AssetSourceManager.bulk_refresh_prices(payload, session, timeout=0.2)).results[0]
+            assert result.errors == ["Provider mockprov timed out after 0.2s"]
+        finally:
+            rate_limiter.reset()
+
+
+
+@pytest.mark.asyncio
+async def test_bulk_refresh_slot_per_provider_call(monkeypatch):
+    """History and current value take one rate-limit slot each; a throttled history call skips the current value."""
+    assert initialize_test_database(), "Failed to initialize test database"
+    AssetProviderRegistry.auto_discover()
+
+    import time
+    from datetime import timedelta
+    from backend.app.db.models import IdentifierType
+    from backend.app.schemas.common import DateRangeModel
+    from backend.app.services.asset_source import AssetSourceError
+    from backend.app.services.asset_source_providers.mockprov import MockProvider
+    from backend.app.services.rate_limiter import RateLimitPolicy, rate_limiter
+    timestamp = int(time.time() * 1000)
+
+    policy = RateLimitPolicy(rate=100.0, burst=10, max_concurrency=1)
+    monkeypatch.setattr(MockProvider, "rate_limit_policy", property(lambda self: policy))
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset = Asset(display_name=f"Refresh Slots Asset {timestamp}", currency="USD", asset_type=AssetType.STOCK, active=True)
+        session.add(asset)
+        await session.commit()
+        await session.refresh(asset)
+        await AssetSourceManager.bulk_assign_providers([
+            FAProviderAssignmentItem(
+                asset_id=asset.id, provider_code="mockprov", identifier="REFRESH_SLOTS_TEST",
+                identifier_type=IdentifierType.UUID, provider_params={}, fetch_interval=1440,
+                )
+            ], session)
+        today = date.today()
+        payload = [FARefreshItem(asset_id=asset.id, date_range=DateRangeModel(start=today - timedelta(days=2), end=today))]
+
+        try:
+            # History + current value: two provider calls, two slots (assignment fetched metadata already)
+            bucket = rate_limiter.get_bucket("mockprov", None, policy)
+            before = bucket.request_count
+            result = (await AssetSourceManager.bulk_refresh_prices(payload, session)).results[0]
+            assert not result.errors, result.errors
+            assert bucket.request_count == before + 2
+
+            # Throttled history: reported to the bucket, no current value call in the same refresh
+            current_calls = []
+            original_current = MockProvider.get_current_value
+
+            async def _throttled_history(self, *args, **kwargs):
+                raise AssetSourceError("Too many requests", "RATE_LIMITED", {"retry_after": 0})
+
+            async def _counted_current(self, *args, **kwargs):
+                current_calls.append(args)
+                return await original_current(self, *args, **kwargs)
+
+            monkeypatch.setattr(MockProvider, "get_history_value", _throttled_history)
+            monkeypatch.setattr(MockProvider, "get_current_value", _counted_current)
+            result = (await AssetSourceManager.bulk_refresh_prices(payload, session)).results[0]
+            assert len(result.errors) == 1 and "rate-limited" in result.errors[0]
+            assert current_calls == []
+            assert (bucket.request_count, bucket.throttled_count) == (before + 3, 1)
+        finally:
+            rate_limiter.reset()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,295 @@
+"""
+Tests for the streaming broker statement import.
+
+Covers a CSV statement (assets resolved by provider identifier and display
+name, linked transaction + cash movement pairs, standalone movements, cash
+accounts created on first use, rejected rows), a JSON array decoded across
+read boundaries with an interruption and an oversell stopping the import,
+resumes from the checkpoint without duplicates, overlapping statements
+skipping the rows already imported (content hash), and a 10k-row benchmark
+against per-row ORM inserts.
+"""
+import json
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import (
+    Asset,
+    AssetProviderAssignment,
+    BrokerImportCheckpoint,
+    CashAccount,
+    CashMovement,
+    CashMovementType,
+    IdentifierType,
+    Transaction,
+    TransactionType,
+    )
+from backend.app.db.session import get_async_engine
+from backend.app.services import broker_import
+from backend.app.services.broker_import import BrokerImportManager
+from backend.app.services.cash_balances import CashBalanceManager
+from backend.app.services.positions import PositionManager
+from backend.app.utils.datetime_utils import utcnow
+from backend.test_scripts.test_utils import create_asset, create_broker, print_info, print_section, print_success
+
+
+async def _movements(session: AsyncSession, broker_id: int) -> list[tuple]:
+    rows = await session.execute(
+        select(CashAccount.currency, CashMovement.type, CashMovement.amount, CashMovement.trade_date)
+        .join(CashAccount, CashAccount.id == CashMovement.cash_account_id)
+        .where(CashAccount.broker_id == broker_id)
+        .order_by(CashMovement.id)
+        )
+    return [tuple(r) for r in rows]
+
+
+@pytest.mark.asyncio
+async def test_import_csv_statement(tmp_path):
+    """Linked pairs, standalone movements, lookups and rejected rows of a CSV statement."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        broker_id, eur = await create_broker(session, "Import csv")
+        ticker = await create_asset(session, "Import csv ticker")
+        named = await create_asset(session, "Import csv named")
+        named_name = (await session.get(Asset, named)).display_name
+        symbol = f"IMP{time.time_ns()}"
+        session.add(AssetProviderAssignment(
+            asset_id=ticker, provider_code="yfinance", identifier=symbol, identifier_type=IdentifierType.TICKER,
+            ))
+        await session.commit()
+
+        path = tmp_path / "statement.csv"
+        path.write_text("\n".join([
+            "Trade_Date,Type,Asset,Quantity,Price,Currency,Amount,Note",
+            "1933-01-02,DEPOSIT,,,,EUR,1000,funding",
+            f"1933-01-03,BUY,{symbol.lower()},10,50,EUR,,",
+            f"1933-01-03,BUY,{named_name},4,25,usd,101.5,with fees",
+            f"1933-01-04,DIVIDEND,{symbol},,7.5,EUR,,",
+            f"1933-01-05,SELL,{symbol},3,60,EUR,,",
+            f"1933-01-05,TRANSFER_OUT,{named_name},1,,USD,,",
+            "1933-01-06,FEE,,,,EUR,2,custody",
+            "1933-01-06,BUY,Unknown asset,1,1,EUR,,",
+            f"1933-01-06,DIVIDEND,{symbol},1,5,EUR,,",
+            "1933-13-01,DEPOSIT,,,,EUR,5,",
+            "1933-01-06,BUY_SPEND,,,,EUR,5,",
+            "1933-01-06,WITHDRAWAL,,,,EUR,-5,",
+            ]))
+        result = await BrokerImportManager.import_file(session, broker_id, path)
+
+        assert (result.rows_read, result.rows_failed, result.completed) == (12, 5, True)
+        assert (result.transactions_created, result.cash_movements_created) == (5, 6)
+        assert [e.row for e in result.errors] == [8, 9, 10, 11, 12]
+        assert "not found" in result.errors[0].message and "quantity must be 0" in result.errors[1].message
+
+        # Linked movements in row order, USD account created on first use
+        assert await _movements(session, broker_id) == [
+            ("EUR", CashMovementType.DEPOSIT, Decimal("1000"), date(1933, 1, 2)),
+            ("EUR", CashMovementType.BUY_SPEND, Decimal("500"), date(1933, 1, 3)),
+            ("USD", CashMovementType.BUY_SPEND, Decimal("101.5"), date(1933, 1, 3)),
+            ("EUR", CashMovementType.DIVIDEND_INCOME, Decimal("7.5"), date(1933, 1, 4)),
+            ("EUR", CashMovementType.SALE_PROCEEDS, Decimal("180"), date(1933, 1, 5)),
+            ("EUR", CashMovementType.FEE, Decimal("2"), date(1933, 1, 6)),
+            ]
+        transactions = (await session.execute(
+            select(Transaction.type, Transaction.note, CashMovement.type)
+            .outerjoin(CashMovement, CashMovement.id == Transaction.cash_movement_id)
+            .where(Transaction.broker_id == broker_id)
+            .order_by(Transaction.id)
+            )).all()
+        assert [tuple(t) for t in transactions] == [
+            (TransactionType.BUY, None, CashMovementType.BUY_SPEND),
+            (TransactionType.BUY, "with fees", CashMovementType.BUY_SPEND),
+            (TransactionType.DIVIDEND, None, CashMovementType.DIVIDEND_INCOME),
+            (TransactionType.SELL, None, CashMovementType.SALE_PROCEEDS),
+            (TransactionType.TRANSFER_OUT, None, None),
+            ]
+
+        # Derived tables follow through the existing triggers
+        positions = await PositionManager.get_positions(session, broker_ids=[broker_id])
+        assert {p.asset_id: p.quantity for p in positions} == {ticker: Decimal(7), named: Decimal(3)}
+        balances = await CashBalanceManager.get_balances(session)
+        assert {b.cash_account_id: b.balance for b in balances}[eur] == Decimal("685.5")
+
+        # Same file again: the completed checkpoint makes it a no-op
+        again = await BrokerImportManager.import_file(session, broker_id, path)
+        assert (again.resumed_from, again.rows_read, again.transactions_created, again.completed) == (12, 0, 0, True)
+
+
+@pytest.mark.asyncio
+async def test_resume_after_interruption_and_oversell(tmp_path, monkeypatch):
+    """JSON array across read boundaries; a crash and an oversell both resume from the last committed chunk."""
+    monkeypatch.setattr(broker_import, "JSON_READ_SIZE", 64)
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        broker_id, *_ = await create_broker(session, "Import json", currencies=())
+        asset_id = await create_asset(session, "Import json")
+        rows = [
+            {"trade_date": str(date(1933, 2, 1) + timedelta(days=i)), "type": "ADD_HOLDING",
+             "asset_id": asset_id, "quantity": 1, "currency": "EUR"}
+            for i in range(5)
+            ]
+        path = tmp_path / "statement.json"
+        path.write_text(json.dumps(rows, indent=2))
+        with open(path) as file:
+            assert list(broker_import._lowercase_keys(broker_import.iter_json_rows(file))) == [
+                {**row, "asset_id": asset_id} for row in rows
+                ]
+
+        def interrupted(source):
+            for i, row in enumerate(source):
+                if i == 3:
+                    raise ConnectionError("source lost")
+                yield row
+
+        key = f"json:{time.time_ns()}"
+        with pytest.raises(ConnectionError):
+            await BrokerImportManager.import_rows(session, broker_id, interrupted(rows), key, chunk_size=2)
+        await session.rollback()
+        checkpoint = await session.get(BrokerImportCheckpoint, key)
+        assert (checkpoint.rows_processed, checkpoint.transactions_created, checkpoint.completed) == (2, 2, False)
+
+        # Resume: rows 3-5, then an oversell in the next chunk stops before writing it
+        overselling = rows + [
+            {"trade_date": "1933-02-10", "type": "REMOVE_HOLDING", "asset_id": asset_id, "quantity": "2", "currency": "EUR"},
+            {"trade_date": "1933-02-11", "type": "REMOVE_HOLDING", "asset_id": asset_id, "quantity": "9", "currency": "EUR"},
+            ]
+        stopped = await BrokerImportManager.import_rows(session, broker_id, iter(overselling), key, chunk_size=3)
+        assert (stopped.resumed_from, stopped.transactions_created, stopped.completed) == (2, 3, False)
+        assert [(e.row, "oversell" in e.message) for e in stopped.errors] == [(7, True)]
+
+        # Fixed statement under the same key: only the remaining rows are written
+        overselling[-1]["quantity"] = "3"
+        resumed = await BrokerImportManager.import_rows(session, broker_id, iter(overselling), key, chunk_size=3)
+        assert (resumed.resumed_from, resumed.rows_read, resumed.transactions_created, resumed.completed) == (5, 2, 2, True)
+        [position] = await PositionManager.get_positions(session, asset_ids=[asset_id], include_closed=True)
+        assert position.quantity == 0
+        count = (await session.execute(select(func.count()).where(Transaction.asset_id == asset_id))).scalar_one()
+        assert count == 7
+
+        with pytest.raises(ValueError):
+            await BrokerImportManager.import_rows(session, -1, iter(rows), key)
+
+
+@pytest.mark.asyncio
+async def test_overlapping_statements_skip_duplicates(tmp_path):
+    """A second export overlapping the first: rows already imported are skipped and reported, identical fills kept."""
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        broker_id, *_ = await create_broker(session, "Import overlap", currencies=())
+        asset_id = await create_asset(session, "Import overlap")
+        header = "trade_date,type,asset_id,quantity,price,currency,amount"
+        buy = f"1934-01-02,BUY,{asset_id},1,10,EUR,"
+        transfer = f"1934-01-03,TRANSFER_OUT,{asset_id},1,,EUR,"
+
+        first = tmp_path / "january.csv"
+        first.write_text("\n".join([header, "1934-01-01,DEPOSIT,,,,EUR,1000", buy, buy, transfer]))
+        imported = await BrokerImportManager.import_file(session, broker_id, first)
+        assert (imported.transactions_created, imported.cash_movements_created, imported.duplicates_skipped) == (3, 3, 0)
+
+        # Same days again plus a third identical fill and new days
+        second = tmp_path / "january-february.csv"
+        second.write_text("\n".join([
+            header, buy, buy, buy, transfer, f"1934-02-01,SELL,{asset_id},1,12,EUR,", "1934-02-01,DEPOSIT,,,,EUR,1000",
+            ]))
+        result = await BrokerImportManager.import_file(session, broker_id, second)
+        assert (result.rows_read, result.rows_failed, result.completed) == (6, 0, True)
+        assert (result.duplicates_skipped, result.duplicate_rows) == (3, [1, 2, 4])
+        assert (result.transactions_created, result.cash_movements_created) == (2, 3)
+
+        [position] = await PositionManager.get_positions(session, asset_ids=[asset_id])
+        assert position.quantity == 1
+        assert [m[1:3] for m in await _movements(session, broker_id)] == [
+            (CashMovementType.DEPOSIT, Decimal("1000")),
+            (CashMovementType.BUY_SPEND, Decimal("10")),
+            (CashMovementType.BUY_SPEND, Decimal("10")),
+            (CashMovementType.BUY_SPEND, Decimal("10")),
+            (CashMovementType.SALE_PROCEEDS, Decimal("12")),
+            (CashMovementType.DEPOSIT, Decimal("1000")),
+            ]
+
+        # Under another key and without the oversell guard, the ON CONFLICT inserts alone skip everything
+        again = await BrokerImportManager.import_file(
+            session, broker_id, second, import_key=f"again:{time.time_ns()}", validate_oversell=False,
+            )
+        assert (again.duplicates_skipped, again.transactions_created, again.cash_movements_created) == (6, 0, 0)
+        assert again.duplicate_rows == [1, 2, 3, 4, 5, 6]
+        count = (await session.execute(select(func.count()).where(Transaction.asset_id == asset_id))).scalar_one()
+        assert count == 5
+
+
+@pytest.mark.asyncio
+async def test_import_benchmark():
+    """Benchmark: 10k statement rows streamed in chunks vs per-row ORM inserts (populate_mock_data style)."""
+    print_section("Benchmark: broker import (10k rows)")
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        broker_id, *_ = await create_broker(session, "Import bench", currencies=())
+        asset_ids = [await create_asset(session, f"Import bench {i}") for i in range(50)]
+        names = (await session.execute(select(Asset.display_name).where(Asset.id.in_(asset_ids)).order_by(Asset.id))).scalars().all()
+        start = date(1933, 3, 1)
+
+        def statement(first_day: date, count: int):
+            yield {"trade_date": str(first_day), "type": "DEPOSIT", "currency": "EUR", "amount": "100000000"}
+            for i in range(count - 1):
+                row = {"trade_date": str(first_day + timedelta(days=1 + i // 50)), "asset": names[i % 50], "currency": "EUR"}
+                if (i // 50) % 3 == 2:
+                    yield {**row, "type": "SELL", "quantity": "1", "price": "11"}
+                else:
+                    yield {**row, "type": "BUY", "quantity": "2", "price": "10.5"}
+
+        started = time.perf_counter()
+        result = await BrokerImportManager.import_rows(session, broker_id, statement(start, 10000), f"bench:{time.time_ns()}")
+        import_seconds = time.perf_counter() - started
+        assert (result.rows_failed, result.transactions_created, result.cash_movements_created) == (0, 9999, 10000)
+
+        # Per-row path: look up the cash account, add and flush the movement, then the transaction
+        other_id, *_ = await create_broker(session, "Import bench orm", currencies=())
+        sample = 300
+        started = time.perf_counter()
+        for row in statement(date(1933, 9, 1), sample):
+            account = (await session.execute(
+                select(CashAccount).where(CashAccount.broker_id == other_id, CashAccount.currency == row["currency"])
+                )).scalar_one_or_none()
+            if account is None:
+                account = CashAccount(broker_id=other_id, currency=row["currency"], display_name=row["currency"])
+                session.add(account)
+                await session.flush()
+            trade_date = date.fromisoformat(row["trade_date"])
+            if "asset" not in row:
+                session.add(CashMovement(
+                    cash_account_id=account.id, type=CashMovementType.DEPOSIT, amount=Decimal(row["amount"]), trade_date=trade_date,
+                    ))
+                continue
+            asset_id = (await session.execute(select(Asset.id).where(Asset.display_name == row["asset"]))).scalar_one()
+            quantity, price = Decimal(row["quantity"]), Decimal(row["price"])
+            movement = CashMovement(
+                cash_account_id=account.id, amount=quantity * price, trade_date=trade_date,
+                type=CashMovementType.BUY_SPEND if row["type"] == "BUY" else CashMovementType.SALE_PROCEEDS,
+                )
+            session.add(movement)
+            await session.flush()
+            session.add(Transaction(
+                asset_id=asset_id, broker_id=other_id, type=TransactionType(row["type"]), quantity=quantity, price=price,
+                currency="EUR", cash_movement_id=movement.id, trade_date=trade_date, created_at=utcnow(), updated_at=utcnow(),
+                ))
+            await session.flush()
+        await session.commit()
+        orm_seconds = (time.perf_counter() - started) * 10000 / sample
+
+        print_info(f"Streaming import: {import_seconds * 1000:.0f}ms ({result.rows_read / import_seconds:.0f} rows/s)")
+        print_info(f"Per-row ORM inserts (extrapolated from {sample}): {orm_seconds * 1000:.0f}ms")
+        assert import_seconds < orm_seconds
+    print_success("✓ Benchmark completed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,193 @@
+"""
+Tests for the cash balance ledger.
+
+Covers trigger maintenance of cash_balance_history (insert, backdated insert,
+update of amount/type/date/account, delete, delete of a movement linked to a
+transaction), rounding stability, balance-at-date and balance-history
+queries, the consistency checker and the rebuild.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import (
+    CashAccount,
+    CashBalanceHistory,
+    CashMovement,
+    CashMovementType,
+    Transaction,
+    TransactionType,
+    )
+from backend.app.db.session import get_async_engine
+from backend.app.services.cash_balances import CashBalanceManager
+from backend.app.utils.datetime_utils import utcnow
+from backend.test_scripts.test_utils import (
+    Stopwatch,
+    create_asset,
+    create_broker,
+    print_info,
+    print_section,
+    print_success,
+    timed,
+    )
+
+
+async def _add_movement(session, cash_account_id, movement_type, amount, trade_date) -> CashMovement:
+    movement = CashMovement(cash_account_id=cash_account_id, type=movement_type, amount=Decimal(amount), trade_date=trade_date)
+    session.add(movement)
+    await session.commit()
+    return movement
+
+
+async def _balance(session, cash_account_id, as_of=None) -> Decimal:
+    [balance] = await CashBalanceManager.get_balances(session, as_of=as_of, cash_account_ids=[cash_account_id])
+    return balance.balance
+
+
+@pytest.mark.asyncio
+async def test_ledger_follows_movements():
+    """Every write path on cash_movements keeps the running balances current."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        _, eur_id, usd_id = await create_broker(session, "Cash Broker ledger", ("EUR", "USD"))
+        assert await _balance(session, eur_id) == 0
+
+        await _add_movement(session, eur_id, CashMovementType.DEPOSIT, "1000", date(2025, 1, 10))
+        fee = await _add_movement(session, eur_id, CashMovementType.FEE, "5", date(2025, 3, 1))
+        await _add_movement(session, eur_id, CashMovementType.DIVIDEND_INCOME, "20", date(2025, 3, 1))
+        assert await _balance(session, eur_id) == Decimal(1015)
+
+        # Backdated withdrawal shifts every later day
+        await _add_movement(session, eur_id, CashMovementType.WITHDRAWAL, "300", date(2025, 2, 1))
+        history = await CashBalanceManager.get_balance_history(session, eur_id)
+        assert [(p.trade_date, p.net_amount, p.balance) for p in history.points] == [
+            (date(2025, 1, 10), Decimal(1000), Decimal(1000)),
+            (date(2025, 2, 1), Decimal(-300), Decimal(700)),
+            (date(2025, 3, 1), Decimal(15), Decimal(715)),
+            ]
+        assert await _balance(session, eur_id, as_of=date(2025, 2, 15)) == Decimal(700)
+        assert await _balance(session, eur_id, as_of=date(2025, 1, 1)) == 0
+
+        # Updates: amount, then date and account (moved to USD)
+        await session.execute(update(CashMovement).where(CashMovement.id == fee.id).values(amount=Decimal(10)))
+        await session.commit()
+        assert await _balance(session, eur_id) == Decimal(710)
+        await session.execute(
+            update(CashMovement).where(CashMovement.id == fee.id).values(cash_account_id=usd_id, trade_date=date(2025, 4, 1))
+            )
+        await session.commit()
+        assert await _balance(session, eur_id) == Decimal(720)
+        assert await _balance(session, usd_id) == Decimal(-10)
+
+        # Range query with opening balance
+        march = await CashBalanceManager.get_balance_history(session, eur_id, date(2025, 3, 1), date(2025, 3, 31))
+        assert march.opening_balance == Decimal(700)
+        assert [(p.trade_date, p.balance) for p in march.points] == [(date(2025, 3, 1), Decimal(720))]
+
+        # Deleting a movement linked to a SELL cascades to the transaction and reverts the balance
+        asset_id = await create_asset(session, "Cash asset")
+        proceeds = await _add_movement(session, eur_id, CashMovementType.SALE_PROCEEDS, "80", date(2025, 2, 1))
+        session.add(Transaction(
+            asset_id=asset_id, broker_id=(await session.get(CashAccount, eur_id)).broker_id, type=TransactionType.SELL,
+            quantity=Decimal(1), price=Decimal(80), currency="EUR", cash_movement_id=proceeds.id, trade_date=date(2025, 2, 1),
+            ))
+        await session.commit()
+        assert await _balance(session, eur_id) == Decimal(800)
+        await session.delete(proceeds)
+        await session.commit()
+        assert (await session.execute(select(Transaction).where(Transaction.cash_movement_id == proceeds.id))).first() is None
+        assert await _balance(session, eur_id) == Decimal(720)
+
+        # Day row disappears with its last movement
+        await session.delete(await session.get(CashMovement, fee.id))
+        await session.commit()
+        assert (await CashBalanceManager.get_balance_history(session, usd_id)).points == []
+
+        with pytest.raises(ValueError):
+            await CashBalanceManager.get_balance_history(session, eur_id, date(2025, 3, 1), date(2025, 1, 1))
+
+        check = await CashBalanceManager.check_consistency(session)
+        assert check.consistent, check.mismatches
+
+
+@pytest.mark.asyncio
+async def test_rounding_check_and_rebuild():
+    """Many fractional movements stay exact; a corrupted row is found by the checker and repaired."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        _, eur_id, _ = await create_broker(session, "Cash Broker rounding", ("EUR", "USD"))
+        now = utcnow()
+        await session.execute(insert(CashMovement), [
+            {
+                "cash_account_id": eur_id, "type": CashMovementType.DEPOSIT if i % 2 else CashMovementType.FEE,
+                "amount": Decimal("0.1") if i % 2 else Decimal("0.033333"),
+                "trade_date": date(2024, 1, 1) + timedelta(days=i % 50), "created_at": now, "updated_at": now,
+                }
+            for i in range(1000)
+            ])
+        await session.commit()
+        assert await _balance(session, eur_id) == Decimal("50.000000") - Decimal("16.666500")
+        assert (await CashBalanceManager.check_consistency(session)).consistent
+
+        await session.execute(
+            update(CashBalanceHistory).where(CashBalanceHistory.cash_account_id == eur_id).values(balance=Decimal(1))
+            )
+        await session.commit()
+        check = await CashBalanceManager.check_consistency(session)
+        assert not check.consistent
+        assert all(m.cash_account_id == eur_id and m.field == "balance" for m in check.mismatches)
+
+        assert await CashBalanceManager.rebuild(session) >= 50
+        assert (await CashBalanceManager.check_consistency(session)).consistent
+
+
+@pytest.mark.asyncio
+async def test_balance_lookup_benchmark():
+    """Benchmark: balance at a date from the ledger vs summing every movement."""
+    print_section("Benchmark: cash balance ledger lookup vs movement sum")
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        _, eur_id, _ = await create_broker(session, "Cash Broker bench", ("EUR", "USD"))
+        start = date(1900, 1, 1)
+        now = utcnow()
+        rows = [
+            {
+                "cash_account_id": eur_id, "type": CashMovementType.DEPOSIT if i % 3 else CashMovementType.WITHDRAWAL,
+                "amount": Decimal("12.5"), "trade_date": start + timedelta(days=i // 2), "created_at": now, "updated_at": now,
+                }
+            for i in range(50_000)
+            ]
+        with Stopwatch() as insert_watch:
+            await session.execute(insert(CashMovement), rows)
+            await session.commit()
+
+        as_of = start + timedelta(days=20_000)
+        ledger, ledger_seconds = await timed(_balance(session, eur_id, as_of=as_of))
+
+        naive, naive_seconds = await timed(session.scalar(
+            select(func.sum(case(
+                (CashMovement.type == CashMovementType.DEPOSIT, CashMovement.amount), else_=-CashMovement.amount,
+                )))
+            .where(CashMovement.cash_account_id == eur_id, CashMovement.trade_date <= as_of)
+            ))
+
+        print_info(f"Insert 50k movements (ledger maintained by triggers): {insert_watch.seconds:.3f}s")
+        print_info(f"Balance at {as_of}: ledger {ledger_seconds * 1000:.2f}ms, sum of movements {naive_seconds * 1000:.2f}ms")
+        assert ledger == naive
+        assert ledger_seconds < naive_seconds
+        print_success("✓ Benchmark completed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
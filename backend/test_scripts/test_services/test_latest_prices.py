@@ -0,0 +1,151 @@
+"""
+Tests for the latest price / latest rate tables.
+
+Covers the trigger-maintained asset_latest_prices (bulk upsert of older and
+newer points, upsert of the latest point, range delete, close cleared, NULL
+closes, asset delete), fx_latest_rates (upsert, pair normalization, delete of
+the latest rate), and a 300-asset benchmark of the maintained table against
+per-asset ORDER BY date DESC lookups.
+"""
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import Asset, AssetLatestPrice, AssetType, FxLatestRate, PriceHistory
+from backend.app.db.session import get_async_engine
+from backend.app.schemas.common import DateRangeModel
+from backend.app.schemas.prices import FAAssetDelete, FAPricePoint, FAUpsert
+from backend.app.services.asset_source import AssetSourceManager
+from backend.app.services.fx import delete_rates_bulk, get_latest_rates, upsert_rates_bulk
+from backend.app.utils.datetime_utils import utcnow
+from backend.test_scripts.test_utils import print_info, print_section, print_success
+
+
+def _point(day: int, close: str) -> FAPricePoint:
+    return FAPricePoint(date=date(1935, 1, day), close=Decimal(close), currency="EUR")
+
+
+async def _latest(session: AsyncSession, asset_id: int) -> tuple | None:
+    prices = await AssetSourceManager.get_latest_prices([asset_id], session)
+    return (prices[0].date.day, prices[0].close) if prices else None
+
+
+@pytest.mark.asyncio
+async def test_latest_price_follows_writes():
+    """Every price_history write path keeps the newest close per asset."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset = Asset(display_name=f"Latest price {time.time_ns()}", currency="EUR", asset_type=AssetType.STOCK)
+        session.add(asset)
+        await session.commit()
+        assert await _latest(session, asset.id) is None
+
+        await AssetSourceManager.bulk_upsert_prices([FAUpsert(asset_id=asset.id, prices=[_point(2, "10"), _point(5, "12"), _point(3, "11")])], session)
+        assert await _latest(session, asset.id) == (5, Decimal("12"))
+
+        # Older point inserted, then the latest point updated (upsert conflict = UPDATE)
+        await AssetSourceManager.bulk_upsert_prices([FAUpsert(asset_id=asset.id, prices=[_point(1, "9"), _point(5, "12.5")])], session)
+        assert await _latest(session, asset.id) == (5, Decimal("12.5"))
+
+        # Newer row without a close is not a price
+        session.add(PriceHistory(asset_id=asset.id, date=date(1935, 1, 9), currency="EUR", source_plugin_key="manual"))
+        await session.commit()
+        assert await _latest(session, asset.id) == (5, Decimal("12.5"))
+
+        # Range delete of the latest point falls back to the previous close
+        await AssetSourceManager.bulk_delete_prices([FAAssetDelete(
+            asset_id=asset.id, date_ranges=[DateRangeModel(start=date(1935, 1, 4), end=date(1935, 1, 5))],
+            )], session)
+        assert await _latest(session, asset.id) == (3, Decimal("11"))
+
+        await session.execute(update(PriceHistory).where(PriceHistory.asset_id == asset.id, PriceHistory.date == date(1935, 1, 3)).values(close=None))
+        await session.commit()
+        assert await _latest(session, asset.id) == (2, Decimal("10"))
+
+        # Close set on the newest row moves the latest point forward
+        await session.execute(update(PriceHistory).where(PriceHistory.asset_id == asset.id, PriceHistory.date == date(1935, 1, 9)).values(close=Decimal("13")))
+        await session.commit()
+        assert await _latest(session, asset.id) == (9, Decimal("13"))
+
+        await session.execute(delete(Asset).where(Asset.id == asset.id))
+        await session.commit()
+        assert (await session.execute(select(AssetLatestPrice).where(AssetLatestPrice.asset_id == asset.id))).first() is None
+
+
+@pytest.mark.asyncio
+async def test_latest_rate_follows_writes():
+    """Upserts and deletes of fx_rates keep the newest rate per stored pair."""
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        await upsert_rates_bulk(session, [
+            (date(1935, 2, 1), "NOK", "SEK", Decimal("1.01"), "MANUAL"),
+            (date(1935, 2, 3), "NOK", "SEK", Decimal("1.03"), "MANUAL"),
+            (date(1935, 2, 2), "NOK", "SEK", Decimal("1.02"), "MANUAL"),
+            ])
+        # Requested in either direction: stored (alphabetical) pair
+        assert await get_latest_rates(session, [("SEK", "NOK")]) == [("NOK", "SEK", date(1935, 2, 3), Decimal("1.03"))]
+
+        await upsert_rates_bulk(session, [(date(1935, 2, 3), "NOK", "SEK", Decimal("1.04"), "MANUAL")])
+        assert (await get_latest_rates(session, [("NOK", "SEK")]))[0][2:] == (date(1935, 2, 3), Decimal("1.04"))
+
+        await delete_rates_bulk(session, [("NOK", "SEK", date(1935, 2, 3), None)])
+        assert (await get_latest_rates(session, [("NOK", "SEK")]))[0][2:] == (date(1935, 2, 2), Decimal("1.02"))
+
+        await delete_rates_bulk(session, [("NOK", "SEK", date(1935, 2, 1), date(1935, 2, 2))])
+        assert await get_latest_rates(session, [("NOK", "SEK")]) == []
+        assert (await session.execute(select(FxLatestRate).where(FxLatestRate.base == "NOK"))).first() is None
+
+
+@pytest.mark.asyncio
+async def test_latest_price_benchmark():
+    """Benchmark: newest close of 300 assets from the maintained table vs per-asset ORDER BY date DESC lookups."""
+    print_section("Benchmark: latest prices (300 assets × 250 days)")
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        assets = [Asset(display_name=f"Latest bench {i} {time.time_ns()}", currency="EUR", asset_type=AssetType.STOCK) for i in range(300)]
+        session.add_all(assets)
+        await session.commit()
+        asset_ids = [a.id for a in assets]
+        start = date(1935, 3, 1)
+        now = utcnow()
+        await session.execute(insert(PriceHistory), [
+            {"asset_id": asset_id, "date": start + timedelta(days=d), "close": Decimal(100 + d), "currency": "EUR",
+             "source_plugin_key": "bench", "fetched_at": now}
+            for asset_id in asset_ids for d in range(250)
+            ])
+        await session.commit()
+
+        started = time.perf_counter()
+        latest = await AssetSourceManager.get_latest_prices(asset_ids, session)
+        table_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        scanned = []
+        for asset_id in asset_ids:
+            row = (await session.execute(
+                select(PriceHistory.date, PriceHistory.close)
+                .where(PriceHistory.asset_id == asset_id, PriceHistory.close.is_not(None))
+                .order_by(PriceHistory.date.desc())
+                .limit(1)
+                )).one()
+            scanned.append((asset_id, row.date, row.close))
+        scan_seconds = time.perf_counter() - started
+
+        assert [(p.asset_id, p.date, p.close) for p in latest] == scanned
+        assert all(p.date == start + timedelta(days=249) for p in latest)
+        print_info(f"Maintained table (one query): {table_seconds * 1000:.1f}ms")
+        print_info(f"Per-asset ORDER BY date DESC LIMIT 1: {scan_seconds * 1000:.1f}ms")
+        assert table_seconds < scan_seconds
+    print_success("✓ Benchmark completed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,261 @@
+"""
+Tests for the FIFO lot engine.
+
+Covers FIFO matching (partial closes across lots, oversell, currency mismatch),
+trigger-based invalidation with incremental recomputation from the earliest
+affected trade_date (backdated insert, update, delete cascaded from
+cash_movements), realized/unrealized P&L queries (pairs with transfers
+flagged), the consistency checker and the full rebuild.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import (
+    CashMovement,
+    LotInvalidation,
+    LotMatch,
+    PriceHistory,
+    Transaction,
+    TransactionType,
+    )
+from backend.app.db.session import get_async_engine
+from backend.app.services.lots import LotManager, match_fifo
+from backend.app.utils.datetime_utils import utcnow
+from backend.test_scripts.test_utils import (
+    add_trade,
+    create_broker,
+    create_pair,
+    print_info,
+    print_section,
+    print_success,
+    timed,
+    )
+
+
+def test_fifo_matching():
+    """Closes consume the oldest lots first, oversell is reported, foreign-currency closes have no P&L."""
+    rows = [
+        (1, 1, 1, date(2025, 1, 1), TransactionType.BUY, Decimal(10), Decimal(100), "EUR"),
+        (2, 1, 1, date(2025, 1, 2), TransactionType.ADD_HOLDING, Decimal(5), None, "EUR"),
+        (3, 1, 1, date(2025, 1, 3), TransactionType.SELL, Decimal(12), Decimal(150), "EUR"),
+        (4, 1, 1, date(2025, 1, 4), TransactionType.REMOVE_HOLDING, Decimal(1), None, "EUR"),
+        (5, 1, 1, date(2025, 1, 5), TransactionType.SELL, Decimal(3), Decimal(20), "USD"),
+        ]
+    lots, matches, unmatched = match_fifo(rows, {})
+
+    assert [(lot["transaction_id"], lot["remaining_quantity"]) for lot in lots] == [(1, 0), (2, 0)]
+    assert [(m["close_transaction_id"], m["lot_transaction_id"], m["quantity"], m["realized_pnl"]) for m in matches] == [
+        (3, 1, Decimal(10), Decimal(500)),
+        (3, 2, Decimal(2), Decimal(300)),  # ADD_HOLDING without price: cost 0
+        (4, 2, Decimal(1), Decimal(0)),
+        (5, 2, Decimal(2), None),  # Closed in USD against an EUR lot
+        ]
+    assert unmatched == Decimal(1)
+
+    # Start lots (restored state) are consumed before new lots and updated in place
+    start = {"transaction_id": 9, "remaining_quantity": Decimal(4), "unit_cost": Decimal(50), "currency": "EUR"}
+    lots, matches, _ = match_fifo(
+        [
+            (10, 1, 1, date(2025, 2, 1), TransactionType.BUY, Decimal(1), Decimal(60), "EUR"),
+            (11, 1, 1, date(2025, 2, 2), TransactionType.SELL, Decimal(3), Decimal(70), "EUR"),
+            ],
+        {(1, 1): [start]},
+        )
+    assert start["remaining_quantity"] == Decimal(1)
+    assert lots[0]["remaining_quantity"] == Decimal(1)
+    assert [(m["lot_transaction_id"], m["realized_pnl"]) for m in matches] == [(9, Decimal(60))]
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_and_pnl():
+    """Backdated inserts, edits and cascaded deletes recompute from the affected date; P&L reads lots."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        await LotManager.sync(session)  # Absorb pending changes of other tests
+        asset_id, broker_id, cash_id = await create_pair(session, "Lots sync")
+
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.BUY, "10", "100", date(2025, 1, 10))
+        sell = await add_trade(session, asset_id, broker_id, cash_id, TransactionType.SELL, "4", "150", date(2025, 3, 1))
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.BUY, "5", "120", date(2025, 4, 1))
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.SELL, "8", "130", date(2025, 5, 1))
+
+        # Jan lot: 4 sold in Mar, 6 in May; Apr lot: 2 sold in May
+        [realized] = await LotManager.get_realized_pnl(session, asset_ids=[asset_id])
+        assert realized.quantity == Decimal(12)
+        assert realized.realized_pnl == Decimal(4 * 50 + 6 * 30 + 2 * 10)
+        [open_lot] = await LotManager.get_open_lots(session, asset_ids=[asset_id])
+        assert open_lot.remaining_quantity == Decimal(3) and open_lot.unit_cost == Decimal(120)
+
+        # Backdated BUY before the Mar SELL does not change the Jan lot matches, only the tail
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.BUY, "10", "90", date(2025, 2, 1))
+        pending = (await session.execute(
+            select(LotInvalidation.from_date).where(LotInvalidation.asset_id == asset_id)
+            )).scalar_one()
+        assert pending == date(2025, 2, 1)
+        result = await LotManager.sync(session)
+        assert result.pairs_recomputed == 1
+        assert result.transactions_replayed == 4  # Feb BUY, Mar SELL, Apr BUY, May SELL (Jan BUY not re-read)
+        lots = await LotManager.get_open_lots(session, asset_ids=[asset_id])
+        assert [(lot.unit_cost, lot.remaining_quantity) for lot in lots] == [(Decimal(90), Decimal(8)), (Decimal(120), Decimal(5))]
+
+        # Realized P&L filtered by closing date
+        [march] = await LotManager.get_realized_pnl(session, date(2025, 3, 1), date(2025, 3, 31), asset_ids=[asset_id])
+        assert march.quantity == Decimal(4) and march.realized_pnl == Decimal(200)
+
+        # Edit: Mar SELL quantity 4 -> 12 (closes the Jan lot and 2 of the Feb lot)
+        await session.execute(update(Transaction).where(Transaction.id == sell.id).values(quantity=Decimal(12)))
+        await session.commit()
+        [march] = await LotManager.get_realized_pnl(session, date(2025, 3, 1), date(2025, 3, 31), asset_ids=[asset_id])
+        assert march.realized_pnl == Decimal(10 * 50 + 2 * 60)
+
+        # Unrealized P&L at the last close up to as_of
+        session.add_all([
+            PriceHistory(asset_id=asset_id, date=date(2025, 6, 1), close=Decimal(100), currency="EUR", source_plugin_key="manual"),
+            PriceHistory(asset_id=asset_id, date=date(2025, 7, 1), close=Decimal(110), currency="EUR", source_plugin_key="manual"),
+            ])
+        await session.commit()
+        [unrealized] = await LotManager.get_unrealized_pnl(session, as_of=date(2025, 6, 15), asset_ids=[asset_id])
+        assert unrealized.quantity == Decimal(5)  # Feb lot fully closed by Mar (2) + May (8) sells
+        assert unrealized.price_date == date(2025, 6, 1)
+        assert unrealized.cost_basis == Decimal(600)
+        assert unrealized.unrealized_pnl == Decimal(-100)
+        [latest] = await LotManager.get_unrealized_pnl(session, asset_ids=[asset_id])
+        assert latest.price_date == date(2025, 7, 1) and latest.unrealized_pnl == Decimal(-50)
+
+        # Delete the Mar SELL's cash movement: FK cascade deletes the transaction and its matches
+        await session.delete(await session.get(CashMovement, sell.cash_movement_id))
+        await session.commit()
+        session.expunge_all()
+        lots = await LotManager.get_open_lots(session, asset_ids=[asset_id])
+        assert sum(lot.remaining_quantity for lot in lots) == Decimal(17)
+
+        check = await LotManager.check_consistency(session)
+        assert check.consistent, check.mismatches
+
+
+@pytest.mark.asyncio
+async def test_transfers_flag_pnl():
+    """Transfers do not move lots: P&L rows of the pairs with transfers are flagged."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset_id, broker_id, cash_id = await create_pair(session, "Lots transfer")
+        receiving_id, *_ = await create_broker(session, "Lots Broker transfer in", currencies=())
+
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.BUY, "10", "100", date(2025, 1, 10))
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.SELL, "2", "150", date(2025, 2, 1))
+        [realized] = await LotManager.get_realized_pnl(session, asset_ids=[asset_id])
+        assert not realized.has_transfers
+
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.TRANSFER_OUT, "4", None, date(2025, 3, 1))
+        await add_trade(session, asset_id, receiving_id, None, TransactionType.TRANSFER_IN, "4", None, date(2025, 3, 1))
+
+        # Lots stay at the sending broker (transfer out closes nothing, transfer in opens nothing)
+        [unrealized] = await LotManager.get_unrealized_pnl(session, asset_ids=[asset_id])
+        assert (unrealized.broker_id, unrealized.quantity) == (broker_id, Decimal(8))
+        assert unrealized.has_transfers
+        [realized] = await LotManager.get_realized_pnl(session, asset_ids=[asset_id])
+        assert realized.has_transfers and realized.realized_pnl == Decimal(100)
+        # Transfers after the period end do not flag it
+        [february] = await LotManager.get_realized_pnl(session, end_date=date(2025, 2, 28), asset_ids=[asset_id])
+        assert not february.has_transfers
+
+
+@pytest.mark.asyncio
+async def test_consistency_check_and_rebuild():
+    """A corrupted match row is reported by the checker and repaired by a rebuild."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset_id, broker_id, cash_id = await create_pair(session, "Lots check")
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.ADD_HOLDING, "5", "10", date(2025, 5, 1))
+        remove = await add_trade(session, asset_id, broker_id, cash_id, TransactionType.REMOVE_HOLDING, "5", None, date(2025, 6, 1))
+        await LotManager.sync(session)
+
+        # REMOVE_HOLDING without price realizes the full cost as a loss, no open lot left
+        [realized] = await LotManager.get_realized_pnl(session, asset_ids=[asset_id])
+        assert realized.realized_pnl == Decimal(-50)
+        assert await LotManager.get_open_lots(session, asset_ids=[asset_id]) == []
+        assert await LotManager.get_unrealized_pnl(session, asset_ids=[asset_id]) == []
+
+        await session.execute(
+            update(LotMatch).where(LotMatch.close_transaction_id == remove.id).values(realized_pnl=Decimal(7))
+            )
+        await session.commit()
+
+        check = await LotManager.check_consistency(session)
+        assert not check.consistent
+        assert any(m.transaction_id == remove.id and m.field == "realized_pnl" for m in check.mismatches)
+
+        rebuilt = await LotManager.rebuild(session)
+        assert rebuilt.pairs_recomputed >= 1
+        assert (await LotManager.check_consistency(session)).consistent
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_benchmark():
+    """Benchmark: backdated change on a 100k-transaction history recomputes only the tail."""
+    print_section("Benchmark: FIFO lots incremental recompute vs full matching")
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        await LotManager.sync(session)
+        asset_id, broker_id, _ = await create_pair(session, "Lots bench")
+        start = date(2023, 1, 1)  # 100 transactions per day over 1000 days
+        now = utcnow()
+        rows = [
+            {
+                "asset_id": asset_id, "broker_id": broker_id,
+                "type": TransactionType.REMOVE_HOLDING if i % 3 == 2 else TransactionType.ADD_HOLDING,
+                "quantity": Decimal(1), "price": Decimal(10 + i % 7), "currency": "EUR",
+                "trade_date": start + timedelta(days=i // 100), "created_at": now, "updated_at": now,
+                }
+            for i in range(100_000)
+            ]
+        await session.execute(insert(Transaction), rows)
+        await session.commit()
+
+        try:
+            full, full_seconds = await timed(LotManager.sync(session))
+
+            await session.execute(insert(Transaction).values(
+                asset_id=asset_id, broker_id=broker_id, type=TransactionType.REMOVE_HOLDING, quantity=Decimal(5),
+                price=Decimal(30), currency="EUR", trade_date=start + timedelta(days=999), created_at=now, updated_at=now,
+                ))
+            await session.commit()
+            incremental, incremental_seconds = await timed(LotManager.sync(session))
+
+            [realized], query_seconds = await timed(LotManager.get_realized_pnl(session, asset_ids=[asset_id]))
+
+            print_info(f"Full matching: {full.transactions_replayed} transactions, {full.matches_written} matches in {full_seconds:.3f}s")
+            print_info(f"Backdated change: {incremental.transactions_replayed} transactions in {incremental_seconds:.3f}s")
+            print_info(f"Realized P&L over {realized.quantity} closed units: {query_seconds:.3f}s")
+            assert full.transactions_replayed == 100_000
+            assert full.unmatched_quantity == 0
+            assert incremental.transactions_replayed == 101  # Last day only (100 + the new one)
+            assert incremental_seconds < full_seconds
+            assert realized.quantity == Decimal(33_333 + 5)
+
+            lots = await LotManager.get_open_lots(session, asset_ids=[asset_id])
+            assert sum(lot.remaining_quantity for lot in lots) == Decimal(100_000 - 2 * 33_333 - 5)
+        finally:
+            # Do not leave 100k rows in the shared test database
+            await session.execute(delete(Transaction).where(Transaction.asset_id == asset_id))
+            await session.commit()
+            await LotManager.sync(session)
+        assert await LotManager.get_open_lots(session, asset_ids=[asset_id]) == []
+        print_success("✓ Benchmark completed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
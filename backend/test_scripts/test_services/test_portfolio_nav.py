@@ -0,0 +1,149 @@
+"""
+Tests for the portfolio NAV engine.
+
+Covers the vectorized kernel (backward-fill, quantity accumulation, FX
+gathering), the SQL loaders (last value before the range, several brokers,
+price currency conversion in both pair directions, unvalued assets) and a
+500-asset, 15-year benchmark of the kernel.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy import insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import FxRate, PriceHistory, Transaction, TransactionType
+from backend.app.db.session import get_async_engine
+from backend.app.services.portfolio_nav import PortfolioNavManager, backward_fill, compute_nav
+from backend.app.utils.datetime_utils import utcnow
+from backend.test_scripts.test_utils import (
+    Stopwatch,
+    create_asset,
+    create_broker,
+    price_row,
+    print_info,
+    print_section,
+    print_success,
+    transaction_row,
+    )
+
+NAN = np.nan
+
+
+def test_nav_kernel():
+    """Quantities accumulate, prices and rates are backward-filled, missing prices are reported."""
+    filled = backward_fill(np.array([[NAN, 1.0], [2.0, NAN], [NAN, NAN], [3.0, 4.0]]))
+    assert np.array_equal(filled, np.array([[NAN, 1.0], [2.0, 1.0], [2.0, 1.0], [3.0, 4.0]]), equal_nan=True)
+
+    # Asset 0 priced in currency 0 (target), asset 1 in currency 1 (rate 0.5 from day 1)
+    deltas = np.array([[10.0, 0.0], [0.0, 4.0], [-5.0, 0.0], [0.0, -4.0]])
+    prices = np.array([[2.0, NAN], [NAN, 100.0], [NAN, NAN], [3.0, NAN]])
+    currencies = np.array([[0, 0], [0, 1], [0, 0], [0, 0]])
+    fx = np.array([[1.0, NAN], [NAN, 0.5], [NAN, NAN], [NAN, NAN]])
+    totals, contributions, unvalued = compute_nav(deltas, prices, currencies, fx)
+    assert contributions.tolist() == [[20.0, 0.0], [20.0, 200.0], [10.0, 200.0], [15.0, 0.0]]
+    assert totals.tolist() == [20.0, 220.0, 210.0, 15.0]
+    assert not unvalued.any()
+
+    # Held before its first price: counted as 0 and reported
+    _, contributions, unvalued = compute_nav(np.array([[1.0], [0.0]]), np.array([[NAN], [5.0]]), np.zeros((2, 1), dtype=int), np.ones((2, 1)))
+    assert contributions[:, 0].tolist() == [0.0, 5.0]
+    assert unvalued[:, 0].tolist() == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_nav_series_from_database():
+    """Positions of two brokers valued with backward-filled prices and both FX pair directions."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        b1, *_ = await create_broker(session, "NAV Broker 1", currencies=())
+        b2, *_ = await create_broker(session, "NAV Broker 2", currencies=())
+        eur_asset = await create_asset(session, "NAV eur", "EUR")
+        usd_asset = await create_asset(session, "NAV usd", "USD")
+        chf_asset = await create_asset(session, "NAV chf", "CHF")
+        unpriced = await create_asset(session, "NAV unpriced", "EUR")
+
+        await session.execute(insert(Transaction), [
+            transaction_row(eur_asset, b1, TransactionType.ADD_HOLDING, "10", date(1949, 6, 1)),  # Before the range
+            transaction_row(eur_asset, b2, TransactionType.ADD_HOLDING, "5", date(1950, 1, 2)),
+            transaction_row(eur_asset, b1, TransactionType.REMOVE_HOLDING, "4", date(1950, 1, 3)),
+            transaction_row(usd_asset, b1, TransactionType.ADD_HOLDING, "2", date(1950, 1, 2)),
+            transaction_row(chf_asset, b2, TransactionType.ADD_HOLDING, "1", date(1950, 1, 1)),
+            transaction_row(unpriced, b1, TransactionType.ADD_HOLDING, "3", date(1950, 1, 3)),
+            ])
+        await session.execute(insert(PriceHistory), [
+            price_row(eur_asset, date(1949, 12, 20), "10", "EUR"),  # Last price before the range
+            price_row(eur_asset, date(1950, 1, 3), "12", "EUR"),
+            price_row(usd_asset, date(1950, 1, 1), "110", "USD"),
+            price_row(chf_asset, date(1950, 1, 1), "50", "CHF"),
+            ])
+        # EUR/USD: 1 EUR = 1.1 USD (USD price divided); CHF/EUR: 1 CHF = 0.9 EUR (CHF price multiplied)
+        # Dates before any provider data, so synced rates never fill these days
+        await session.execute(sqlite_insert(FxRate).on_conflict_do_nothing(), [
+            {"date": date(1949, 1, 1), "base": "EUR", "quote": "USD", "rate": Decimal("1.1"), "source": "TEST", "fetched_at": utcnow()},
+            {"date": date(1949, 1, 1), "base": "CHF", "quote": "EUR", "rate": Decimal("0.9"), "source": "TEST", "fetched_at": utcnow()},
+            ])
+        await session.commit()
+
+        assets = [eur_asset, usd_asset, chf_asset, unpriced]
+        nav = await PortfolioNavManager.get_nav_series(
+            session, date(1950, 1, 1), date(1950, 1, 4), "EUR", asset_ids=assets, include_contributions=True,
+            )
+        assert nav.dates == [date(1950, 1, 1) + timedelta(days=i) for i in range(4)]
+        by_asset = {c.asset_id: c.values for c in nav.contributions}
+        assert by_asset[eur_asset] == pytest.approx([100.0, 150.0, 132.0, 132.0])
+        assert by_asset[usd_asset] == pytest.approx([0.0, 200.0, 200.0, 200.0])
+        assert by_asset[chf_asset] == pytest.approx([45.0, 45.0, 45.0, 45.0])
+        assert by_asset[unpriced] == [0.0] * 4
+        assert nav.totals == pytest.approx([145.0, 395.0, 377.0, 377.0])
+        assert nav.unvalued_asset_ids == [unpriced]
+
+        # Broker filter and a currency without rates to the target
+        nav = await PortfolioNavManager.get_nav_series(session, date(1950, 1, 4), date(1950, 1, 4), "EUR", broker_ids=[b2], asset_ids=assets)
+        assert nav.totals == pytest.approx([5 * 12 + 45.0])
+        nav = await PortfolioNavManager.get_nav_series(session, date(1950, 1, 4), date(1950, 1, 4), "JPY", asset_ids=assets)
+        assert nav.totals == [0.0]
+        assert nav.unvalued_asset_ids == sorted(assets)
+
+        empty = await PortfolioNavManager.get_nav_series(session, date(1950, 1, 1), date(1950, 1, 2), "EUR", asset_ids=[-1])
+        assert empty.totals == [0.0, 0.0] and empty.contributions == []
+        with pytest.raises(ValueError):
+            await PortfolioNavManager.get_nav_series(session, date(1950, 1, 2), date(1950, 1, 1), "EUR")
+
+
+def test_nav_kernel_benchmark():
+    """Benchmark: 500 assets over 15 years of calendar days, sparse trades, weekday prices, 5 currencies."""
+    print_section("Benchmark: vectorized NAV kernel (500 assets x 15 years)")
+    rng = np.random.default_rng(42)
+    days, assets, currencies = 15 * 365 + 4, 500, 5
+
+    deltas = np.zeros((days, assets))
+    trade_rows = rng.integers(0, days, size=20 * assets)
+    np.add.at(deltas, (trade_rows, np.repeat(np.arange(assets), 20)), rng.integers(1, 100, size=20 * assets).astype(float))
+    prices = rng.uniform(10, 500, size=(days, assets))
+    prices[np.arange(days) % 7 >= 5] = np.nan
+    price_currencies = np.broadcast_to(rng.integers(0, currencies, size=assets), (days, assets))
+    fx = np.where(np.arange(days)[:, None] % 7 >= 5, np.nan, rng.uniform(0.5, 2, size=(days, currencies)))
+    fx[:, 0] = 1.0
+
+    with Stopwatch() as watch:
+        totals, contributions, unvalued = compute_nav(deltas, prices, price_currencies, fx)
+
+    print_info(f"NAV of {assets} assets over {days} days ({days * assets:,} cells): {watch.seconds * 1000:.1f}ms")
+    assert totals.shape == (days,) and contributions.shape == (days, assets)
+    assert np.allclose(totals, contributions.sum(axis=1))
+    assert watch.seconds < 1.0
+    print_success("✓ Benchmark completed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
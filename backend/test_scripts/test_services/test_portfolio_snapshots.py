@@ -0,0 +1,204 @@
+"""
+Tests for the daily portfolio snapshots.
+
+Covers the invalidation triggers (transactions, cash movements, prices of
+assets with a position history only), the incremental recompute from the invalidated day, broker and
+total rows with assets and cash (unvalued balances without a rate), the full
+recompute on a base currency change and a benchmark of incremental sync and
+snapshot reads against on-the-fly valuation.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import (
+    CashMovement,
+    CashMovementType,
+    PortfolioDailySnapshot,
+    PriceHistory,
+    Transaction,
+    TransactionType,
+    )
+from backend.app.db.session import get_async_engine
+from backend.app.services.portfolio_nav import PortfolioNavManager
+from backend.app.services.portfolio_snapshots import PortfolioSnapshotManager
+from backend.test_scripts.test_utils import (
+    Stopwatch,
+    create_asset,
+    create_broker,
+    price_row,
+    print_info,
+    print_section,
+    print_success,
+    timed,
+    transaction_row,
+    )
+
+# Days before any provider data (no FX rates), after the other tests' fixtures
+TODAY = date(1930, 1, 10)
+
+
+async def _broker_points(session, broker_id, start=None, end=None) -> dict:
+    series = await PortfolioSnapshotManager.get_snapshots(session, start, end, broker_id=broker_id)
+    return {p.snapshot_date: (p.assets_value, p.cash_value, p.total_value, p.unvalued) for p in series.points}
+
+
+@pytest.mark.asyncio
+async def test_snapshots_follow_writes():
+    """Writes mark the earliest affected day, sync recomputes from it, reads are range scans."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        await PortfolioSnapshotManager.sync(session, today=TODAY)
+        assert await PortfolioSnapshotManager.get_pending_from(session) is None
+
+        broker_id, eur_id, usd_id = await create_broker(session, "Snapshot Broker writes", ("EUR", "USD"))
+        asset_id = await create_asset(session, "Snapshot writes")
+        session.add(CashMovement(cash_account_id=eur_id, type=CashMovementType.DEPOSIT, amount=Decimal(1000), trade_date=date(1930, 1, 2)))
+        await session.commit()
+        assert await PortfolioSnapshotManager.get_pending_from(session) == date(1930, 1, 2)
+
+        await session.execute(insert(Transaction), [transaction_row(asset_id, broker_id, TransactionType.ADD_HOLDING, "10", date(1930, 1, 3))])
+        await session.execute(insert(PriceHistory), [price_row(asset_id, date(1929, 12, 1), "5"), price_row(asset_id, date(1930, 1, 5), "6")])
+        await session.commit()
+        # The old price of an asset not held yet is not marked: it only matters from the transaction day
+        assert await PortfolioSnapshotManager.get_pending_from(session) == date(1930, 1, 2)
+
+        result = await PortfolioSnapshotManager.sync(session, today=TODAY)
+        assert result.from_date == date(1930, 1, 2) and result.to_date == TODAY
+        points = await _broker_points(session, broker_id)
+        assert min(points) == date(1930, 1, 2) and max(points) == TODAY  # From the broker's first activity
+        assert points[date(1930, 1, 2)] == (Decimal(0), Decimal(1000), Decimal(1000), False)
+        assert points[date(1930, 1, 4)] == (Decimal(50), Decimal(1000), Decimal(1050), False)
+        assert points[date(1930, 1, 5)][2] == Decimal(1060)
+
+        # Totals are the sum of the broker rows
+        totals = await PortfolioSnapshotManager.get_snapshots(session, date(1930, 1, 5), date(1930, 1, 5))
+        broker_totals = (await session.execute(
+            select(PortfolioDailySnapshot.total_value)
+            .where(PortfolioDailySnapshot.snapshot_date == date(1930, 1, 5), PortfolioDailySnapshot.broker_id.is_not(None))
+            )).scalars().all()
+        assert totals.points[0].total_value == pytest.approx(sum(broker_totals), abs=Decimal("0.00001"))
+        assert totals.pending_from is None
+
+        # Price of an asset without position: no invalidation
+        other_asset = await create_asset(session, "Snapshot not held")
+        await session.execute(insert(PriceHistory), [price_row(other_asset, date(1930, 1, 1), "1")])
+        await session.commit()
+        assert await PortfolioSnapshotManager.get_pending_from(session) is None
+
+        # Backdated price: only the days from it are recomputed
+        await session.execute(insert(PriceHistory), [price_row(asset_id, date(1930, 1, 4), "7")])
+        await session.commit()
+        series = await PortfolioSnapshotManager.get_snapshots(session, date(1930, 1, 4), date(1930, 1, 4), broker_id=broker_id)
+        assert series.pending_from == date(1930, 1, 4)
+        assert series.points[0].total_value == Decimal(1050)  # Stale until the next sync
+        result = await PortfolioSnapshotManager.sync(session, today=TODAY)
+        assert result.from_date == date(1930, 1, 4)
+        assert (await _broker_points(session, broker_id))[date(1930, 1, 4)][2] == Decimal(1070)
+
+        # USD balance without a EUR/USD rate: counted as 0 and flagged
+        session.add(CashMovement(cash_account_id=usd_id, type=CashMovementType.DEPOSIT, amount=Decimal(50), trade_date=date(1930, 1, 8)))
+        await session.commit()
+        await PortfolioSnapshotManager.sync(session, today=TODAY)
+        points = await _broker_points(session, broker_id, date(1930, 1, 7), date(1930, 1, 8))
+        assert points[date(1930, 1, 7)] == (Decimal(60), Decimal(1000), Decimal(1060), False)
+        assert points[date(1930, 1, 8)] == (Decimal(60), Decimal(1000), Decimal(1060), True)
+        assert (await PortfolioSnapshotManager.get_snapshots(session, date(1930, 1, 8), date(1930, 1, 8))).points[0].unvalued
+
+        # Updating and deleting transactions
+        await session.execute(update(Transaction).where(Transaction.asset_id == asset_id).values(quantity=Decimal(20)))
+        await session.commit()
+        assert await PortfolioSnapshotManager.get_pending_from(session) == date(1930, 1, 3)
+        await PortfolioSnapshotManager.sync(session, today=TODAY)
+        assert (await _broker_points(session, broker_id))[date(1930, 1, 5)][0] == Decimal(120)
+        await session.execute(delete(Transaction).where(Transaction.asset_id == asset_id))
+        await session.commit()
+        await PortfolioSnapshotManager.sync(session, today=TODAY)
+        assert (await _broker_points(session, broker_id))[date(1930, 1, 5)][0] == Decimal(0)
+
+        # Nothing pending: only the missing days are added
+        assert (await PortfolioSnapshotManager.sync(session, today=TODAY)).from_date is None
+        result = await PortfolioSnapshotManager.sync(session, today=TODAY + timedelta(days=2))
+        assert result.from_date == TODAY + timedelta(days=1) and result.to_date == TODAY + timedelta(days=2)
+
+        with pytest.raises(ValueError):
+            await PortfolioSnapshotManager.get_snapshots(session, date(1930, 1, 5), date(1930, 1, 1))
+
+
+@pytest.mark.asyncio
+async def test_base_currency_change_recomputes_everything(monkeypatch):
+    """Snapshots in another currency are replaced on the next sync."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        broker_id, eur_id, _ = await create_broker(session, "Snapshot Broker currency", ("EUR", "USD"))
+        session.add(CashMovement(cash_account_id=eur_id, type=CashMovementType.DEPOSIT, amount=Decimal(10), trade_date=date(1930, 1, 9)))
+        await session.commit()
+        await PortfolioSnapshotManager.sync(session, today=TODAY)
+
+        monkeypatch.setenv("PORTFOLIO_BASE_CURRENCY", "CHF")
+        result = await PortfolioSnapshotManager.sync(session, today=TODAY)
+        assert result.full
+        currencies = (await session.execute(select(PortfolioDailySnapshot.currency).distinct())).scalars().all()
+        assert currencies == ["CHF"]
+        series = await PortfolioSnapshotManager.get_snapshots(session, date(1930, 1, 9), TODAY, broker_id=broker_id)
+        assert series.currency == "CHF"
+        assert [p.unvalued for p in series.points] == [True, True]  # No EUR/CHF rate in 1930
+
+        monkeypatch.undo()
+        assert (await PortfolioSnapshotManager.sync(session, today=TODAY)).full
+        points = await _broker_points(session, broker_id)
+        assert points[TODAY] == (Decimal(0), Decimal(10), Decimal(10), False)
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_benchmark():
+    """Benchmark: one-day recompute vs full rebuild, stored range read vs on-the-fly NAV."""
+    print_section("Benchmark: portfolio snapshots (50 assets, 5 years of weekday prices)")
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        broker_id, eur_id, _ = await create_broker(session, "Snapshot Broker bench", ("EUR", "USD"))
+        assets = [await create_asset(session, f"Snapshot bench {i}") for i in range(50)]
+        start, end = date(1920, 1, 1), date(1924, 12, 31)
+        session.add(CashMovement(cash_account_id=eur_id, type=CashMovementType.DEPOSIT, amount=Decimal(1000), trade_date=start))
+        await session.execute(insert(Transaction), [
+            transaction_row(asset_id, broker_id, TransactionType.ADD_HOLDING, str(i + 1), start) for i, asset_id in enumerate(assets)
+            ])
+        await session.commit()
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        prices = [price_row(asset_id, day, str(10 + i % 7)) for asset_id in assets for i, day in enumerate(days) if day.weekday() < 5]
+        with Stopwatch() as insert_watch:
+            await session.execute(insert(PriceHistory), prices)
+            await session.commit()
+
+        full, rebuild_seconds = await timed(PortfolioSnapshotManager.rebuild(session, today=TODAY))
+
+        await session.execute(insert(PriceHistory), [price_row(assets[0], date(1930, 1, 6), "20")])
+        await session.commit()
+        incremental, sync_seconds = await timed(PortfolioSnapshotManager.sync(session, today=TODAY))
+        assert incremental.from_date == date(1930, 1, 6) and incremental.rows_written < full.rows_written
+
+        stored, read_seconds = await timed(PortfolioSnapshotManager.get_snapshots(session, start, end, broker_id=broker_id))
+        nav, nav_seconds = await timed(PortfolioNavManager.get_nav_series(session, start, end, "EUR", broker_ids=[broker_id]))
+
+        print_info(f"Insert {len(prices):,} prices (invalidation triggers): {insert_watch.seconds:.3f}s")
+        print_info(f"Full rebuild ({full.rows_written:,} rows): {rebuild_seconds * 1000:.1f}ms")
+        print_info(f"Incremental sync of {incremental.rows_written} rows: {sync_seconds * 1000:.1f}ms")
+        print_info(f"Read {len(stored.points)} days: snapshots {read_seconds * 1000:.1f}ms, on-the-fly NAV {nav_seconds * 1000:.1f}ms")
+        assert [float(p.assets_value) for p in stored.points] == pytest.approx(nav.totals)
+        assert sync_seconds < rebuild_seconds
+        print_success("✓ Benchmark completed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,282 @@
+"""
+Tests for the materialized positions engine.
+
+Covers average cost replay, trigger-based invalidation (insert, backdated
+insert, update, delete cascaded from cash_movements), incremental sync from the
+earliest affected trade_date, as-of queries, the consistency checker and the
+full rebuild.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import (
+    CashMovement,
+    PositionHistory,
+    PositionInvalidation,
+    Transaction,
+    TransactionType,
+    )
+from backend.app.db.session import get_async_engine
+from backend.app.services.positions import PositionManager, apply_transaction, find_oversells, replay_transactions
+from backend.app.utils.datetime_utils import utcnow
+from backend.test_scripts.test_utils import (
+    add_trade,
+    create_pair,
+    print_info,
+    print_section,
+    print_success,
+    timed,
+    transaction_row,
+    )
+
+
+def test_average_cost_replay():
+    """BUY adds cost, SELL removes average cost, closing resets cost, days are end-of-day states."""
+    quantity, cost = apply_transaction(Decimal(0), Decimal(0), TransactionType.BUY, Decimal(10), Decimal(100))
+    quantity, cost = apply_transaction(quantity, cost, TransactionType.BUY, Decimal(10), Decimal(200))
+    assert (quantity, cost) == (Decimal(20), Decimal(3000))
+    quantity, cost = apply_transaction(quantity, cost, TransactionType.SELL, Decimal(5), Decimal(500))
+    assert (quantity, cost) == (Decimal(15), Decimal(2250))
+    quantity, cost = apply_transaction(quantity, cost, TransactionType.REMOVE_HOLDING, Decimal(15), None)
+    assert (quantity, cost) == (Decimal(0), Decimal(0))
+
+    rows = [
+        (1, 1, date(2025, 1, 1), TransactionType.ADD_HOLDING, Decimal(3), None),
+        (1, 1, date(2025, 1, 1), TransactionType.BUY, Decimal(1), Decimal("3")),
+        (1, 1, date(2025, 1, 2), TransactionType.SELL, Decimal(1), Decimal("9")),
+        (1, 2, date(2025, 1, 5), TransactionType.TRANSFER_IN, Decimal(2), Decimal("7")),
+        ]
+    history = replay_transactions(rows, {(1, 2): (Decimal(1), Decimal(10))})
+    assert history[(1, 1)] == [(date(2025, 1, 1), Decimal(4), Decimal(3)), (date(2025, 1, 2), Decimal(3), Decimal("2.250000"))]
+    assert history[(1, 2)] == [(date(2025, 1, 5), Decimal(3), Decimal(24))]
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_follows_transaction_changes():
+    """Inserts, backdated inserts, edits and cascaded deletes replay only from the affected date."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        await PositionManager.sync(session)  # Absorb pending changes of other tests
+        asset_id, broker_id, cash_id = await create_pair(session, "Position sync")
+
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.BUY, "10", "100", date(2025, 1, 10))
+        sell = await add_trade(session, asset_id, broker_id, cash_id, TransactionType.SELL, "4", "150", date(2025, 3, 1))
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.ADD_HOLDING, "2", None, date(2025, 4, 1))
+
+        [position] = await PositionManager.get_positions(session, asset_ids=[asset_id])
+        assert position.quantity == Decimal(8)
+        assert position.cost_basis == Decimal(600)
+        assert position.first_trade_date == date(2025, 1, 10)
+        assert position.last_trade_date == date(2025, 4, 1)
+
+        # Backdated BUY between the existing trades: trigger records its date, replay starts there
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.BUY, "10", "200", date(2025, 2, 1))
+        pending = (await session.execute(
+            select(PositionInvalidation.from_date).where(PositionInvalidation.asset_id == asset_id)
+            )).scalar_one()
+        assert pending == date(2025, 2, 1)
+        result = await PositionManager.sync(session)
+        assert result.pairs_replayed == 1
+        assert result.transactions_replayed == 3  # Feb BUY, Mar SELL, Apr ADD_HOLDING (Jan BUY not re-read)
+        [position] = await PositionManager.get_positions(session, asset_ids=[asset_id])
+        assert position.quantity == Decimal(18)
+        assert position.cost_basis == Decimal(2400)  # 3000 - 4 * 150 average cost
+
+        # Edit: SELL quantity 4 -> 6
+        await session.execute(update(Transaction).where(Transaction.id == sell.id).values(quantity=Decimal(6)))
+        await session.commit()
+        [position] = await PositionManager.get_positions(session, asset_ids=[asset_id])
+        assert position.quantity == Decimal(16)
+
+        # As-of queries read history rows
+        [before_sell] = await PositionManager.get_positions_at(date(2025, 2, 15), session, asset_ids=[asset_id])
+        assert before_sell.quantity == Decimal(20)
+        assert before_sell.last_trade_date == date(2025, 2, 1)
+        assert await PositionManager.get_positions_at(date(2024, 12, 31), session, asset_ids=[asset_id]) == []
+
+        # Delete the SELL's cash movement: FK cascade deletes the transaction, trigger still fires
+        await session.delete(await session.get(CashMovement, sell.cash_movement_id))
+        await session.commit()
+        session.expunge_all()
+        [position] = await PositionManager.get_positions(session, asset_ids=[asset_id])
+        assert position.quantity == Decimal(22)
+
+        check = await PositionManager.check_consistency(session)
+        assert check.consistent, check.mismatches
+
+
+@pytest.mark.asyncio
+async def test_consistency_check_and_rebuild():
+    """A corrupted history row is reported by the checker and repaired by a rebuild."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset_id, broker_id, cash_id = await create_pair(session, "Position check")
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.ADD_HOLDING, "5", "10", date(2025, 5, 1))
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.REMOVE_HOLDING, "5", None, date(2025, 6, 1))
+        await PositionManager.sync(session)
+
+        # Closed position kept (quantity 0), hidden by default
+        assert await PositionManager.get_positions(session, asset_ids=[asset_id]) == []
+        [closed] = await PositionManager.get_positions(session, asset_ids=[asset_id], include_closed=True)
+        assert closed.quantity == 0 and closed.cost_basis == 0
+
+        await session.execute(
+            update(PositionHistory)
+            .where(PositionHistory.asset_id == asset_id, PositionHistory.trade_date == date(2025, 5, 1))
+            .values(quantity=Decimal(7))
+            )
+        await session.commit()
+
+        check = await PositionManager.check_consistency(session)
+        assert not check.consistent
+        assert any(m.asset_id == asset_id and m.field == "quantity" and m.expected == "5.000000" for m in check.mismatches)
+
+        rebuilt = await PositionManager.rebuild(session)
+        assert rebuilt.pairs_replayed >= 1
+        assert (await PositionManager.check_consistency(session)).consistent
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_benchmark():
+    """Benchmark: backdated change on a 20k-transaction history replays only the tail."""
+    print_section("Benchmark: positions incremental replay vs rebuild")
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset_id, broker_id, _ = await create_pair(session, "Position bench")
+        start = date(2000, 1, 1)
+        now = utcnow()
+        rows = [
+            {
+                "asset_id": asset_id, "broker_id": broker_id,
+                "type": TransactionType.ADD_HOLDING if i % 3 else TransactionType.REMOVE_HOLDING,
+                "quantity": Decimal(1), "price": Decimal("10.5"), "currency": "EUR",
+                "trade_date": start + timedelta(days=i), "created_at": now, "updated_at": now,
+                }
+            for i in range(20_000)
+            ]
+        await session.execute(insert(Transaction), rows)
+        await session.commit()
+
+        full, full_seconds = await timed(PositionManager.sync(session))
+
+        last_date = start + timedelta(days=19_990)
+        await session.execute(insert(Transaction).values(
+            asset_id=asset_id, broker_id=broker_id, type=TransactionType.ADD_HOLDING, quantity=Decimal(5),
+            price=Decimal(1), currency="EUR", trade_date=last_date, created_at=now, updated_at=now,
+            ))
+        await session.commit()
+        incremental, incremental_seconds = await timed(PositionManager.sync(session))
+
+        print_info(f"Initial replay: {full.transactions_replayed} transactions in {full_seconds:.3f}s")
+        print_info(f"Backdated change: {incremental.transactions_replayed} transactions in {incremental_seconds:.3f}s")
+        assert full.transactions_replayed >= 20_000
+        assert incremental.transactions_replayed == 11
+        assert incremental_seconds < full_seconds
+
+        [position] = await PositionManager.get_positions(session, asset_ids=[asset_id])
+        assert position.quantity == Decimal(20_000 - 2 * 6667 + 5)
+        print_success("✓ Benchmark completed")
+
+
+def test_find_oversells_merge():
+    """Batch rows are merged with stored days; stored quantities of a date apply before batch rows of that date."""
+    stored = {(1, 1): (Decimal(5), [(date(2025, 2, 1), Decimal(8)), (date(2025, 3, 1), Decimal(2))])}
+    batch = [
+        (1, 1, date(2025, 1, 15), 0, Decimal(-5)),  # 5 -> 0
+        (1, 1, date(2025, 2, 1), 1, Decimal(-3)),   # stored 8 - 5 - 3 = 0
+        (1, 1, date(2025, 4, 1), 2, Decimal(-1)),   # stored 2 - 9 = -7
+        (2, 1, date(2025, 1, 1), 3, Decimal(1)),
+        (2, 1, date(2025, 1, 1), 4, Decimal(-2)),   # no history: -1
+        ]
+    violations = find_oversells(batch, stored)
+    assert [(v.asset_id, v.trade_date, v.index, v.quantity) for v in violations] == [
+        (1, date(2025, 3, 1), None, Decimal(-6)),
+        (1, date(2025, 4, 1), 2, Decimal(-7)),
+        (2, date(2025, 1, 1), 4, Decimal(-1)),
+        ]
+    assert find_oversells(batch[:2], {(1, 1): (Decimal(5), stored[(1, 1)][1][:1])}) == []
+
+
+@pytest.mark.asyncio
+async def test_validate_batch_against_stored_positions():
+    """A batch is checked against stored history: own oversells, later stored days and cash-only rows."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset_id, broker_id, cash_id = await create_pair(session, "Position guard")
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.BUY, "10", "100", date(2025, 1, 10))
+        await add_trade(session, asset_id, broker_id, cash_id, TransactionType.SELL, "8", "120", date(2025, 3, 1))
+
+        ok = await PositionManager.validate_batch(session, [
+            transaction_row(asset_id, broker_id, TransactionType.SELL, "2", date(2025, 3, 1)),
+            {**transaction_row(asset_id, broker_id, TransactionType.DIVIDEND, "0", date(2024, 1, 1)), "quantity": 0},
+            ])
+        assert ok.valid and ok.rows_checked == 2 and ok.pairs_checked == 1
+
+        # Backdated SELL of 5 is covered (10 held) but leaves the stored March SELL short
+        result = await PositionManager.validate_batch(session, [
+            transaction_row(asset_id, broker_id, TransactionType.SELL, "5", date(2025, 2, 1)),
+            transaction_row(asset_id, broker_id, TransactionType.TRANSFER_OUT, "1", date(2025, 1, 1)),
+            ])
+        assert not result.valid
+        assert [(v.trade_date, v.index, v.quantity) for v in result.violations] == [
+            (date(2025, 1, 1), 1, Decimal(-1)),
+            (date(2025, 3, 1), None, Decimal(-4)),
+            ]
+
+        # Validation does not write anything
+        [position] = await PositionManager.get_positions(session, asset_ids=[asset_id])
+        assert position.quantity == Decimal(2)
+
+
+@pytest.mark.asyncio
+async def test_validate_batch_benchmark():
+    """Benchmark: oversell validation of a 50k-row import against stored history."""
+    print_section("Benchmark: oversell guard on a 50k-row batch")
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        pairs = [await create_pair(session, f"Position guard-bench-{i}") for i in range(10)]
+        start = date(2010, 1, 1)
+        await session.execute(insert(Transaction), [
+            transaction_row(asset_id, broker_id, TransactionType.ADD_HOLDING, "100", start + timedelta(days=day))
+            for asset_id, broker_id, _ in pairs
+            for day in range(0, 2000, 2)
+            ])
+        await session.commit()
+        await PositionManager.sync(session)
+
+        # Interleaved with the stored days, in import (not sorted) order
+        batch = [
+            transaction_row(asset_id, broker_id, TransactionType.BUY if i % 2 else TransactionType.SELL, "50",
+                     start + timedelta(days=(5000 - i) % 2000))
+            for i in range(5000)
+            for asset_id, broker_id, _ in pairs
+            ]
+        result, seconds = await timed(PositionManager.validate_batch(session, batch))
+        assert result.valid, result.violations[:5]
+        assert result.rows_checked == 50_000 and result.pairs_checked == 10
+
+        batch[-1] = transaction_row(pairs[-1][0], pairs[-1][1], TransactionType.SELL, "1000000", start)
+        result = await PositionManager.validate_batch(session, batch)
+        assert not result.valid
+        assert result.violations[0].index == len(batch) - 1
+
+        print_info(f"Validate 50k rows over {len(pairs)} pairs: {seconds:.3f}s")
+        print_success("✓ Benchmark completed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,131 @@
+"""
+Tests for the multi-asset price matrix.
+
+Covers the aligned calendar-day axis (last close before the range, gaps,
+assets without prices), the backward-fill mask, agreement with the per-asset
+get_prices backward-fill, optional conversion to a target currency, input
+errors (range, unknown assets, mixed price currencies), and a benchmark of
+50 assets × 10 years against 50 get_prices calls.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import PriceHistory
+from backend.app.db.session import get_async_engine
+from backend.app.services.asset_source import AssetSourceManager
+from backend.app.services.fx import upsert_rates_bulk
+from backend.test_scripts.test_utils import (
+    Stopwatch,
+    create_asset,
+    price_row,
+    print_info,
+    print_section,
+    print_success,
+    timed,
+    )
+
+START, END = date(1936, 1, 1), date(1936, 1, 5)
+
+
+async def _add_prices(session: AsyncSession, prices: list[tuple[int, date, str, str]]) -> None:
+    await session.execute(insert(PriceHistory), [price_row(*price) for price in prices])
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_price_matrix_alignment_and_conversion():
+    """Shared date axis, backward-fill mask and optional conversion."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        eur, chf, unpriced = [await create_asset(session, f"Matrix align {i}") for i in range(3)]
+        await _add_prices(session, [
+            (eur, date(1935, 12, 30), "10", "EUR"),
+            (eur, date(1936, 1, 2), "11", "EUR"),
+            (eur, date(1936, 1, 4), "12.5", "EUR"),
+            (eur, date(1936, 1, 9), "99", "EUR"),
+            (chf, date(1936, 1, 3), "20", "CHF"),
+            ])
+
+        matrix = await AssetSourceManager.get_price_matrix([chf, eur, unpriced, eur], START, END, session)
+        assert matrix.dates == [START + timedelta(days=i) for i in range(5)] and matrix.currency is None
+        assert [s.asset_id for s in matrix.series] == [chf, eur, unpriced]
+        series = {s.asset_id: s for s in matrix.series}
+        assert (series[eur].currency, series[eur].closes) == ("EUR", [10.0, 11.0, 11.0, 12.5, 12.5])
+        assert series[eur].backward_filled == [True, False, True, False, True]
+        assert (series[chf].currency, series[chf].closes) == ("CHF", [None, None, 20.0, 20.0, 20.0])
+        assert series[chf].backward_filled == [False, False, False, True, True]
+        assert (series[unpriced].currency, series[unpriced].closes) == (None, [None] * 5)
+        assert series[unpriced].backward_filled == [False] * 5
+
+        # Same values as the per-asset backward-fill (stored prices)
+        points = await AssetSourceManager.get_prices(eur, START, END, session)
+        assert [float(p.close) for p in points] == series[eur].closes
+        assert [p.backward_fill_info is not None for p in points] == series[eur].backward_filled
+
+        # Converted at the backward-filled rate of each day (1 CHF = rate EUR)
+        await upsert_rates_bulk(session, [
+            (date(1935, 12, 31), "CHF", "EUR", Decimal("0.9"), "MANUAL"),
+            (date(1936, 1, 4), "CHF", "EUR", Decimal("1.1"), "MANUAL"),
+            ])
+        converted = await AssetSourceManager.get_price_matrix([eur, chf], START, END, session, currency="EUR")
+        assert converted.currency == "EUR"
+        assert converted.series[0].closes == [10.0, 11.0, 11.0, 12.5, 12.5]
+        assert converted.series[1].closes == [None, None, 18.0, 22.0, 22.0]
+        assert converted.series[1].currency == "EUR"
+
+
+@pytest.mark.asyncio
+async def test_price_matrix_errors():
+    """Invalid range, unknown assets and mixed currencies without a target are rejected."""
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        mixed = await create_asset(session, "Matrix mixed")
+        await _add_prices(session, [(mixed, date(1936, 1, 1), "1", "EUR"), (mixed, date(1936, 1, 2), "1", "CHF")])
+
+        with pytest.raises(ValueError, match="after"):
+            await AssetSourceManager.get_price_matrix([mixed], END, START, session)
+        with pytest.raises(ValueError, match="not found"):
+            await AssetSourceManager.get_price_matrix([mixed, -1], START, END, session)
+        with pytest.raises(ValueError, match="several currencies"):
+            await AssetSourceManager.get_price_matrix([mixed], START, END, session)
+        converted = await AssetSourceManager.get_price_matrix([mixed], START, END, session, currency="EUR")
+        assert converted.series[0].closes[:2] == [1.0, 0.9]
+
+
+@pytest.mark.asyncio
+async def test_price_matrix_benchmark():
+    """Benchmark: 50 assets × 10 years in one matrix vs 50 get_prices calls."""
+    print_section("Benchmark: price matrix (50 assets × 10 years)")
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset_ids = [await create_asset(session, f"Matrix bench {i}") for i in range(50)]
+        start, days = date(1937, 1, 1), 3650
+        await _add_prices(session, [
+            (asset_id, start + timedelta(days=d), str(100 + (d * (i + 1)) % 37), "EUR")
+            for i, asset_id in enumerate(asset_ids) for d in range(days) if d % 7 not in (5, 6)
+            ])
+        end = start + timedelta(days=days - 1)
+
+        matrix, matrix_seconds = await timed(AssetSourceManager.get_price_matrix(asset_ids, start, end, session))
+
+        with Stopwatch() as per_asset_watch:
+            per_asset = [await AssetSourceManager.get_prices(asset_id, start, end, session) for asset_id in asset_ids]
+
+        for series, points in zip(matrix.series, per_asset):
+            assert series.closes == [float(p.close) for p in points]
+        print_info(f"Price matrix (one query): {matrix_seconds * 1000:.0f}ms")
+        print_info(f"get_prices per asset ({len(asset_ids)} calls): {per_asset_watch.seconds * 1000:.0f}ms")
+        assert matrix_seconds < per_asset_watch.seconds
+    print_success("✓ Benchmark completed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,148 @@
+"""
+Tests for the background price refresh scheduler.
+
+Covers staleness ordering, per-provider budgets, market-hour deferral and
+the status snapshot (queue depth / lag). The APScheduler loop is not started:
+queue building and batch selection are exercised directly.
+"""
+import heapq
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import Asset, AssetType, IdentifierType
+from backend.app.db.session import get_async_engine
+from backend.app.schemas.provider import FAProviderAssignmentItem
+from backend.app.services.asset_source import AssetSourceManager
+from backend.app.services.price_refresh_scheduler import (
+    PriceRefreshScheduler,
+    NEVER_FETCHED,
+    is_market_open,
+    last_market_close,
+    )
+from backend.app.services.provider_registry import AssetProviderRegistry
+
+# Saturday 2025-06-14 12:00 UTC
+SATURDAY_NOON = datetime(2025, 6, 14, 12, 0, tzinfo=timezone.utc)
+
+
+def _queue(entries):
+    heapq.heapify(entries)
+    return entries
+
+
+def test_select_batch_orders_by_staleness():
+    """Most stale assets are picked first, never-fetched before everything."""
+    AssetProviderRegistry.auto_discover()
+    scheduler = PriceRefreshScheduler(tick_seconds=60, batch_size=2, retry_minutes=30)
+    now = datetime(2025, 6, 10, 12, 0, tzinfo=timezone.utc)
+
+    queue = _queue([
+        (now - timedelta(hours=1), 1, "mockprov", now - timedelta(days=1, hours=1)),
+        (now - timedelta(hours=5), 2, "mockprov", now - timedelta(days=1, hours=5)),
+        (NEVER_FETCHED, 3, "mockprov", None),
+        (now + timedelta(hours=1), 4, "mockprov", now - timedelta(hours=23)),
+        ])
+    batch, deferred = scheduler.select_batch(queue, now)
+
+    assert batch == [3, 2]
+    assert deferred == 0
+    # Remaining due entry stays queued, not-yet-due entry untouched
+    assert sorted(entry[1] for entry in queue) == [1, 4]
+
+
+def test_select_batch_respects_provider_budget():
+    """Assets over a provider budget stay in queue for the next tick."""
+    AssetProviderRegistry.auto_discover()
+    scheduler = PriceRefreshScheduler(tick_seconds=60, batch_size=100, retry_minutes=30)
+    now = datetime(2025, 6, 10, 12, 0, tzinfo=timezone.utc)
+    scraper_budget = AssetProviderRegistry.get_provider_instance("cssscraper").refresh_budget
+
+    entries = [(now - timedelta(minutes=i + 1), i, "cssscraper", None) for i in range(scraper_budget + 3)]
+    entries.append((now - timedelta(minutes=1), 1000, "mockprov", None))
+    batch, _ = scheduler.select_batch(_queue(entries), now)
+
+    scraper_ids = [asset_id for asset_id in batch if asset_id != 1000]
+    assert len(scraper_ids) == scraper_budget
+    assert 1000 in batch
+
+
+def test_market_hours_helpers():
+    """Trading window and last close are computed Monday-Friday in UTC."""
+    hours = AssetProviderRegistry.get_provider_instance("justetf").market_hours
+    assert hours is not None
+
+    assert not is_market_open(hours, SATURDAY_NOON)
+    friday_close = last_market_close(hours, SATURDAY_NOON)
+    assert friday_close.weekday() == 4
+    assert friday_close.time() == hours[1]
+
+    wednesday_midday = datetime(2025, 6, 11, 12, 0, tzinfo=timezone.utc)
+    assert is_market_open(hours, wednesday_midday)
+
+
+def test_select_batch_defers_outside_market_hours():
+    """Outside market hours an asset refreshed after last close is deferred."""
+    scheduler = PriceRefreshScheduler(tick_seconds=60, batch_size=10, retry_minutes=30)
+    hours = AssetProviderRegistry.get_provider_instance("justetf").market_hours
+    friday_close = last_market_close(hours, SATURDAY_NOON)
+
+    queue = _queue([
+        # Refreshed after Friday close: nothing new until Monday open
+        (SATURDAY_NOON - timedelta(minutes=5), 1, "justetf", friday_close + timedelta(hours=1)),
+        # Last refresh before Friday close: one more refresh to get the closing price
+        (SATURDAY_NOON - timedelta(minutes=10), 2, "justetf", friday_close - timedelta(hours=1)),
+        # Provider without market hours is never deferred
+        (SATURDAY_NOON - timedelta(minutes=1), 3, "mockprov", friday_close + timedelta(hours=1)),
+        ])
+    batch, deferred = scheduler.select_batch(queue, SATURDAY_NOON)
+
+    assert batch == [2, 3]
+    assert deferred == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_status_reports_queue_and_lag():
+    """Status snapshot includes never-fetched assets and per-provider due counts."""
+    assert initialize_test_database(), "Failed to initialize test database"
+    AssetProviderRegistry.auto_discover()
+    timestamp = int(time.time() * 1000)
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset = Asset(display_name=f"Scheduler Status Asset {timestamp}", currency="USD", asset_type=AssetType.STOCK, active=True)
+        session.add(asset)
+        await session.commit()
+        await session.refresh(asset)
+
+        await AssetSourceManager.bulk_assign_providers([
+            FAProviderAssignmentItem(
+                asset_id=asset.id,
+                provider_code="mockprov",
+                identifier="SCHEDULER_TEST",
+                identifier_type=IdentifierType.UUID,
+                provider_params={},
+                fetch_interval=60
+                )
+            ], session)
+
+        scheduler = PriceRefreshScheduler(tick_seconds=60, batch_size=10, retry_minutes=30)
+        queue = await scheduler.build_queue(session)
+        assert any(entry[1] == asset.id and entry[0] == NEVER_FETCHED for entry in queue)
+
+        status = await scheduler.get_status(session)
+        assert not status.running
+        assert status.queue_depth >= 1
+        assert status.due_count >= status.never_fetched_count >= 1
+        assert status.due_by_provider.get("mockprov", 0) >= 1
+        assert status.max_lag_seconds >= 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
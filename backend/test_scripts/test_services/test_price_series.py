@@ -0,0 +1,191 @@
+"""
+Tests for the lazy backward-filled price series (DB fallback of get_prices).
+
+Covers the last close before the range (filled from the first day), rows
+without a close, ranges before the first price, points sharing the stored row,
+JSON parity of the streamed points with FAPricePoint serialization, the
+chunked JSON array writer, a 30-year benchmark of the streamed series
+against building and serializing the FAPricePoint list, and a 10k-point
+benchmark of the JSON response body (fast path vs FastAPI default vs json).
+"""
+import json
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import AsyncIterator, List
+
+import pytest
+from pydantic import TypeAdapter
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import PriceHistory
+from backend.app.db.session import get_async_engine
+from backend.app.schemas.prices import FAPricePoint
+from backend.app.services.asset_source import AssetSourceManager, PriceSeriesPoint
+from backend.app.utils.streaming import StreamFormat, iter_json_array, streaming_response
+from backend.test_scripts.test_utils import create_asset, price_row, print_info, print_section, print_success
+
+START, END = date(1938, 1, 2), date(1938, 1, 6)
+
+
+async def _json_items(points):
+    async for point in points:
+        yield point.to_json()
+
+
+async def _empty():
+    return
+    yield
+
+
+async def _join(chunks) -> str:
+    return b"".join([chunk async for chunk in chunks]).decode()
+
+
+async def _create_asset(session: AsyncSession, prices: list[tuple[date, str | None]]) -> int:
+    asset_id = await create_asset(session, "Price series")
+    await session.execute(insert(PriceHistory), [price_row(asset_id, day, close, volume="100") for day, close in prices])
+    await session.commit()
+    return asset_id
+
+
+@pytest.mark.asyncio
+async def test_series_starts_from_last_price_before_range():
+    """The close before start_date fills the first days; rows without a close are skipped."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset_id = await _create_asset(session, [(date(1937, 12, 30), "10"), (date(1938, 1, 3), None), (date(1938, 1, 4), "11")])
+
+        points = await AssetSourceManager.iter_prices(asset_id, START, END, session)
+        assert isinstance(points, AsyncIterator)
+        points = [p async for p in points]
+        assert [p.date for p in points] == [START + timedelta(days=i) for i in range(5)]
+        assert points[0].row is points[1].row  # Filled days share the stored row
+
+        prices = await AssetSourceManager.get_prices(asset_id, START, END, session)
+        assert [p.close for p in prices] == [Decimal("10"), Decimal("10"), Decimal("11"), Decimal("11"), Decimal("11")]
+        assert [p.backward_fill_info.days_back if p.backward_fill_info else 0 for p in prices] == [3, 4, 0, 1, 2]
+        assert prices[0].backward_fill_info.actual_rate_date == date(1937, 12, 30)
+        assert all(p.volume == Decimal("100") and p.currency == "EUR" for p in prices)
+
+        # Range before the first price: empty; range across it: starts at the first price
+        assert await AssetSourceManager.get_prices(asset_id, date(1937, 12, 1), date(1937, 12, 29), session) == []
+        prices = await AssetSourceManager.get_prices(asset_id, date(1937, 12, 28), date(1937, 12, 31), session)
+        assert [p.date for p in prices] == [date(1937, 12, 30), date(1937, 12, 31)]
+
+
+@pytest.mark.asyncio
+async def test_series_json_matches_price_points():
+    """Streamed JSON has the same shape and values as the serialized FAPricePoint list."""
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset_id = await _create_asset(session, [(date(1938, 1, 1), "10.5"), (date(1938, 1, 4), "11.25")])
+
+        expected = TypeAdapter(List[FAPricePoint]).dump_python(await AssetSourceManager.get_prices(asset_id, START, END, session), mode="json")
+        points = await AssetSourceManager.iter_prices(asset_id, START, END, session)
+        assert [p.to_json() async for p in points] == expected
+        # Row strings formatted once per stored row, reused on backward-filled days
+        to_json = PriceSeriesPoint.json_serializer()
+        points = await AssetSourceManager.iter_prices(asset_id, START, END, session)
+        assert [to_json(p) async for p in points] == expected
+
+        for chunk_size in (1, 2, 10):
+            points = await AssetSourceManager.iter_prices(asset_id, START, END, session)
+            assert json.loads(await _join(iter_json_array(_json_items(points), chunk_size=chunk_size))) == expected
+        assert await _join(iter_json_array(_json_items(_empty()))) == "[]"
+
+
+@pytest.mark.asyncio
+async def test_series_benchmark():
+    """Benchmark: 30 years of daily points streamed as JSON vs FAPricePoint list + serialization."""
+    print_section("Benchmark: price series (30 years)")
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        start, days = date(1900, 1, 1), 10957
+        asset_id = await _create_asset(session, [
+            (start + timedelta(days=d), str(100 + d % 37)) for d in range(days) if d % 7 not in (5, 6)
+            ])
+        end = start + timedelta(days=days - 1)
+
+        started = time.perf_counter()
+        points = await AssetSourceManager.iter_prices(asset_id, start, end, session)
+        streamed = await _join(iter_json_array(_json_items(points)))
+        stream_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        prices = TypeAdapter(List[FAPricePoint]).validate_python(await AssetSourceManager.get_prices(asset_id, start, end, session), from_attributes=True)
+        serialized = TypeAdapter(List[FAPricePoint]).dump_json(prices)
+        model_seconds = time.perf_counter() - started
+
+        # Peak memory measured separately (tracemalloc slows allocations down)
+        tracemalloc.start()
+        points = await AssetSourceManager.iter_prices(asset_id, start, end, session)
+        async for _ in iter_json_array(_json_items(points)):
+            pass
+        _, stream_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        tracemalloc.start()
+        TypeAdapter(List[FAPricePoint]).dump_json(await AssetSourceManager.get_prices(asset_id, start, end, session))
+        _, model_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert json.loads(streamed) == json.loads(serialized) and len(prices) == days
+        print_info(f"Streamed points: {stream_seconds * 1000:.0f}ms, peak {stream_peak / 2 ** 20:.1f} MiB")
+        print_info(f"FAPricePoint list + serialization: {model_seconds * 1000:.0f}ms, peak {model_peak / 2 ** 20:.1f} MiB")
+        assert stream_peak < model_peak
+    print_success("✓ Benchmark completed")
+
+
+@pytest.mark.asyncio
+async def test_series_response_benchmark():
+    """Benchmark: JSON response body of a 10k-point series, fast path vs FastAPI default vs json.dumps."""
+    print_section("Benchmark: price series response (10k points)")
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        start, days = date(1900, 1, 1), 10000
+        asset_id = await _create_asset(session, [
+            (start + timedelta(days=d), f"{100 + d % 37}.{d % 1000:03d}") for d in range(days) if d % 7 not in (5, 6)
+            ])
+        end = start + timedelta(days=days - 1)
+        adapter = TypeAdapter(List[FAPricePoint])
+
+        async def _fast() -> bytes:
+            # Response of the endpoint: streamed points, orjson, row strings reused on filled days
+            points = await AssetSourceManager.iter_prices(asset_id, start, end, session)
+            response = streaming_response(points, StreamFormat.JSON, PriceSeriesPoint.json_serializer(), PriceSeriesPoint.to_csv_row, PriceSeriesPoint.CSV_COLUMNS, "prices")
+            return b"".join([chunk async for chunk in response.body_iterator])
+
+        async def _fastapi_default() -> bytes:
+            # response_model=List[FAPricePoint]: models validated then dumped by pydantic-core
+            return adapter.dump_json(adapter.validate_python(await AssetSourceManager.get_prices(asset_id, start, end, session)))
+
+        async def _json_dumps() -> bytes:
+            # Previous streamed path: one json.dumps per point
+            points = await AssetSourceManager.iter_prices(asset_id, start, end, session)
+            return ("[" + ",".join([json.dumps(p.to_json(), separators=(",", ":")) async for p in points]) + "]").encode()
+
+        timings = {}
+        for name, build in (("fast path", _fast), ("FastAPI default", _fastapi_default), ("json.dumps", _json_dumps)):
+            best = None
+            for _ in range(3):
+                started = time.perf_counter()
+                body = await build()
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            timings[name] = best
+            assert len(json.loads(body)) == days
+            print_info(f"{name}: {best * 1000:.0f}ms ({len(body) / 2 ** 20:.1f} MiB)")
+
+        assert json.loads(await _fast()) == json.loads(await _fastapi_default()) == json.loads(await _json_dumps())
+        assert timings["fast path"] < timings["json.dumps"]
+        assert timings["fast path"] < timings["FastAPI default"]
+    print_success("✓ Benchmark completed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,155 @@
+"""
+Tests for the shared provider rate limiter.
+
+Covers throttle detection (429 / Retry-After, wrapped provider errors),
+token bucket pacing, concurrency caps and adaptive rate changes.
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from backend.app.services.asset_source import AssetSourceError
+from backend.app.services.rate_limiter import (
+    RateLimiter,
+    RateLimitPolicy,
+    throttle_delay,
+    host_from_url,
+    DEFAULT_THROTTLE_SECONDS,
+    )
+
+
+def _http_error(status_code: int, headers: dict | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://example.com/quote")
+    response = httpx.Response(status_code, headers=headers or {}, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status_code}", request=request, response=response)
+
+
+def test_throttle_delay_detection():
+    """429/503 with Retry-After, RATE_LIMITED provider errors and wrapped errors are throttles."""
+    assert throttle_delay(_http_error(429, {"Retry-After": "3"})) == 3.0
+    assert throttle_delay(_http_error(503)) == DEFAULT_THROTTLE_SECONDS
+    assert throttle_delay(_http_error(500)) is None
+    assert throttle_delay(ValueError("bad payload")) is None
+
+    assert throttle_delay(AssetSourceError("slow down", "RATE_LIMITED", {"retry_after": 7})) == 7.0
+
+    class YFRateLimitError(Exception):
+        pass
+
+    assert throttle_delay(YFRateLimitError("Too Many Requests. Rate limited.")) == DEFAULT_THROTTLE_SECONDS
+    # Message text alone is not a throttle (ids, ISINs, prices may contain 429)
+    assert throttle_delay(AssetSourceError("Provider fetch failed for asset 1429", "PROVIDER_FETCH_ERROR")) is None
+    assert throttle_delay(ValueError("HTTP 429 Too Many Requests")) is None
+
+    # Provider wrapping the original HTTP error (raise ... from e)
+    try:
+        try:
+            raise _http_error(429, {"Retry-After": "5"})
+        except httpx.HTTPStatusError as e:
+            raise AssetSourceError("Fetch failed", "FETCH_ERROR") from e
+    except AssetSourceError as wrapped:
+        assert throttle_delay(wrapped) == 5.0
+
+
+def test_host_from_url():
+    assert host_from_url("https://www.BorsaItaliana.it/borsa/x.html") == "www.borsaitaliana.it"
+    assert host_from_url("AAPL") is None
+    assert host_from_url(None) is None
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_requests():
+    """After the burst is spent, requests are spaced at 1/rate."""
+    limiter = RateLimiter()
+    policy = RateLimitPolicy(rate=20.0, burst=1, max_concurrency=1)
+
+    started = time.monotonic()
+    for _ in range(5):
+        async with limiter.limit("test_pacing", None, policy):
+            pass
+    elapsed = time.monotonic() - started
+
+    # 1 burst token + 4 paced tokens at 20/s -> ~0.2s
+    assert elapsed >= 0.15, f"Requests not paced: {elapsed:.3f}s"
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_per_bucket():
+    """max_concurrency bounds in-flight calls per (provider, host)."""
+    limiter = RateLimiter()
+    policy = RateLimitPolicy(rate=1000.0, burst=100, max_concurrency=2)
+    in_flight = 0
+    peak = 0
+
+    async def call():
+        nonlocal in_flight, peak
+        async with limiter.limit("test_concurrency", "example.com", policy):
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_throttle_blocks_bucket_and_halves_rate():
+    """A 429 halves the rate and blocks the bucket until Retry-After expires."""
+    limiter = RateLimiter()
+    policy = RateLimitPolicy(rate=10.0, burst=5, max_concurrency=5)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        async with limiter.limit("test_throttle", None, policy):
+            raise _http_error(429, {"Retry-After": "0.3"})
+
+    bucket = limiter.get_bucket("test_throttle", None, policy)
+    assert bucket.rate == 5.0
+    assert bucket.throttled_count == 1
+
+    started = time.monotonic()
+    async with limiter.limit("test_throttle", None, policy):
+        pass
+    assert time.monotonic() - started >= 0.25, "Retry-After not honoured"
+
+
+@pytest.mark.asyncio
+async def test_adaptive_rate_shrinks_and_recovers():
+    """Handled errors reported via slot shrink the rate, successes grow it back (bounded)."""
+    limiter = RateLimiter()
+    policy = RateLimitPolicy(rate=100.0, burst=100, max_concurrency=5, max_rate_factor=1.5)
+    bucket = limiter.get_bucket("test_adaptive", None, policy)
+
+    # Client-side errors carry no load signal
+    for _ in range(3):
+        async with limiter.limit("test_adaptive", None, policy) as slot:
+            slot.record_error(AssetSourceError("Search not supported", "NOT_SUPPORTED"))
+    assert bucket.rate >= policy.rate
+
+    for _ in range(5):
+        async with limiter.limit("test_adaptive", None, policy) as slot:
+            slot.record_error(httpx.ConnectError("connection reset"))
+    assert bucket.rate < policy.rate
+
+    for _ in range(200):
+        async with limiter.limit("test_adaptive", None, policy):
+            pass
+    assert bucket.rate == pytest.approx(policy.rate * policy.max_rate_factor)
+
+    # Separate hosts get separate buckets
+    assert limiter.get_bucket("test_adaptive", "other.host", policy) is not bucket
+
+
+@pytest.mark.asyncio
+async def test_no_policy_means_unlimited():
+    """Local providers (policy None) bypass the limiter entirely."""
+    limiter = RateLimiter()
+    async with limiter.limit("mockprov", None, None) as slot:
+        slot.record_error(RuntimeError("ignored"))
+    assert limiter.snapshot() == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
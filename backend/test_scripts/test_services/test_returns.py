@@ -0,0 +1,183 @@
+"""
+Tests for the return engine.
+
+Covers the vectorized kernels (TWR with start-of-day flows, bracketed Newton
+XIRR against closed-form cases, columns without a solution), broker and asset
+returns from the database (deposits, buys through linked cash movements,
+holdings added without a price), the return cache and its invalidation by
+writes, and a 500-asset, 10-year batch benchmark against one column at a time.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import (
+    CashMovement,
+    CashMovementType,
+    PortfolioDailySnapshot,
+    PriceHistory,
+    Transaction,
+    TransactionType,
+    )
+from backend.app.db.session import get_async_engine
+from backend.app.schemas.portfolio import ReturnScope
+from backend.app.services.returns import ReturnManager, money_weighted_returns, time_weighted_returns, xirr
+from backend.app.utils.datetime_utils import utcnow
+from backend.test_scripts.test_utils import (
+    Stopwatch,
+    create_asset,
+    create_broker,
+    price_row,
+    print_info,
+    print_section,
+    print_success,
+    )
+
+
+def test_return_kernels():
+    """TWR chains daily factors around flows; XIRR matches closed forms and reports no solution as NaN."""
+    # Column 0: 100 grows 10% per day, 100 deposited at the start of day 2. Column 1: never invested
+    values = np.array([[100.0, 0.0], [110.0, 0.0], [231.0, 0.0]])
+    flows = np.array([[0.0, 0.0], [100.0, 0.0]])
+    twr = time_weighted_returns(values, flows)
+    assert twr[0] == pytest.approx(0.21)
+    assert np.isnan(twr[1])
+
+    # 100 invested for one year returns 110: 10%; doubling in half a year: 300%; a loss of 20%
+    amounts = np.zeros((366, 3))
+    amounts[0] = -100.0
+    amounts[365, 0], amounts[182, 1], amounts[365, 2] = 110.0, 200.0, 80.0
+    rates = xirr(amounts, np.arange(366) / 365.0)
+    assert rates == pytest.approx([0.1, 2.0 ** (365 / 182) - 1, -0.2])
+
+    # No sign change: no solution
+    assert np.isnan(xirr(np.array([[-100.0], [-10.0]]), np.array([0.0, 1.0]))[0])
+
+    # MWR over a year: 100 at the start, 50 deposited at the start of day 183 (point 182), 170 at the end
+    values = np.zeros((366, 2))
+    values[0, 0], values[-1, 0] = 100.0, 170.0
+    flows = np.zeros((365, 2))
+    flows[182, 0] = 50.0
+    mwr = money_weighted_returns(values, flows)
+    assert -100.0 - 50.0 * (1 + mwr[0]) ** (-182 / 365) + 170.0 * (1 + mwr[0]) ** -1.0 == pytest.approx(0.0, abs=1e-6)
+    assert np.isnan(mwr[1])
+
+@pytest.mark.asyncio
+async def test_broker_and_asset_returns():
+    """Flows per scope, cached results and invalidation by a price write."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        broker_id, account_id = await create_broker(session, "Returns Broker")
+        bought = await create_asset(session, "Returns bought")
+        gifted = await create_asset(session, "Returns gifted")
+        start, end = date(1931, 1, 1), date(1931, 1, 5)
+
+        # Deposit 1000, buy 10 × 50 on day 2, receive 5 units without a price on day 3 (last close 20)
+        session.add(CashMovement(cash_account_id=account_id, type=CashMovementType.DEPOSIT, amount=Decimal(1000), trade_date=start))
+        spend = CashMovement(cash_account_id=account_id, type=CashMovementType.BUY_SPEND, amount=Decimal(500), trade_date=date(1931, 1, 2))
+        session.add(spend)
+        await session.commit()
+        session.add_all([
+            Transaction(
+                asset_id=bought, broker_id=broker_id, type=TransactionType.BUY, quantity=Decimal(10), price=Decimal(50),
+                currency="EUR", cash_movement_id=spend.id, trade_date=date(1931, 1, 2),
+                ),
+            Transaction(
+                asset_id=gifted, broker_id=broker_id, type=TransactionType.ADD_HOLDING, quantity=Decimal(5),
+                currency="EUR", trade_date=date(1931, 1, 3),
+                ),
+            ])
+        await session.execute(insert(PriceHistory), [
+            price_row(bought, date(1930, 12, 31), "50"), price_row(bought, date(1931, 1, 3), "55"), price_row(bought, date(1931, 1, 5), "60"),
+            price_row(gifted, date(1931, 1, 1), "20"),
+            ])
+        await session.commit()
+
+        # Broker values: 1000, 1000, 1150 (500 + 550 + 100), 1150, 1200; flows: +1000 day 1, +100 day 3
+        brokers = await ReturnManager.get_returns(session, ReturnScope.BROKER, start, end, ids=[broker_id])
+        [result] = brokers.results
+        assert (result.start_value, result.end_value, result.net_flows) == (0.0, 1200.0, 1100.0)
+        assert result.twr == pytest.approx(1150 / 1100 * 1200 / 1150 - 1)
+        years = np.array([0.0, 2.0, 5.0]) / 365.0
+        assert np.sum(np.array([-1000.0, -100.0, 1200.0]) * (1 + result.mwr) ** -years) == pytest.approx(0.0, abs=1e-6)
+        assert brokers.cached_count == 0
+
+        # Asset scope: buy (linked BUY_SPEND) and gift are flows, price moves are returns
+        assets = await ReturnManager.get_returns(session, ReturnScope.ASSET, start, end, ids=[gifted, bought, -1])
+        by_id = {r.scope_id: r for r in assets.results}
+        assert by_id[bought].twr == pytest.approx(0.2) and by_id[bought].net_flows == 500.0
+        assert by_id[gifted].twr == pytest.approx(0.0) and by_id[gifted].mwr == pytest.approx(0.0, abs=1e-9)
+        assert by_id[-1].twr is None and by_id[-1].mwr is None
+        assert [r.scope_id for r in assets.results] == sorted([gifted, bought, -1])
+
+        # Same period again: read from the cache
+        again = await ReturnManager.get_returns(session, ReturnScope.ASSET, start, end, ids=[bought, gifted])
+        assert again.cached_count == 2
+        assert {r.scope_id: r.twr for r in again.results} == {bought: by_id[bought].twr, gifted: by_id[gifted].twr}
+        assert (await ReturnManager.get_returns(session, ReturnScope.PORTFOLIO, start, end)).results[0].scope_id == 0
+
+        # A price write in the period drops the cached results that include it
+        await session.execute(
+            update(PriceHistory).where(PriceHistory.asset_id == bought, PriceHistory.date == date(1931, 1, 5)).values(close=Decimal(66))
+            )
+        await session.commit()
+        changed = await ReturnManager.get_returns(session, ReturnScope.ASSET, start, end, ids=[bought])
+        assert changed.cached_count == 0
+        assert changed.results[0].twr == pytest.approx(0.32)
+        earlier = await ReturnManager.get_returns(session, ReturnScope.ASSET, start, date(1931, 1, 4), ids=[bought])
+        assert earlier.results[0].twr == pytest.approx(0.1)
+
+        with pytest.raises(ValueError):
+            await ReturnManager.get_returns(session, ReturnScope.PORTFOLIO, end, start)
+        # Future periods: rejected before any snapshot day or cached return is written
+        tomorrow = utcnow().date() + timedelta(days=1)
+        with pytest.raises(ValueError, match="in the future"):
+            await ReturnManager.get_returns(session, ReturnScope.PORTFOLIO, start, tomorrow)
+        assert (await session.execute(
+            select(func.max(PortfolioDailySnapshot.snapshot_date))
+            )).scalar_one() < tomorrow
+
+
+def test_return_batch_benchmark():
+    """Benchmark: TWR + XIRR of 500 assets over 10 years in one batch vs one asset at a time."""
+    print_section("Benchmark: vectorized returns (500 assets x 10 years)")
+    rng = np.random.default_rng(7)
+    days, assets = 10 * 365, 500
+
+    flows = np.zeros((days, assets))
+    flow_rows = rng.integers(0, days, size=12 * assets)
+    np.add.at(flows, (flow_rows, np.repeat(np.arange(assets), 12)), rng.uniform(-200, 1000, size=12 * assets))
+    growth = np.cumprod(1 + rng.normal(0.0003, 0.01, size=(days, assets)), axis=0)
+    values = np.vstack([np.full((1, assets), 1000.0), 1000.0 * growth + np.cumsum(flows, axis=0)])
+
+    with Stopwatch() as batch:
+        twr, mwr = time_weighted_returns(values, flows), money_weighted_returns(values, flows)
+
+    sample = 50
+    with Stopwatch() as loop:
+        for column in range(sample):
+            time_weighted_returns(values[:, column:column + 1], flows[:, column:column + 1])
+            money_weighted_returns(values[:, column:column + 1], flows[:, column:column + 1])
+    loop_seconds = loop.seconds * assets / sample
+
+    single = money_weighted_returns(values[:, :sample], flows[:, :sample])
+    print_info(f"Batch of {assets} assets x {days} days: {batch.seconds * 1000:.1f}ms")
+    print_info(f"One asset at a time (extrapolated from {sample}): {loop_seconds * 1000:.1f}ms")
+    assert np.allclose(mwr[:sample], single, equal_nan=True)
+    assert np.isfinite(twr).all() and np.isfinite(mwr).sum() > assets * 0.9
+    assert batch.seconds < loop_seconds
+    print_success("✓ Benchmark completed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,161 @@
+"""
+Tests for batch valuation of scheduled-yield assets.
+
+Covers ScheduledInvestmentProvider.bulk_get_history_value (set-based
+queries for any number of assets, per-asset errors) and its use by
+AssetSourceManager.get_prices and bulk_refresh_prices.
+"""
+import time
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import (
+    Asset,
+    AssetType,
+    Broker,
+    CashAccount,
+    CashMovement,
+    CashMovementType,
+    IdentifierType,
+    PriceHistory,
+    Transaction,
+    TransactionType,
+    )
+from backend.app.db.session import get_async_engine
+from backend.app.schemas.common import DateRangeModel
+from backend.app.schemas.provider import FAProviderAssignmentItem
+from backend.app.schemas.refresh import FARefreshItem
+from backend.app.services.asset_source import AssetSourceManager, AssetSourceError
+from backend.app.services.provider_registry import AssetProviderRegistry
+
+SCHEDULE_PARAMS = {
+    "schedule": [
+        {"start_date": "2025-01-01", "end_date": "2025-12-31", "annual_rate": "0.08", "compounding": "SIMPLE", "day_count": "ACT/365"}
+        ],
+    "late_interest": None,
+    }
+
+
+async def _create_loans(session: AsyncSession, count: int) -> list[int]:
+    """Create scheduled-yield assets with one BUY each (1000, 2000, ...)."""
+    timestamp = int(time.time() * 1000)
+    broker = Broker(name=f"Bulk Valuation Broker {timestamp}")
+    session.add(broker)
+    await session.commit()
+    cash_account = CashAccount(broker_id=broker.id, currency="EUR", display_name="EUR")
+    session.add(cash_account)
+    await session.commit()
+
+    asset_ids = []
+    for i in range(count):
+        amount = Decimal(1000 * (i + 1))
+        asset = Asset(display_name=f"Bulk Loan {timestamp}-{i}", currency="EUR", asset_type=AssetType.CROWDFUND_LOAN, active=True)
+        movement = CashMovement(cash_account_id=cash_account.id, type=CashMovementType.BUY_SPEND, amount=amount, trade_date=date(2025, 1, 1))
+        session.add_all([asset, movement])
+        await session.flush()
+        session.add(Transaction(
+            asset_id=asset.id, broker_id=broker.id, type=TransactionType.BUY, quantity=Decimal("1"), price=amount,
+            currency="EUR", cash_movement_id=movement.id, trade_date=date(2025, 1, 1)
+            ))
+        asset_ids.append(asset.id)
+    await session.commit()
+
+    await AssetSourceManager.bulk_assign_providers([
+        FAProviderAssignmentItem(
+            asset_id=asset_id,
+            provider_code="scheduled_investment",
+            identifier=str(asset_id),
+            identifier_type=IdentifierType.UUID,
+            provider_params=SCHEDULE_PARAMS,
+            )
+        for asset_id in asset_ids
+        ], session)
+    return asset_ids
+
+
+@pytest.mark.asyncio
+async def test_bulk_history_uses_two_queries():
+    """Any number of assets is valued with two SELECTs (one once cached); unknown assets get per-asset errors."""
+    assert initialize_test_database(), "Failed to initialize test database"
+    AssetProviderRegistry.auto_discover()
+    provider = AssetProviderRegistry.get_provider_instance("scheduled_investment")
+    assert provider.supports_bulk_history
+
+    engine = get_async_engine()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        asset_ids = await _create_loans(session, 5)
+
+        statements = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _count)
+        try:
+            results = await provider.bulk_get_history_value(asset_ids + [999999], date(2025, 1, 1), date(2025, 1, 31), session)
+            selects = len([s for s in statements if s.lstrip().upper().startswith("SELECT")])
+            # Cached curves: only the version lookup, transactions are not read
+            cached = await provider.bulk_get_history_value(asset_ids, date(2025, 1, 10), date(2025, 1, 20), session)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _count)
+
+        assert selects == 2, statements
+        assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 3, statements
+        assert cached[asset_ids[0]].prices == results[asset_ids[0]].prices[9:20]
+        assert isinstance(results[999999], AssetSourceError)
+        assert results[999999].error_code == "ASSET_NOT_FOUND"
+
+        for i, asset_id in enumerate(asset_ids):
+            history = results[asset_id]
+            assert len(history.prices) == 31
+            principal = Decimal(1000 * (i + 1))
+            assert history.prices[0].close == principal  # 0 days accrued on 2025-01-01
+            assert history.prices[-1].close == principal + principal * Decimal("0.08") * Decimal(30) / Decimal(365)
+
+        # Portfolio-wide: all assets assigned to the provider
+        everything = await provider.bulk_get_history_value(None, date(2025, 1, 31), date(2025, 1, 31), session)
+        assert set(asset_ids) <= set(everything)
+
+        current = await provider.bulk_get_current_value(asset_ids[:2], session)
+        assert all(value.as_of_date == date.today() for value in current.values())
+
+
+@pytest.mark.asyncio
+async def test_get_prices_and_refresh_use_bulk_valuation():
+    """get_prices returns computed values; bulk_refresh_prices stores them via one batch call."""
+    assert initialize_test_database(), "Failed to initialize test database"
+    AssetProviderRegistry.auto_discover()
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset_ids = await _create_loans(session, 3)
+
+        prices = await AssetSourceManager.get_prices(asset_ids[0], date(2025, 2, 1), date(2025, 2, 3), session)
+        assert [p.date for p in prices] == [date(2025, 2, 1), date(2025, 2, 2), date(2025, 2, 3)]
+        assert prices[0].close > Decimal("1000")
+
+        payload = [
+            FARefreshItem(asset_id=asset_id, date_range=DateRangeModel(start=date(2025, 3, 1), end=date(2025, 3, 10)))
+            for asset_id in asset_ids
+            ]
+        response = await AssetSourceManager.bulk_refresh_prices(payload, session)
+        assert response.success_count == 3, [r.errors for r in response.results]
+        assert all(r.inserted_count == 10 for r in response.results)
+
+        stored = (await session.execute(
+            select(PriceHistory).where(PriceHistory.asset_id == asset_ids[2]).order_by(PriceHistory.date)
+            )).scalars().all()
+        assert len(stored) == 10
+        assert stored[0].source_plugin_key == "scheduled_investment"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
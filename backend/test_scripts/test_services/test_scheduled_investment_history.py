@@ -0,0 +1,153 @@
+"""
+Tests for the ScheduledInvestmentProvider history sweep engine.
+
+The sweep (_calculate_values_for_range) must produce exactly the same values
+as the per-day method (face value from transactions + _calculate_value_for_date)
+for every convention, compounding type and the grace/late segments.
+
+Includes a benchmark over 10-year and 30-year daily ranges.
+"""
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from backend.app.schemas.assets import FAScheduledInvestmentSchedule
+from backend.app.services.asset_source_providers.scheduled_investment import ScheduledInvestmentProvider
+from backend.test_scripts.test_utils import print_info, print_section, print_success
+
+DAY_COUNTS = ["ACT/365", "ACT/ACT", "30/360", "ACT/360"]
+FREQUENCIES = ["MONTHLY", "DAILY", "QUARTERLY", "CONTINUOUS"]
+
+TRANSACTIONS = [
+    {"type": "BUY", "quantity": 1, "price": "10000", "trade_date": "2015-03-01"},
+    {"type": "BUY", "quantity": 2, "price": "500.50", "trade_date": "2016-05-10"},
+    {"type": "INTEREST", "quantity": 1, "price": "150", "trade_date": "2017-01-01"},
+    {"type": "INTEREST", "quantity": 1, "price": "-1200", "trade_date": "2018-01-01"},
+    {"type": "SELL", "quantity": 1, "price": "300", "trade_date": "2020-02-29"},
+    ]
+
+
+def _build_schedule(years: int, compounding: str) -> FAScheduledInvestmentSchedule:
+    """Semiannual periods from 2015-01-01 cycling rates, day counts and frequencies."""
+    periods = []
+    start = date(2015, 1, 1)
+    for i in range(years * 2):
+        next_start = date(start.year + 1, 1, 1) if start.month == 7 else date(start.year, 7, 1)
+        period = {
+            "start_date": start.isoformat(),
+            "end_date": (next_start - timedelta(days=1)).isoformat(),
+            "annual_rate": str(Decimal("0.03") + Decimal(i % 5) / 100),
+            "compounding": compounding,
+            "day_count": DAY_COUNTS[i % len(DAY_COUNTS)],
+            }
+        if compounding == "COMPOUND":
+            period["compound_frequency"] = FREQUENCIES[i % len(FREQUENCIES)]
+        periods.append(period)
+        start = next_start
+
+    return ScheduledInvestmentProvider().validate_params({
+        "schedule": periods,
+        "late_interest": {"annual_rate": "0.12", "grace_period_days": 30, "compounding": "SIMPLE", "day_count": "ACT/365"},
+        })
+
+
+def _per_day_values(provider, schedule, transactions, start_date, end_date) -> list[tuple[date, Decimal]]:
+    """Reference: per-day rescan of transactions + _calculate_value_for_date."""
+    values = []
+    current = start_date
+    while current <= end_date:
+        face_value = provider._calculate_face_value_from_transactions(
+            [txn for txn in transactions if txn["trade_date"] <= current.isoformat()]
+            )
+        value = Decimal("0") if face_value <= 0 else provider._calculate_value_for_date(schedule, face_value, current)
+        values.append((current, value))
+        current += timedelta(days=1)
+    return values
+
+
+@pytest.mark.parametrize("compounding", ["SIMPLE", "COMPOUND"])
+def test_sweep_matches_per_day_values(compounding):
+    """Sweep values are identical (value and Decimal representation) to per-day computation."""
+    provider = ScheduledInvestmentProvider()
+    schedule = _build_schedule(3, compounding)
+    # Before first period, through maturity (2017-12-31), grace and late interest
+    start_date, end_date = date(2014, 12, 1), date(2018, 6, 30)
+
+    swept = provider._calculate_values_for_range(schedule, TRANSACTIONS, start_date, end_date)
+    expected = _per_day_values(provider, schedule, TRANSACTIONS, start_date, end_date)
+
+    assert len(swept) == len(expected)
+    for (sweep_date, sweep_value), (ref_date, ref_value) in zip(swept, expected):
+        assert sweep_date == ref_date
+        assert str(sweep_value) == str(ref_value), f"{compounding} mismatch on {ref_date}: {sweep_value} != {ref_value}"
+
+
+def test_sweep_without_late_interest_and_empty_transactions():
+    """After maturity without late_interest the value is flat; no principal means 0."""
+    provider = ScheduledInvestmentProvider()
+    schedule = provider.validate_params({
+        "schedule": [{"start_date": "2025-01-01", "end_date": "2025-06-30", "annual_rate": "0.05", "compounding": "SIMPLE", "day_count": "ACT/365"}],
+        })
+    txns = [{"type": "BUY", "quantity": 1, "price": "1000", "trade_date": "2025-01-01"}]
+
+    values = provider._calculate_values_for_range(schedule, txns, date(2025, 6, 29), date(2025, 7, 3))
+    expected = _per_day_values(provider, schedule, txns, date(2025, 6, 29), date(2025, 7, 3))
+    assert values == expected
+    assert values[-1][1] == values[-2][1] == values[-3][1]
+
+    assert all(value == 0 for _, value in provider._calculate_values_for_range(schedule, [], date(2025, 1, 1), date(2025, 1, 10)))
+
+
+def test_sweep_after_sell_to_zero_and_rebuy():
+    """Periods closing while nothing is held are recomputed when the same face value comes back."""
+    provider = ScheduledInvestmentProvider()
+    schedule = provider.validate_params({
+        "schedule": [
+            {"start_date": start, "end_date": end, "annual_rate": "0.05", "compounding": "SIMPLE", "day_count": "ACT/365"}
+            for start, end in (("2025-01-01", "2025-03-31"), ("2025-04-01", "2025-06-30"), ("2025-07-01", "2025-12-31"))
+            ],
+        })
+    txns = [
+        {"type": "BUY", "quantity": 1, "price": "1000", "trade_date": "2025-01-01"},
+        {"type": "SELL", "quantity": 1, "price": "1000", "trade_date": "2025-03-15"},
+        {"type": "BUY", "quantity": 1, "price": "1000", "trade_date": "2025-08-01"},
+        ]
+    start_date, end_date = date(2025, 1, 1), date(2025, 8, 10)
+
+    swept = provider._calculate_values_for_range(schedule, txns, start_date, end_date)
+    assert swept == _per_day_values(provider, schedule, txns, start_date, end_date)
+    assert dict(swept)[date(2025, 8, 5)] > Decimal("1025")  # Q1 and Q2 interest included
+
+
+@pytest.mark.parametrize("years", [10, 30])
+def test_history_sweep_benchmark(years):
+    """Benchmark: daily history over 10 and 30 years (sweep vs per-day reference on 10 years)."""
+    print_section(f"Benchmark: {years}-year scheduled investment history")
+    provider = ScheduledInvestmentProvider()
+    schedule = _build_schedule(years, "COMPOUND")
+    start_date = date(2015, 1, 1)
+    end_date = date(2015 + years, 1, 1)
+
+    started = time.perf_counter()
+    swept = provider._calculate_values_for_range(schedule, TRANSACTIONS, start_date, end_date)
+    sweep_seconds = time.perf_counter() - started
+    print_info(f"Sweep: {len(swept)} days, {len(schedule.schedule)} periods in {sweep_seconds:.3f}s")
+
+    assert len(swept) == (end_date - start_date).days + 1
+    assert sweep_seconds < 5.0, f"Sweep too slow: {sweep_seconds:.3f}s"
+
+    if years == 10:
+        started = time.perf_counter()
+        expected = _per_day_values(provider, schedule, TRANSACTIONS, start_date, end_date)
+        per_day_seconds = time.perf_counter() - started
+        print_info(f"Per-day reference: {per_day_seconds:.3f}s (speedup {per_day_seconds / max(sweep_seconds, 1e-9):.1f}x)")
+        assert swept == expected
+        assert sweep_seconds < per_day_seconds
+
+    print_success("✓ Benchmark completed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,248 @@
+"""
+Tests for the scheduled-yield value curve cache.
+
+Covers curve slicing/LRU behaviour and the provider integration: repeated
+range queries are cache hits, transaction and provider_params changes bump the
+trigger-maintained curve version and produce a new curve, curves are capped at
+SCHEDULED_VALUE_CURVE_MAX_DAYS.
+"""
+import time
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import (
+    Asset,
+    AssetType,
+    Broker,
+    CashAccount,
+    CashMovement,
+    CashMovementType,
+    IdentifierType,
+    ScheduledValueVersion,
+    Transaction,
+    TransactionType,
+    )
+from backend.app.db.session import get_async_engine
+from backend.app.schemas.provider import FAProviderAssignmentItem
+from backend.app.services.asset_source import AssetSourceManager
+from backend.app.services.asset_source_providers.scheduled_investment import ScheduledInvestmentProvider
+from backend.app.services.provider_registry import AssetProviderRegistry
+from backend.app.services.scheduled_value_cache import (
+    ScheduledValueCache,
+    ValueCurve,
+    scheduled_value_cache,
+    )
+
+
+def _schedule_params(rate: str) -> dict:
+    return {
+        "schedule": [
+            {"start_date": "2025-01-01", "end_date": "2025-12-31", "annual_rate": rate, "compounding": "SIMPLE", "day_count": "ACT/365"}
+            ],
+        "late_interest": None,
+        }
+
+
+async def _create_loan(session: AsyncSession, name: str):
+    """Create a loan asset with a broker/cash account; return (asset, add_buy, assign) helpers."""
+    asset = Asset(display_name=name, currency="EUR", asset_type=AssetType.CROWDFUND_LOAN, active=True)
+    broker = Broker(name=f"{name} Broker")
+    session.add_all([asset, broker])
+    await session.commit()
+    cash_account = CashAccount(broker_id=broker.id, currency="EUR", display_name="EUR")
+    session.add(cash_account)
+    await session.commit()
+
+    async def add_buy(amount: str, trade_date: date) -> Transaction:
+        movement = CashMovement(cash_account_id=cash_account.id, type=CashMovementType.BUY_SPEND, amount=Decimal(amount), trade_date=trade_date)
+        session.add(movement)
+        await session.flush()
+        txn = Transaction(
+            asset_id=asset.id, broker_id=broker.id, type=TransactionType.BUY, quantity=Decimal("1"), price=Decimal(amount),
+            currency="EUR", cash_movement_id=movement.id, trade_date=trade_date
+            )
+        session.add(txn)
+        await session.commit()
+        return txn
+
+    async def assign(rate: str):
+        await AssetSourceManager.bulk_assign_providers([
+            FAProviderAssignmentItem(
+                asset_id=asset.id,
+                provider_code="scheduled_investment",
+                identifier=str(asset.id),
+                identifier_type=IdentifierType.UUID,
+                provider_params=_schedule_params(rate),
+                )
+            ], session)
+
+    return asset, add_buy, assign
+
+
+async def _version(session: AsyncSession, asset_id: int) -> int:
+    return (await session.execute(
+        select(ScheduledValueVersion.version).where(ScheduledValueVersion.asset_id == asset_id)
+        )).scalar_one_or_none() or 0
+
+
+def test_curve_slice_and_lru():
+    """Curves serve covered ranges as slices; LRU drops the least recently used asset."""
+    cache = ScheduledValueCache(max_entries=2)
+    values = [Decimal(i) for i in range(10)]
+    cache.put(1, ValueCurve(version=7, schedule=None, start_date=date(2025, 1, 1), values=values))
+
+    curve = cache.get(1, 7, date(2025, 1, 3), date(2025, 1, 5))
+    assert curve is not None
+    assert curve.end_date == date(2025, 1, 10)
+    assert curve.slice(date(2025, 1, 3), date(2025, 1, 5)) == [
+        (date(2025, 1, 3), Decimal(2)), (date(2025, 1, 4), Decimal(3)), (date(2025, 1, 5), Decimal(4))
+        ]
+
+    # Outside the cached range: miss, curve kept for extension
+    assert cache.get(1, 7, date(2025, 1, 5), date(2025, 1, 20)) is None
+    assert cache.peek(1, 7) is not None
+    # Different version: miss, stale curve dropped
+    assert cache.get(1, 8, date(2025, 1, 3), date(2025, 1, 5)) is None
+    assert cache.peek(1, 7) is None
+
+    for asset_id in (2, 3, 4):
+        cache.put(asset_id, ValueCurve(version=1, schedule=None, start_date=date(2025, 1, 1), values=values))
+    assert len(cache) == 2
+    assert cache.peek(2, 1) is None
+
+    cache.invalidate([3])
+    assert len(cache) == 1
+    assert 4 in cache and 3 not in cache
+
+
+@pytest.mark.asyncio
+async def test_provider_serves_ranges_from_cache():
+    """History queries reuse the cached curve until transactions or provider_params change."""
+    assert initialize_test_database(), "Failed to initialize test database"
+    AssetProviderRegistry.auto_discover()
+    provider = ScheduledInvestmentProvider()
+    timestamp = int(time.time() * 1000)
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset, add_buy, assign = await _create_loan(session, f"Cached Loan {timestamp}")
+        await add_buy("10000", date(2025, 1, 1))
+        await assign("0.05")
+
+    identifier = str(asset.id)
+    hits, misses = scheduled_value_cache.hits, scheduled_value_cache.misses
+
+    full = await provider.get_history_value(identifier, IdentifierType.UUID, {}, date(2025, 1, 1), date(2025, 3, 31))
+    assert scheduled_value_cache.misses == misses + 1
+
+    # Sub-range is a slice of the cached curve
+    feb = await provider.get_history_value(identifier, IdentifierType.UUID, {}, date(2025, 2, 1), date(2025, 2, 28))
+    assert scheduled_value_cache.hits == hits + 1
+    assert [p.close for p in feb.prices] == [p.close for p in full.prices if p.date.month == 2]
+
+    # Range extension: recomputed once over the union, then both ranges are hits
+    await provider.get_history_value(identifier, IdentifierType.UUID, {}, date(2025, 3, 1), date(2025, 4, 30))
+    hits = scheduled_value_cache.hits
+    await provider.get_history_value(identifier, IdentifierType.UUID, {}, date(2025, 1, 15), date(2025, 4, 15))
+    assert scheduled_value_cache.hits == hits + 1
+
+    # New transaction: new version, values after trade date include the extra principal
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        await add_buy("5000", date(2025, 2, 1))
+    after_buy = await provider.get_history_value(identifier, IdentifierType.UUID, {}, date(2025, 1, 1), date(2025, 3, 31))
+    assert after_buy.prices[0].close == full.prices[0].close
+    assert after_buy.prices[-1].close > full.prices[-1].close + Decimal("5000")
+
+    # New provider_params: curve evicted eagerly and recomputed with the new rate
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        await assign("0.10")
+    assert asset.id not in scheduled_value_cache
+    after_rate = await provider.get_history_value(identifier, IdentifierType.UUID, {}, date(2025, 1, 1), date(2025, 3, 31))
+    assert after_rate.prices[-1].close > after_buy.prices[-1].close
+
+    # Current value served from the same machinery (single-day slice)
+    current = await provider.get_current_value(identifier, IdentifierType.UUID, {})
+    assert current.currency == "EUR"
+    assert current.as_of_date == date.today()
+    assert current.value > 0
+
+
+@pytest.mark.asyncio
+async def test_curve_version_bumped_by_triggers():
+    """Transaction and assignment writes of scheduled_investment assets bump the version; other assets are untouched."""
+    assert initialize_test_database(), "Failed to initialize test database"
+    timestamp = int(time.time() * 1000)
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        loan, add_loan_buy, assign = await _create_loan(session, f"Versioned Loan {timestamp}")
+        other, add_other_buy, _ = await _create_loan(session, f"Unversioned Asset {timestamp}")
+
+        await add_loan_buy("1000", date(2025, 1, 1))  # Not assigned yet: no bump
+        assert await _version(session, loan.id) == 0
+
+        await assign("0.05")
+        version = await _version(session, loan.id)
+        assert version > 0
+
+        txn = await add_loan_buy("2000", date(2025, 2, 1))
+        assert await _version(session, loan.id) == version + 1
+
+        await session.execute(update(Transaction).where(Transaction.id == txn.id).values(price=Decimal("2500")))
+        await session.commit()
+        assert await _version(session, loan.id) == version + 2
+
+        await session.execute(update(Transaction).where(Transaction.id == txn.id).values(note="note"))
+        await session.commit()
+        assert await _version(session, loan.id) == version + 2
+
+        await session.delete(txn)
+        await session.commit()
+        assert await _version(session, loan.id) == version + 3
+
+        await assign("0.07")
+        assert await _version(session, loan.id) > version + 3
+
+        await add_other_buy("1000", date(2025, 1, 1))
+        assert await _version(session, other.id) == 0
+
+
+@pytest.mark.asyncio
+async def test_curve_span_is_capped(monkeypatch):
+    """Range extensions stop at SCHEDULED_VALUE_CURVE_MAX_DAYS; longer ranges are computed but not cached."""
+    assert initialize_test_database(), "Failed to initialize test database"
+    AssetProviderRegistry.auto_discover()
+    monkeypatch.setenv("SCHEDULED_VALUE_CURVE_MAX_DAYS", "60")
+    provider = ScheduledInvestmentProvider()
+    timestamp = int(time.time() * 1000)
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset, add_buy, assign = await _create_loan(session, f"Capped Loan {timestamp}")
+        await add_buy("10000", date(2025, 1, 1))
+        await assign("0.05")
+
+        await provider.bulk_get_history_value([asset.id], date(2025, 1, 1), date(2025, 1, 31), session)
+        curve = scheduled_value_cache.peek(asset.id, await _version(session, asset.id))
+        assert (curve.start_date, curve.end_date) == (date(2025, 1, 1), date(2025, 1, 31))
+
+        # Union would span 90 days: the curve restarts from the requested range
+        await provider.bulk_get_history_value([asset.id], date(2025, 3, 1), date(2025, 3, 31), session)
+        curve = scheduled_value_cache.peek(asset.id, await _version(session, asset.id))
+        assert (curve.start_date, curve.end_date) == (date(2025, 3, 1), date(2025, 3, 31))
+
+        # Requested range over the cap: values returned, cached curve unchanged
+        result = await provider.bulk_get_history_value([asset.id], date(2025, 1, 1), date(2025, 6, 30), session)
+        assert len(result[asset.id].prices) == 181
+        curve = scheduled_value_cache.peek(asset.id, await _version(session, asset.id))
+        assert (curve.start_date, curve.end_date) == (date(2025, 3, 1), date(2025, 3, 31))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
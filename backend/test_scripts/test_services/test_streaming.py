@@ -0,0 +1,130 @@
+"""
+Tests for streamed series (utils/streaming.py and fx.iter_converted_series).
+
+Covers the day-by-day backward-fill over a row stream, the NDJSON / CSV chunk
+writers, agreement of the streamed FX conversion series with convert_bulk
+(both directions, days before the first rate), and flat memory: streaming a
+30-year price range peaks at about the same memory as a 5-year range.
+"""
+import csv
+import json
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from backend.test_scripts.test_db_config import setup_test_database, initialize_test_database
+
+setup_test_database()
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import Asset, AssetType, PriceHistory
+from backend.app.db.session import get_async_engine
+from backend.app.services.asset_source import AssetSourceManager
+from backend.app.services.fx import convert_bulk, iter_converted_series, upsert_rates_bulk
+from backend.app.utils.datetime_utils import utcnow
+from backend.app.utils.streaming import iter_backward_filled, iter_csv, iter_ndjson
+from backend.test_scripts.test_utils import print_info, print_section, print_success
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _collect(items) -> list:
+    return [item async for item in items]
+
+
+@pytest.mark.asyncio
+async def test_backward_fill_and_writers():
+    """Backward-fill over a row stream and chunked NDJSON / CSV output."""
+    rows = [SimpleNamespace(date=date(1940, 1, 3)), SimpleNamespace(date=date(1940, 1, 5))]
+    start, end = date(1940, 1, 1), date(1940, 1, 6)
+
+    filled = await _collect(iter_backward_filled(_aiter(rows), start, end))
+    assert [(day.day, row.date.day) for day, row in filled] == [(3, 3), (4, 3), (5, 5), (6, 5)]
+    previous = SimpleNamespace(date=date(1939, 12, 31))
+    filled = await _collect(iter_backward_filled(_aiter(rows), start, end, previous))
+    assert [row.date.day for _, row in filled] == [31, 31, 3, 3, 5, 5]
+    assert await _collect(iter_backward_filled(_aiter([]), start, end)) == []
+    assert len(await _collect(iter_backward_filled(_aiter([]), start, end, previous))) == 6
+
+    items = [{"n": i, "value": str(Decimal(i) / 4)} for i in range(5)]
+    chunks = await _collect(iter_ndjson(_aiter(items), chunk_size=2))
+    assert len(chunks) == 3 and [json.loads(line) for line in b"".join(chunks).splitlines()] == items
+    chunks = await _collect(iter_csv(_aiter([(i, None, Decimal("1.5")) for i in range(5)]), ("n", "empty", "value"), chunk_size=2))
+    rows = list(csv.reader("".join(chunks).splitlines()))
+    assert rows[0] == ["n", "empty", "value"] and rows[1:] == [[str(i), "", "1.5"] for i in range(5)]
+    assert "".join(await _collect(iter_csv(_aiter([]), ("n",)))) == "n\n"
+
+
+@pytest.mark.asyncio
+async def test_converted_series_matches_convert_bulk():
+    """Streamed conversion series equals convert_bulk day by day, in both directions."""
+    assert initialize_test_database(), "Failed to initialize test database"
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        await upsert_rates_bulk(session, [
+            (date(1940, 2, 3), "HUF", "ISK", Decimal("0.37"), "MANUAL"),
+            (date(1940, 2, 6), "HUF", "ISK", Decimal("0.41"), "MANUAL"),
+            ])
+        start, end = date(1940, 2, 1), date(1940, 2, 9)
+        days = [start + timedelta(days=i) for i in range(9)]
+
+        for from_cur, to_cur in (("HUF", "ISK"), ("ISK", "HUF")):
+            series = await _collect(iter_converted_series(session, Decimal("250"), from_cur, to_cur, start, end))
+            assert [day for day, _, _ in series] == days
+            # Days before the first rate of the pair
+            assert series[:2] == [(days[0], None, None), (days[1], None, None)]
+            results, errors = await convert_bulk(session, [(Decimal("250"), from_cur, to_cur, day) for day in days[2:]], raise_on_error=False)
+            assert not errors
+            assert [(amount, rate_date) for _, amount, rate_date in series[2:]] == [(amount, rate_date) for amount, rate_date, _ in results]
+
+        identity = await _collect(iter_converted_series(session, Decimal("7"), "ISK", "ISK", start, start + timedelta(days=1)))
+        assert identity == [(start, Decimal("7"), start), (start + timedelta(days=1), Decimal("7"), start + timedelta(days=1))]
+
+
+@pytest.mark.asyncio
+async def test_streamed_memory_is_flat():
+    """Benchmark: peak memory of a streamed 30-year price series vs a 5-year one."""
+    print_section("Benchmark: streamed price series memory (5 vs 30 years)")
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        asset = Asset(display_name=f"Streaming {time.time_ns()}", currency="EUR", asset_type=AssetType.STOCK)
+        session.add(asset)
+        await session.commit()
+        start, days = date(1900, 1, 1), 10957
+        now = utcnow()
+        await session.execute(insert(PriceHistory), [
+            {"asset_id": asset.id, "date": start + timedelta(days=d), "close": Decimal(100 + d % 37), "currency": "EUR",
+             "source_plugin_key": "manual", "fetched_at": now}
+            for d in range(days) if d % 7 not in (5, 6)
+            ])
+        await session.commit()
+
+        # Warm-up (statement compilation and caches are not part of the measure)
+        async for _ in await AssetSourceManager.iter_prices(asset.id, start, start + timedelta(days=30), session):
+            pass
+        peaks = {}
+        for years, span in ((5, 1826), (30, days)):
+            tracemalloc.start()
+            count = 0
+            async for point in await AssetSourceManager.iter_prices(asset.id, start, start + timedelta(days=span - 1), session):
+                point.to_json()
+                count += 1
+            _, peaks[years] = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert count == span
+            print_info(f"{years} year(s), {count} points: peak {peaks[years] / 2 ** 20:.2f} MiB")
+        # Linear growth would be 6x
+        assert peaks[30] < 2 * peaks[5]
+    print_success("✓ Benchmark completed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
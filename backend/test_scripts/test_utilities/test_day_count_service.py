@@ -0,0 +1,112 @@
+"""
+Test suite for the day count service.
+
+Checks that the closed-form evaluation (precomputed year tables) returns the
+same Decimal values as the year-by-year ACT/ACT walk and the 30/360 rules,
+and that repeated period boundaries are served from the LRU cache.
+"""
+import calendar
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from backend.app.schemas.assets import DayCountConvention
+from backend.app.utils.day_count import (
+    YEAR_TABLE_END,
+    YEAR_TABLE_START,
+    act_act_fraction,
+    day_count_fraction,
+    days_in_year,
+    )
+from backend.test_scripts.test_utils import print_info, print_section, print_success
+
+
+def _act_act_year_walk(start_date: date, end_date: date) -> Decimal:
+    """Reference: ACT/ACT summed year by year (original algorithm)."""
+    if start_date.year == end_date.year:
+        days_in = 366 if calendar.isleap(start_date.year) else 365
+        return Decimal((end_date - start_date).days) / Decimal(days_in)
+
+    total = Decimal("0")
+    last_year = end_date.year - 1 if (end_date.month == 1 and end_date.day == 1) else end_date.year
+    for year in range(start_date.year, last_year + 1):
+        period_start = start_date if year == start_date.year else date(year, 1, 1)
+        period_end = end_date if year == last_year else date(year, 12, 31)
+        days_in = 366 if calendar.isleap(year) else 365
+        total += Decimal((period_end - period_start).days) / Decimal(days_in)
+    return total
+
+
+def _random_pairs(count: int, seed: int = 11) -> tuple[list[date], list[date]]:
+    rng = random.Random(seed)
+    starts, ends = [], []
+    for _ in range(count):
+        start = date(1980, 1, 1) + timedelta(days=rng.randint(0, 20000))
+        end = start + timedelta(days=rng.randint(-30, 5000))
+        if rng.random() < 0.1:
+            end = date(end.year, 1, 1)  # Jan 1 edge case
+        starts.append(start)
+        ends.append(end)
+    return starts, ends
+
+
+class TestYearTables:
+    def test_days_in_year(self):
+        assert days_in_year(2024) == 366
+        assert days_in_year(2025) == 365
+        assert days_in_year(2000) == 366
+        assert days_in_year(2100) == 365
+        # Outside the precomputed range: calendar fallback
+        assert days_in_year(YEAR_TABLE_START - 4) == (366 if calendar.isleap(YEAR_TABLE_START - 4) else 365)
+        assert days_in_year(YEAR_TABLE_END + 4) == (366 if calendar.isleap(YEAR_TABLE_END + 4) else 365)
+
+
+class TestClosedForm:
+    def test_act_act_matches_year_walk(self):
+        starts, ends = _random_pairs(5000)
+        for start, end in zip(starts, ends):
+            assert act_act_fraction(start, end) == _act_act_year_walk(start, end), f"{start} -> {end}"
+
+    def test_act_act_outside_year_tables(self):
+        start, end = date(1850, 3, 1), date(1905, 1, 1)
+        assert act_act_fraction(start, end) == _act_act_year_walk(start, end)
+
+    def test_known_values(self):
+        assert day_count_fraction(date(2023, 1, 1), date(2026, 1, 1), DayCountConvention.ACT_ACT) == (
+            Decimal("364") / Decimal("365") + Decimal("365") / Decimal("366") + Decimal("365") / Decimal("365")
+        )
+        assert day_count_fraction(date(2025, 1, 31), date(2025, 3, 31), DayCountConvention.THIRTY_360) == Decimal("60") / Decimal("360")
+        assert day_count_fraction(date(2025, 1, 1), date(2025, 1, 31), DayCountConvention.ACT_360) == Decimal("30") / Decimal("360")
+
+    def test_unsupported_convention(self):
+        with pytest.raises(ValueError):
+            day_count_fraction(date(2025, 1, 1), date(2025, 2, 1), "ACT/999")
+
+
+class TestCache:
+    def test_repeated_boundaries_hit_cache(self):
+        """Daily valuation pattern: many days share the same period boundaries."""
+        print_section("Benchmark: day count fractions, repeated period boundaries")
+        period_start = date(2031, 7, 1)
+        days = [period_start + timedelta(days=i) for i in range(3650)]
+
+        before = day_count_fraction.cache_info()
+        started = time.perf_counter()
+        first = [day_count_fraction(period_start, day, DayCountConvention.ACT_ACT) for day in days]
+        cold_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        second = [day_count_fraction(period_start, day, DayCountConvention.ACT_ACT) for day in days]
+        warm_seconds = time.perf_counter() - started
+        after = day_count_fraction.cache_info()
+
+        print_info(f"Cold: {cold_seconds:.4f}s, cached: {warm_seconds:.4f}s for {len(days)} fractions")
+        assert first == second
+        assert after.hits - before.hits >= len(days)
+        print_success("✓ Benchmark completed")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
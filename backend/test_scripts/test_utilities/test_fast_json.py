@@ -0,0 +1,42 @@
+"""
+Test fast JSON encoding (backend/app/utils/fast_json.py).
+
+Both encoders (orjson and the standard json fallback) must produce the same
+JSON as the pydantic serialization of the response models.
+"""
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from backend.app.db.models import AssetType
+from backend.app.schemas.common import BackwardFillInfo
+from backend.app.schemas.prices import FAPricePoint
+from backend.app.utils.fast_json import ORJSON_AVAILABLE, FastJSONResponse, _json_dumps, _orjson_dumps, dumps
+
+ENCODERS = [_json_dumps] + ([_orjson_dumps] if ORJSON_AVAILABLE else [])
+
+
+@pytest.mark.parametrize("encoder", ENCODERS, ids=lambda f: f.__name__)
+def test_encoders_match_pydantic_json(encoder):
+    """Decimals, dates, UTC datetimes, enums and nested models encode like pydantic."""
+    point = FAPricePoint(
+        date=date(2024, 1, 5), close=Decimal("1E+2"), open=Decimal("0.00000100"), volume=Decimal("12345"), currency="EUR",
+        backward_fill_info=BackwardFillInfo(actual_rate_date=date(2024, 1, 3), days_back=2),
+        )
+    assert json.loads(encoder(point)) == json.loads(point.model_dump_json())
+    assert encoder(point.model_dump()) == point.model_dump_json().encode()
+
+    fetched = datetime(2024, 1, 5, 10, 30, 0, 250000, tzinfo=timezone.utc)
+    value = {"fetched_at": fetched, "type": AssetType.ETF, "amounts": [Decimal("1.50"), None], "name": "Crédit"}
+    assert json.loads(encoder(value)) == {"fetched_at": "2024-01-05T10:30:00.250000Z", "type": "ETF", "amounts": ["1.50", None], "name": "Crédit"}
+    with pytest.raises(TypeError):
+        encoder({"value": object()})
+
+
+def test_fast_json_response():
+    """FastJSONResponse renders compact JSON with dumps."""
+    response = FastJSONResponse({"results": [{"amount": Decimal("2.5")}], "success_count": 1, "errors": []}, status_code=200)
+    assert response.body == dumps({"results": [{"amount": "2.5"}], "success_count": 1, "errors": []})
+    assert response.media_type == "application/json"
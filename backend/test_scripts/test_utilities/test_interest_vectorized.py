@@ -0,0 +1,178 @@
+"""
+Test suite for the vectorized accrual kernel.
+
+calculate_interest_vectorized must agree with the scalar functions
+(calculate_simple_interest / calculate_compound_interest):
+- float mode: within float64 tolerance, for every compounding type
+- exact mode: identical Decimal values (verification reference)
+
+Includes a run over thousands of periods and the scheduled investment engine
+(ScheduledInvestmentProvider._segments_interest, history / forward projection).
+"""
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from backend.app.schemas.assets import (
+    CompoundFrequency,
+    CompoundingType,
+    DayCountConvention,
+    FAInterestRatePeriod,
+    )
+from backend.app.utils.financial_math import (
+    CONTINUOUS_COMPOUNDING_CODE,
+    SIMPLE_INTEREST_CODE,
+    calculate_compound_interest,
+    calculate_day_count_fraction,
+    calculate_interest_vectorized,
+    calculate_simple_interest,
+    get_compounding_code,
+    )
+from backend.app.services.asset_source_providers.scheduled_investment import ScheduledInvestmentProvider
+from backend.test_scripts.test_utils import print_info, print_section, print_success
+
+FREQUENCIES = [
+    CompoundFrequency.DAILY,
+    CompoundFrequency.MONTHLY,
+    CompoundFrequency.QUARTERLY,
+    CompoundFrequency.SEMIANNUAL,
+    CompoundFrequency.ANNUAL,
+    CompoundFrequency.CONTINUOUS,
+    ]
+
+
+def _scalar_interest(principal: Decimal, rate: Decimal, fraction: Decimal, code: int) -> Decimal:
+    """Reference: scalar function selected by compounding code."""
+    if code == SIMPLE_INTEREST_CODE:
+        return calculate_simple_interest(principal, rate, fraction)
+    frequency = next(f for f in FREQUENCIES if get_compounding_code(CompoundingType.COMPOUND, f) == code)
+    return calculate_compound_interest(principal, rate, fraction, frequency)
+
+
+def _random_inputs(count: int, seed: int = 42):
+    """Principals, rates, fractions (as Decimal) and compounding codes."""
+    rng = np.random.default_rng(seed)
+    codes = [SIMPLE_INTEREST_CODE] + [get_compounding_code(CompoundingType.COMPOUND, f) for f in FREQUENCIES]
+    principals = [Decimal(str(round(float(x), 2))) for x in rng.uniform(100, 1_000_000, count)]
+    rates = [Decimal(str(round(float(x), 4))) for x in rng.uniform(0.0, 0.25, count)]
+    fractions = [Decimal(int(x)) / Decimal(365) for x in rng.integers(0, 3650, count)]
+    return principals, rates, fractions, [codes[i % len(codes)] for i in range(count)]
+
+
+class TestCompoundingCode:
+    """Test encoding of compounding type + frequency."""
+
+    def test_codes(self):
+        assert get_compounding_code(CompoundingType.SIMPLE) == SIMPLE_INTEREST_CODE
+        assert get_compounding_code(CompoundingType.COMPOUND, CompoundFrequency.CONTINUOUS) == CONTINUOUS_COMPOUNDING_CODE
+        assert get_compounding_code(CompoundingType.COMPOUND, CompoundFrequency.MONTHLY) == 12
+        assert get_compounding_code(CompoundingType.COMPOUND, CompoundFrequency.DAILY) == 365
+
+    def test_compound_requires_frequency(self):
+        with pytest.raises(ValueError):
+            get_compounding_code(CompoundingType.COMPOUND)
+
+
+class TestVectorizedKernel:
+    """Test float and exact modes against the scalar functions."""
+
+    def test_known_values(self):
+        """€10,000 at 5% for 1 year: simple €500, monthly ≈ €511.62, continuous ≈ €512.71."""
+        result = calculate_interest_vectorized(
+            10000, 0.05, 1, [SIMPLE_INTEREST_CODE, 12, CONTINUOUS_COMPOUNDING_CODE]
+            )
+        assert result.shape == (3,)
+        assert result[0] == pytest.approx(500.0)
+        assert result[1] == pytest.approx(511.6189788173)
+        assert result[2] == pytest.approx(512.7109637602)
+
+    def test_zero_rate_and_zero_time(self):
+        result = calculate_interest_vectorized([1000, 1000, 1000], [0, 0.05, 0.05], [1, 0, 0], [12, 12, CONTINUOUS_COMPOUNDING_CODE])
+        assert np.all(result == 0)
+
+    @pytest.mark.parametrize("frequency", FREQUENCIES)
+    def test_float_mode_matches_scalar(self, frequency):
+        principals, rates, fractions, _ = _random_inputs(200)
+        code = get_compounding_code(CompoundingType.COMPOUND, frequency)
+        result = calculate_interest_vectorized(
+            [float(p) for p in principals], [float(r) for r in rates], [float(t) for t in fractions], code
+            )
+        expected = [float(calculate_compound_interest(p, r, t, frequency)) for p, r, t in zip(principals, rates, fractions)]
+        np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-6)
+
+    def test_exact_mode_identical_to_scalar(self):
+        principals, rates, fractions, codes = _random_inputs(500)
+        result = calculate_interest_vectorized(principals, rates, fractions, codes, exact=True)
+        expected = [_scalar_interest(p, r, t, c) for p, r, t, c in zip(principals, rates, fractions, codes)]
+        assert all(isinstance(value, Decimal) for value in result)
+        assert [str(v) for v in result] == [str(v) for v in expected]
+
+    def test_thousands_of_periods(self):
+        """Float kernel over 100k periods agrees with exact mode and is faster."""
+        print_section("Benchmark: vectorized accrual over 100k periods")
+        principals, rates, fractions, codes = _random_inputs(100_000, seed=7)
+        p = [float(x) for x in principals]
+        r = [float(x) for x in rates]
+        t = [float(x) for x in fractions]
+
+        started = time.perf_counter()
+        fast = calculate_interest_vectorized(p, r, t, codes)
+        fast_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        exact = calculate_interest_vectorized(principals, rates, fractions, codes, exact=True)
+        exact_seconds = time.perf_counter() - started
+        print_info(f"Float kernel: {fast_seconds:.4f}s, exact mode: {exact_seconds:.3f}s")
+
+        np.testing.assert_allclose(fast, [float(v) for v in exact], rtol=1e-9, atol=1e-6)
+        assert fast_seconds < exact_seconds
+        print_success("✓ Benchmark completed")
+
+
+class TestPeriodsInterest:
+    """Test interest over FAInterestRatePeriod schedules."""
+
+    def _periods(self, count: int, start: date) -> list[FAInterestRatePeriod]:
+        periods = []
+        for i in range(count):
+            end = start + timedelta(days=89)
+            compound = i % 2 == 1
+            periods.append(FAInterestRatePeriod(
+                start_date=start,
+                end_date=end,
+                annual_rate=Decimal("0.04") + Decimal(i % 3) / 100,
+                compounding=CompoundingType.COMPOUND if compound else CompoundingType.SIMPLE,
+                compound_frequency=CompoundFrequency.MONTHLY if compound else None,
+                day_count=[DayCountConvention.ACT_365, DayCountConvention.ACT_ACT, DayCountConvention.THIRTY_360][i % 3],
+                ))
+            start = end + timedelta(days=1)
+        return periods
+
+    def test_history_and_projection(self):
+        """Past and future schedules: the engine's segment sum matches the per-period scalar sum and the float kernel."""
+        principal = Decimal("25000")
+        for start in (date(2020, 1, 1), date.today() + timedelta(days=1)):
+            periods = self._periods(40, start)
+            segments = [(p.start_date, p.end_date, p.annual_rate, p.compounding, p.compound_frequency, p.day_count) for p in periods]
+            # Zero-length segment: no positive day count fraction, skipped like in _period_interest
+            segments.append((start, start, Decimal("0.05"), CompoundingType.SIMPLE, None, DayCountConvention.ACT_365))
+
+            expected = Decimal("0")
+            for segment in segments:
+                interest = ScheduledInvestmentProvider._period_interest(principal, *segment)
+                if interest is not None:
+                    expected += interest
+            total = ScheduledInvestmentProvider._segments_interest(principal, segments)
+            assert total == expected
+            assert str(total) == str(expected)
+
+            fractions = [calculate_day_count_fraction(p.start_date, p.end_date, p.day_count) for p in periods]
+            codes = [get_compounding_code(p.compounding, p.compound_frequency) for p in periods]
+            fast = calculate_interest_vectorized(float(principal), [float(p.annual_rate) for p in periods], [float(f) for f in fractions], codes)
+            np.testing.assert_allclose(float(fast.sum()), float(total), rtol=1e-9)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
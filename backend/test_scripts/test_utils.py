@@ -5,6 +5,24 @@ Common utilities for all test scripts to avoid code duplication.
 Provides standardized output formatting, test helpers, and common functions.
 """
 import sys
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Any, Awaitable, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db.models import (
+    Asset,
+    AssetType,
+    Broker,
+    CashAccount,
+    CashMovement,
+    CashMovementType,
+    Transaction,
+    TransactionType,
+    )
+from backend.app.utils.datetime_utils import utcnow
 
 
 # ============================================================================
@@ -143,6 +161,107 @@ def print_test_header(title: str, description: str = None, prerequisites: list[s
         print()
 
 
+# ============================================================================
+# DATABASE FACTORIES
+# ============================================================================
+# Tests share one database: names carry a timestamp so fixtures never collide
+
+async def create_asset(session: AsyncSession, label: str, currency: str = "EUR") -> int:
+    """Create an active STOCK asset named "{label} {timestamp}"; return its id."""
+    asset = Asset(display_name=f"{label} {time.time_ns()}", currency=currency, asset_type=AssetType.STOCK, active=True)
+    session.add(asset)
+    await session.commit()
+    return asset.id
+
+
+async def create_broker(session: AsyncSession, label: str, currencies: Sequence[str] = ("EUR",)) -> tuple[int, ...]:
+    """Create a broker with one cash account per currency; return (broker_id, *cash_account_ids)."""
+    broker = Broker(name=f"{label} {time.time_ns()}")
+    session.add(broker)
+    await session.commit()
+    accounts = [CashAccount(broker_id=broker.id, currency=currency, display_name=currency) for currency in currencies]
+    session.add_all(accounts)
+    await session.commit()
+    return (broker.id, *(account.id for account in accounts))
+
+
+async def create_pair(session: AsyncSession, label: str) -> tuple[int, int, int]:
+    """Create asset, broker and EUR cash account; return (asset_id, broker_id, cash_account_id)."""
+    asset_id = await create_asset(session, label)
+    broker_id, cash_account_id = await create_broker(session, f"{label} Broker")
+    return asset_id, broker_id, cash_account_id
+
+
+async def add_trade(
+    session: AsyncSession,
+    asset_id: int,
+    broker_id: int,
+    cash_account_id: Optional[int],
+    txn_type: TransactionType,
+    quantity: str,
+    price: Optional[str],
+    trade_date: date,
+    ) -> Transaction:
+    """Add BUY/SELL with its cash movement (CHECK constraint), or a holding change without."""
+    movement_id = None
+    if txn_type in (TransactionType.BUY, TransactionType.SELL):
+        movement = CashMovement(
+            cash_account_id=cash_account_id,
+            type=CashMovementType.BUY_SPEND if txn_type == TransactionType.BUY else CashMovementType.SALE_PROCEEDS,
+            amount=Decimal(quantity) * Decimal(price), trade_date=trade_date,
+            )
+        session.add(movement)
+        await session.flush()
+        movement_id = movement.id
+    txn = Transaction(
+        asset_id=asset_id, broker_id=broker_id, type=txn_type, quantity=Decimal(quantity),
+        price=None if price is None else Decimal(price), currency="EUR", cash_movement_id=movement_id, trade_date=trade_date,
+        )
+    session.add(txn)
+    await session.commit()
+    return txn
+
+
+def transaction_row(asset_id: int, broker_id: int, txn_type: TransactionType, quantity: str, trade_date: date, price: str = "1") -> dict:
+    """Row for insert(Transaction) without cash movement (holding changes, bulk fixtures)."""
+    now = utcnow()
+    return {
+        "asset_id": asset_id, "broker_id": broker_id, "type": txn_type, "quantity": Decimal(quantity),
+        "price": Decimal(price), "currency": "EUR", "trade_date": trade_date, "created_at": now, "updated_at": now,
+        }
+
+
+def price_row(asset_id: int, day: date, close: Optional[str], currency: str = "EUR", volume: Optional[str] = None) -> dict:
+    """Row for insert(PriceHistory) (close None = row without a close)."""
+    return {
+        "asset_id": asset_id, "date": day, "close": None if close is None else Decimal(close), "currency": currency,
+        "volume": None if volume is None else Decimal(volume), "source_plugin_key": "test", "fetched_at": utcnow(),
+        }
+
+
+# ============================================================================
+# BENCHMARK HELPERS
+# ============================================================================
+
+async def timed(awaitable: Awaitable) -> tuple[Any, float]:
+    """Await and return (result, elapsed seconds)."""
+    started = time.perf_counter()
+    result = await awaitable
+    return result, time.perf_counter() - started
+
+
+class Stopwatch:
+    """Elapsed seconds of a block: with Stopwatch() as watch: ...; watch.seconds."""
+
+    def __enter__(self) -> "Stopwatch":
+        self.seconds = 0.0
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.seconds = time.perf_counter() - self._started
+
+
 # ============================================================================
 # EXIT HELPERS
 # ============================================================================
@@ -142,6 +142,54 @@ function print_help() {
     echo "                         ./dev.sh db:upgrade"
     echo "                         ./dev.sh db:upgrade $test_db"
     echo ""
+    echo "  db:positions <rebuild|check> [path]  Materialized positions maintenance"
+    echo "                       rebuild: recompute positions from all transactions"
+    echo "                       check:   compare positions with a from-scratch replay"
+    echo "                       Optional: SQLite file path (default: $prod_db)"
+    echo "                       Examples:"
+    echo "                         ./dev.sh db:positions check"
+    echo "                         ./dev.sh db:positions rebuild $test_db"
+    echo ""
+    echo "  db:lots <rebuild|check> [path]  FIFO lots maintenance"
+    echo "                       rebuild: recompute lots and matches from all transactions"
+    echo "                       check:   compare lots with a from-scratch FIFO matching"
+    echo "                       Optional: SQLite file path (default: $prod_db)"
+    echo "                       Examples:"
+    echo "                         ./dev.sh db:lots check"
+    echo "                         ./dev.sh db:lots rebuild $test_db"
+    echo ""
+    echo "  db:cash-balances <rebuild|check> [path]  Cash balance ledger maintenance"
+    echo "                       rebuild: recompute running balances from all cash movements"
+    echo "                       check:   compare the ledger with a from-scratch sum"
+    echo "                       Optional: SQLite file path (default: $prod_db)"
+    echo "                       Examples:"
+    echo "                         ./dev.sh db:cash-balances check"
+    echo "                         ./dev.sh db:cash-balances rebuild $test_db"
+    echo ""
+    echo "  db:snapshots <sync|rebuild> [path]  Daily portfolio snapshot maintenance"
+    echo "                       sync:    recompute the days invalidated since the last run"
+    echo "                       rebuild: recompute every day from the first activity"
+    echo "                       Optional: SQLite file path (default: $prod_db)"
+    echo "                       Examples:"
+    echo "                         ./dev.sh db:snapshots sync"
+    echo "                         ./dev.sh db:snapshots rebuild $test_db"
+    echo ""
+    echo "  db:allocation <rebuild|check> [path]  Asset allocation weights maintenance"
+    echo "                       rebuild: recompute weights from assets.classification_params"
+    echo "                       check:   compare the weights with classification_params"
+    echo "                       Optional: SQLite file path (default: $prod_db)"
+    echo "                       Examples:"
+    echo "                         ./dev.sh db:allocation check"
+    echo "                         ./dev.sh db:allocation rebuild $test_db"
+    echo ""
+    echo "  db:import <broker_id> <file> [path]  Import a broker statement (CSV or JSON)"
+    echo "                       Streams the file into transactions and cash movements;"
+    echo "                       running it again resumes an interrupted import"
+    echo "                       Optional: SQLite file path (default: $prod_db)"
+    echo "                       Examples:"
+    echo "                         ./dev.sh db:import 1 degiro-2024.csv"
+    echo "                         ./dev.sh db:import 2 statement.json $test_db"
+    echo ""
     echo "  db:downgrade [path]  Rollback one migration"
     echo "                       Optional: SQLite file path (default: $prod_db)"
     echo "                       Examples:"
@@ -557,6 +605,81 @@ function open_shell() {
     pipenv shell
 }
 
+# Run the maintenance CLI of a backend.app.services module on a database
+# Usage: run_db_maintenance <module> <dev.sh command> <label> <verb>... -- <verb> [path]
+function run_db_maintenance() {
+    local module="$1"
+    local name="$2"
+    local label="$3"
+    shift 3
+    local verbs=()
+    while [ "$#" -gt 0 ] && [ "$1" != "--" ]; do
+        verbs+=("$1")
+        shift
+    done
+    shift
+
+    local command="$1"
+    if [[ " ${verbs[*]} " != *" $command "* ]]; then
+        local usage=$(IFS='|'; echo "${verbs[*]}")
+        echo -e "${RED}Usage: ./dev.sh $name <$usage> [path]${NC}"
+        exit 1
+    fi
+
+    # Accept optional SQLite file path as second parameter
+    local db_path="${2:-$(get_database_path)}"
+    local db_url=$(path_to_url "$db_path")
+
+    echo -e "${GREEN}$label $command in: ${YELLOW}$db_path${NC}"
+    echo ""
+    if [ -n "$db_url" ]; then
+        DATABASE_URL="$db_url" pipenv run python -m "backend.app.services.$module" "$command"
+    else
+        pipenv run python -m "backend.app.services.$module" "$command"
+    fi
+}
+
+function db_positions() {
+    run_db_maintenance positions db:positions "Positions" rebuild check -- "$@"
+}
+
+function db_lots() {
+    run_db_maintenance lots db:lots "Lots" rebuild check -- "$@"
+}
+
+function db_cash_balances() {
+    run_db_maintenance cash_balances db:cash-balances "Cash balance ledger" rebuild check -- "$@"
+}
+
+function db_snapshots() {
+    run_db_maintenance portfolio_snapshots db:snapshots "Portfolio snapshots" sync rebuild -- "$@"
+}
+
+function db_allocation() {
+    run_db_maintenance asset_allocation db:allocation "Asset allocation weights" rebuild check -- "$@"
+}
+
+function db_import() {
+    local broker_id="$1"
+    local file="$2"
+    if [ -z "$broker_id" ] || [ -z "$file" ]; then
+        echo -e "${RED}Usage: ./dev.sh db:import <broker_id> <file> [path]${NC}"
+        exit 1
+    fi
+
+    # Accept optional SQLite file path as third parameter
+    local db_path="${3:-$(get_database_path)}"
+    local db_url=$(path_to_url "$db_path")
+
+    echo -e "${GREEN}Importing ${YELLOW}$file${GREEN} for broker $broker_id in: ${YELLOW}$db_path${NC}"
+    echo ""
+    if [ -n "$db_url" ]; then
+        DATABASE_URL="$db_url" pipenv run python -m backend.app.services.broker_import "$broker_id" "$file"
+    else
+        pipenv run python -m backend.app.services.broker_import "$broker_id" "$file"
+    fi
+}
+
 function list_api_endpoints() {
     echo -e "${GREEN}Listing all API endpoints...${NC}"
     echo ""
@@ -591,6 +714,24 @@ case "$COMMAND" in
     db:downgrade)
         db_downgrade "$2"
         ;;
+    db:positions)
+        db_positions "$2" "$3"
+        ;;
+    db:lots)
+        db_lots "$2" "$3"
+        ;;
+    db:cash-balances)
+        db_cash_balances "$2" "$3"
+        ;;
+    db:snapshots)
+        db_snapshots "$2" "$3"
+        ;;
+    db:allocation)
+        db_allocation "$2" "$3"
+        ;;
+    db:import)
+        db_import "$2" "$3" "$4"
+        ;;
     test)
         # Pass all arguments after 'test' to test_runner.py
         shift
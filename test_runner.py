@@ -654,6 +654,42 @@ def utils_distribution_models(verbose: bool = False) -> bool:
         )
 
 
+def utils_interest_vectorized(verbose: bool = False) -> bool:
+    """Test vectorized accrual kernel against scalar interest functions."""
+    print_section("Utils: Vectorized Interest")
+    print_info("Testing: backend/app/utils/financial_math.py (calculate_interest_vectorized)")
+    print_info("Tests: Float kernel vs scalar, exact Decimal mode, 100k periods, schedule helper")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_utilities/test_interest_vectorized.py", "-v"],
+        "Vectorized interest tests",
+        verbose=verbose
+        )
+
+
+def utils_day_count_service(verbose: bool = False) -> bool:
+    """Test day count service (year tables, closed form, batch, cache)."""
+    print_section("Utils: Day Count Service")
+    print_info("Testing: backend/app/utils/day_count.py")
+    print_info("Tests: Closed-form ACT/ACT vs year walk, batch exact/float, LRU cache on repeated boundaries")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_utilities/test_day_count_service.py", "-v"],
+        "Day count service tests",
+        verbose=verbose
+        )
+
+
+def utils_fast_json(verbose: bool = False) -> bool:
+    """Test fast JSON encoding (orjson and standard json fallback)."""
+    print_section("Utils: Fast JSON")
+    print_info("Testing: backend/app/utils/fast_json.py")
+    print_info("Tests: Both encoders match pydantic JSON (Decimal, dates, UTC, enums), FastJSONResponse")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_utilities/test_fast_json.py", "-v"],
+        "Fast JSON tests",
+        verbose=verbose
+        )
+
+
 def utils_all(verbose: bool = False) -> bool:
     """Run all utility tests."""
     print_header("LibreFolio Utility Tests")
@@ -670,6 +706,9 @@ def utils_all(verbose: bool = False) -> bool:
         ("FAGeographicArea Integration", lambda: utils_geographic_area_integration(verbose)),
         ("Sector Normalization", lambda: utils_sector_normalization(verbose)),
         ("Distribution Models", lambda: utils_distribution_models(verbose)),
+        ("Vectorized Interest", lambda: utils_interest_vectorized(verbose)),
+        ("Day Count Service", lambda: utils_day_count_service(verbose)),
+        ("Fast JSON", lambda: utils_fast_json(verbose)),
         ]
 
     results = []
@@ -701,6 +740,218 @@ def utils_all(verbose: bool = False) -> bool:
         return False
 
 
+def services_price_refresh_scheduler(verbose: bool = False) -> bool:
+    """
+    Test background price refresh scheduler.
+    """
+    print_section("Services: Price Refresh Scheduler")
+    print_info("Testing: backend/test_scripts/test_services/test_price_refresh_scheduler.py")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_price_refresh_scheduler.py", "-v"],
+        "Price Refresh Scheduler tests",
+        verbose=verbose
+        )
+
+
+def services_rate_limiter(verbose: bool = False) -> bool:
+    """
+    Test shared provider rate limiter (token buckets).
+    """
+    print_section("Services: Provider Rate Limiter")
+    print_info("Testing: backend/test_scripts/test_services/test_rate_limiter.py")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_rate_limiter.py", "-v"],
+        "Provider Rate Limiter tests",
+        verbose=verbose
+        )
+
+
+def services_scheduled_history(verbose: bool = False) -> bool:
+    """
+    Test the scheduled investment history sweep engine and its benchmark.
+    """
+    print_section("Services: Scheduled Investment History Sweep")
+    print_info("Testing: single-sweep daily history (identical to per-day values)")
+    print_info("Benchmark: 10-year and 30-year daily ranges")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_scheduled_investment_history.py", "-v"],
+        "Scheduled investment history tests",
+        verbose=verbose
+        )
+
+
+def services_scheduled_value_cache(verbose: bool = False) -> bool:
+    """
+    Test scheduled-yield value curve cache.
+    """
+    print_section("Services: Scheduled Value Cache")
+    print_info("Testing: value curves keyed by (schedule JSON, transaction set) version")
+    print_info("Covers: range slices, LRU eviction, invalidation on transaction/provider_params change")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_scheduled_value_cache.py", "-v"],
+        "Scheduled value cache tests",
+        verbose=verbose
+        )
+
+
+def services_scheduled_bulk(verbose: bool = False) -> bool:
+    """
+    Test batch valuation of scheduled-yield assets.
+    """
+    print_section("Services: Scheduled Investment Bulk Valuation")
+    print_info("Testing: bulk_get_history_value (assets, assignments, transactions in 3 queries)")
+    print_info("Covers: per-asset errors, portfolio-wide valuation, get_prices / bulk refresh integration")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_scheduled_investment_bulk.py", "-v"],
+        "Scheduled investment bulk valuation tests",
+        verbose=verbose
+        )
+
+
+def services_positions(verbose: bool = False) -> bool:
+    """Test materialized positions engine (incremental replay, rebuild, consistency check, oversell guard)."""
+    print_section("Services: Positions")
+    print_info("Testing: backend/app/services/positions.py")
+    print_info("Tests: Trigger invalidation, incremental sync, as-of queries, consistency check, rebuild, oversell guard")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_positions.py", "-v"],
+        "Positions engine tests",
+        verbose=verbose
+        )
+
+
+def services_lots(verbose: bool = False) -> bool:
+    """Test persisted FIFO lot engine (incremental recompute, realized/unrealized P&L, rebuild)."""
+    print_section("Services: FIFO Lots")
+    print_info("Testing: backend/app/services/lots.py")
+    print_info("Tests: FIFO matching, trigger invalidation, incremental sync, P&L queries, consistency check, 100k benchmark")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_lots.py", "-v"],
+        "FIFO lots engine tests",
+        verbose=verbose
+        )
+
+
+def services_cash_balances(verbose: bool = False) -> bool:
+    """Test cash balance ledger (trigger maintenance, balance queries, rebuild)."""
+    print_section("Services: Cash Balances")
+    print_info("Testing: backend/app/services/cash_balances.py")
+    print_info("Tests: Trigger-maintained running balances, balance-at-date/history queries, consistency check, rebuild")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_cash_balances.py", "-v"],
+        "Cash balance ledger tests",
+        verbose=verbose
+        )
+
+
+def services_portfolio_nav(verbose: bool = False) -> bool:
+    """Test vectorized portfolio NAV engine (quantity, price and FX matrices)."""
+    print_section("Services: Portfolio NAV")
+    print_info("Testing: backend/app/services/portfolio_nav.py")
+    print_info("Tests: Backward-fill kernel, multi-broker/multi-currency valuation, 500-asset x 15-year benchmark")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_portfolio_nav.py", "-v"],
+        "Portfolio NAV tests",
+        verbose=verbose
+        )
+
+
+def services_portfolio_snapshots(verbose: bool = False) -> bool:
+    """Test daily portfolio snapshots (invalidation triggers and incremental recompute)."""
+    print_section("Services: Portfolio Snapshots")
+    print_info("Testing: backend/app/services/portfolio_snapshots.py")
+    print_info("Tests: Invalidation on writes, recompute from the marked day, broker/total rows, base currency change, benchmark")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_portfolio_snapshots.py", "-v"],
+        "Portfolio Snapshots tests",
+        verbose=verbose
+        )
+
+
+def services_returns(verbose: bool = False) -> bool:
+    """Test time-weighted and money-weighted returns (vectorized kernels, XIRR solver, cache)."""
+    print_section("Services: Returns")
+    print_info("Testing: backend/app/services/returns.py")
+    print_info("Tests: TWR/XIRR kernels, broker and asset flows, cache hits and invalidation, batch benchmark")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_returns.py", "-v"],
+        "Returns tests",
+        verbose=verbose
+        )
+
+
+def services_asset_allocation(verbose: bool = False) -> bool:
+    """Test asset allocation index (trigger-maintained weights) and country/sector exposures."""
+    print_section("Services: Asset Allocation")
+    print_info("Testing: backend/app/services/asset_allocation.py")
+    print_info("Tests: Weights on asset create/patch/clear/delete, consistency check, exposures at a date, benchmark")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_asset_allocation.py", "-v"],
+        "Asset Allocation tests",
+        verbose=verbose
+        )
+
+
+def services_broker_import(verbose: bool = False) -> bool:
+    """Test streaming broker statement import (CSV/JSON, chunked bulk writes, resumable checkpoints)."""
+    print_section("Services: Broker Import")
+    print_info("Testing: backend/app/services/broker_import.py")
+    print_info("Tests: CSV statement with lookups and rejected rows, JSON resume after crash/oversell, overlapping statements, benchmark")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_broker_import.py", "-v"],
+        "Broker Import tests",
+        verbose=verbose
+        )
+
+
+def services_latest_prices(verbose: bool = False) -> bool:
+    """Test trigger-maintained latest price / latest FX rate tables."""
+    print_section("Services: Latest Prices")
+    print_info("Testing: asset_latest_prices / fx_latest_rates (migration 010 triggers)")
+    print_info("Tests: Upsert, update, range delete, NULL close, asset delete, FX pairs, benchmark")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_latest_prices.py", "-v"],
+        "Latest Prices tests",
+        verbose=verbose
+        )
+
+
+def services_price_matrix(verbose: bool = False) -> bool:
+    """Test the aligned multi-asset price matrix."""
+    print_section("Services: Price Matrix")
+    print_info("Testing: AssetSourceManager.get_price_matrix (one query, NumPy backward-fill)")
+    print_info("Tests: Shared date axis, fill mask, currency conversion, errors, benchmark")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_price_matrix.py", "-v"],
+        "Price Matrix tests",
+        verbose=verbose
+        )
+
+
+def services_price_series(verbose: bool = False) -> bool:
+    """Test the lazy backward-filled price series."""
+    print_section("Services: Price Series")
+    print_info("Testing: AssetSourceManager.iter_prices (compact points, streamed JSON)")
+    print_info("Tests: Last close before start, NULL closes, JSON parity, chunked array, benchmarks (30 years, 10k-point response)")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_price_series.py", "-v"],
+        "Price Series tests",
+        verbose=verbose
+        )
+
+
+def services_streaming(verbose: bool = False) -> bool:
+    """Test streamed series (NDJSON / CSV writers, FX conversion series)."""
+    print_section("Services: Streaming")
+    print_info("Testing: utils/streaming.py, fx.iter_converted_series (server-side cursors)")
+    print_info("Tests: Backward-fill over row stream, NDJSON/CSV chunks, parity with convert_bulk, flat memory")
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_services/test_streaming.py", "-v"],
+        "Streaming tests",
+        verbose=verbose
+        )
+
+
 def services_all(verbose: bool = False) -> bool:
     """
     Run all backend service tests.
@@ -726,6 +977,23 @@ def services_all(verbose: bool = False) -> bool:
         ("Provider Registry", lambda: services_provider_registry(verbose)),
         ("Synthetic Yield Calculation", lambda: services_synthetic_yield(verbose)),
         ("Synthetic Yield Integration E2E", lambda: services_synthetic_yield_integration(verbose)),
+        ("Price Refresh Scheduler", lambda: services_price_refresh_scheduler(verbose)),
+        ("Provider Rate Limiter", lambda: services_rate_limiter(verbose)),
+        ("Scheduled Investment History", lambda: services_scheduled_history(verbose)),
+        ("Scheduled Value Cache", lambda: services_scheduled_value_cache(verbose)),
+        ("Scheduled Investment Bulk Valuation", lambda: services_scheduled_bulk(verbose)),
+        ("Positions", lambda: services_positions(verbose)),
+        ("FIFO Lots", lambda: services_lots(verbose)),
+        ("Cash Balances", lambda: services_cash_balances(verbose)),
+        ("Portfolio NAV", lambda: services_portfolio_nav(verbose)),
+        ("Portfolio Snapshots", lambda: services_portfolio_snapshots(verbose)),
+        ("Returns", lambda: services_returns(verbose)),
+        ("Asset Allocation", lambda: services_asset_allocation(verbose)),
+        ("Broker Import", lambda: services_broker_import(verbose)),
+        ("Latest Prices", lambda: services_latest_prices(verbose)),
+        ("Price Matrix", lambda: services_price_matrix(verbose)),
+        ("Price Series", lambda: services_price_series(verbose)),
+        ("Streaming", lambda: services_streaming(verbose)),
         ]
 
     results = []
@@ -879,6 +1147,22 @@ def api_utilities(verbose: bool = False) -> bool:
         )
 
 
+def api_portfolio(verbose: bool = False) -> bool:
+    """
+    Run Portfolio API endpoint tests.
+    """
+    print_section("Portfolio API Endpoint Tests")
+    print_info("Testing REST API endpoints for portfolio valuation")
+    print_info("Tests: GET /portfolio/nav, GET /portfolio/snapshots, GET /portfolio/returns, GET /portfolio/allocation")
+    print_info("Note: Server will be automatically started and stopped by test")
+
+    return run_command(
+        ["pipenv", "run", "python", "-m", "pytest", "backend/test_scripts/test_api/test_portfolio.py", "-v"],
+        "Portfolio API tests",
+        verbose=verbose
+        )
+
+
 def api_test(verbose: bool = False) -> bool:
     """
     Run all API tests.
@@ -895,6 +1179,7 @@ def api_test(verbose: bool = False) -> bool:
         ("Assets Price API", lambda: api_assets_price(verbose)),
         ("Assets Provider API", lambda: api_assets_provider(verbose)),
         ("Utilities API", lambda: api_utilities(verbose)),
+        ("Portfolio API", lambda: api_portfolio(verbose)),
         ]
 
     results = []
@@ -1224,16 +1509,67 @@ Test commands:
                               📋 Prerequisites: Database created (run: db create)
                               💡 Scenarios: P2P loan (grace + late), bond compound quarterly, mixed SIMPLE/COMPOUND
   
+  price-refresh-scheduler - Test background price refresh scheduler
+                         💡 Tests: staleness ordering, provider budgets, market-hour deferral, status
+
+  rate-limiter         - Test shared provider rate limiter (token buckets)
+                         💡 Tests: 429/Retry-After detection, pacing, concurrency cap, adaptive rate
+
+  scheduled-history    - Test scheduled investment history sweep engine
+                         💡 Tests: identical values vs per-day method, 10y/30y benchmark
+
+  scheduled-value-cache - Test scheduled-yield value curve cache
+                         💡 Tests: range slices, LRU, invalidation on transaction/provider_params change
+
+  scheduled-bulk       - Test batch valuation of scheduled-yield assets
+                         💡 Tests: three set-based queries, get_prices and bulk refresh integration
+
+  positions            - Test materialized positions engine
+                         💡 Tests: trigger invalidation, incremental replay, consistency check, rebuild, oversell guard
+
+  lots                 - Test persisted FIFO lot engine
+                         💡 Tests: FIFO matching, incremental recompute, realized/unrealized P&L, rebuild
+
+  cash-balances        - Test cash balance ledger
+                         💡 Tests: running balances on movement insert/update/delete, O(log n) lookups, rebuild
+
+  portfolio-nav        - Test vectorized portfolio NAV engine
+                         💡 Tests: backward-filled prices/FX, per-asset contributions, 500 assets x 15 years benchmark
+
+  portfolio-snapshots  - Test incrementally maintained daily portfolio snapshots
+                         💡 Tests: invalidation triggers, incremental recompute, assets + cash per broker, range reads
+
+  returns              - Test time-weighted and money-weighted returns with cached XIRR
+                         💡 Tests: TWR/XIRR kernels, per-scope flows, cache invalidation, benchmark
+
+  asset-allocation     - Test asset allocation index and exposures
+                         💡 Tests: trigger-maintained weights, country/sector GROUP BY exposures, benchmark
+
+  broker-import        - Test streaming broker statement import
+                         💡 Tests: linked transaction + cash movement bulk writes, checkpoint resume, duplicate skipping, benchmark
+
+  latest-prices        - Test latest price / FX rate tables
+                         💡 Tests: trigger maintenance on every write path, benchmark vs ORDER BY date DESC
+
+  price-matrix         - Test aligned multi-asset price matrix
+                         💡 Tests: shared date axis, backward-fill mask, conversion, benchmark vs get_prices
+
+  price-series         - Test lazy backward-filled price series
+                         💡 Tests: last close before start, JSON parity, benchmarks vs FAPricePoint list and json.dumps (10k-point response)
+
+  streaming            - Test streamed series (NDJSON / CSV, FX conversion series)
+                         💡 Tests: row-stream backward-fill, parity with convert_bulk, flat memory 5 vs 30 years
+
   all                   - Run all backend service tests
   
-Future: FIFO calculations, portfolio aggregations, loan schedules will be added here
+Future: loan schedules will be added here
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter
         )
 
     services_parser.add_argument(
         "action",
-        choices=["fx-conversion", "asset-source", "asset-metadata", "asset-source-refresh", "provider-registry", "synthetic-yield", "synthetic-yield-integration", "all"],
+        choices=["fx-conversion", "asset-source", "asset-metadata", "asset-source-refresh", "provider-registry", "synthetic-yield", "synthetic-yield-integration", "price-refresh-scheduler", "rate-limiter", "scheduled-history", "scheduled-value-cache", "scheduled-bulk", "positions", "lots", "cash-balances", "portfolio-nav", "portfolio-snapshots", "returns", "asset-allocation", "broker-import", "latest-prices", "price-matrix", "price-series", "streaming", "all"],
         help="Service test to run"
         )
 
@@ -1292,6 +1628,18 @@ Test commands:
                         📋 Prerequisites: None
                         💡 Tests: Weight validation, quantization, country/sector normalization
   
+  interest-vectorized - Test vectorized NumPy accrual kernel (calculate_interest_vectorized)
+                        📋 Prerequisites: None
+                        💡 Tests: Float kernel vs scalar interest, exact Decimal mode, 100k periods
+  
+  day-count-service - Test day count service (backend/app/utils/day_count.py)
+                      📋 Prerequisites: None
+                      💡 Tests: Closed-form ACT/ACT and 30/360, batch fractions, LRU cache
+  
+  fast-json        - Test fast JSON encoding (backend/app/utils/fast_json.py)
+                      📋 Prerequisites: None
+                      💡 Tests: orjson and json fallback match pydantic JSON, FastJSONResponse
+  
   all              - Run all utility tests
   
 These are foundational tests for remediation phases 1 & 2.
@@ -1312,6 +1660,9 @@ These are foundational tests for remediation phases 1 & 2.
             "geographic-area-integration",
             "sector-normalization",
             "distribution-models",
+            "interest-vectorized",
+            "day-count-service",
+            "fast-json",
             "all",
             ],
         help="Utility test to run",
@@ -1360,6 +1711,11 @@ Test commands:
                     📋 Prerequisites: None
                     💡 Tests: GET /utilities/sectors, GET /utilities/countries/normalize
                     Note: Server will be automatically started and stopped by test
+
+  portfolio       - Test Portfolio endpoints (NAV series, daily snapshots, returns, allocation)
+                    📋 Prerequisites: Database created (run: db create)
+                    💡 Tests: GET /portfolio/nav, GET /portfolio/snapshots (series shape, validation)
+                    Note: Server will be automatically started and stopped by test
                     
   all             - Run all API tests (FX + Assets Metadata + Assets CRUD + Utilities)
         """,
@@ -1368,7 +1724,7 @@ Test commands:
 
     api_parser.add_argument(
         "action",
-        choices=["fx", "fx-sync", "assets-metadata", "assets-crud", "assets-provider", "assets-price", "utilities", "all"],
+        choices=["fx", "fx-sync", "assets-metadata", "assets-crud", "assets-provider", "assets-price", "utilities", "portfolio", "all"],
         help="API test to run"
         )
 
@@ -1502,6 +1858,40 @@ def main():
             success = services_synthetic_yield(verbose=verbose)
         elif args.action == "synthetic-yield-integration":
             success = services_synthetic_yield_integration(verbose=verbose)
+        elif args.action == "price-refresh-scheduler":
+            success = services_price_refresh_scheduler(verbose=verbose)
+        elif args.action == "rate-limiter":
+            success = services_rate_limiter(verbose=verbose)
+        elif args.action == "scheduled-history":
+            success = services_scheduled_history(verbose=verbose)
+        elif args.action == "scheduled-value-cache":
+            success = services_scheduled_value_cache(verbose=verbose)
+        elif args.action == "scheduled-bulk":
+            success = services_scheduled_bulk(verbose=verbose)
+        elif args.action == "positions":
+            success = services_positions(verbose=verbose)
+        elif args.action == "lots":
+            success = services_lots(verbose=verbose)
+        elif args.action == "cash-balances":
+            success = services_cash_balances(verbose=verbose)
+        elif args.action == "portfolio-nav":
+            success = services_portfolio_nav(verbose=verbose)
+        elif args.action == "portfolio-snapshots":
+            success = services_portfolio_snapshots(verbose=verbose)
+        elif args.action == "returns":
+            success = services_returns(verbose=verbose)
+        elif args.action == "asset-allocation":
+            success = services_asset_allocation(verbose=verbose)
+        elif args.action == "broker-import":
+            success = services_broker_import(verbose=verbose)
+        elif args.action == "latest-prices":
+            success = services_latest_prices(verbose=verbose)
+        elif args.action == "price-matrix":
+            success = services_price_matrix(verbose=verbose)
+        elif args.action == "price-series":
+            success = services_price_series(verbose=verbose)
+        elif args.action == "streaming":
+            success = services_streaming(verbose=verbose)
         elif args.action == "all":
             success = services_all(verbose=verbose)
 
@@ -1527,6 +1917,12 @@ def main():
             success = utils_sector_normalization(verbose=verbose)
         elif args.action == "distribution-models":
             success = utils_distribution_models(verbose=verbose)
+        elif args.action == "interest-vectorized":
+            success = utils_interest_vectorized(verbose=verbose)
+        elif args.action == "day-count-service":
+            success = utils_day_count_service(verbose=verbose)
+        elif args.action == "fast-json":
+            success = utils_fast_json(verbose=verbose)
         elif args.action == "all":
             success = utils_all(verbose=verbose)
 
@@ -1546,6 +1942,8 @@ def main():
             success = api_assets_provider(verbose=verbose)
         elif args.action == "utilities":
             success = api_utilities(verbose=verbose)
+        elif args.action == "portfolio":
+            success = api_portfolio(verbose=verbose)
         elif args.action == "all":
             success = api_test(verbose=verbose)
 